@@ -0,0 +1,125 @@
+"""Throughput benchmark of the gRPC channel pool.
+
+Starts a local stand-in gRPC server, which answers every call after --latency
+seconds and serves at most --max-streams calls at a time per connection, as the
+HTTP/2 frontends of the real API bound the concurrent streams of each connection.
+Then sends --requests calls from --workers threads through a ClientPool of each
+number of --channels:
+
+    python benchmarks/channel_pool_benchmark.py --channels 1 2 4 8 --workers 64 \\
+        --latency 0.02 --max-streams 8
+
+Reports the throughput of each number of channels, with both dispatch strategies.
+"""
+import argparse
+import collections
+import threading
+import time
+from concurrent import futures
+
+import grpc
+
+from datacatalog_fileset_processor import client_pool, constant
+
+_SERVICE_NAME = 'google.cloud.datacatalog.v1.DataCatalog'
+_GET_ENTRY_METHOD = '/{}/GetEntry'.format(_SERVICE_NAME)
+
+
+def start_server(latency, max_streams, max_workers):
+    # Calls beyond the limit of their connection, identified by its peer address,
+    # wait for a slot, as the streams queued by the client would.
+    connection_slots = collections.defaultdict(lambda: threading.BoundedSemaphore(max_streams))
+    lock = threading.Lock()
+
+    def get_entry(request, context):
+        with lock:
+            slots = connection_slots[context.peer()]
+        with slots:
+            time.sleep(latency)
+        return request
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    server.add_generic_rpc_handlers([
+        grpc.method_handlers_generic_handler(
+            _SERVICE_NAME, {'GetEntry': grpc.unary_unary_rpc_method_handler(get_entry)})
+    ])
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    return server, 'localhost:{}'.format(port)
+
+
+class StandInTransport:
+    """Stand-in for the Data Catalog gRPC transport, without credentials."""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.get_entry = channel.unary_unary(_GET_ENTRY_METHOD)
+
+    @classmethod
+    def create_channel(cls, address, credentials=None, options=None):
+        return grpc.insecure_channel(address, options=options)
+
+
+class StandInClient:
+    """Stand-in for the Data Catalog client, sending the Entry names as raw bytes."""
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    def get_entry(self, name):
+        return self.transport.get_entry(name.encode())
+
+
+def make_pool(address, channels, dispatch):
+    return client_pool.ClientPool([
+        StandInClient(client_pool.create_transport(None, StandInTransport, address))
+        for _ in range(channels)
+    ], dispatch)
+
+
+def run_calls(pool, requests, workers):
+    # A first call per channel opens the connections before the timing starts.
+    for client in pool.clients:
+        client.get_entry('warm-up')
+
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        start = time.perf_counter()
+        list(
+            executor.map(lambda index: pool.get_entry(name='entry_{}'.format(index)),
+                         range(requests)))
+        elapsed = time.perf_counter() - start
+
+    for client in pool.clients:
+        client.transport.channel.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--channels', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=64, help='Client threads')
+    parser.add_argument('--latency', type=float, default=0.02, help='Seconds per call')
+    parser.add_argument('--max-streams',
+                        type=int,
+                        default=8,
+                        help='Maximum concurrent streams per connection')
+    args = parser.parse_args()
+
+    server, address = start_server(args.latency, args.max_streams, args.workers * 2)
+    try:
+        print('{:>8} {:>14} {:>12} {:>12}'.format('channels', 'dispatch', 'seconds', 'calls/s'))
+        for channels in args.channels:
+            for dispatch in (constant.CHANNEL_DISPATCH_ROUND_ROBIN,
+                             constant.CHANNEL_DISPATCH_LEAST_LOADED):
+                elapsed = run_calls(make_pool(address, channels, dispatch), args.requests,
+                                    args.workers)
+                print('{:>8} {:>14} {:>12.3f} {:>12.1f}'.format(channels, dispatch, elapsed,
+                                                                args.requests / elapsed))
+    finally:
+        server.stop(None)
+
+
+if __name__ == '__main__':
+    main()
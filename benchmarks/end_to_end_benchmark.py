@@ -0,0 +1,139 @@
+"""End-to-end benchmark of the create and delete commands.
+
+Generates a synthetic CSV file with --entry-groups x --entries-per-group x
+--columns-per-entry rows and runs the processor against an in-process fake Data
+Catalog client, which simulates the API latency and transient errors:
+
+    python benchmarks/end_to_end_benchmark.py --entry-groups 50 --workers 1 8 32 \\
+        --latency 0.05 --rpc-latency create_entry=0.1 --error-rate 0.01
+
+Reports the CSV parse, normalization and extraction times, the Entry objects
+construction time, and the create and delete throughput for each number of workers.
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from datacatalog_fileset_processor import \
+    datacatalog_entity_factory, fileset_datasource_processor, rate_limiter
+
+from fake_datacatalog_client import FakeDataCatalogClient, patched_datacatalog_client
+from synthetic_csv import write_synthetic_csv
+
+_PROCESSOR_CLASS = fileset_datasource_processor.FilesetDatasourceProcessor
+_normalize_dataframe = getattr(_PROCESSOR_CLASS,
+                               '_FilesetDatasourceProcessor__normalize_dataframe')
+_extract_entry_group_specs = getattr(_PROCESSOR_CLASS,
+                                     '_FilesetDatasourceProcessor__extract_entry_group_specs')
+
+
+def time_call(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def make_entries(entry_group_specs):
+    return [
+        datacatalog_entity_factory.DataCatalogEntityFactory.make_entry(entry_spec)
+        for entry_group_spec in entry_group_specs for entry_spec in entry_group_spec.entries
+    ]
+
+
+def run_stages(file_path):
+    dataframe, parse_time = time_call(pd.read_csv, file_path, comment='#')
+    normalized_df, normalize_time = time_call(_normalize_dataframe, dataframe)
+    entry_group_specs, extract_time = time_call(_extract_entry_group_specs, normalized_df)
+    entries, construct_time = time_call(make_entries, entry_group_specs)
+
+    print('{:>24} {:>10}'.format('stage', 'seconds'))
+    for stage, stage_time in (('parse', parse_time), ('normalize', normalize_time),
+                              ('extract', extract_time), ('entity construction', construct_time)):
+        print('{:>24} {:>10.3f}'.format(stage, stage_time))
+
+    return len(entries)
+
+
+def run_commands(file_path, entries_count, workers_list, client_args, max_retries):
+    print()
+    print('{:>8} {:>14} {:>14} {:>14} {:>14} {:>8}'.format('workers', 'create s', 'create e/s',
+                                                           'delete s', 'delete e/s', 'calls'))
+    for workers in workers_list:
+        client = FakeDataCatalogClient(**client_args)
+        with patched_datacatalog_client(client):
+            processor = _PROCESSOR_CLASS(rate_limiter=rate_limiter.RateLimiter(
+                max_retries=max_retries, initial_backoff=0.01))
+            _, create_time = time_call(processor.create_entry_groups_and_entries_from_csv,
+                                       file_path,
+                                       workers=workers)
+            if len(client.entries) != entries_count:
+                raise AssertionError('{} Entries were created, {} expected'.format(
+                    len(client.entries), entries_count))
+            _, delete_time = time_call(processor.delete_entry_groups_and_entries_from_csv,
+                                       file_path,
+                                       workers=workers)
+
+        print('{:>8} {:>14.3f} {:>14.1f} {:>14.3f} {:>14.1f} {:>8}'.format(
+            workers, create_time, entries_count / create_time, delete_time,
+            entries_count / delete_time, client.calls_count))
+
+
+def parse_rpc_values(values):
+    rpc_values = {}
+    for value in values or []:
+        rpc_name, _, rpc_value = value.partition('=')
+        rpc_values[rpc_name] = float(rpc_value)
+    return rpc_values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entry-groups', type=int, default=20)
+    parser.add_argument('--entries-per-group', type=int, default=20)
+    parser.add_argument('--columns-per-entry', type=int, default=5)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--latency', type=float, default=0.02, help='Seconds per call')
+    parser.add_argument('--rpc-latency',
+                        action='append',
+                        metavar='RPC=SECONDS',
+                        help='Latency of a given RPC type, e.g. create_entry=0.1')
+    parser.add_argument('--error-rate',
+                        type=float,
+                        default=0.0,
+                        help='Fraction of the calls failing with a transient error')
+    parser.add_argument('--rpc-error-rate',
+                        action='append',
+                        metavar='RPC=RATE',
+                        help='Error rate of a given RPC type, e.g. get_entry=0.05')
+    parser.add_argument('--max-retries', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, 'filesets.csv')
+        rows = write_synthetic_csv(file_path, args.entry_groups, args.entries_per_group,
+                                   args.columns_per_entry)
+        print('{} rows, {} Entry Groups, {} Entries'.format(
+            rows, args.entry_groups, args.entry_groups * args.entries_per_group))
+        print()
+
+        entries_count = run_stages(file_path)
+        run_commands(
+            file_path, entries_count, args.workers, {
+                'latency': args.latency,
+                'rpc_latency': parse_rpc_values(args.rpc_latency),
+                'error_rate': args.error_rate,
+                'rpc_error_rate': parse_rpc_values(args.rpc_error_rate),
+                'seed': args.seed
+            }, args.max_retries)
+
+
+if __name__ == '__main__':
+    main()
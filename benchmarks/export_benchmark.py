@@ -0,0 +1,108 @@
+"""Benchmark for the export of the Filesets Entry Groups and Entries to CSV.
+
+Fills an in-process fake Data Catalog client with synthetic Entry Groups of Fileset
+Entries, then exports them with each number of --workers, and reports the throughput
+and the peak memory allocated while exporting, which should not grow with the number
+of Entries:
+
+    python benchmarks/export_benchmark.py --entries 10000 100000 --workers 1 8 \\
+        --latency 0.02
+
+Each page of Entries listed costs a call of --latency seconds. The exported file is
+read back with the csv parser, and its Entries are checked against the exported ones.
+"""
+import argparse
+import gc
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+from google.cloud import datacatalog_v1
+
+from datacatalog_fileset_processor import csv_parser, fileset_datasource_processor
+
+from fake_datacatalog_client import FakeDataCatalogClient, patched_datacatalog_client
+
+PROJECT_ID = 'my-project'
+LOCATION_ID = 'us-central1'
+ENTRIES_PER_GROUP = 1000
+COLUMNS_PER_ENTRY = 5
+
+
+def fill_client(client, entries_count):
+    parent = 'projects/{}/locations/{}'.format(PROJECT_ID, LOCATION_ID)
+    for group_index in range(max(1, entries_count // ENTRIES_PER_GROUP)):
+        entry_group = datacatalog_v1.types.EntryGroup()
+        entry_group.name = '{}/entryGroups/entry_group_{}'.format(parent, group_index)
+        entry_group.display_name = 'Entry Group {}'.format(group_index)
+        client.entry_groups[entry_group.name] = entry_group
+        for entry_index in range(ENTRIES_PER_GROUP):
+            entry = datacatalog_v1.types.Entry()
+            entry.name = '{}/entries/entry_{}'.format(entry_group.name, entry_index)
+            entry.display_name = 'Fileset {}'.format(entry_index)
+            entry.type = datacatalog_v1.enums.EntryType.FILESET
+            entry.gcs_fileset_spec.file_patterns.append('gs://bucket_{}/entry_{}/*.csv'.format(
+                group_index, entry_index))
+            entry.schema.columns.extend([
+                datacatalog_v1.types.ColumnSchema(column='column_{}'.format(column_index),
+                                                  type='STRING',
+                                                  mode='NULLABLE')
+                for column_index in range(COLUMNS_PER_ENTRY)
+            ])
+            client.entries[entry.name] = entry
+
+
+def export(client, file_path, workers):
+    """Exports the client Entry Groups and Entries.
+
+    :return: The number of exported Entries, the elapsed time, and the peak memory
+     allocated while exporting.
+    """
+    with patched_datacatalog_client(client):
+        processor = fileset_datasource_processor.FilesetDatasourceProcessor()
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    _, entries_count = processor.export_entry_groups_and_entries_to_csv(
+        [(PROJECT_ID, LOCATION_ID)], file_path, workers)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return entries_count, elapsed, peak
+
+
+def run(entries_list, workers_list, latency):
+    print('{:>10} {:>8} {:>10} {:>12} {:>10}'.format('entries', 'workers', 'seconds', 'entries/s',
+                                                     'peak MiB'))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, 'filesets.csv')
+        for entries in entries_list:
+            client = FakeDataCatalogClient(latency=latency)
+            fill_client(client, entries)
+            for workers in workers_list:
+                entries_count, elapsed, peak = export(client, file_path, workers)
+                read_entries_count = sum(
+                    len(entry_group_spec.entries)
+                    for entry_group_spec in csv_parser.read_entry_group_specs(file_path))
+                if read_entries_count != len(client.entries):
+                    raise AssertionError('{} Entries read back, {} expected'.format(
+                        read_entries_count, len(client.entries)))
+                print('{:>10} {:>8} {:>10.3f} {:>12.0f} {:>10.1f}'.format(
+                    entries_count, workers, elapsed, entries_count / elapsed, peak / 2**20))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--latency', type=float, default=0.02, help='Seconds per call')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    run(args.entries, args.workers, args.latency)
+
+
+if __name__ == '__main__':
+    main()
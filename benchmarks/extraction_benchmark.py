@@ -0,0 +1,157 @@
+"""Benchmark for the Entry Groups and Entries extraction stage.
+
+Compares the single pass extraction used by FilesetDatasourceProcessor with the
+former loc/drop implementation over synthetic CSV files, and checks that both
+produce the same Entry Groups and Entries:
+
+    python benchmarks/extraction_benchmark.py --rows 10000 100000 1000000
+
+Row counts are rounded down to whole Entry Groups of 100 rows. The former
+implementation is quadratic, so it only runs up to --legacy-max-rows.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from datacatalog_fileset_processor import constant, fileset_datasource_processor
+
+from synthetic_csv import write_synthetic_csv
+
+ENTRIES_PER_GROUP = 20
+COLUMNS_PER_ENTRY = 5
+ROWS_PER_ENTRY_GROUP = ENTRIES_PER_GROUP * COLUMNS_PER_ENTRY
+
+_PROCESSOR_CLASS = fileset_datasource_processor.FilesetDatasourceProcessor
+_normalize_dataframe = getattr(_PROCESSOR_CLASS,
+                               '_FilesetDatasourceProcessor__normalize_dataframe')
+_extract_entry_group_specs = getattr(_PROCESSOR_CLASS,
+                                     '_FilesetDatasourceProcessor__extract_entry_group_specs')
+
+
+def legacy_extract_entry_groups_dict(dataframe):
+    """The loc/drop based extraction, kept for comparison purposes."""
+    dataframe.set_index(constant.FILESETS_ENTRY_GROUP_NAME_COLUMN_LABEL, inplace=True)
+    key_values = dataframe.index.unique().tolist()
+    array = []
+    for key_value in key_values:
+        if pd.notna(key_value):
+            entry_group_subset = dataframe.loc[[key_value]]
+
+            dataframe.drop(key_value, inplace=True)
+
+            entry_group_data = \
+                entry_group_subset.loc[:, :constant.FILESETS_ENTRY_GROUP_DESCRIPTION_COLUMN_LABEL]
+
+            entries = legacy_extract_entries(
+                key_value, entry_group_subset.loc[:, constant.FILESETS_ENTRY_ID_COLUMN_LABEL:])
+
+            array.append({
+                'name':
+                key_value,
+                'display_name':
+                entry_group_data[constant.FILESETS_ENTRY_GROUP_DISPLAY_NAME_COLUMN_LABEL][0],
+                'description':
+                entry_group_data[constant.FILESETS_ENTRY_GROUP_DESCRIPTION_COLUMN_LABEL][0],
+                'entries':
+                entries
+            })
+    return array
+
+
+def legacy_extract_entries(entry_group_name, dataframe):
+    dataframe.set_index(constant.FILESETS_ENTRY_ID_COLUMN_LABEL, inplace=True)
+    key_values = dataframe.index.unique().tolist()
+    array = []
+    for key_value in key_values:
+        if pd.notna(key_value):
+            entry_subset = dataframe.loc[[key_value]]
+
+            schema_columns_dict = {}
+            for base_object in entry_subset.loc[:, constant.
+                                                FILESETS_ENTRY_SCHEMA_COLUMN_NAME_COLUMN_LABEL:] \
+                    .to_dict(orient='records'):
+                schema_columns_dict[base_object[
+                    constant.FILESETS_ENTRY_SCHEMA_COLUMN_NAME_COLUMN_LABEL]] = {
+                        constant.FILESETS_ENTRY_SCHEMA_COLUMN_DESCRIPTION_COLUMN_LABEL:
+                        base_object[
+                            constant.FILESETS_ENTRY_SCHEMA_COLUMN_DESCRIPTION_COLUMN_LABEL],
+                        constant.FILESETS_ENTRY_SCHEMA_COLUMN_MODE_COLUMN_LABEL:
+                        base_object[constant.FILESETS_ENTRY_SCHEMA_COLUMN_MODE_COLUMN_LABEL],
+                        constant.FILESETS_ENTRY_SCHEMA_COLUMN_TYPE_COLUMN_LABEL:
+                        base_object[constant.FILESETS_ENTRY_SCHEMA_COLUMN_TYPE_COLUMN_LABEL]
+                    }
+
+            array.append({
+                'id':
+                key_value,
+                'name':
+                '{}/entries/{}'.format(entry_group_name, key_value),
+                'display_name':
+                entry_subset['entry_display_name'][0],
+                'description':
+                entry_subset['entry_description'][0],
+                'file_patterns':
+                entry_subset['entry_file_patterns'][0].split(
+                    constant.FILE_PATTERNS_VALUES_SEPARATOR),
+                'schema_columns':
+                schema_columns_dict
+            })
+    return array
+
+
+def to_dicts(entry_group_specs):
+    """Converts the Entry Group specs to the dicts made by the former implementation."""
+    return [
+        dict(entry_group_spec.to_dict(),
+             entries=[entry_spec.to_dict() for entry_spec in entry_group_spec.entries])
+        for entry_group_spec in entry_group_specs
+    ]
+
+
+def time_call(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run(rows_list, legacy_max_rows):
+    print('{:>10} {:>12} {:>14} {:>14} {:>9}'.format('rows', 'normalize s', 'single pass s',
+                                                     'loc/drop s', 'speedup'))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for rows in rows_list:
+            file_path = os.path.join(temp_dir, 'filesets_{}.csv'.format(rows))
+            rows = write_synthetic_csv(file_path, max(1, rows // ROWS_PER_ENTRY_GROUP),
+                                       ENTRIES_PER_GROUP, COLUMNS_PER_ENTRY)
+            dataframe = pd.read_csv(file_path, comment='#')
+
+            normalized_df, normalize_time = time_call(_normalize_dataframe, dataframe)
+            entry_groups, extract_time = time_call(_extract_entry_group_specs,
+                                                   normalized_df.copy())
+
+            legacy_time = None
+            if rows <= legacy_max_rows:
+                legacy_entry_groups, legacy_time = time_call(legacy_extract_entry_groups_dict,
+                                                             normalized_df.copy())
+                if legacy_entry_groups != to_dicts(entry_groups):
+                    raise AssertionError('Extraction results differ for {} rows'.format(rows))
+
+            print('{:>10} {:>12.3f} {:>14.3f} {:>14} {:>9}'.format(
+                rows, normalize_time, extract_time,
+                '{:.3f}'.format(legacy_time) if legacy_time is not None else 'skipped',
+                '{:.1f}x'.format(legacy_time / extract_time) if legacy_time is not None else '-'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--legacy-max-rows', type=int, default=100000)
+    args = parser.parse_args()
+    run(args.rows, args.legacy_max_rows)
+
+
+if __name__ == '__main__':
+    main()
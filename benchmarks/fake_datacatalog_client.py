@@ -0,0 +1,183 @@
+"""In-process stand-in for the Data Catalog API client, for benchmarking."""
+import contextlib
+import random
+import threading
+import time
+import types
+from unittest import mock
+
+from google.api_core import exceptions, page_iterator
+from google.cloud import datacatalog_v1
+
+
+class FakeDataCatalogClient:
+    """Keeps the Entry Groups and Entries in memory.
+
+    Every call sleeps for its RPC latency, which releases the GIL like a network
+    call would, and fails with ServiceUnavailable at its RPC error rate.
+    """
+
+    def __init__(self,
+                 latency=0.0,
+                 rpc_latency=None,
+                 error_rate=0.0,
+                 rpc_error_rate=None,
+                 seed=None):
+        """
+        :param latency: Default latency of the calls, in seconds.
+        :param rpc_latency: Optional dict of the latency by RPC type, in seconds.
+        :param error_rate: Default fraction of the calls that fail, from 0 to 1.
+        :param rpc_error_rate: Optional dict of the fraction of calls that fail, by RPC type.
+        :param seed: Optional seed for the errors, so runs are reproducible.
+        """
+        self.__latency = latency
+        self.__rpc_latency = rpc_latency or {}
+        self.__error_rate = error_rate
+        self.__rpc_error_rate = rpc_error_rate or {}
+        self.__random = random.Random(seed)
+        self.__lock = threading.Lock()
+        self.calls_count = 0
+        self.entry_groups = {}
+        self.entries = {}
+
+    def __call(self, rpc_name):
+        time.sleep(self.__rpc_latency.get(rpc_name, self.__latency))
+        with self.__lock:
+            self.calls_count += 1
+            failed = self.__random.random() < self.__rpc_error_rate.get(
+                rpc_name, self.__error_rate)
+        if failed:
+            raise exceptions.ServiceUnavailable('Injected {} error'.format(rpc_name))
+
+    def create_entry_group(self, parent, entry_group_id, entry_group):
+        self.__call('create_entry_group')
+        name = '{}/entryGroups/{}'.format(parent, entry_group_id)
+        with self.__lock:
+            if name in self.entry_groups:
+                raise exceptions.AlreadyExists('Entry Group already exists')
+            created_entry_group = datacatalog_v1.types.EntryGroup()
+            created_entry_group.CopyFrom(entry_group)
+            created_entry_group.name = name
+            self.entry_groups[name] = created_entry_group
+        return created_entry_group
+
+    def list_entry_groups(self, parent):
+        prefix = parent + '/entryGroups/'
+        with self.__lock:
+            entry_groups = [
+                entry_group for name, entry_group in self.entry_groups.items()
+                if name.startswith(prefix)
+            ]
+        return self.__iterate_pages('list_entry_groups', entry_groups)
+
+    def update_entry_group(self, entry_group, update_mask=None):
+        self.__call('update_entry_group')
+        with self.__lock:
+            if entry_group.name not in self.entry_groups:
+                raise exceptions.PermissionDenied('Entry Group not found')
+            updated_entry_group = self.__apply_update(self.entry_groups[entry_group.name],
+                                                      entry_group, update_mask)
+            self.entry_groups[entry_group.name] = updated_entry_group
+        return updated_entry_group
+
+    def delete_entry_group(self, name):
+        self.__call('delete_entry_group')
+        with self.__lock:
+            if name not in self.entry_groups:
+                raise exceptions.PermissionDenied('Entry Group not found')
+            del self.entry_groups[name]
+
+    def create_entry(self, parent, entry_id, entry):
+        self.__call('create_entry')
+        name = '{}/entries/{}'.format(parent, entry_id)
+        with self.__lock:
+            if name in self.entries:
+                raise exceptions.AlreadyExists('Entry already exists')
+            created_entry = datacatalog_v1.types.Entry()
+            created_entry.CopyFrom(entry)
+            created_entry.name = name
+            self.entries[name] = created_entry
+        return created_entry
+
+    def get_entry(self, name):
+        self.__call('get_entry')
+        with self.__lock:
+            if name not in self.entries:
+                raise exceptions.PermissionDenied('Entry not found')
+            entry = datacatalog_v1.types.Entry()
+            entry.CopyFrom(self.entries[name])
+        return entry
+
+    def list_entries(self, parent, page_size=None):
+        prefix = parent + '/entries/'
+        with self.__lock:
+            entries = [entry for name, entry in self.entries.items() if name.startswith(prefix)]
+        return self.__iterate_pages('list_entries', entries, page_size)
+
+    def __iterate_pages(self, rpc_name, items, page_size=None):
+        # As with the 1.x clients, each page is a call of its own, made as the previous
+        # one is exhausted. The page token is the position of the next item.
+        def list_page(request):
+            self.__call(rpc_name)
+            start = int(request.page_token or 0)
+            end = start + (page_size or len(items))
+            return types.SimpleNamespace(items=items[start:end],
+                                         next_page_token=str(end) if end < len(items) else '')
+
+        return page_iterator.GRPCIterator(None, list_page, types.SimpleNamespace(page_token=None),
+                                          'items')
+
+    def update_entry(self, entry, update_mask=None):
+        self.__call('update_entry')
+        with self.__lock:
+            if entry.name not in self.entries:
+                raise exceptions.PermissionDenied('Entry not found')
+            updated_entry = self.__apply_update(self.entries[entry.name], entry, update_mask)
+            self.entries[entry.name] = updated_entry
+        return updated_entry
+
+    @classmethod
+    def __apply_update(cls, stored, update, update_mask):
+        # As with the API, only the fields in the update mask are overwritten, or all of
+        # them if there is no mask.
+        updated = type(update)()
+        updated.CopyFrom(stored if update_mask else update)
+        for path in (update_mask or {}).get('paths', ()):
+            field_names = path.split('.')
+            target, source = updated, update
+            for field_name in field_names[:-1]:
+                target, source = getattr(target, field_name), getattr(source, field_name)
+            field_name = field_names[-1]
+            value = getattr(source, field_name)
+            if isinstance(value, (bool, bytes, float, int, str)):
+                setattr(target, field_name, value)
+            elif hasattr(value, 'CopyFrom'):
+                getattr(target, field_name).CopyFrom(value)
+            else:
+                # Repeated fields are replaced, not merged.
+                del getattr(target, field_name)[:]
+                getattr(target, field_name).extend(value)
+        return updated
+
+    def delete_entry(self, name):
+        self.__call('delete_entry')
+        with self.__lock:
+            if name not in self.entries:
+                raise exceptions.PermissionDenied('Entry not found')
+            del self.entries[name]
+
+
+@contextlib.contextmanager
+def patched_datacatalog_client(client):
+    """Makes the Data Catalog facades created in the block use the given client."""
+    location_path = datacatalog_v1.DataCatalogClient.location_path
+
+    class PatchedDataCatalogClient:
+
+        def __new__(cls):
+            return client
+
+    PatchedDataCatalogClient.location_path = staticmethod(location_path)
+
+    with mock.patch.object(datacatalog_v1, 'DataCatalogClient', PatchedDataCatalogClient):
+        yield client
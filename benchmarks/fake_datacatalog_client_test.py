@@ -0,0 +1,64 @@
+import unittest
+
+from google.cloud import datacatalog_v1
+
+import fake_datacatalog_client
+
+ENTRY_GROUP_NAME = 'projects/my-project/locations/us/entryGroups/entry_group'
+
+
+class FakeDataCatalogClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__client = fake_datacatalog_client.FakeDataCatalogClient()
+
+    def test_update_entry_with_mask_should_keep_the_other_fields(self):
+        entry = datacatalog_v1.types.Entry()
+        entry.display_name = 'My Fileset'
+        entry.description = 'Description'
+        entry.gcs_fileset_spec.file_patterns.extend(['gs://bucket/*'])
+        entry.schema.columns.append(datacatalog_v1.types.ColumnSchema(column='id', type='INT64'))
+        created_entry = self.__client.create_entry(ENTRY_GROUP_NAME, 'entry', entry)
+        entry_update = datacatalog_v1.types.Entry()
+        entry_update.name = created_entry.name
+        entry_update.description = 'New Description'
+
+        self.__client.update_entry(entry_update, {'paths': ['description']})
+
+        updated_entry = self.__client.get_entry(created_entry.name)
+        self.assertEqual('New Description', updated_entry.description)
+        self.assertEqual('My Fileset', updated_entry.display_name)
+        self.assertEqual(['gs://bucket/*'], list(updated_entry.gcs_fileset_spec.file_patterns))
+        self.assertEqual(['id'], [column.column for column in updated_entry.schema.columns])
+
+    def test_update_entry_with_nested_mask_should_replace_repeated_field(self):
+        entry = datacatalog_v1.types.Entry()
+        entry.display_name = 'My Fileset'
+        entry.gcs_fileset_spec.file_patterns.extend(['gs://bucket/*'])
+        created_entry = self.__client.create_entry(ENTRY_GROUP_NAME, 'entry', entry)
+        entry_update = datacatalog_v1.types.Entry()
+        entry_update.name = created_entry.name
+        entry_update.gcs_fileset_spec.file_patterns.extend(['gs://other-bucket/*'])
+
+        self.__client.update_entry(entry_update, {'paths': ['gcs_fileset_spec.file_patterns']})
+
+        updated_entry = self.__client.get_entry(created_entry.name)
+        self.assertEqual(['gs://other-bucket/*'],
+                         list(updated_entry.gcs_fileset_spec.file_patterns))
+        self.assertEqual('My Fileset', updated_entry.display_name)
+
+    def test_update_entry_group_with_mask_should_keep_the_other_fields(self):
+        entry_group = datacatalog_v1.types.EntryGroup()
+        entry_group.display_name = 'My Entry Group'
+        entry_group.description = 'Description'
+        created_entry_group = self.__client.create_entry_group('projects/my-project/locations/us',
+                                                               'entry_group', entry_group)
+        entry_group_update = datacatalog_v1.types.EntryGroup()
+        entry_group_update.name = created_entry_group.name
+        entry_group_update.display_name = 'New Name'
+
+        self.__client.update_entry_group(entry_group_update, {'paths': ['display_name']})
+
+        updated_entry_group = self.__client.entry_groups[created_entry_group.name]
+        self.assertEqual('New Name', updated_entry_group.display_name)
+        self.assertEqual('Description', updated_entry_group.description)
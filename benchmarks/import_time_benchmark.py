@@ -0,0 +1,97 @@
+"""Benchmark guarding the command line interface startup latency.
+
+Imports the package in fresh interpreters with -X importtime, and times the usage
+printing, which is what orchestration jobs pay for on argument errors:
+
+    python benchmarks/import_time_benchmark.py --runs 10 --max-import-ms 100
+
+Fails if the median import time exceeds --max-import-ms, or if any of the heavy
+dependencies, which are only needed to run a command, is imported at startup.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PACKAGE = 'datacatalog_fileset_processor'
+
+HEAVY_MODULES = ('pandas', 'google.cloud.datacatalog_v1', 'google.api_core')
+
+_HELP_SCRIPT = ('from datacatalog_fileset_processor import datacatalog_fileset_processor_cli;'
+                ' datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run(["-h"])')
+
+
+def parse_import_times(importtime_output):
+    """
+    :return: A dict of the cumulative import time of each module, in microseconds.
+    """
+    import_times = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module_name = line[len('import time:'):].split('|')
+        import_times[module_name.strip()] = int(cumulative)
+    return import_times
+
+
+def measure_import(env):
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + PACKAGE],
+                             env=env,
+                             stderr=subprocess.PIPE,
+                             universal_newlines=True,
+                             check=True)
+    return parse_import_times(process.stderr)
+
+
+def measure_wall_time(env, *args):
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + list(args), env=env, stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def run(runs, max_import_ms, top):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+
+    import_runs = [measure_import(env) for _ in range(runs)]
+    import_ms = statistics.median(import_times[PACKAGE] for import_times in import_runs) / 1000
+    interpreter_s = statistics.median(measure_wall_time(env, '-c', 'pass') for _ in range(runs))
+    help_s = statistics.median(measure_wall_time(env, '-c', _HELP_SCRIPT) for _ in range(runs))
+
+    print('{:>32} {:>10.1f}'.format('package import ms', import_ms))
+    print('{:>32} {:>10.1f}'.format('interpreter startup ms', interpreter_s * 1000))
+    print('{:>32} {:>10.1f}'.format('usage printing ms', help_s * 1000))
+    print()
+    print('Slowest imports, cumulative ms:')
+    import_times = import_runs[-1]
+    for module_name in sorted(import_times, key=import_times.get, reverse=True)[:top]:
+        print('{:>10.1f}  {}'.format(import_times[module_name] / 1000, module_name))
+
+    failures = []
+    heavy_modules = sorted(module_name for module_name in import_times if any(
+        module_name == heavy or module_name.startswith(heavy + '.') for heavy in HEAVY_MODULES))
+    if heavy_modules:
+        failures.append('Heavy modules imported at startup: {}'.format(', '.join(heavy_modules)))
+    if max_import_ms and import_ms > max_import_ms:
+        failures.append('Package import took {:.1f} ms, more than {} ms'.format(
+            import_ms, max_import_ms))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-import-ms', type=float, default=100)
+    parser.add_argument('--top', type=int, default=10, help='Number of slowest imports listed')
+    args = parser.parse_args()
+
+    failures = run(args.runs, args.max_import_ms, args.top)
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Benchmark for reading many CSV files, e.g. one per team, in a single run.
+
+Writes synthetic CSV files and reads all of their Entry Groups with CsvFilesReader,
+as the create, delete and plan commands do when --csv-file is a directory or a glob
+pattern, by number of parse processes. One process reads the files sequentially:
+
+    python benchmarks/multi_file_benchmark.py --files 300 --parse-workers 1 4 8
+
+Each file holds the Entry Groups of its own project, so none is reported as
+defined in more than one file.
+"""
+import argparse
+import functools
+import os
+import tempfile
+import time
+
+from datacatalog_fileset_processor import constant, csv_files_reader, \
+    fileset_datasource_processor
+
+from synthetic_csv import write_synthetic_csv
+
+ENTRIES_PER_GROUP = 20
+
+
+def read_files(file_paths, parser, parse_workers):
+    """Reads all the Entry Groups of the files.
+
+    :return: The number of Entries read and the elapsed time.
+    """
+    read_file = functools.partial(
+        fileset_datasource_processor.FilesetDatasourceProcessor.read_csv_file, parser=parser)
+    start = time.perf_counter()
+    files_reader = csv_files_reader.CsvFilesReader(file_paths, read_file, parse_workers)
+    for _ in files_reader:
+        pass
+    return files_reader.entries_count, time.perf_counter() - start
+
+
+def run(files, entry_groups, parsers, parse_workers_list):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        rows = 0
+        for index in range(files):
+            rows += write_synthetic_csv(os.path.join(temp_dir, 'team_{}.csv'.format(index)),
+                                        entry_groups,
+                                        ENTRIES_PER_GROUP,
+                                        project_id='team-{}'.format(index))
+        file_paths = csv_files_reader.resolve_csv_files(temp_dir)
+        print('{} files, {} rows'.format(files, rows))
+
+        print('{:>8} {:>10} {:>10} {:>12} {:>10}'.format('parser', 'processes', 'seconds',
+                                                         'rows/s', 'speedup'))
+        expected_entries = files * entry_groups * ENTRIES_PER_GROUP
+        for parser in parsers:
+            baseline = None
+            for parse_workers in parse_workers_list:
+                entries, elapsed = read_files(file_paths, parser, parse_workers)
+                if entries != expected_entries:
+                    raise AssertionError('Read {} Entries, expected {}'.format(
+                        entries, expected_entries))
+                baseline = baseline or elapsed
+                print('{:>8} {:>10} {:>10.3f} {:>12.0f} {:>9.1f}x'.format(
+                    parser, parse_workers, elapsed, rows / elapsed, baseline / elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=300)
+    parser.add_argument('--entry-groups',
+                        help='Number of Entry Groups in each file',
+                        type=int,
+                        default=5)
+    parser.add_argument('--parser', nargs='+', choices=constant.PARSERS, default=constant.PARSERS)
+    parser.add_argument('--parse-workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    run(args.files, args.entry_groups, args.parser, args.parse_workers)
+
+
+if __name__ == '__main__':
+    main()
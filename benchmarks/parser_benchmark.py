@@ -0,0 +1,85 @@
+"""Benchmark comparing the pandas and csv parser backends.
+
+Reads synthetic CSV files with both backends, loading the whole file and streaming it,
+and reports the throughput and the peak memory traced while reading:
+
+    python benchmarks/parser_benchmark.py --entry-groups 100 1000 --chunk-size 10000
+
+Both backends are checked to produce the same Entry Groups and Entries.
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from datacatalog_fileset_processor import constant, fileset_datasource_processor
+
+from fake_datacatalog_client import FakeDataCatalogClient, patched_datacatalog_client
+from synthetic_csv import write_synthetic_csv
+
+
+def read_entry_groups(processor, file_path, parser, chunk_size):
+    """Reads all the Entry Groups, keeping them unless they are streamed.
+
+    :return: The Entry Groups, or their number if streamed, and the elapsed time
+     and peak traced memory.
+    """
+    read_entry_group_specs = getattr(
+        processor, '_FilesetDatasourceProcessor__read_csv_file_entry_group_specs')
+    tracemalloc.start()
+    start = time.perf_counter()
+    entry_group_specs = read_entry_group_specs(file_path, chunk_size, parser)
+    if chunk_size:
+        result = sum(1 for _ in entry_group_specs)
+    else:
+        result = list(entry_group_specs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run(entry_groups_list, entries_per_group, columns_per_entry, chunk_size):
+    print('{:>10} {:>8} {:>10} {:>10} {:>12} {:>10}'.format('rows', 'parser', 'mode', 'seconds',
+                                                            'rows/s', 'peak MiB'))
+    with tempfile.TemporaryDirectory() as temp_dir, \
+            patched_datacatalog_client(FakeDataCatalogClient()):
+        processor = fileset_datasource_processor.FilesetDatasourceProcessor()
+        for entry_groups in entry_groups_list:
+            file_path = os.path.join(temp_dir, 'filesets_{}.csv'.format(entry_groups))
+            rows = write_synthetic_csv(file_path, entry_groups, entries_per_group,
+                                       columns_per_entry)
+
+            results = {}
+            for parser in (constant.PARSER_PANDAS, constant.PARSER_CSV):
+                for mode, mode_chunk_size in (('load', None), ('stream', chunk_size)):
+                    result, elapsed, peak = read_entry_groups(processor, file_path, parser,
+                                                              mode_chunk_size)
+                    results[(parser, mode)] = result
+                    print('{:>10} {:>8} {:>10} {:>10.3f} {:>12.0f} {:>10.1f}'.format(
+                        rows, parser, mode, elapsed, rows / elapsed, peak / 2**20))
+
+            if results[(constant.PARSER_PANDAS, 'load')] != results[(constant.PARSER_CSV, 'load')]:
+                raise AssertionError('Parsers results differ for {} rows'.format(rows))
+            if results[(constant.PARSER_PANDAS, 'stream')] != \
+                    results[(constant.PARSER_CSV, 'stream')]:
+                raise AssertionError('Parsers streamed a different number of Entry Groups')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entry-groups', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--entries-per-group', type=int, default=20)
+    parser.add_argument('--columns-per-entry', type=int, default=5)
+    parser.add_argument('--chunk-size',
+                        type=int,
+                        default=10000,
+                        help='Rows per chunk, when the pandas parser streams the file')
+    args = parser.parse_args()
+    run(args.entry_groups, args.entries_per_group, args.columns_per_entry, args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
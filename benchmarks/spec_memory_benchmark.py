@@ -0,0 +1,129 @@
+"""Benchmark for the memory used by the Entry Groups and Entries intermediate model.
+
+Builds the model from synthetic CSV files both with the slotted specs and interned
+strings used by FilesetDatasourceProcessor, and with the former nested dicts, and
+reports the memory each model retains once the whole file was read:
+
+    python benchmarks/spec_memory_benchmark.py --rows 10000 100000 1000000
+
+Row counts are rounded down to whole Entry Groups of 100 rows. The rows are read
+with the csv parser, so only the model itself is retained.
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from datacatalog_fileset_processor import constant, csv_parser
+
+from synthetic_csv import write_synthetic_csv
+
+ENTRIES_PER_GROUP = 20
+COLUMNS_PER_ENTRY = 5
+ROWS_PER_ENTRY_GROUP = ENTRIES_PER_GROUP * COLUMNS_PER_ENTRY
+
+
+def build_specs(rows):
+    builder = csv_parser.EntryGroupsBuilder()
+    for row in rows:
+        builder.add_row(row)
+    return builder.pop_entry_group_specs()
+
+
+def build_dicts(rows):
+    """The nested dicts model, kept for comparison purposes."""
+    entry_groups = {}
+    for row in rows:
+        (entry_group_name, entry_group_display_name, entry_group_description, entry_id,
+         entry_display_name, entry_description, entry_file_patterns, schema_column_name,
+         schema_column_type, schema_column_description, schema_column_mode) = row
+
+        entry_group = entry_groups.get(entry_group_name)
+        if entry_group is None:
+            entry_group = entry_groups[entry_group_name] = {
+                'name': entry_group_name,
+                'display_name': entry_group_display_name,
+                'description': entry_group_description,
+                'entries': {}
+            }
+
+        entry = entry_group['entries'].get(entry_id)
+        if entry is None:
+            entry = entry_group['entries'][entry_id] = {
+                'id': entry_id,
+                'name': '{}/entries/{}'.format(entry_group_name, entry_id),
+                'display_name': entry_display_name,
+                'description': entry_description,
+                'file_patterns':
+                entry_file_patterns.split(constant.FILE_PATTERNS_VALUES_SEPARATOR),
+                'schema_columns': {}
+            }
+
+        entry['schema_columns'][schema_column_name] = {
+            constant.FILESETS_ENTRY_SCHEMA_COLUMN_DESCRIPTION_COLUMN_LABEL:
+            schema_column_description,
+            constant.FILESETS_ENTRY_SCHEMA_COLUMN_MODE_COLUMN_LABEL: schema_column_mode,
+            constant.FILESETS_ENTRY_SCHEMA_COLUMN_TYPE_COLUMN_LABEL: schema_column_type
+        }
+
+    entry_groups = list(entry_groups.values())
+    for entry_group in entry_groups:
+        entry_group['entries'] = list(entry_group['entries'].values())
+    return entry_groups
+
+
+def measure(build_model, file_path):
+    """Builds a model from a CSV file.
+
+    :return: The model, the elapsed time, and the memory retained by the model.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(file_path, newline='') as csv_file:
+        model = build_model(csv_parser.read_rows(csv_file))
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return model, elapsed, retained
+
+
+def run(rows_list):
+    print('{:>10} {:>8} {:>10} {:>12} {:>12} {:>12}'.format('rows', 'model', 'seconds',
+                                                            'retained MiB', 'bytes/row', 'saved'))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for rows in rows_list:
+            file_path = os.path.join(temp_dir, 'filesets_{}.csv'.format(rows))
+            rows = write_synthetic_csv(file_path, max(1, rows // ROWS_PER_ENTRY_GROUP),
+                                       ENTRIES_PER_GROUP, COLUMNS_PER_ENTRY)
+
+            dicts, dicts_time, dicts_retained = measure(build_dicts, file_path)
+            entries_count = sum(len(entry_group['entries']) for entry_group in dicts)
+            del dicts
+            specs, specs_time, specs_retained = measure(build_specs, file_path)
+            if sum(len(entry_group.entries) for entry_group in specs) != entries_count:
+                raise AssertionError('Models differ for {} rows'.format(rows))
+            del specs
+
+            saved = '{:.0%}'.format(1 - specs_retained / dicts_retained)
+            for model, model_time, retained, model_saved in (
+                ('dicts', dicts_time, dicts_retained, '-'),
+                ('specs', specs_time, specs_retained, saved),
+            ):
+                print('{:>10} {:>8} {:>10.3f} {:>12.1f} {:>12.0f} {:>12}'.format(
+                    rows, model, model_time, retained / 2**20, retained / rows, model_saved))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+    run(args.rows)
+
+
+if __name__ == '__main__':
+    main()
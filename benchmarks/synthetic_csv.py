@@ -0,0 +1,41 @@
+"""Synthetic CSV files in the format consumed by the processor, for benchmarking."""
+from datacatalog_fileset_processor import constant
+
+
+def write_synthetic_csv(file_path,
+                        entry_groups,
+                        entries_per_group=20,
+                        columns_per_entry=5,
+                        project_id='my-project'):
+    """Writes a CSV file with entry_groups x entries_per_group x columns_per_entry rows.
+
+    The Entry Group fields are only set on the first row of each group, so the
+    forward-fill performed on normalization is exercised as well.
+
+    :return: The number of rows written.
+    """
+    with open(file_path, 'w') as csv_file:
+        csv_file.write(','.join(constant.FILESETS_COLUMNS_ORDER) + '\n')
+        for group in range(entry_groups):
+            for entry in range(entries_per_group):
+                for column in range(columns_per_entry):
+                    if entry == 0 and column == 0:
+                        entry_group_fields = [
+                            'projects/{}/locations/us-central1/entryGroups/'
+                            'entry_group_{}'.format(project_id,
+                                                    group), 'Entry Group {}'.format(group),
+                            'Entry Group {} description'.format(group)
+                        ]
+                    else:
+                        entry_group_fields = ['', '', '']
+                    file_patterns = 'gs://bucket_{0}/{1}/*.csv|gs://bucket_{0}/{1}/*.parquet' \
+                        .format(group, entry)
+                    entry_fields = [
+                        'entry_{}'.format(entry), 'Entry {}'.format(entry),
+                        'Entry {} description'.format(entry), file_patterns
+                    ]
+                    column_fields = ['column_{}'.format(column), 'STRING', 'Column', 'NULLABLE']
+                    csv_file.write(','.join(entry_group_fields + entry_fields + column_fields) +
+                                   '\n')
+
+    return entry_groups * entries_per_group * columns_per_entry
@@ -26,6 +26,9 @@ setuptools.setup(
         'google-cloud-datacatalog>=1,<2',
         'pandas',
     ),
+    extras_require={
+        'columnar': ('pyarrow', ),
+    },
     setup_requires=('pytest-runner', ),
     tests_require=('pytest-cov', ),
     python_requires='>=3.6',
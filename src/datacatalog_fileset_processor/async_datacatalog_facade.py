@@ -0,0 +1,206 @@
+import asyncio
+import functools
+import logging
+
+from google.cloud import datacatalog_v1
+
+from datacatalog_fileset_processor import datacatalog_facade, entry_update, facade_operations
+
+
+class AsyncDataCatalogFacade:
+    """Data Catalog API communication facade, with coroutines in place of blocking calls."""
+
+    def __init__(self,
+                 client=None,
+                 rate_limiter=None,
+                 metrics=None,
+                 channels=None,
+                 channel_dispatch=None,
+                 update_payloads=None):
+        """
+        :param client: Optional asyncio Data Catalog client.
+        :param rate_limiter: Optional RateLimiter, used to throttle and retry the API calls.
+         The limiter is blocking, so the blocking client is adapted when it is set.
+        :param metrics: Optional RunMetrics, recording every API call attempt. The blocking
+         client is adapted when it is set, as well.
+        :param channels: Number of gRPC channels the API calls are spread over. The pool
+         of blocking clients is adapted when it is greater than 1.
+        :param channel_dispatch: How the calls are spread over the channels, one of the
+         constant.CHANNEL_DISPATCHES values. Defaults to round-robin.
+        :param update_payloads: Optional UpdatePayloadStats, recording the bytes sent by
+         the Entry updates.
+        """
+        # Initialize the API client.
+        self.__datacatalog = client or self.__make_client(rate_limiter, metrics, channels,
+                                                          channel_dispatch)
+        self.update_payloads = update_payloads or entry_update.UpdatePayloadStats()
+
+    @classmethod
+    def __make_client(cls, rate_limiter=None, metrics=None, channels=None, channel_dispatch=None):
+        pooled = channels and channels > 1
+        if rate_limiter or metrics or pooled:
+            # Pools are made of blocking clients, each owning a channel.
+            client = datacatalog_facade.DataCatalogFacade.create_client(
+                channels, channel_dispatch) if pooled else datacatalog_v1.DataCatalogClient()
+            if metrics:
+                client = metrics.wrap(client)
+            if rate_limiter:
+                client = rate_limiter.wrap(client)
+            return BlockingClientAdapter(client)
+
+        # The asyncio client is only shipped by newer google-cloud-datacatalog releases,
+        # so the blocking one is adapted to coroutines when it is not available.
+        if hasattr(datacatalog_v1, 'DataCatalogAsyncClient'):
+            return datacatalog_v1.DataCatalogAsyncClient()
+
+        logging.info('Data Catalog asyncio client not available, adapting the blocking one.')
+        return BlockingClientAdapter(datacatalog_v1.DataCatalogClient())
+
+    async def create_entry(self, entry_group_name, entry_id, entry):
+        """Creates a Data Catalog Entry.
+
+        :param entry_group_name: Parent Entry Group name.
+        :param entry_id: Entry id.
+        :param entry: An Entry object.
+        :return: The created Entry, or None if permission to create it was denied.
+        """
+        return await self.__run(facade_operations.create_entry(entry_group_name, entry_id, entry))
+
+    async def get_entry(self, name):
+        """Retrieves Data Catalog Entry.
+
+        :param name: The Entry name.
+        :return: An Entry object if it exists.
+        """
+        return await self.__datacatalog.get_entry(name=name)
+
+    async def list_entries(self, entry_group_name):
+        """Lists the Entries that belong to an Entry Group.
+
+        :param entry_group_name: The Entry Group name.
+        :return: A list with all the Entries, from every page.
+        """
+        pager = await self.__datacatalog.list_entries(parent=entry_group_name)
+        if hasattr(pager, '__aiter__'):
+            return [entry async for entry in pager]
+        return list(pager)
+
+    async def update_entry(self, entry, update_fields=None):
+        """Same as DataCatalogFacade.update_entry.
+
+        :param entry: An Entry object, with its name set.
+        :param update_fields: Optional update mask paths, among entry_update.UPDATE_FIELDS.
+        :return: The updated Entry.
+        """
+        return await self.__run(
+            facade_operations.update_entry(entry, update_fields, self.update_payloads))
+
+    async def upsert_entry(self,
+                           entry_group_name,
+                           entry_name,
+                           entry_id,
+                           entry,
+                           existing_entries=None,
+                           manifest=None):
+        """Same as DataCatalogFacade.upsert_entry.
+
+        :param entry_group_name: Parent Entry Group name.
+        :param entry_name: Entry Name.
+        :param entry_id: Entry id.
+        :param entry: An Entry object.
+        :param existing_entries: Optional dict of the Entries that already exist in the
+         Entry Group, by id. If provided, it is used instead of reading the Entry.
+        :param manifest: Optional EntryManifest, in which the Entry is recorded once
+         it is created, updated or found up-to-date.
+        :return: The updated or created Entry, or None if it was not written.
+        """
+        return await self.__run(
+            facade_operations.upsert_entry(entry_group_name, entry_name, entry_id, entry,
+                                           existing_entries, manifest, self.update_payloads))
+
+    async def delete_entry(self, name):
+        """Same as DataCatalogFacade.delete_entry.
+
+        :param name: The Entry name.
+        :return: One of the constant.DELETE_OUTCOME_* values.
+        """
+        return await self.__run(facade_operations.delete_entry(name))
+
+    async def create_entry_group(self, project_id, location_id, entry_group_id, entry_group):
+        """Creates a Data Catalog Entry Group.
+
+        :param project_id: Project id.
+        :param location_id: Location id.
+        :param entry_group_id: Entry Group id.
+        :param entry_group: Entry Group.
+
+        :return: The created Entry Group.
+        """
+        return await self.__run(
+            facade_operations.create_entry_group(project_id, location_id, entry_group_id,
+                                                 entry_group))
+
+    async def list_entry_groups(self, project_id, location_id):
+        """Lists the Entry Groups of a project and location.
+
+        :param project_id: Project id.
+        :param location_id: Location id.
+        :return: The list of Entry Groups.
+        """
+        pager = await self.__datacatalog.list_entry_groups(
+            parent=datacatalog_v1.DataCatalogClient.location_path(project_id, location_id))
+        if hasattr(pager, '__aiter__'):
+            return [entry_group async for entry_group in pager]
+        return list(pager)
+
+    async def update_entry_group(self, entry_group, update_fields):
+        """Updates some fields of an Entry Group.
+
+        :param entry_group: An Entry Group object, with its name set.
+        :param update_fields: The names of the fields to update.
+        :return: The updated Entry Group.
+        """
+        return await self.__run(facade_operations.update_entry_group(entry_group, update_fields))
+
+    async def delete_entry_group(self, name):
+        """
+        Deletes a Data Catalog Entry Group.
+
+        :param name: The Entry Group name.
+        """
+        await self.__datacatalog.delete_entry_group(name=name)
+
+    @classmethod
+    def extract_resources_from_entry_group(cls, entry_group_name):
+        return datacatalog_facade.DataCatalogFacade.extract_resources_from_entry_group(
+            entry_group_name)
+
+    def __run(self, operation):
+        return facade_operations.run_asynchronously(operation, self.__datacatalog)
+
+
+class BlockingClientAdapter:
+    """Exposes the methods of a blocking Data Catalog client as coroutines.
+
+    Each call runs in the event loop's default executor, so the number of requests
+    actually in flight is bounded by the executor size, at most
+    constant.ASYNC_EXECUTOR_MAX_WORKERS threads. Only the asyncio client, shipped by
+    google-cloud-datacatalog 2 and later, keeps more requests in flight.
+    """
+
+    def __init__(self, client):
+        self.__client = client
+
+    def __getattr__(self, name):
+        method = getattr(self.__client, name)
+
+        async def run_in_executor(**kwargs):
+            loop = asyncio.get_event_loop()
+            if name.startswith('list_'):
+                # Pagers fetch further pages while being iterated, which must not
+                # happen in the event loop thread.
+                return await loop.run_in_executor(
+                    None, lambda: list(functools.partial(method, **kwargs)()))
+            return await loop.run_in_executor(None, functools.partial(method, **kwargs))
+
+        return run_in_executor
@@ -0,0 +1,90 @@
+import functools
+import itertools
+import threading
+
+from datacatalog_fileset_processor import constant
+
+# Options of the channels created by the Data Catalog client itself.
+_CHANNEL_OPTIONS = [
+    ('grpc.max_send_message_length', -1),
+    ('grpc.max_receive_message_length', -1),
+    # gRPC shares the connections of the channels created with the same options,
+    # so each channel gets its own subchannel pool to open a connection of its own.
+    ('grpc.use_local_subchannel_pool', 1),
+]
+
+
+def create_transport(credentials=None, default_class=None, address=None):
+    """Creates a Data Catalog client transport, with a gRPC channel of its own.
+
+    Meant to be given as the transport of a DataCatalogClient, which calls it with its
+    credentials, default transport class and API address.
+
+    :return: The transport.
+    """
+    channel = default_class.create_channel(address=address,
+                                           credentials=credentials,
+                                           options=_CHANNEL_OPTIONS)
+    return default_class(channel=channel)
+
+
+class ClientPool:
+    """Spreads the API calls over several Data Catalog clients.
+
+    Each client owns a gRPC channel, hence an HTTP/2 connection, so the calls in flight
+    are not all bound by the streams limit of a single connection. Calls are dispatched
+    round-robin, or to the client with the fewest calls in flight.
+    """
+
+    def __init__(self, clients, dispatch=constant.CHANNEL_DISPATCH_ROUND_ROBIN):
+        """
+        :param clients: The Data Catalog clients, one for each channel.
+        :param dispatch: One of the constant.CHANNEL_DISPATCHES values.
+        """
+        if dispatch not in constant.CHANNEL_DISPATCHES:
+            raise ValueError('Unknown channel dispatch: {}'.format(dispatch))
+
+        self.__clients = list(clients)
+        self.__dispatch = dispatch
+        self.__in_flight = [0] * len(self.__clients)
+        self.__next_indexes = itertools.cycle(range(len(self.__clients)))
+        self.__lock = threading.Lock()
+
+    @property
+    def clients(self):
+        return self.__clients
+
+    @property
+    def in_flight(self):
+        """
+        :return: The number of calls in flight, for each client.
+        """
+        with self.__lock:
+            return list(self.__in_flight)
+
+    def call(self, rpc_name, *args, **kwargs):
+        """Calls an API method through one of the clients.
+
+        :param rpc_name: The method name, e.g. 'create_entry'.
+        :return: The method result.
+        """
+        index = self.__acquire()
+        try:
+            return getattr(self.__clients[index], rpc_name)(*args, **kwargs)
+        finally:
+            with self.__lock:
+                self.__in_flight[index] -= 1
+
+    def __acquire(self):
+        with self.__lock:
+            index = next(self.__next_indexes)
+            if self.__dispatch == constant.CHANNEL_DISPATCH_LEAST_LOADED:
+                # Ties are broken round-robin, so idle clients are all used in turn.
+                count = len(self.__clients)
+                index = min(((index + offset) % count for offset in range(count)),
+                            key=self.__in_flight.__getitem__)
+            self.__in_flight[index] += 1
+            return index
+
+    def __getattr__(self, name):
+        return functools.partial(self.call, name)
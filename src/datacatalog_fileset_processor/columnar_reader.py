@@ -0,0 +1,101 @@
+import importlib
+import os
+
+import pandas as pd
+
+from datacatalog_fileset_processor import constant
+
+# Number of JSON Lines rows read at a time, as they have no row groups.
+JSON_LINES_CHUNK_SIZE = 100000
+
+
+def get_columnar_format(file_path):
+    """
+    :param file_path: An input file path.
+    :return: One of the constant.INPUT_FORMAT_* values if the file is a columnar one,
+     according to its extension, None otherwise.
+    """
+    return constant.COLUMNAR_FILE_EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+
+
+def read_dataframes(file_path, chunk_size=None):
+    """Reads a Parquet, Arrow IPC or JSON Lines file a part at a time.
+
+    Only the columns of constant.FILESETS_COLUMNS_ORDER are read. Parquet files are read
+    a row group at a time, and Arrow IPC ones a record batch at a time, from a memory map.
+    The columns missing from a Parquet or Arrow IPC file are missing from the dataframes
+    too, while JSON Lines dataframes have all the columns.
+
+    :param file_path: The file path.
+    :param chunk_size: Number of rows read at a time from JSON Lines files. Defaults to
+     JSON_LINES_CHUNK_SIZE.
+    :return: An iterator over the non-empty dataframes, indexed by the position of the
+     rows in the file, starting from 0.
+    """
+    columnar_format = get_columnar_format(file_path)
+    if columnar_format == constant.INPUT_FORMAT_PARQUET:
+        dataframes = _read_parquet_row_groups(file_path)
+    elif columnar_format == constant.INPUT_FORMAT_ARROW:
+        dataframes = _read_arrow_record_batches(file_path)
+    elif columnar_format == constant.INPUT_FORMAT_JSON_LINES:
+        dataframes = _read_json_lines_chunks(file_path, chunk_size or JSON_LINES_CHUNK_SIZE)
+    else:
+        raise ValueError('Not a columnar file: {}'.format(file_path))
+
+    start = 0
+    for dataframe in dataframes:
+        if not len(dataframe):
+            continue
+        dataframe.index = pd.RangeIndex(start, start + len(dataframe))
+        start += len(dataframe)
+        yield dataframe
+
+
+def _read_parquet_row_groups(file_path):
+    parquet = _import_pyarrow('pyarrow.parquet')
+    parquet_file = parquet.ParquetFile(file_path)
+    columns = _select_columns(parquet_file.schema_arrow.names)
+    for row_group_index in range(parquet_file.num_row_groups):
+        yield parquet_file.read_row_group(row_group_index, columns=columns).to_pandas()
+
+
+def _read_arrow_record_batches(file_path):
+    pyarrow = _import_pyarrow('pyarrow')
+    ipc = _import_pyarrow('pyarrow.ipc')
+    with pyarrow.memory_map(file_path) as source:
+        # Both the random access file format and the streaming one are accepted.
+        try:
+            reader = ipc.open_file(source)
+            batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+        except pyarrow.ArrowInvalid:
+            source.seek(0)
+            reader = ipc.open_stream(source)
+            batches = iter(reader)
+
+        columns = _select_columns(reader.schema.names)
+        for batch in batches:
+            yield pyarrow.Table.from_batches([batch]).select(columns).to_pandas()
+
+
+def _read_json_lines_chunks(file_path, chunk_size):
+    # Values are kept as read, e.g. ids made of digits are not converted to numbers.
+    # Records may leave out the keys without a value, so there is no header to select
+    # the columns from, and all of them are kept.
+    for dataframe in pd.read_json(file_path,
+                                  lines=True,
+                                  chunksize=chunk_size,
+                                  dtype=False,
+                                  convert_dates=False):
+        yield dataframe.reindex(columns=constant.FILESETS_COLUMNS_ORDER)
+
+
+def _select_columns(column_names):
+    return [column for column in constant.FILESETS_COLUMNS_ORDER if column in column_names]
+
+
+def _import_pyarrow(name):
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        raise ImportError('Parquet and Arrow IPC files require pyarrow, which can be installed'
+                          ' with: pip install datacatalog-fileset-processor[columnar]')
@@ -42,3 +42,74 @@ FILESETS_NON_FILLABLE_COLUMNS = [
 FILE_PATTERNS_VALUES_SEPARATOR = "|"
 
 DATAFLOW_SQL_VALID_TYPES = ['INT64', 'FLOAT64', 'BOOL', 'STRING', 'BYTES', 'TIMESTAMP']
+
+# Columns that must be set on every row that describes an Entry.
+FILESETS_REQUIRED_COLUMNS = [
+    FILESETS_ENTRY_GROUP_NAME_COLUMN_LABEL, FILESETS_ENTRY_ID_COLUMN_LABEL,
+    FILESETS_ENTRY_DISPLAY_NAME_COLUMN_LABEL, FILESETS_ENTRY_FILE_PATTERNS_COLUMN_LABEL
+]
+
+# Entry Group names, capturing the project, location and Entry Group ids.
+ENTRY_GROUP_NAME_PATTERN = r'^projects[/]([_a-zA-Z-\d]+)[/]locations[/]' \
+    r'([a-zA-Z-\d]+)[/]entryGroups[/]([@a-zA-Z-_\d]+)$'
+
+# Entry ids start with a letter or an underscore, and have at most 64 characters.
+ENTRY_ID_PATTERN = r'^[a-zA-Z_][a-zA-Z\d_]{0,63}$'
+
+# File patterns designate objects of a Cloud Storage bucket.
+ENTRY_FILE_PATTERN_PATTERN = r'^gs://[a-z\d][-_.a-z\d]*[a-z\d]/'
+
+SCHEMA_COLUMN_VALID_MODES = ['NULLABLE', 'REQUIRED', 'REPEATED']
+
+# Maximum number of threads running the blocking API calls adapted to coroutines, so the
+# asyncio mode does not start a thread per request in flight.
+ASYNC_EXECUTOR_MAX_WORKERS = 64
+
+# Outcomes of the delete operations.
+DELETE_OUTCOME_DELETED = 'deleted'
+DELETE_OUTCOME_NOT_FOUND = 'not found'
+DELETE_OUTCOME_FAILED = 'failed'
+
+# Outcomes of the create operations.
+CREATE_OUTCOME_UPSERTED = 'upserted'
+CREATE_OUTCOME_UNCHANGED = 'unchanged'
+CREATE_OUTCOME_FAILED = 'failed'
+
+# Outcomes of the export operations.
+EXPORT_OUTCOME_EXPORTED = 'exported'
+
+# Outcomes of the Entry Groups upserts.
+ENTRY_GROUP_OUTCOME_CREATED = 'created'
+ENTRY_GROUP_OUTCOME_UPDATED = 'updated'
+ENTRY_GROUP_OUTCOME_UNCHANGED = 'unchanged'
+ENTRY_GROUP_OUTCOMES = (ENTRY_GROUP_OUTCOME_CREATED, ENTRY_GROUP_OUTCOME_UPDATED,
+                        ENTRY_GROUP_OUTCOME_UNCHANGED)
+
+# Backends available to parse the CSV files.
+PARSER_CSV = 'csv'
+PARSER_PANDAS = 'pandas'
+PARSERS = (PARSER_CSV, PARSER_PANDAS)
+
+# Strategies to pick the client of a pool each API call is sent through.
+CHANNEL_DISPATCH_LEAST_LOADED = 'least-loaded'
+CHANNEL_DISPATCH_ROUND_ROBIN = 'round-robin'
+CHANNEL_DISPATCHES = (CHANNEL_DISPATCH_LEAST_LOADED, CHANNEL_DISPATCH_ROUND_ROBIN)
+
+# Formats of the log records.
+LOG_FORMAT_JSON = 'json'
+LOG_FORMAT_TEXT = 'text'
+LOG_FORMATS = (LOG_FORMAT_JSON, LOG_FORMAT_TEXT)
+
+# Columnar input files, read a row group or batch at a time, by file extension.
+INPUT_FORMAT_ARROW = 'arrow'
+INPUT_FORMAT_JSON_LINES = 'jsonl'
+INPUT_FORMAT_PARQUET = 'parquet'
+COLUMNAR_FILE_EXTENSIONS = {
+    '.arrow': INPUT_FORMAT_ARROW,
+    '.feather': INPUT_FORMAT_ARROW,
+    '.ipc': INPUT_FORMAT_ARROW,
+    '.jsonl': INPUT_FORMAT_JSON_LINES,
+    '.ndjson': INPUT_FORMAT_JSON_LINES,
+    '.parquet': INPUT_FORMAT_PARQUET,
+    '.pq': INPUT_FORMAT_PARQUET,
+}
@@ -0,0 +1,118 @@
+import collections
+import glob
+import logging
+import os
+from concurrent import futures
+
+from datacatalog_fileset_processor import constant
+
+# Extensions of the files read from a directory: CSV and columnar ones.
+INPUT_FILES_EXTENSIONS = ('.csv', ) + tuple(constant.COLUMNAR_FILE_EXTENSIONS)
+
+
+def resolve_csv_files(path):
+    """Lists the CSV files designated by a path.
+
+    Parquet, Arrow IPC and JSON Lines files are listed along with the CSV ones.
+
+    :param path: A CSV file path, a directory, whose CSV and columnar files are read,
+     or a glob pattern.
+    :return: The sorted list of the files paths.
+    """
+    if os.path.isdir(path):
+        file_paths = [
+            file_path for file_path in glob.glob(os.path.join(path, '*'))
+            if os.path.splitext(file_path)[1].lower() in INPUT_FILES_EXTENSIONS
+        ]
+    elif glob.has_magic(path):
+        file_paths = [file_path for file_path in glob.glob(path) if os.path.isfile(file_path)]
+    else:
+        return [path]
+
+    if not file_paths:
+        raise FileNotFoundError('No CSV files found: {}'.format(path))
+    return sorted(file_paths)
+
+
+class CsvFilesReader:
+    """Reads the Entry Groups of several CSV files, as a single iterable.
+
+    Files are read in parallel in a process pool, a bounded number of them ahead of
+    the one being consumed, and their Entry Groups are yielded in the files order.
+    Entry Groups defined in more than one file are reported, as each file definition
+    is processed separately.
+    """
+
+    def __init__(self, file_paths, read_file, workers=None):
+        """
+        :param file_paths: The CSV files paths.
+        :param read_file: Picklable function reading all the Entry Groups of a file, given
+         its path.
+        :param workers: Number of processes used to read the files. Files are read
+         sequentially, in the calling process, if set to 1, in which case read_file may
+         return a lazy iterable. Defaults to the number of CPUs.
+        """
+        self.__file_paths = file_paths
+        self.__read_file = read_file
+        self.__workers = min(workers or os.cpu_count() or 1, len(file_paths))
+        self.__entry_group_files = {}
+        self.duplicate_entry_groups = collections.OrderedDict()
+        self.entry_groups_count = 0
+        self.entries_count = 0
+
+    def __iter__(self):
+        for file_path, entry_group_specs in self.__read_files():
+            for entry_group_spec in entry_group_specs:
+                self.__check_duplicate(entry_group_spec.name, file_path)
+                self.entry_groups_count += 1
+                self.entries_count += len(entry_group_spec.entries)
+                yield entry_group_spec
+
+    def __read_files(self):
+        if self.__workers <= 1:
+            for file_path in self.__file_paths:
+                logging.info('Reading CSV file: %s...', file_path)
+                yield file_path, self.__read_file(file_path)
+            return
+
+        logging.info('Reading %d CSV files with %d processes...', len(self.__file_paths),
+                     self.__workers)
+        with futures.ProcessPoolExecutor(max_workers=self.__workers) as executor:
+            # Bounding the files read ahead keeps memory usage flat, even if syncing
+            # the Entry Groups is slower than reading them.
+            pending_files = collections.deque()
+            for file_path in self.__file_paths:
+                pending_files.append((file_path, executor.submit(self.__read_file, file_path)))
+                if len(pending_files) >= self.__workers * 2:
+                    yield self.__pop_result(pending_files)
+
+            while pending_files:
+                yield self.__pop_result(pending_files)
+
+    @classmethod
+    def __pop_result(cls, pending_files):
+        file_path, future = pending_files.popleft()
+        entry_group_specs = future.result()
+        logging.info('Read CSV file: %s', file_path)
+        return file_path, entry_group_specs
+
+    def __check_duplicate(self, entry_group_name, file_path):
+        first_file_path = self.__entry_group_files.setdefault(entry_group_name, file_path)
+        if first_file_path == file_path:
+            return
+
+        file_paths = self.duplicate_entry_groups.setdefault(entry_group_name, [first_file_path])
+        if file_path not in file_paths:
+            logging.warning('Entry Group %s is defined in more than one file: %s',
+                            entry_group_name, ', '.join(file_paths + [file_path]))
+            file_paths.append(file_path)
+
+    def log_summary(self):
+        """Logs the number of files, Entry Groups and Entries read, and the duplicates."""
+        logging.info('Read %d CSV files: %d Entry Groups, %d Entries', len(self.__file_paths),
+                     self.entry_groups_count, self.entries_count)
+        if self.duplicate_entry_groups:
+            logging.warning('%d Entry Groups are defined in more than one file:',
+                            len(self.duplicate_entry_groups))
+            for entry_group_name, file_paths in self.duplicate_entry_groups.items():
+                logging.warning('  %s: %s', entry_group_name, ', '.join(file_paths))
@@ -0,0 +1,193 @@
+import csv
+import logging
+
+from datacatalog_fileset_processor import constant, fileset_spec
+
+COMMENT = '#'
+
+# The strings pandas.read_csv reads as missing values by default.
+NA_VALUES = frozenset(
+    ('', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+     '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'n/a', 'nan', 'null'))
+
+_FILLABLE_POSITIONS = tuple(
+    constant.FILESETS_COLUMNS_ORDER.index(column) for column in constant.FILESETS_FILLABLE_COLUMNS)
+
+
+class EntryGroupsBuilder:
+    """Groups the Filesets rows by Entry Group and Entry.
+
+    Rows are tuples of values in the constant.FILESETS_COLUMNS_ORDER order. Specs keep
+    the order in which each Entry Group, Entry and column first appears, and rows that
+    belong to the same Entry are merged even if they are not contiguous. Missing values
+    are set as None, and the schema columns without a name are dropped.
+    """
+
+    def __init__(self):
+        self.__entry_groups = {}
+        # Entries are indexed by Entry Group name and id while they are being built.
+        self.__entries = {}
+
+    def add_row(self, row):
+        """
+        :param row: A tuple of the row values.
+        :return: The row Entry Group name, or None if it is missing.
+        """
+        (entry_group_name, entry_group_display_name, entry_group_description, entry_id,
+         entry_display_name, entry_description, entry_file_patterns, schema_column_name,
+         schema_column_type, schema_column_description, schema_column_mode) = row
+
+        if is_missing(entry_group_name):
+            return None
+
+        entry_group = self.__entry_groups.get(entry_group_name)
+        if entry_group is None:
+            entry_group = self.__entry_groups[entry_group_name] = fileset_spec.EntryGroupSpec(
+                entry_group_name, _or_none(entry_group_display_name),
+                _or_none(entry_group_description))
+
+        if is_missing(entry_id):
+            return entry_group_name
+
+        entry = self.__entries.get((entry_group_name, entry_id))
+        if entry is None:
+            entry = self.__entries[(entry_group_name, entry_id)] = fileset_spec.EntrySpec(
+                entry_group.name, entry_id, _or_none(entry_display_name),
+                _or_none(entry_description),
+                entry_file_patterns.split(constant.FILE_PATTERNS_VALUES_SEPARATOR))
+            entry_group.entries.append(entry)
+
+        if not is_missing(schema_column_name):
+            entry.set_column(
+                fileset_spec.ColumnSpec(schema_column_name, _or_none(schema_column_type),
+                                        _or_none(schema_column_description),
+                                        _or_none(schema_column_mode)))
+        return entry_group_name
+
+    def pop_entry_group_specs(self):
+        """
+        :return: A list with the specs of the Entry Groups added so far, which are
+         forgotten by the builder.
+        """
+        entry_groups = list(self.__entry_groups.values())
+        self.__entry_groups = {}
+        self.__entries = {}
+        return entry_groups
+
+
+def is_missing(value):
+    """Whether a value is missing, i.e. None or NaN."""
+    return value is None or value != value
+
+
+def _or_none(value):
+    return None if is_missing(value) else value
+
+
+def read_entry_group_specs(file_path, stream=False):
+    """Reads the Entry Groups and Entries from a CSV file.
+
+    :param file_path: The CSV file path.
+    :param stream: If set, each Entry Group is yielded as soon as a row of another
+     one is read, so memory usage does not grow with the file. The rows of each Entry
+     Group are expected to be contiguous in this mode.
+    :return: An iterable of EntryGroupSpec.
+    """
+    if stream:
+        return _stream_entry_group_specs(file_path)
+
+    builder = EntryGroupsBuilder()
+    with open(file_path, newline='') as csv_file:
+        for row in read_rows(csv_file):
+            builder.add_row(row)
+    return builder.pop_entry_group_specs()
+
+
+def _stream_entry_group_specs(file_path):
+    with open(file_path, newline='') as csv_file:
+        builder = EntryGroupsBuilder()
+        current_entry_group_name = None
+        yielded_entry_group_names = set()
+        for row in read_rows(csv_file):
+            entry_group_name = row[0]
+            if entry_group_name != current_entry_group_name and \
+                    not is_missing(current_entry_group_name):
+                yield from _check_contiguous(builder.pop_entry_group_specs(),
+                                             yielded_entry_group_names)
+            builder.add_row(row)
+            current_entry_group_name = entry_group_name
+
+        yield from _check_contiguous(builder.pop_entry_group_specs(), yielded_entry_group_names)
+
+
+def _check_contiguous(entry_group_specs, yielded_entry_group_names):
+    for entry_group_spec in entry_group_specs:
+        entry_group_name = entry_group_spec.name
+        if entry_group_name in yielded_entry_group_names:
+            logging.warning(
+                'Entry Group %s rows are not contiguous, they will be processed'
+                ' separately.', entry_group_name)
+        yielded_entry_group_names.add(entry_group_name)
+        yield entry_group_spec
+
+
+def read_rows(csv_file):
+    """Reads the normalized rows of a Filesets CSV file.
+
+    The rows are read sequentially, with the same semantics as the pandas based
+    normalization: comments start with '#', columns are matched by name in any order,
+    the pandas default missing value markers are honored, values are stripped and the
+    Entry Group columns are filled forward. Values are kept as strings, and missing
+    values are None.
+
+    :param csv_file: A file object, opened with newline=''.
+    :return: An iterator of tuples of the row values, in the
+     constant.FILESETS_COLUMNS_ORDER order.
+    """
+    reader = csv.reader(_uncommented_lines(csv_file))
+    header = next(reader, None)
+    if header is None:
+        return
+
+    positions = [
+        header.index(column) if column in header else None
+        for column in constant.FILESETS_COLUMNS_ORDER
+    ]
+    fill_values = [None] * len(positions)
+    for record in reader:
+        row = [_read_value(record, position) for position in positions]
+        for position in _FILLABLE_POSITIONS:
+            if row[position] is None:
+                row[position] = fill_values[position]
+            else:
+                fill_values[position] = row[position]
+        yield tuple(row)
+
+
+def _read_value(record, position):
+    if position is None or position >= len(record):
+        return None
+    value = record[position]
+    if value in NA_VALUES:
+        return None
+    return value.strip()
+
+
+def _uncommented_lines(lines):
+    # Everything from a comment character outside of a quoted value to the end of the
+    # line is dropped, and so are the blank lines.
+    quoted = False
+    for line in lines:
+        starts_quoted = quoted
+        if COMMENT in line:
+            for index, character in enumerate(line):
+                if character == '"':
+                    quoted = not quoted
+                elif character == COMMENT and not quoted:
+                    line = line[:index] + '\n'
+                    break
+        elif line.count('"') % 2:
+            quoted = not quoted
+
+        if starts_quoted or line.strip():
+            yield line
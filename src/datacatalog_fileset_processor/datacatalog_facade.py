@@ -1,18 +1,54 @@
-import logging
 import re
 
-from google.api_core import exceptions
 from google.cloud import datacatalog_v1
 
-from datacatalog_fileset_processor.values_comparable_object import ValuesComparableObject
+from datacatalog_fileset_processor import client_pool, constant, entry_update, \
+    facade_operations
 
 
 class DataCatalogFacade:
     """Data Catalog API communication facade."""
 
-    def __init__(self):
+    def __init__(self,
+                 rate_limiter=None,
+                 metrics=None,
+                 channels=None,
+                 channel_dispatch=None,
+                 update_payloads=None):
+        """
+        :param rate_limiter: Optional RateLimiter, used to throttle and retry the API calls.
+        :param metrics: Optional RunMetrics, recording every API call attempt.
+        :param channels: Number of gRPC channels the API calls are spread over.
+         A single channel is used if not set or lower than 2.
+        :param channel_dispatch: How the calls are spread over the channels, one of the
+         constant.CHANNEL_DISPATCHES values. Defaults to round-robin.
+        :param update_payloads: Optional UpdatePayloadStats, recording the bytes sent by
+         the Entry updates.
+        """
         # Initialize the API client.
-        self.__datacatalog = datacatalog_v1.DataCatalogClient()
+        self.__datacatalog = self.create_client(channels, channel_dispatch)
+        self.update_payloads = update_payloads or entry_update.UpdatePayloadStats()
+        if metrics:
+            self.__datacatalog = metrics.wrap(self.__datacatalog)
+        if rate_limiter:
+            self.__datacatalog = rate_limiter.wrap(self.__datacatalog)
+
+    @classmethod
+    def create_client(cls, channels=None, channel_dispatch=None):
+        """Creates a Data Catalog client, or a pool of clients with a channel each.
+
+        :param channels: Number of gRPC channels. A single client is created if not set
+         or lower than 2.
+        :param channel_dispatch: One of the constant.CHANNEL_DISPATCHES values.
+        :return: The client or ClientPool.
+        """
+        if not channels or channels < 2:
+            return datacatalog_v1.DataCatalogClient()
+
+        return client_pool.ClientPool([
+            datacatalog_v1.DataCatalogClient(transport=client_pool.create_transport)
+            for _ in range(channels)
+        ], channel_dispatch or constant.CHANNEL_DISPATCH_ROUND_ROBIN)
 
     def create_entry(self, entry_group_name, entry_id, entry):
         """Creates a Data Catalog Entry.
@@ -20,19 +56,9 @@ class DataCatalogFacade:
         :param entry_group_name: Parent Entry Group name.
         :param entry_id: Entry id.
         :param entry: An Entry object.
-        :return: The created Entry.
+        :return: The created Entry, or None if permission to create it was denied.
         """
-        try:
-            entry = self.__datacatalog.create_entry(parent=entry_group_name,
-                                                    entry_id=entry_id,
-                                                    entry=entry)
-            self.__log_entry_operation('created', entry=entry)
-        except exceptions.PermissionDenied as e:
-            entry_name = '{}/entries/{}'.format(entry_group_name, entry_id)
-            self.__log_entry_operation('was not created', entry_name=entry_name)
-            logging.warning('Error: %s', e)
-
-        return entry
+        return self.__run(facade_operations.create_entry(entry_group_name, entry_id, entry))
 
     def get_entry(self, name):
         """Retrieves Data Catalog Entry.
@@ -42,17 +68,37 @@ class DataCatalogFacade:
         """
         return self.__datacatalog.get_entry(name=name)
 
-    def update_entry(self, entry):
+    def list_entries(self, entry_group_name, page_size=None):
+        """Lists the Entries that belong to an Entry Group.
+
+        :param entry_group_name: The Entry Group name.
+        :param page_size: Optional maximum number of Entries fetched by each call.
+         Defaults to the API one.
+        :return: An iterator over the Entries, which fetches the pages on demand.
+        """
+        if page_size:
+            return self.__datacatalog.list_entries(parent=entry_group_name, page_size=page_size)
+        return self.__datacatalog.list_entries(parent=entry_group_name)
+
+    def update_entry(self, entry, update_fields=None):
         """Updates an Entry.
 
-        :param entry: An Entry object.
+        :param entry: An Entry object, with its name set.
+        :param update_fields: Optional update mask paths, among entry_update.UPDATE_FIELDS.
+         If set, only these fields are sent, along with a matching update mask, and the
+         bytes saved once updated are recorded. Otherwise, the whole Entry is sent.
         :return: The updated Entry.
         """
-        entry = self.__datacatalog.update_entry(entry=entry, update_mask=None)
-        self.__log_entry_operation('updated', entry=entry)
-        return entry
-
-    def upsert_entry(self, entry_group_name, entry_name, entry_id, entry):
+        return self.__run(
+            facade_operations.update_entry(entry, update_fields, self.update_payloads))
+
+    def upsert_entry(self,
+                     entry_group_name,
+                     entry_name,
+                     entry_id,
+                     entry,
+                     existing_entries=None,
+                     manifest=None):
         """
         Update a Data Catalog Entry if it exists and has been changed.
         Creates a new Entry if it does not exist.
@@ -61,90 +107,55 @@ class DataCatalogFacade:
         :param entry_name: Entry Name.
         :param entry_id: Entry id.
         :param entry: An Entry object.
-        :return: The updated or created Entry.
-        """
-        persisted_entry = entry
-        try:
-            persisted_entry = self.get_entry(name=entry_name)
-            self.__log_entry_operation('already exists', entry_name=entry_name)
-            if self.__entry_was_updated(persisted_entry, entry):
-                # merge fields.
-                persisted_entry.name = entry_name
-                persisted_entry.display_name = entry.display_name
-                persisted_entry.description = entry.description
-                # clear repeated message containers.
-                del persisted_entry.gcs_fileset_spec.file_patterns[:]
-                del persisted_entry.schema.columns[:]
-
-                persisted_entry.gcs_fileset_spec.file_patterns.extend(
-                    entry.gcs_fileset_spec.file_patterns)
-                persisted_entry.schema.columns.extend(entry.schema.columns)
-                persisted_entry = self.update_entry(entry=persisted_entry)
-            else:
-                self.__log_entry_operation('is up-to-date', entry=persisted_entry)
-        except exceptions.PermissionDenied:
-            self.__log_entry_operation('does not exist', entry_name=entry_name)
-            persisted_entry = self.create_entry(entry_group_name=entry_group_name,
-                                                entry_id=entry_id,
-                                                entry=entry)
-        except exceptions.FailedPrecondition as e:
-            logging.warning('Entry was not updated: %s', entry_name)
-            logging.warning('Error: %s', e)
-
-        return persisted_entry
+        :param existing_entries: Optional dict of the Entries that already exist in the
+         Entry Group, by id. If provided, it is used instead of reading the Entry.
+        :param manifest: Optional EntryManifest, in which the Entry is recorded once
+         it is created, updated or found up-to-date.
+        :return: The updated or created Entry, or None if it was not written.
+        """
+        return self.__run(
+            facade_operations.upsert_entry(entry_group_name, entry_name, entry_id, entry,
+                                           existing_entries, manifest, self.update_payloads))
 
     @classmethod
-    def __entry_was_updated(cls, current_entry, new_entry):
-        # Update time comparison allows to verify whether the entry was
-        # updated on the source system.
-        current_update_time = \
-            current_entry.source_system_timestamps.update_time.seconds
-        new_update_time = \
-            new_entry.source_system_timestamps.update_time.seconds
+    def merge_entry(cls, persisted_entry, entry_name, entry):
+        """Merges the fields managed by this package into a persisted Entry.
 
-        updated_time_changed = \
-            new_update_time != 0 and current_update_time != new_update_time
+        :param persisted_entry: The Entry read from Data Catalog, changed in place.
+        :param entry_name: Entry Name.
+        :param entry: An Entry object with the new values.
+        """
+        facade_operations.merge_entry(persisted_entry, entry_name, entry)
+
+    @classmethod
+    def entry_was_updated(cls, current_entry, new_entry):
+        """Checks whether a persisted Entry differs from a new one.
 
-        return updated_time_changed or not cls.__entries_are_equal(current_entry, new_entry)
+        :param current_entry: The Entry read from Data Catalog.
+        :param new_entry: An Entry object with the new values.
+        :return: True if the persisted Entry needs to be updated.
+        """
+        return facade_operations.entry_was_updated(current_entry, new_entry)
 
     @classmethod
-    def __entries_are_equal(cls, entry_1, entry_2):
-        object_1 = ValuesComparableObject()
-        object_1.user_specified_system = entry_1.user_specified_system
-        object_1.user_specified_type = entry_1.user_specified_type
-        object_1.display_name = entry_1.display_name
-        object_1.description = entry_1.description
-        object_1.linked_resource = entry_1.linked_resource
-
-        object_2 = ValuesComparableObject()
-        object_2.user_specified_system = entry_2.user_specified_system
-        object_2.user_specified_type = entry_2.user_specified_type
-        object_2.display_name = entry_2.display_name
-        object_2.description = entry_2.description
-        object_2.linked_resource = entry_2.linked_resource
-
-        return object_1 == object_2
+    def is_fileset_entry(cls, entry):
+        """Checks whether an Entry is a Fileset, as managed by this package.
+
+        :param entry: An Entry object.
+        :return: True if the Entry type is FILESET.
+        """
+        return entry.type == datacatalog_v1.enums.EntryType.FILESET
 
     def delete_entry(self, name):
         """Deletes a Data Catalog Entry.
 
+        Errors are not raised, but reported by the returned outcome. Permission denied
+        errors are reported as not found, as they are returned for missing Entries too.
+
         :param name: The Entry name.
+        :return: One of the constant.DELETE_OUTCOME_* values.
         """
-        try:
-            self.__datacatalog.delete_entry(name=name)
-            self.__log_entry_operation('deleted', entry_name=name)
-        except Exception as e:
-            logging.info('An exception ocurred while attempting to' ' delete Entry: %s', name)
-            logging.debug(str(e))
-
-    @classmethod
-    def __log_entry_operation(cls, description, entry=None, entry_name=None):
-
-        formatted_description = 'Entry {}: '.format(description)
-        logging.info('%s%s', formatted_description, entry.name if entry else entry_name)
-
-        if entry:
-            logging.info('%s^ %s', ' ' * len(formatted_description), entry.linked_resource)
+        return self.__run(facade_operations.delete_entry(name))
 
     def create_entry_group(self, project_id, location_id, entry_group_id, entry_group):
         """Creates a Data Catalog Entry Group.
@@ -156,12 +167,28 @@ class DataCatalogFacade:
 
         :return: The created Entry Group.
         """
-        created_entry_group = self.__datacatalog.create_entry_group(
-            parent=datacatalog_v1.DataCatalogClient.location_path(project_id, location_id),
-            entry_group_id=entry_group_id,
-            entry_group=entry_group)
-        logging.info('Entry Group created: %s', created_entry_group.name)
-        return created_entry_group
+        return self.__run(
+            facade_operations.create_entry_group(project_id, location_id, entry_group_id,
+                                                 entry_group))
+
+    def list_entry_groups(self, project_id, location_id):
+        """Lists the Entry Groups of a project and location.
+
+        :param project_id: Project id.
+        :param location_id: Location id.
+        :return: An iterator over the Entry Groups, which fetches the pages on demand.
+        """
+        return self.__datacatalog.list_entry_groups(
+            parent=datacatalog_v1.DataCatalogClient.location_path(project_id, location_id))
+
+    def update_entry_group(self, entry_group, update_fields):
+        """Updates some fields of an Entry Group.
+
+        :param entry_group: An Entry Group object, with its name set.
+        :param update_fields: The names of the fields to update.
+        :return: The updated Entry Group.
+        """
+        return self.__run(facade_operations.update_entry_group(entry_group, update_fields))
 
     def delete_entry_group(self, name):
         """
@@ -171,11 +198,12 @@ class DataCatalogFacade:
         """
         self.__datacatalog.delete_entry_group(name=name)
 
+    def __run(self, operation):
+        return facade_operations.run(operation, self.__datacatalog)
+
     @classmethod
     def extract_resources_from_entry_group(cls, entry_group_name):
-        re_match = re.match(
-            r'^projects[/]([_a-zA-Z-\d]+)[/]locations[/]'
-            r'([a-zA-Z-\d]+)[/]entryGroups[/]([@a-zA-Z-_\d]+)$', entry_group_name)
+        re_match = re.match(constant.ENTRY_GROUP_NAME_PATTERN, entry_group_name)
 
         if re_match:
             project_id, location_id, entry_group_id, = re_match.groups()
@@ -2,21 +2,33 @@ import argparse
 import logging
 import sys
 
-from datacatalog_fileset_processor import fileset_datasource_processor
+# structured_logging is light, and is first used from the worker threads, which must not
+# load a lazily imported module, so it is imported upfront.
+from datacatalog_fileset_processor import constant, structured_logging
+from datacatalog_fileset_processor.lazy_import import lazy_import
+
+# Lazily imported, so the heavy dependencies are only loaded when a command runs.
+entry_manifest = lazy_import('datacatalog_fileset_processor.entry_manifest')
+fileset_datasource_processor = lazy_import('datacatalog_fileset_processor.'
+                                           'fileset_datasource_processor')
+rate_limiter = lazy_import('datacatalog_fileset_processor.rate_limiter')
+run_journal = lazy_import('datacatalog_fileset_processor.run_journal')
+run_metrics = lazy_import('datacatalog_fileset_processor.run_metrics')
 
 
 class DatacatalogFilesetProcessorCLI:
 
     @classmethod
     def run(cls, argv):
-        cls.__setup_logging()
-
         args = cls._parse_args(argv)
+        cls.__setup_logging(args)
+
         args.func(args)
 
     @classmethod
-    def __setup_logging(cls):
-        logging.basicConfig(level=logging.INFO)
+    def __setup_logging(cls, args):
+        structured_logging.setup_logging(getattr(args, 'log_format', constant.LOG_FORMAT_TEXT),
+                                         getattr(args, 'log_sample_rate', None))
 
     @classmethod
     def _parse_args(cls, argv):
@@ -39,40 +51,431 @@ class DatacatalogFilesetProcessorCLI:
 
         cls.add_delete_filesets_cmd(filesets_subparsers)
 
+        cls.add_plan_filesets_cmd(filesets_subparsers)
+
+        cls.add_apply_filesets_cmd(filesets_subparsers)
+
+        cls.add_shards_filesets_cmd(filesets_subparsers)
+
+        cls.add_export_filesets_cmd(filesets_subparsers)
+
+    @classmethod
+    def add_plan_filesets_cmd(cls, subparsers):
+        plan_filesets_parser = subparsers.add_parser('plan',
+                                                     help='Plan the changes needed to sync the'
+                                                     ' Filesets Entry Groups and Entries from CSV',
+                                                     parents=[cls.__make_common_parser()])
+        plan_filesets_parser.add_argument('--csv-file',
+                                          help='CSV file with Filesets Entries information, or a'
+                                          ' directory or glob pattern matching several CSV'
+                                          ' files, processed in a single run',
+                                          required=True)
+        plan_filesets_parser.add_argument('--plan-file',
+                                          help='Plan file to be written',
+                                          required=True)
+        plan_filesets_parser.add_argument('--validate-dataflow-sql-types',
+                                          help='Flag if enabled will validate Data Flow SQL '
+                                          'Types',
+                                          action='store_true')
+        plan_filesets_parser.add_argument('--chunk-size',
+                                          help='Stream the CSV file in chunks of this number'
+                                          ' of rows',
+                                          type=int)
+        plan_filesets_parser.add_argument('--parser',
+                                          help='CSV parser backend: pandas, or csv for the'
+                                          ' standard library one, which streams the rows',
+                                          choices=constant.PARSERS,
+                                          default=constant.PARSER_PANDAS)
+        plan_filesets_parser.add_argument('--parse-workers',
+                                          help='Number of processes used to parse several CSV'
+                                          ' files in parallel. Defaults to the number of CPUs',
+                                          type=int)
+        plan_filesets_parser.add_argument('--workers',
+                                          help='Number of worker threads used to read the'
+                                          ' Entry Groups concurrently',
+                                          type=int)
+        plan_filesets_parser.set_defaults(func=cls.__plan_filesets_entry_groups_and_entries)
+
+    @classmethod
+    def add_apply_filesets_cmd(cls, subparsers):
+        apply_filesets_parser = subparsers.add_parser('apply',
+                                                      help='Apply the changes listed in a plan'
+                                                      ' file',
+                                                      parents=[cls.__make_common_parser()])
+        apply_filesets_parser.add_argument('--plan-file',
+                                           help='Plan file written by the plan command',
+                                           required=True)
+        apply_filesets_parser.add_argument('--workers',
+                                           help='Number of worker threads used to apply the'
+                                           ' Entries changes concurrently',
+                                           type=int)
+        apply_filesets_parser.set_defaults(func=cls.__apply_filesets_plan)
+
+    @classmethod
+    def add_shards_filesets_cmd(cls, subparsers):
+        shards_filesets_parser = subparsers.add_parser('shards',
+                                                       help='Print the number of Entry Groups'
+                                                       ' and Entries of each shard')
+        shards_filesets_parser.add_argument('--csv-file',
+                                            help='CSV file with Filesets Entries information, or a'
+                                            ' directory or glob pattern matching several CSV'
+                                            ' files',
+                                            required=True)
+        shards_filesets_parser.add_argument('--shard-count',
+                                            help='Number of shards the Entry Groups are spread'
+                                            ' across',
+                                            type=int,
+                                            required=True)
+        shards_filesets_parser.add_argument('--parser',
+                                            help='CSV parser backend: pandas, or csv for the'
+                                            ' standard library one',
+                                            choices=constant.PARSERS,
+                                            default=constant.PARSER_PANDAS)
+        shards_filesets_parser.add_argument('--parse-workers',
+                                            help='Number of processes used to parse several CSV'
+                                            ' files in parallel. Defaults to the number of CPUs',
+                                            type=int)
+        shards_filesets_parser.set_defaults(func=cls.__count_filesets_shard_sizes)
+
+    @classmethod
+    def add_export_filesets_cmd(cls, subparsers):
+        export_filesets_parser = subparsers.add_parser('export',
+                                                       help='Export the Filesets Entry Groups'
+                                                       ' and Entries of Data Catalog to CSV',
+                                                       parents=[cls.__make_common_parser()])
+        export_filesets_parser.add_argument('--location',
+                                            help='Project and location whose Entry Groups are'
+                                            ' exported, e.g. my-project/us-central1. Can be'
+                                            ' repeated',
+                                            type=cls.__parse_location,
+                                            action='append',
+                                            required=True)
+        export_filesets_parser.add_argument('--csv-file',
+                                            help='CSV file to be written, in the layout read by'
+                                            ' the create command',
+                                            required=True)
+        export_filesets_parser.add_argument('--workers',
+                                            help='Number of worker threads used to list the'
+                                            ' Entries concurrently',
+                                            type=int)
+        export_filesets_parser.set_defaults(func=cls.__export_filesets_entry_groups_and_entries)
+
     @classmethod
     def add_delete_filesets_cmd(cls, subparsers):
         delete_filesets_parser = subparsers.add_parser('delete',
                                                        help='Delete Filesets Entry Groups'
-                                                       ' and Entries from CSV')
+                                                       ' and Entries from CSV',
+                                                       parents=[cls.__make_common_parser()])
         delete_filesets_parser.add_argument('--csv-file',
-                                            help='CSV file with Fileset Entries information',
+                                            help='CSV file with Filesets Entries information, or a'
+                                            ' directory or glob pattern matching several CSV'
+                                            ' files, processed in a single run',
                                             required=True)
+        delete_filesets_parser.add_argument('--chunk-size',
+                                            help='Stream the CSV file in chunks of this number'
+                                            ' of rows',
+                                            type=int)
+        delete_filesets_parser.add_argument('--parser',
+                                            help='CSV parser backend: pandas, or csv for the'
+                                            ' standard library one, which streams the rows',
+                                            choices=constant.PARSERS,
+                                            default=constant.PARSER_PANDAS)
+        delete_filesets_parser.add_argument('--parse-workers',
+                                            help='Number of processes used to parse several CSV'
+                                            ' files in parallel. Defaults to the number of CPUs',
+                                            type=int)
+        delete_filesets_parser.add_argument('--shard-index',
+                                            help='Only process the Entry Groups whose name hashes'
+                                            ' into this shard, from 0 to SHARD_COUNT - 1',
+                                            type=int)
+        delete_filesets_parser.add_argument('--shard-count',
+                                            help='Number of shards the Entry Groups are spread'
+                                            ' across, e.g. one per job replica',
+                                            type=int)
+        delete_filesets_parser.add_argument('--journal-file',
+                                            help='Journal file recording each Entry Group and'
+                                            ' Entry processed by the run, with its outcome')
+        delete_filesets_parser.add_argument('--resume',
+                                            help='Flag if enabled will skip the Entry Groups and'
+                                            ' Entries the journal file reports as done by an'
+                                            ' interrupted run',
+                                            action='store_true')
+        delete_filesets_parser.add_argument('--workers',
+                                            help='Number of worker threads used to delete the'
+                                            ' Entries concurrently',
+                                            type=int)
+        delete_filesets_parser.add_argument('--manifest-file',
+                                            help='Manifest file from which the deleted Entries'
+                                            ' are removed')
         delete_filesets_parser.set_defaults(func=cls.__delete_filesets_entry_groups_and_entries)
 
     @classmethod
     def add_create_filesets_cmd(cls, subparsers):
         create_filesets_parser = subparsers.add_parser('create',
                                                        help='Create Filesets Entry Groups'
-                                                       ' and Entries from CSV')
+                                                       ' and Entries from CSV',
+                                                       parents=[cls.__make_common_parser()])
         create_filesets_parser.add_argument('--csv-file',
-                                            help='CSV file with Filesets Entries information',
+                                            help='CSV file with Filesets Entries information, or a'
+                                            ' directory or glob pattern matching several CSV'
+                                            ' files, processed in a single run',
                                             required=True)
         create_filesets_parser.add_argument('--validate-dataflow-sql-types',
                                             help='Flag if enabled will validate Data Flow SQL '
                                             'Types',
                                             action='store_true')
+        create_filesets_parser.add_argument('--chunk-size',
+                                            help='Stream the CSV file in chunks of this number'
+                                            ' of rows',
+                                            type=int)
+        create_filesets_parser.add_argument('--parser',
+                                            help='CSV parser backend: pandas, or csv for the'
+                                            ' standard library one, which streams the rows',
+                                            choices=constant.PARSERS,
+                                            default=constant.PARSER_PANDAS)
+        create_filesets_parser.add_argument('--parse-workers',
+                                            help='Number of processes used to parse several CSV'
+                                            ' files in parallel. Defaults to the number of CPUs',
+                                            type=int)
+        create_filesets_parser.add_argument('--shard-index',
+                                            help='Only process the Entry Groups whose name hashes'
+                                            ' into this shard, from 0 to SHARD_COUNT - 1',
+                                            type=int)
+        create_filesets_parser.add_argument('--shard-count',
+                                            help='Number of shards the Entry Groups are spread'
+                                            ' across, e.g. one per job replica',
+                                            type=int)
+        create_filesets_parser.add_argument('--journal-file',
+                                            help='Journal file recording each Entry Group and'
+                                            ' Entry processed by the run, with its outcome')
+        create_filesets_parser.add_argument('--resume',
+                                            help='Flag if enabled will skip the Entry Groups and'
+                                            ' Entries the journal file reports as done by an'
+                                            ' interrupted run',
+                                            action='store_true')
+        create_filesets_parser.add_argument('--prefetch-entries',
+                                            help='Flag if enabled will list the existing Entries'
+                                            ' of each Entry Group once, instead of reading every'
+                                            ' Entry before upserting it',
+                                            action='store_true')
+        concurrency_group = create_filesets_parser.add_mutually_exclusive_group()
+        concurrency_group.add_argument('--workers',
+                                       help='Number of worker threads used to upsert the'
+                                       ' Entries concurrently',
+                                       type=int)
+        concurrency_group.add_argument('--async-concurrency',
+                                       help='Upsert the Entries on an asyncio event loop, keeping'
+                                       ' up to this number of Entries in flight',
+                                       type=int)
+        create_filesets_parser.add_argument('--manifest-file',
+                                            help='Manifest file recording the content of the'
+                                            ' synced Entries, so the unchanged ones are skipped'
+                                            ' in the next runs')
+        create_filesets_parser.add_argument('--force-resync',
+                                            help='Flag if enabled will sync every Entry, even the'
+                                            ' ones the manifest reports as unchanged',
+                                            action='store_true')
+        create_filesets_parser.add_argument('--invalidate-manifest',
+                                            help='Flag if enabled will discard the manifest'
+                                            ' content before syncing',
+                                            action='store_true')
         create_filesets_parser.set_defaults(func=cls.__create_filesets_entry_groups_and_entries)
 
+    @classmethod
+    def __make_common_parser(cls):
+        common_parser = argparse.ArgumentParser(add_help=False)
+        common_parser.add_argument('--qps',
+                                   help='Maximum number of API calls per second, for each'
+                                   ' RPC type',
+                                   type=float)
+        common_parser.add_argument('--rpc-qps',
+                                   help='Maximum number of API calls per second for a given'
+                                   ' RPC type, e.g. create_entry=10. Can be repeated',
+                                   type=cls.__parse_rpc_qps,
+                                   action='append')
+        common_parser.add_argument('--max-concurrency',
+                                   help='Maximum number of API calls in flight, lowered on'
+                                   ' quota errors and grown back as calls succeed',
+                                   type=int)
+        common_parser.add_argument('--max-retries',
+                                   help='Maximum number of retries for API calls that fail'
+                                   ' with a transient error',
+                                   type=int,
+                                   default=5)
+        common_parser.add_argument('--channels',
+                                   help='Number of gRPC channels, each with a connection of'
+                                   ' its own, the API calls are spread over',
+                                   type=int)
+        common_parser.add_argument('--channel-dispatch',
+                                   help='How the API calls are spread over the channels:'
+                                   ' round-robin, or least-loaded to the channel with the'
+                                   ' fewest calls in flight',
+                                   choices=constant.CHANNEL_DISPATCHES,
+                                   default=constant.CHANNEL_DISPATCH_ROUND_ROBIN)
+        common_parser.add_argument('--progress-interval',
+                                   help='Log the number of Entries done, their throughput, the'
+                                   ' ETA and their counts by outcome every this number of'
+                                   ' seconds. 0 disables it',
+                                   type=float,
+                                   default=10.0)
+        common_parser.add_argument('--log-format',
+                                   help='Log format: text, or json for one JSON object per'
+                                   ' line with the structured fields of each record',
+                                   choices=constant.LOG_FORMATS,
+                                   default=constant.LOG_FORMAT_TEXT)
+        common_parser.add_argument('--log-sample-rate',
+                                   help='Fraction of the Entries whose log lines are written,'
+                                   ' e.g. 0.01. Warnings and errors are always written',
+                                   type=float)
+        common_parser.add_argument('--metrics-out',
+                                   help='Write the API calls and phases metrics of the run to'
+                                   ' METRICS_OUT.json and, in the Prometheus text format, to'
+                                   ' METRICS_OUT.prom')
+        return common_parser
+
+    @classmethod
+    def __parse_rpc_qps(cls, value):
+        rpc_name, _, qps = value.partition('=')
+        try:
+            return rpc_name, float(qps)
+        except ValueError:
+            raise argparse.ArgumentTypeError('expected RPC=QPS, e.g. create_entry=10')
+
+    @classmethod
+    def __parse_location(cls, value):
+        project_id, _, location_id = value.partition('/')
+        if not project_id or not location_id or '/' in location_id:
+            raise argparse.ArgumentTypeError('expected PROJECT_ID/LOCATION_ID, e.g.'
+                                             ' my-project/us-central1')
+        return project_id, location_id
+
+    @classmethod
+    def __make_processor(cls, args, metrics=None):
+        return fileset_datasource_processor.FilesetDatasourceProcessor(
+            rate_limiter=rate_limiter.RateLimiter(qps=args.qps,
+                                                  rpc_qps=dict(args.rpc_qps or []),
+                                                  max_concurrency=args.max_concurrency,
+                                                  max_retries=args.max_retries),
+            metrics=metrics,
+            channels=args.channels,
+            channel_dispatch=args.channel_dispatch,
+            progress_interval=args.progress_interval)
+
+    @classmethod
+    def __make_metrics(cls, args):
+        if args.metrics_out:
+            return run_metrics.RunMetrics()
+
+    @classmethod
+    def __write_metrics(cls, metrics, metrics_out):
+        if metrics:
+            metrics.write(metrics_out)
+            logging.info('Metrics written to %s.json and %s.prom', metrics_out, metrics_out)
+
     @classmethod
     def __create_filesets_entry_groups_and_entries(cls, args):
-        fileset_datasource_processor.FilesetDatasourceProcessor(
-        ).create_entry_groups_and_entries_from_csv(
-            file_path=args.csv_file, validate_dataflow_sql_types=args.validate_dataflow_sql_types)
+        journal = cls.__open_journal(args.journal_file, args.resume)
+        manifest = cls.__open_manifest(args.manifest_file, args.force_resync)
+        if manifest and args.invalidate_manifest:
+            manifest.invalidate()
+        metrics = cls.__make_metrics(args)
+        try:
+            cls.__make_processor(args, metrics).create_entry_groups_and_entries_from_csv(
+                file_path=args.csv_file,
+                validate_dataflow_sql_types=args.validate_dataflow_sql_types,
+                workers=args.workers,
+                async_concurrency=args.async_concurrency,
+                prefetch_entries=args.prefetch_entries,
+                chunk_size=args.chunk_size,
+                manifest=manifest,
+                parser=args.parser,
+                parse_workers=args.parse_workers,
+                shard_index=args.shard_index,
+                shard_count=args.shard_count,
+                journal=journal)
+        finally:
+            if manifest:
+                manifest.close()
+            if journal:
+                journal.close()
+            cls.__write_metrics(metrics, args.metrics_out)
 
     @classmethod
     def __delete_filesets_entry_groups_and_entries(cls, args):
-        fileset_datasource_processor.FilesetDatasourceProcessor(
-        ).delete_entry_groups_and_entries_from_csv(file_path=args.csv_file)
+        journal = cls.__open_journal(args.journal_file, args.resume)
+        manifest = cls.__open_manifest(args.manifest_file)
+        metrics = cls.__make_metrics(args)
+        try:
+            cls.__make_processor(args, metrics).delete_entry_groups_and_entries_from_csv(
+                file_path=args.csv_file,
+                chunk_size=args.chunk_size,
+                manifest=manifest,
+                workers=args.workers,
+                parser=args.parser,
+                parse_workers=args.parse_workers,
+                shard_index=args.shard_index,
+                shard_count=args.shard_count,
+                journal=journal)
+        finally:
+            if manifest:
+                manifest.close()
+            if journal:
+                journal.close()
+            cls.__write_metrics(metrics, args.metrics_out)
+
+    @classmethod
+    def __plan_filesets_entry_groups_and_entries(cls, args):
+        metrics = cls.__make_metrics(args)
+        try:
+            cls.__make_processor(args, metrics).plan_entry_groups_and_entries_from_csv(
+                file_path=args.csv_file,
+                plan_file_path=args.plan_file,
+                validate_dataflow_sql_types=args.validate_dataflow_sql_types,
+                workers=args.workers,
+                chunk_size=args.chunk_size,
+                parser=args.parser,
+                parse_workers=args.parse_workers)
+        finally:
+            cls.__write_metrics(metrics, args.metrics_out)
+
+    @classmethod
+    def __apply_filesets_plan(cls, args):
+        metrics = cls.__make_metrics(args)
+        try:
+            cls.__make_processor(args, metrics).apply_plan(plan_file_path=args.plan_file,
+                                                           workers=args.workers)
+        finally:
+            cls.__write_metrics(metrics, args.metrics_out)
+
+    @classmethod
+    def __export_filesets_entry_groups_and_entries(cls, args):
+        metrics = cls.__make_metrics(args)
+        try:
+            cls.__make_processor(args, metrics).export_entry_groups_and_entries_to_csv(
+                locations=args.location, file_path=args.csv_file, workers=args.workers)
+        finally:
+            cls.__write_metrics(metrics, args.metrics_out)
+
+    @classmethod
+    def __count_filesets_shard_sizes(cls, args):
+        # No API call is made, so neither the processor nor its client are created.
+        fileset_datasource_processor.FilesetDatasourceProcessor.count_shard_sizes_from_csv(
+            file_path=args.csv_file,
+            shard_count=args.shard_count,
+            parser=args.parser,
+            parse_workers=args.parse_workers)
+
+    @classmethod
+    def __open_journal(cls, journal_file, resume=False):
+        if resume and not journal_file:
+            raise ValueError('--resume requires --journal-file')
+        if journal_file:
+            return run_journal.RunJournal(journal_file, resume=resume)
+
+    @classmethod
+    def __open_manifest(cls, manifest_file, force_resync=False):
+        if manifest_file:
+            return entry_manifest.EntryManifest(manifest_file, force_resync=force_resync)
 
 
 def main():
@@ -0,0 +1,44 @@
+import hashlib
+import json
+
+
+def fingerprint_entry(entry):
+    """Computes a stable fingerprint of the Entry fields managed by this package.
+
+    The display name, description, file patterns and schema columns are covered, so
+    two Entries with the same fingerprint need no update. Fields set by Data Catalog,
+    such as the linked resource, are ignored.
+
+    :param entry: An Entry object.
+    :return: The hexadecimal fingerprint string.
+    """
+    return _fingerprint(entry.display_name, entry.description,
+                        entry.gcs_fileset_spec.file_patterns,
+                        [(column.column, column.type, column.description, column.mode)
+                         for column in entry.schema.columns])
+
+
+def fingerprint_entry_spec(entry_spec):
+    """Computes the fingerprint of the Entry that would be made from a spec.
+
+    It equals the fingerprint_entry result for the Entry built from the spec, without
+    building it, so unchanged Entries can be skipped in bulk.
+
+    :param entry_spec: An EntrySpec.
+    :return: The hexadecimal fingerprint string.
+    """
+    # Missing values are left unset in the Entries, which reads them as empty strings.
+    return _fingerprint(_or_empty(entry_spec.display_name), _or_empty(entry_spec.description),
+                        entry_spec.file_patterns, [(column.name, _or_empty(
+                            column.type), _or_empty(column.description), _or_empty(column.mode))
+                                                   for column in entry_spec.columns])
+
+
+def _fingerprint(display_name, description, file_patterns, columns):
+    # Tuples are serialized as JSON arrays.
+    content = [display_name, description, list(file_patterns), columns]
+    return hashlib.sha256(json.dumps(content, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def _or_empty(value):
+    return '' if value is None else value
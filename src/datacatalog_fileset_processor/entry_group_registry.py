@@ -0,0 +1,128 @@
+import collections
+import logging
+
+from google.api_core import exceptions
+
+from datacatalog_fileset_processor import constant, csv_parser, datacatalog_entity_factory, \
+    facade_operations
+
+# Entry Group fields managed by this package, compared to detect drifted Entry Groups.
+MANAGED_FIELDS = ('display_name', 'description')
+
+
+class EntryGroupRegistry:
+    """The Entry Groups that exist in Data Catalog, cached for a run.
+
+    The Entry Groups of each project and location are listed once, the first time one
+    of them is upserted. Missing Entry Groups are then created, and the ones whose
+    display name or description drifted from their spec are updated, so syncing the
+    Entry Groups already in sync makes no write call.
+
+    If the Entry Groups of a location cannot be listed, they are created regardless,
+    and the ones that already exist are left as is.
+    """
+
+    def __init__(self):
+        self.__entry_groups_by_location = {}
+        self.outcomes = collections.Counter()
+
+    def upsert_entry_group(self, datacatalog_facade, entry_group_spec):
+        """Creates an Entry Group if it is missing, or updates its drifted fields.
+
+        :param datacatalog_facade: The DataCatalogFacade used to call the API.
+        :param entry_group_spec: An EntryGroupSpec.
+        :return: One of the constant.ENTRY_GROUP_OUTCOME_* values.
+        """
+        return facade_operations.run(
+            self.__upsert_entry_group(datacatalog_facade, entry_group_spec), datacatalog_facade)
+
+    async def upsert_entry_group_asynchronously(self, async_facade, entry_group_spec):
+        """Same as upsert_entry_group, calling the API through an AsyncDataCatalogFacade.
+
+        :param async_facade: The AsyncDataCatalogFacade used to call the API.
+        :param entry_group_spec: An EntryGroupSpec.
+        :return: One of the constant.ENTRY_GROUP_OUTCOME_* values.
+        """
+        return await facade_operations.run_asynchronously(
+            self.__upsert_entry_group(async_facade, entry_group_spec), async_facade)
+
+    def __upsert_entry_group(self, facade, entry_group_spec):
+        # Yields the facade calls, so the blocking and asyncio facades share this logic.
+        entry_group_name = entry_group_spec.name
+        project_id, location_id, entry_group_id = \
+            facade.extract_resources_from_entry_group(entry_group_name)
+        location = project_id, location_id
+        if location not in self.__entry_groups_by_location:
+            try:
+                listed_entry_groups = list(
+                    (yield facade_operations.call('list_entry_groups', project_id, location_id)))
+            except exceptions.GoogleAPICallError as e:
+                listed_entry_groups = self.__log_listing_error(location, e)
+            self.__index_entry_groups(location, listed_entry_groups)
+
+        entry_group = datacatalog_entity_factory.DataCatalogEntityFactory.make_entry_group(
+            entry_group_spec)
+        existing_entry_group = self.__find_entry_group(location, entry_group_id)
+        if existing_entry_group is None:
+            try:
+                yield facade_operations.call('create_entry_group', project_id, location_id,
+                                             entry_group_id, entry_group)
+                outcome = constant.ENTRY_GROUP_OUTCOME_CREATED
+            except exceptions.AlreadyExists:
+                logging.warning('Entry Group %s already exists.', entry_group_name)
+                outcome = constant.ENTRY_GROUP_OUTCOME_UNCHANGED
+        else:
+            drifted_fields = self.__find_drifted_fields(existing_entry_group, entry_group_spec)
+            if drifted_fields:
+                entry_group.name = existing_entry_group.name
+                yield facade_operations.call('update_entry_group', entry_group, drifted_fields)
+                outcome = constant.ENTRY_GROUP_OUTCOME_UPDATED
+            else:
+                logging.info('Entry Group %s is unchanged.', entry_group_name)
+                outcome = constant.ENTRY_GROUP_OUTCOME_UNCHANGED
+
+        return self.__record(location, entry_group_id, entry_group, outcome)
+
+    @classmethod
+    def __log_listing_error(cls, location, error):
+        logging.warning(
+            'Entry Groups of project %s in %s could not be listed, they will be created'
+            ' if missing: %s', location[0], location[1], error)
+
+    def __index_entry_groups(self, location, listed_entry_groups):
+        if listed_entry_groups is None:
+            self.__entry_groups_by_location[location] = None
+            return
+
+        # Entry Groups are indexed by id, as the listed names may be spelled differently,
+        # e.g. using the project number instead of its id.
+        self.__entry_groups_by_location[location] = {
+            entry_group.name.split('/')[-1]: entry_group
+            for entry_group in listed_entry_groups
+        }
+        logging.info('Listed %d existing Entry Groups of project %s in %s',
+                     len(self.__entry_groups_by_location[location]), location[0], location[1])
+
+    def __find_entry_group(self, location, entry_group_id):
+        entry_groups = self.__entry_groups_by_location[location]
+        return entry_groups.get(entry_group_id) if entry_groups is not None else None
+
+    @classmethod
+    def __find_drifted_fields(cls, existing_entry_group, entry_group_spec):
+        # Fields left empty in the CSV file are not specified, as when creating the
+        # Entry Group, so their existing values are kept.
+        drifted_fields = []
+        for field in MANAGED_FIELDS:
+            value = getattr(entry_group_spec, field)
+            if csv_parser.is_missing(value) or value == '':
+                continue
+            if getattr(existing_entry_group, field) != value:
+                drifted_fields.append(field)
+        return drifted_fields
+
+    def __record(self, location, entry_group_id, entry_group, outcome):
+        entry_groups = self.__entry_groups_by_location[location]
+        if entry_groups is not None:
+            entry_groups[entry_group_id] = entry_group
+        self.outcomes[outcome] += 1
+        return outcome
@@ -0,0 +1,116 @@
+import json
+import logging
+import os
+import threading
+
+
+class EntryManifest:
+    """Local record of the Entries content, as last applied to Data Catalog.
+
+    The manifest is stored as a JSON Lines file, each line holding an Entry name and
+    the fingerprint of its content, as computed by the entry_fingerprint module.
+    Changes are appended as they happen, and the file is compacted when the manifest
+    is closed.
+    """
+
+    def __init__(self, file_path, force_resync=False):
+        """
+        :param file_path: The manifest file path, created if it does not exist.
+        :param force_resync: flag if enabled will report every Entry as changed,
+         while still recording the ones that get synced.
+        """
+        self.__file_path = file_path
+        self.__force_resync = force_resync
+        self.__lock = threading.Lock()
+        self.__entry_hashes = self.__load(file_path)
+        self.__file = open(file_path, 'a')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @classmethod
+    def __load(cls, file_path):
+        entry_hashes = {}
+        if not os.path.exists(file_path):
+            return entry_hashes
+
+        with open(file_path) as manifest_file:
+            for line in manifest_file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record['hash']:
+                    entry_hashes[record['name']] = record['hash']
+                else:
+                    entry_hashes.pop(record['name'], None)
+
+        logging.info('Loaded %d Entries from manifest: %s', len(entry_hashes), file_path)
+        return entry_hashes
+
+    def is_unchanged(self, entry_name, entry_fingerprint):
+        """Checks whether an Entry was already synced with the same content.
+
+        :param entry_name: Entry Name.
+        :param entry_fingerprint: The Entry content fingerprint.
+        :return: True if the Entry can be skipped.
+        """
+        if self.__force_resync:
+            return False
+        return self.__entry_hashes.get(entry_name) == entry_fingerprint
+
+    def record(self, entry_name, entry_fingerprint):
+        """Records the content of an Entry that was synced.
+
+        :param entry_name: Entry Name.
+        :param entry_fingerprint: The Entry content fingerprint.
+        """
+        self.__write(entry_name, entry_fingerprint)
+
+    def remove(self, entry_name):
+        """Forgets an Entry, so it is synced next time it is seen.
+
+        :param entry_name: Entry Name.
+        """
+        self.__write(entry_name, None)
+
+    def __write(self, entry_name, entry_hash):
+        with self.__lock:
+            if self.__entry_hashes.get(entry_name) == entry_hash:
+                return
+            if entry_hash:
+                self.__entry_hashes[entry_name] = entry_hash
+            else:
+                self.__entry_hashes.pop(entry_name, None)
+            self.__file.write(
+                json.dumps({
+                    'name': entry_name,
+                    'hash': entry_hash
+                }, separators=(',', ':')) + '\n')
+            self.__file.flush()
+
+    def invalidate(self):
+        """Forgets every Entry, so they are all synced in the next run."""
+        with self.__lock:
+            self.__entry_hashes.clear()
+            self.__file.truncate(0)
+        logging.info('Manifest invalidated: %s', self.__file_path)
+
+    def close(self):
+        """Compacts the manifest file, keeping one line per Entry, and closes it."""
+        with self.__lock:
+            if self.__file.closed:
+                return
+            self.__file.close()
+
+            temp_file_path = '{}.tmp'.format(self.__file_path)
+            with open(temp_file_path, 'w') as temp_file:
+                for entry_name, entry_hash in self.__entry_hashes.items():
+                    temp_file.write(
+                        json.dumps({
+                            'name': entry_name,
+                            'hash': entry_hash
+                        }, separators=(',', ':')) + '\n')
+            os.replace(temp_file_path, self.__file_path)
@@ -0,0 +1,79 @@
+import threading
+
+from google.cloud import datacatalog_v1
+
+# Entry fields managed by this package, as update mask paths.
+UPDATE_FIELDS = ('display_name', 'description', 'gcs_fileset_spec.file_patterns', 'schema')
+
+
+def find_changed_fields(persisted_entry, entry):
+    """Lists the managed fields whose value differs between two Entries.
+
+    :param persisted_entry: The Entry read from Data Catalog.
+    :param entry: An Entry object with the new values.
+    :return: The update mask paths of the changed fields, in the UPDATE_FIELDS order.
+    """
+    changed_fields = []
+    if persisted_entry.display_name != entry.display_name:
+        changed_fields.append('display_name')
+    if persisted_entry.description != entry.description:
+        changed_fields.append('description')
+    if list(persisted_entry.gcs_fileset_spec.file_patterns) != \
+            list(entry.gcs_fileset_spec.file_patterns):
+        changed_fields.append('gcs_fileset_spec.file_patterns')
+    if list(persisted_entry.schema.columns) != list(entry.schema.columns):
+        changed_fields.append('schema')
+    return changed_fields
+
+
+def make_entry_update(entry, update_fields):
+    """Makes the Entry sent to update some of the fields of an Entry.
+
+    :param entry: An Entry object, with its name set.
+    :param update_fields: The update mask paths of the fields to be sent.
+    :return: A new Entry with the name and the given fields of the Entry only.
+    """
+    entry_update = datacatalog_v1.types.Entry()
+    entry_update.name = entry.name
+    if 'display_name' in update_fields:
+        entry_update.display_name = entry.display_name
+    if 'description' in update_fields:
+        entry_update.description = entry.description
+    if 'gcs_fileset_spec.file_patterns' in update_fields:
+        entry_update.gcs_fileset_spec.file_patterns.extend(entry.gcs_fileset_spec.file_patterns)
+    if 'schema' in update_fields:
+        entry_update.schema.columns.extend(entry.schema.columns)
+    return entry_update
+
+
+class UpdatePayloadStats:
+    """Thread safe counter of the bytes sent by the field-masked Entry updates.
+
+    Each update is compared with the whole Entry, which would be sent without a mask,
+    so the bytes saved by sending the changed fields only are known.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forgets the updates recorded so far."""
+        with self.__lock:
+            self.updates_count = 0
+            self.sent_bytes = 0
+            self.full_bytes = 0
+
+    def record(self, sent_bytes, full_bytes):
+        """
+        :param sent_bytes: The size of the Entry sent with the update mask.
+        :param full_bytes: The size of the whole Entry.
+        """
+        with self.__lock:
+            self.updates_count += 1
+            self.sent_bytes += sent_bytes
+            self.full_bytes += full_bytes
+
+    @property
+    def saved_bytes(self):
+        return self.full_bytes - self.sent_bytes
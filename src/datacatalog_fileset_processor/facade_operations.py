@@ -0,0 +1,323 @@
+"""Data Catalog operations shared by the blocking and asyncio facades.
+
+An operation is a generator holding the decision logic of a facade method: it yields
+the API calls it needs, is sent back their results, or thrown their errors, and
+returns the method result. The facades only differ by how they run the calls, which
+the run and run_asynchronously functions take care of.
+"""
+import collections
+import logging
+
+from google.api_core import exceptions
+from google.cloud import datacatalog_v1
+
+from datacatalog_fileset_processor import constant, entry_fingerprint, entry_update, \
+    structured_logging
+
+ApiCall = collections.namedtuple('ApiCall', ('method', 'args', 'kwargs'))
+
+
+def call(method, *args, **kwargs):
+    """
+    :param method: The name of the method to call.
+    :return: An ApiCall, to be yielded by an operation.
+    """
+    return ApiCall(method, args, kwargs)
+
+
+def run(operation, target):
+    """Runs an operation, making its calls as blocking method calls.
+
+    :param operation: An operation generator.
+    :param target: The object whose methods are called, e.g. a Data Catalog client.
+    :return: The operation result.
+    """
+    result = error = None
+    while True:
+        try:
+            api_call = operation.throw(error) if error else operation.send(result)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            result, error = getattr(target, api_call.method)(*api_call.args,
+                                                             **api_call.kwargs), None
+        except Exception as e:
+            result, error = None, e
+
+
+async def run_asynchronously(operation, target):
+    """Runs an operation, awaiting its calls.
+
+    :param operation: An operation generator.
+    :param target: The object whose coroutine methods are called, e.g. an asyncio Data
+     Catalog client.
+    :return: The operation result.
+    """
+    result = error = None
+    while True:
+        try:
+            api_call = operation.throw(error) if error else operation.send(result)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            result, error = await getattr(target, api_call.method)(*api_call.args,
+                                                                   **api_call.kwargs), None
+        except Exception as e:
+            result, error = None, e
+
+
+def create_entry(entry_group_name, entry_id, entry, manifest=None):
+    """Creates a Data Catalog Entry.
+
+    :param entry_group_name: Parent Entry Group name.
+    :param entry_id: Entry id.
+    :param entry: An Entry object.
+    :param manifest: Optional EntryManifest, in which the Entry is recorded once created.
+    :return: The created Entry, or None if permission to create it was denied.
+    """
+    entry_name = '{}/entries/{}'.format(entry_group_name, entry_id)
+    try:
+        created_entry = yield call('create_entry',
+                                   parent=entry_group_name,
+                                   entry_id=entry_id,
+                                   entry=entry)
+        _log_entry_operation('created', entry=created_entry)
+        if manifest:
+            manifest.record(entry_name, entry_fingerprint.fingerprint_entry(entry))
+        return created_entry
+    except exceptions.PermissionDenied as e:
+        _log_entry_operation('was not created', entry_name=entry_name)
+        logging.warning('Error: %s', e)
+
+
+def update_entry(entry, update_fields=None, update_payloads=None):
+    """Updates an Entry.
+
+    :param entry: An Entry object, with its name set.
+    :param update_fields: Optional update mask paths, among entry_update.UPDATE_FIELDS.
+     If set, only these fields are sent, along with a matching update mask, and the
+     bytes saved once updated are recorded. Otherwise, the whole Entry is sent.
+    :param update_payloads: Optional UpdatePayloadStats, recording the bytes sent.
+    :return: The updated Entry.
+    """
+    entry_payload = entry
+    update_mask = None
+    if update_fields:
+        entry_payload = entry_update.make_entry_update(entry, update_fields)
+        update_mask = {'paths': list(update_fields)}
+    updated_entry = yield call('update_entry', entry=entry_payload, update_mask=update_mask)
+    if update_mask and update_payloads:
+        update_payloads.record(entry_payload.ByteSize(), entry.ByteSize())
+    _log_entry_operation('updated', entry=updated_entry)
+    return updated_entry
+
+
+def upsert_entry(entry_group_name,
+                 entry_name,
+                 entry_id,
+                 entry,
+                 existing_entries=None,
+                 manifest=None,
+                 update_payloads=None):
+    """
+    Update a Data Catalog Entry if it exists and has been changed.
+    Creates a new Entry if it does not exist.
+
+    :param entry_group_name: Parent Entry Group name.
+    :param entry_name: Entry Name.
+    :param entry_id: Entry id.
+    :param entry: An Entry object.
+    :param existing_entries: Optional dict of the Entries that already exist in the
+     Entry Group, by id. If provided, it is used instead of reading the Entry.
+    :param manifest: Optional EntryManifest, in which the Entry is recorded once
+     it is created, updated or found up-to-date.
+    :param update_payloads: Optional UpdatePayloadStats, recording the bytes sent by
+     the update.
+    :return: The updated or created Entry, or None if it was not written, as the
+     create call was denied or the update call failed its preconditions.
+    """
+    if existing_entries is not None:
+        return (yield from _upsert_prefetched_entry(entry_group_name, entry_name, entry_id, entry,
+                                                    existing_entries, manifest, update_payloads))
+
+    persisted_entry = entry
+    try:
+        try:
+            persisted_entry = yield call('get_entry', name=entry_name)
+        except exceptions.PermissionDenied:
+            _log_entry_operation('does not exist', entry_name=entry_name)
+            try:
+                return (yield from create_entry(entry_group_name, entry_id, entry, manifest))
+            except exceptions.AlreadyExists:
+                # Create calls are retried on transient errors, so a previous attempt
+                # may have created the Entry, e.g. before timing out: it is read instead.
+                persisted_entry = yield call('get_entry', name=entry_name)
+        _log_entry_operation('already exists', entry_name=entry_name)
+        persisted_entry = yield from _update_entry_if_changed(persisted_entry, entry_name, entry,
+                                                              manifest, update_payloads)
+    except exceptions.FailedPrecondition as e:
+        logging.warning('Entry was not updated: %s', entry_name)
+        logging.warning('Error: %s', e)
+        return None
+
+    return persisted_entry
+
+
+def _upsert_prefetched_entry(entry_group_name, entry_name, entry_id, entry, existing_entries,
+                             manifest, update_payloads):
+    # Entries are looked up by id, as the listed names may be spelled differently,
+    # e.g. using the project number instead of its id.
+    persisted_entry = existing_entries.get(entry_id)
+    if persisted_entry is None:
+        _log_entry_operation('does not exist', entry_name=entry_name)
+        try:
+            return (yield from create_entry(entry_group_name, entry_id, entry, manifest))
+        except exceptions.AlreadyExists:
+            # The Entry may have been created since the Entries were listed, so fall
+            # back to reading it.
+            return (yield from upsert_entry(entry_group_name,
+                                            entry_name,
+                                            entry_id,
+                                            entry,
+                                            manifest=manifest,
+                                            update_payloads=update_payloads))
+
+    _log_entry_operation('already exists', entry_name=entry_name)
+    try:
+        persisted_entry = yield from _update_entry_if_changed(persisted_entry, entry_name, entry,
+                                                              manifest, update_payloads)
+    except exceptions.FailedPrecondition as e:
+        logging.warning('Entry was not updated: %s', entry_name)
+        logging.warning('Error: %s', e)
+        return None
+
+    return persisted_entry
+
+
+def _update_entry_if_changed(persisted_entry, entry_name, entry, manifest, update_payloads):
+    if entry_was_updated(persisted_entry, entry):
+        # Only the changed fields are sent. The whole Entry is, if none of them
+        # changed, i.e. if only its source system update time did.
+        update_fields = entry_update.find_changed_fields(persisted_entry, entry)
+        merge_entry(persisted_entry, entry_name, entry)
+        persisted_entry = yield from update_entry(persisted_entry, update_fields, update_payloads)
+    else:
+        _log_entry_operation('is up-to-date', entry=persisted_entry)
+
+    if manifest:
+        manifest.record(entry_name, entry_fingerprint.fingerprint_entry(entry))
+    return persisted_entry
+
+
+def merge_entry(persisted_entry, entry_name, entry):
+    """Merges the fields managed by this package into a persisted Entry.
+
+    :param persisted_entry: The Entry read from Data Catalog, changed in place.
+    :param entry_name: Entry Name.
+    :param entry: An Entry object with the new values.
+    """
+    persisted_entry.name = entry_name
+    persisted_entry.display_name = entry.display_name
+    persisted_entry.description = entry.description
+    # clear repeated message containers.
+    del persisted_entry.gcs_fileset_spec.file_patterns[:]
+    del persisted_entry.schema.columns[:]
+
+    persisted_entry.gcs_fileset_spec.file_patterns.extend(entry.gcs_fileset_spec.file_patterns)
+    persisted_entry.schema.columns.extend(entry.schema.columns)
+
+
+def entry_was_updated(current_entry, new_entry):
+    """Checks whether a persisted Entry differs from a new one.
+
+    The Entries are compared by their fingerprints, covering the display name,
+    description, file patterns and schema columns.
+
+    :param current_entry: The Entry read from Data Catalog.
+    :param new_entry: An Entry object with the new values.
+    :return: True if the persisted Entry needs to be updated.
+    """
+    # Update time comparison allows to verify whether the entry was
+    # updated on the source system.
+    current_update_time = \
+        current_entry.source_system_timestamps.update_time.seconds
+    new_update_time = \
+        new_entry.source_system_timestamps.update_time.seconds
+
+    updated_time_changed = \
+        new_update_time != 0 and current_update_time != new_update_time
+
+    if updated_time_changed:
+        return True
+    return entry_fingerprint.fingerprint_entry(current_entry) != \
+        entry_fingerprint.fingerprint_entry(new_entry)
+
+
+def delete_entry(name):
+    """Deletes a Data Catalog Entry.
+
+    Errors are not raised, but reported by the returned outcome. Permission denied
+    errors are reported as not found, as they are returned for missing Entries too.
+
+    :param name: The Entry name.
+    :return: One of the constant.DELETE_OUTCOME_* values.
+    """
+    try:
+        yield call('delete_entry', name=name)
+        _log_entry_operation('deleted', entry_name=name)
+        return constant.DELETE_OUTCOME_DELETED
+    except (exceptions.NotFound, exceptions.PermissionDenied) as e:
+        _log_entry_operation('not found', entry_name=name)
+        logging.debug(str(e))
+        return constant.DELETE_OUTCOME_NOT_FOUND
+    except Exception as e:
+        logging.warning('An exception ocurred while attempting to delete Entry: %s', name)
+        logging.warning('Error: %s', e)
+        return constant.DELETE_OUTCOME_FAILED
+
+
+def _log_entry_operation(description, entry=None, entry_name=None):
+
+    formatted_description = 'Entry {}: '.format(description)
+    entry_name = entry.name if entry else entry_name
+    fields = {'fields': {'entry': entry_name, 'operation': description}}
+    structured_logging.entry_logger.info('%s%s', formatted_description, entry_name, extra=fields)
+
+    if entry:
+        structured_logging.entry_logger.info('%s^ %s',
+                                             ' ' * len(formatted_description),
+                                             entry.linked_resource,
+                                             extra=fields)
+
+
+def create_entry_group(project_id, location_id, entry_group_id, entry_group):
+    """Creates a Data Catalog Entry Group.
+
+    :param project_id: Project id.
+    :param location_id: Location id.
+    :param entry_group_id: Entry Group id.
+    :param entry_group: Entry Group.
+
+    :return: The created Entry Group.
+    """
+    created_entry_group = yield call('create_entry_group',
+                                     parent=datacatalog_v1.DataCatalogClient.location_path(
+                                         project_id, location_id),
+                                     entry_group_id=entry_group_id,
+                                     entry_group=entry_group)
+    logging.info('Entry Group created: %s', created_entry_group.name)
+    return created_entry_group
+
+
+def update_entry_group(entry_group, update_fields):
+    """Updates some fields of an Entry Group.
+
+    :param entry_group: An Entry Group object, with its name set.
+    :param update_fields: The names of the fields to update.
+    :return: The updated Entry Group.
+    """
+    updated_entry_group = yield call('update_entry_group',
+                                     entry_group=entry_group,
+                                     update_mask={'paths': list(update_fields)})
+    logging.info('Entry Group updated: %s', entry_group.name)
+    return updated_entry_group
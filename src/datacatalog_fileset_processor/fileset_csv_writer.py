@@ -0,0 +1,73 @@
+import csv
+
+from datacatalog_fileset_processor import constant
+
+
+class FilesetsCsvWriter:
+    """Writes Entry Groups and Fileset Entries to a Filesets CSV file.
+
+    The rows are laid out as the processor reads them: the first row of each Entry Group
+    holds its columns, which are filled forward on the next rows, and each Entry spans
+    one row per schema column, of which only the first one describes the Entry. Rows are
+    written as the Entries are iterated, so memory usage does not grow with the file.
+    """
+
+    def __init__(self, file_path):
+        self.__file = open(file_path, 'w', newline='')
+        # Values are all quoted, as the readers drop anything after a '#' outside of
+        # quotes, taking it for a comment.
+        self.__writer = csv.writer(self.__file, quoting=csv.QUOTE_ALL)
+        self.__writer.writerow(constant.FILESETS_COLUMNS_ORDER)
+        self.entry_groups_count = 0
+        self.entries_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write_entry_group(self, entry_group, entries):
+        """Writes an Entry Group and its Entries.
+
+        :param entry_group: An Entry Group object, with its name set.
+        :param entries: An iterable of the Fileset Entry objects of the Entry Group.
+         An Entry Group without any Entry is written as a single row.
+        """
+        entry_group_values = [entry_group.name, entry_group.display_name, entry_group.description]
+        for entry in entries:
+            self.write_entry(entry, entry_group_values)
+            entry_group_values = None
+
+        if entry_group_values:
+            self.__write_row(entry_group_values)
+        self.entry_groups_count += 1
+
+    def write_entry(self, entry, entry_group_values=None):
+        """Writes the rows of a Fileset Entry.
+
+        :param entry: A Fileset Entry object, with its name set.
+        :param entry_group_values: The Entry Group name, display name and description,
+         written on the first row of the Entry Group only.
+        """
+        entry_values = [
+            entry.name.split('/')[-1], entry.display_name, entry.description,
+            constant.FILE_PATTERNS_VALUES_SEPARATOR.join(entry.gcs_fileset_spec.file_patterns)
+        ]
+        columns = entry.schema.columns
+        if not columns:
+            self.__write_row(entry_group_values, entry_values)
+        for column in columns:
+            self.__write_row(entry_group_values, entry_values,
+                             [column.column, column.type, column.description, column.mode])
+            # The next rows only carry the Entry id, which the schema columns belong to.
+            entry_group_values = None
+            entry_values = entry_values[:1] + [None] * (len(entry_values) - 1)
+        self.entries_count += 1
+
+    def __write_row(self, entry_group_values=None, entry_values=None, column_values=None):
+        self.__writer.writerow((entry_group_values or [None] * 3) + (entry_values or [None] * 4) +
+                               (column_values or [None] * 4))
+
+    def close(self):
+        self.__file.close()
@@ -1,38 +1,134 @@
+import asyncio
+import collections
+import contextlib
+import functools
+import itertools
 import logging
+import queue
+import threading
+from concurrent import futures
 
 import pandas as pd
 from google.api_core import exceptions
 
-from . import constant, datacatalog_entity_factory, datacatalog_facade
+from . import async_datacatalog_facade, columnar_reader, constant, csv_files_reader, csv_parser, \
+    datacatalog_entity_factory, datacatalog_facade, entry_fingerprint, entry_group_registry, \
+    entry_update, fileset_csv_writer, fileset_plan, fileset_spec, fileset_validator, \
+    progress_reporter, sharding, structured_logging
+
+# Number of rows read at a time to validate the CSV files before processing them.
+VALIDATION_CHUNK_SIZE = 100000
+
+# Number of Entries fetched by each list call when exporting, the API maximum. As many
+# are buffered for each Entry Group waiting to be written.
+EXPORT_PAGE_SIZE = 1000
 
 
 class FilesetDatasourceProcessor:
 
-    def __init__(self):
-        self.__datacatalog_facade = datacatalog_facade.DataCatalogFacade()
+    def __init__(self,
+                 rate_limiter=None,
+                 metrics=None,
+                 channels=None,
+                 channel_dispatch=None,
+                 progress_interval=None):
+        """
+        :param rate_limiter: Optional RateLimiter, used to throttle and retry the API calls.
+        :param metrics: Optional RunMetrics, recording the API calls and the time spent in
+         each phase: read, normalize, validate, extract, build, plan and sync.
+        :param channels: Number of gRPC channels the API calls are spread over.
+        :param channel_dispatch: How the calls are spread over the channels, one of the
+         constant.CHANNEL_DISPATCHES values. Defaults to round-robin.
+        :param progress_interval: If set, the number of Entries done, their throughput,
+         the ETA and their counts by outcome are logged every this number of seconds
+         while syncing.
+        """
+        self.__rate_limiter = rate_limiter
+        self.__metrics = metrics
+        self.__channels = channels
+        self.__channel_dispatch = channel_dispatch
+        # Bytes sent by the Entry updates of a run, by either facade.
+        self.__update_payloads = entry_update.UpdatePayloadStats()
+        self.__datacatalog_facade = datacatalog_facade.DataCatalogFacade(
+            rate_limiter=rate_limiter,
+            metrics=metrics,
+            channels=channels,
+            channel_dispatch=channel_dispatch,
+            update_payloads=self.__update_payloads)
+        self.__entry_group_registry = entry_group_registry.EntryGroupRegistry()
+        self.__progress_interval = progress_interval
+        self.__progress = None
 
     def create_entry_groups_and_entries_from_csv(self,
                                                  file_path,
-                                                 validate_dataflow_sql_types=None):
+                                                 validate_dataflow_sql_types=None,
+                                                 workers=None,
+                                                 async_concurrency=None,
+                                                 prefetch_entries=None,
+                                                 chunk_size=None,
+                                                 manifest=None,
+                                                 parser=None,
+                                                 parse_workers=None,
+                                                 shard_index=None,
+                                                 shard_count=None,
+                                                 journal=None):
         """
         Creates Entry Groups and Entries, if they don't exist,
           by reading information from a CSV file.
 
-        :param file_path: The CSV file path.
+        :param file_path: The CSV file path, or a directory or glob pattern matching
+         several CSV files, whose Entry Groups are all processed in this run.
         :param validate_dataflow_sql_types: flag if enabled will validate Data Flow SQL types.
+         The rows are all validated before any Entry Group is created, and the run fails,
+         reporting every invalid row, if any of them is invalid.
+        :param workers: Number of worker threads used to upsert the Entries.
+         Entries are upserted sequentially if not set or lower than 2.
+        :param async_concurrency: If set, the Entries are upserted on an asyncio event loop,
+         keeping up to this number of requests in flight. Takes precedence over workers.
+        :param prefetch_entries: flag if enabled will list the existing Entries of each
+         Entry Group once, instead of reading every Entry before upserting it.
+        :param chunk_size: If set, the CSV file is streamed in chunks of this number of rows
+         and each Entry Group is processed as soon as all of its rows were read. The rows of
+         each Entry Group are expected to be contiguous in this mode.
+        :param manifest: Optional EntryManifest. Entries whose content did not change since
+         they were recorded in it are skipped, and the upserted ones are recorded.
+        :param parser: The CSV parser backend, one of constant.PARSERS. Defaults to pandas.
+        :param parse_workers: Number of processes used to parse several CSV files in
+         parallel. Defaults to the number of CPUs. Files are streamed one after the other
+         if chunk_size is set.
+        :param shard_index: If set, along with shard_count, only the Entry Groups whose
+         name hashes into this shard are processed.
+        :param shard_count: The number of shards the Entry Groups are spread across.
+        :param journal: Optional RunJournal. Entry Groups and Entries it reports as done
+         are skipped, and the processed ones are recorded in it with their outcome.
         :return: A list of Tuple (entry_group, entries)
          with all Entry Groups and Entries processed.
         """
+        sharding.validate_shard(shard_index, shard_count)
+
         logging.info('')
         logging.info('===> Create Fileset Entry Groups and Entries from CSV [STARTED]')
 
         logging.info('')
-        logging.info('Reading CSV file: %s...', file_path)
-        dataframe = pd.read_csv(file_path, comment='#')
+        validator = fileset_validator.FilesetsValidator(validate_dataflow_sql_types)
+        with self.__read_entry_group_specs(file_path, chunk_size, parser, parse_workers,
+                                           validator) as entry_group_specs:
+            logging.info('')
+            self.__start_progress('Entries', entry_group_specs, validator, shard_count, journal)
+            entry_group_specs = self.__select_shard(entry_group_specs, shard_index, shard_count)
+            entry_group_specs = self.__skip_journaled(entry_group_specs, journal)
+            # Existing Entry Groups are listed once per run, as they may change between runs.
+            self.__entry_group_registry = entry_group_registry.EntryGroupRegistry()
+            self.__update_payloads.reset()
+            with self.__phase('sync'):
+                created_assets = self.__create_entry_groups_and_entries(
+                    entry_group_specs, workers, async_concurrency, prefetch_entries, manifest,
+                    journal)
+            self.__finish_progress()
 
         logging.info('')
-        created_assets = self.__create_entry_groups_and_entries_from_dataframe(
-            dataframe, validate_dataflow_sql_types)
+        self.__log_entry_group_outcomes()
+        self.__log_update_payloads()
 
         logging.info('')
         logging.info(
@@ -40,71 +136,921 @@ class FilesetDatasourceProcessor:
 
         return created_assets
 
-    def delete_entry_groups_and_entries_from_csv(self, file_path):
+    def delete_entry_groups_and_entries_from_csv(self,
+                                                 file_path,
+                                                 chunk_size=None,
+                                                 manifest=None,
+                                                 workers=None,
+                                                 parser=None,
+                                                 parse_workers=None,
+                                                 shard_index=None,
+                                                 shard_count=None,
+                                                 journal=None):
         """
         Delete Entry Groups and Entries by reading information from a CSV file.
 
-        :param file_path: The CSV file path.
+        :param file_path: The CSV file path, or a directory or glob pattern matching
+         several CSV files, whose Entry Groups are all processed in this run.
+        :param chunk_size: If set, the CSV file is read in chunks of this number of rows.
+         The Entry Groups are deleted once all the rows were read, so the ones split
+         across chunks or files are deleted once.
+        :param manifest: Optional EntryManifest, from which the deleted Entries are removed.
+        :param workers: Number of worker threads used to delete the Entries concurrently.
+         Each Entry Group is deleted once none of its Entries failed to be deleted.
+        :param parser: The CSV parser backend, one of constant.PARSERS. Defaults to pandas.
+        :param parse_workers: Number of processes used to parse several CSV files in
+         parallel. Defaults to the number of CPUs.
+        :param shard_index: If set, along with shard_count, only the Entry Groups whose
+         name hashes into this shard are processed.
+        :param shard_count: The number of shards the Entry Groups are spread across.
+        :param journal: Optional RunJournal. Entry Groups and Entries it reports as done
+         are skipped, and the processed ones are recorded in it with their outcome.
+        :return: A list of Tuple (entry_group, outcome, entries), entries being a list of
+         Tuple (entry, outcome). Outcomes are one of the constant.DELETE_OUTCOME_* values.
         """
+        sharding.validate_shard(shard_index, shard_count)
+
         logging.info('')
         logging.info('===> Delete Fileset Entry Groups and Entries from CSV [STARTED]')
 
         logging.info('')
-        logging.info('Reading CSV file: %s...', file_path)
-        dataframe = pd.read_csv(file_path, comment='#')
+        with self.__read_entry_group_specs(file_path, chunk_size, parser,
+                                           parse_workers) as entry_group_specs:
+            logging.info('')
+            logging.info('Deleting the Entries...')
+            self.__start_progress('Entries',
+                                  entry_group_specs,
+                                  shard_count=shard_count,
+                                  journal=journal)
+            entry_group_specs = self.__select_shard(entry_group_specs, shard_index, shard_count)
+            entry_group_specs = self.__skip_journaled(entry_group_specs, journal)
+            # An Entry Group split across files or chunks is deleted once, after all of
+            # its Entries, so its fragments are merged.
+            entry_group_specs = fileset_spec.merge_entry_group_specs(entry_group_specs)
+            with self.__phase('sync'):
+                deleted_assets = self.__delete_entry_groups_and_entries(
+                    entry_group_specs, manifest, workers or 1, journal)
+            self.__finish_progress()
 
         logging.info('')
-        logging.info('Deleting the Entries...')
-        self.__delete_entry_groups_and_entries_from_dataframe(dataframe)
+        entry_groups_outcomes = collections.Counter(outcome for _, outcome, _ in deleted_assets)
+        entries_outcomes = collections.Counter(outcome for _, _, entries in deleted_assets
+                                               for _, outcome in entries)
+        for outcome in (constant.DELETE_OUTCOME_DELETED, constant.DELETE_OUTCOME_NOT_FOUND,
+                        constant.DELETE_OUTCOME_FAILED):
+            logging.info('Entry Groups %s: %d, Entries %s: %d', outcome,
+                         entry_groups_outcomes[outcome], outcome, entries_outcomes[outcome])
 
         logging.info('')
         logging.info(
             '==== Delete Fileset Entry Groups and Entries from CSV [FINISHED] ===========')
 
-    def __create_entry_groups_and_entries_from_dataframe(self,
-                                                         dataframe,
-                                                         validate_dataflow_sql_types=None):
-        normalized_df = self.__normalize_dataframe(dataframe)
+        return deleted_assets
+
+    def plan_entry_groups_and_entries_from_csv(self,
+                                               file_path,
+                                               plan_file_path,
+                                               validate_dataflow_sql_types=None,
+                                               workers=None,
+                                               chunk_size=None,
+                                               parser=None,
+                                               parse_workers=None):
+        """
+        Compares the Entry Groups and Entries in a CSV file with the ones in Data Catalog,
+          and writes the changes needed to sync them to a plan file.
+
+        Entries that exist in the Entry Groups but are not listed in the CSV file
+        are planned for deletion.
+
+        :param file_path: The CSV file path, or a directory or glob pattern matching
+         several CSV files.
+        :param plan_file_path: The plan file path.
+        :param validate_dataflow_sql_types: flag if enabled will validate Data Flow SQL types.
+         The rows are all validated before any Entry Group is read, and planning fails,
+         reporting every invalid row, if any of them is invalid.
+        :param workers: Number of worker threads used to read the Entry Groups concurrently.
+        :param chunk_size: If set, the CSV file is streamed in chunks of this number of rows.
+         The Entry Groups are still all read before being compared, so the ones split across
+         files or chunks are planned as a whole.
+        :param parser: The CSV parser backend, one of constant.PARSERS. Defaults to pandas.
+        :param parse_workers: Number of processes used to parse several CSV files in
+         parallel. Defaults to the number of CPUs.
+        :return: A Counter with the number of planned changes by (resource, action).
+        """
+        logging.info('')
+        logging.info('===> Plan Fileset Entry Groups and Entries from CSV [STARTED]')
+
+        logging.info('')
+        validator = fileset_validator.FilesetsValidator(validate_dataflow_sql_types)
+        with self.__read_entry_group_specs(file_path, chunk_size, parser, parse_workers,
+                                           validator) as entry_group_specs:
+            logging.info('')
+            logging.info('Comparing with Data Catalog...')
+            with fileset_plan.FilesetPlanWriter(plan_file_path) as plan_writer, \
+                    self.__phase('plan'):
+                # An Entry Group planned in fragments would see the Entries of the other
+                # fragments as missing from the CSV files, and plan them for deletion.
+                self.__plan_entry_groups(fileset_spec.merge_entry_group_specs(entry_group_specs),
+                                         plan_writer, workers or 1)
+
+        logging.info('')
+        for (resource, action), count in sorted(plan_writer.summary.items()):
+            logging.info('Planned %s %s: %d', resource, action, count)
+
+        logging.info('')
+        logging.info(
+            '==== Plan Fileset Entry Groups and Entries from CSV [FINISHED] =============')
+
+        return plan_writer.summary
+
+    def apply_plan(self, plan_file_path, workers=None):
+        """
+        Applies the changes listed in a plan file. Unchanged resources are not touched.
+
+        :param plan_file_path: The plan file path.
+        :param workers: Number of worker threads used to apply the Entries changes.
+        :return: A Counter with the number of applied changes by (resource, action).
+         Failed changes are counted with the 'failed' action.
+        """
+        logging.info('')
+        logging.info('===> Apply Fileset Entry Groups and Entries plan [STARTED]')
+
+        logging.info('')
+        logging.info('Reading plan file: %s...', plan_file_path)
+        self.__entry_group_registry = entry_group_registry.EntryGroupRegistry()
+        self.__update_payloads.reset()
+        with self.__phase('sync'):
+            applied_changes = self.__apply_plan_records(
+                fileset_plan.FilesetPlanReader(plan_file_path), workers or 1)
+
+        logging.info('')
+        for (resource, action), count in sorted(applied_changes.items()):
+            logging.info('Applied %s %s: %d', resource, action, count)
+        self.__log_update_payloads()
+
+        logging.info('')
+        logging.info(
+            '==== Apply Fileset Entry Groups and Entries plan [FINISHED] ================')
+
+        return applied_changes
+
+    def export_entry_groups_and_entries_to_csv(self, locations, file_path, workers=None):
+        """
+        Writes the Entry Groups and Fileset Entries of Data Catalog to a CSV file, in the
+          layout read by the create command.
+
+        The Entries of several Entry Groups are listed concurrently, a page at a time, and
+        written as they are listed, so memory usage does not grow with the number of
+        Entries. Entries of other types are skipped.
+
+        :param locations: An iterable of Tuple (project_id, location_id), whose Entry
+         Groups are all exported.
+        :param file_path: The CSV file path.
+        :param workers: Number of worker threads used to list the Entries concurrently.
+        :return: A Tuple (entry_groups_count, entries_count) of the exported resources.
+        """
+        logging.info('')
+        logging.info('===> Export Fileset Entry Groups and Entries to CSV [STARTED]')
+
+        logging.info('')
+        logging.info('Listing the Entry Groups and Entries...')
+        self.__start_progress('Entries', None)
+        with fileset_csv_writer.FilesetsCsvWriter(file_path) as csv_writer, \
+                self.__phase('export'):
+            self.__export_entry_groups(list(locations), csv_writer, workers or 1)
+        self.__finish_progress()
+
+        logging.info('')
+        logging.info('Exported %d Entry Groups and %d Entries to %s',
+                     csv_writer.entry_groups_count, csv_writer.entries_count, file_path)
+
+        logging.info('')
+        logging.info(
+            '==== Export Fileset Entry Groups and Entries to CSV [FINISHED] =============')
+
+        return csv_writer.entry_groups_count, csv_writer.entries_count
+
+    @classmethod
+    def count_shard_sizes_from_csv(cls, file_path, shard_count, parser=None, parse_workers=None):
+        """
+        Counts the Entry Groups and Entries each shard would process, to check the shards
+          balance before syncing. No API call is made.
+
+        :param file_path: The CSV file path, or a directory or glob pattern matching
+         several CSV files.
+        :param shard_count: The number of shards the Entry Groups are spread across.
+        :param parser: The CSV parser backend, one of constant.PARSERS. Defaults to pandas.
+        :param parse_workers: Number of processes used to parse several CSV files in
+         parallel. Defaults to the number of CPUs.
+        :return: A list of Tuple (entry_groups_count, entries_count), by shard index.
+        """
+        sharding.validate_shard(0, shard_count)
+
+        files_reader = csv_files_reader.CsvFilesReader(
+            csv_files_reader.resolve_csv_files(file_path),
+            functools.partial(cls.read_csv_file, parser=parser), parse_workers)
+        shard_sizes = sharding.count_shard_sizes(files_reader, shard_count)
+
+        logging.info('')
+        for shard_index, (entry_groups_count, entries_count) in enumerate(shard_sizes):
+            logging.info('Shard %d of %d: %d Entry Groups, %d Entries', shard_index, shard_count,
+                         entry_groups_count, entries_count)
+        mean_entries_count = files_reader.entries_count / shard_count
+        if mean_entries_count:
+            logging.info(
+                'Largest shard: %.0f%% of the mean number of Entries',
+                100 * max(entries_count for _, entries_count in shard_sizes) / mean_entries_count)
+
+        return shard_sizes
+
+    @classmethod
+    def read_csv_file(cls, file_path, parser=None):
+        """
+        Reads all the Entry Groups and Entries of a CSV file at once.
+
+        Being a picklable classmethod, it is used to read several files in worker processes.
+
+        :param file_path: The CSV file path. Parquet, Arrow IPC and JSON Lines files are
+         read too, according to their extension.
+        :param parser: The CSV parser backend, one of constant.PARSERS. Defaults to pandas.
+        :return: A list of EntryGroupSpec.
+        """
+        if columnar_reader.get_columnar_format(file_path):
+            # Each row group or batch is normalized and extracted on its own, so only the
+            # specs of the file are held at once, not its rows.
+            builder = csv_parser.EntryGroupsBuilder()
+            fill_values = None
+            for dataframe in columnar_reader.read_dataframes(file_path):
+                normalized_df = cls.__normalize_dataframe(dataframe, fill_values)
+                fill_values = normalized_df[constant.FILESETS_FILLABLE_COLUMNS].iloc[-1].to_dict()
+                cls.__add_rows(builder, normalized_df)
+            return builder.pop_entry_group_specs()
+
+        if parser == constant.PARSER_CSV:
+            return csv_parser.read_entry_group_specs(file_path)
+
+        dataframe = pd.read_csv(file_path, comment='#')
+        return cls.__extract_entry_group_specs(cls.__normalize_dataframe(dataframe))
+
+    @contextlib.contextmanager
+    def __read_entry_group_specs(self,
+                                 file_path,
+                                 chunk_size=None,
+                                 parser=None,
+                                 parse_workers=None,
+                                 validator=None):
+        # Yields the Entry Groups of all the CSV files matched by file_path, and logs the
+        # combined summary once they were all processed.
+        file_paths = csv_files_reader.resolve_csv_files(file_path)
+        if validator and (len(file_paths) > 1 or chunk_size or parser == constant.PARSER_CSV
+                          or columnar_reader.get_columnar_format(file_paths[0])):
+            # Entry Groups read this way are processed before the last rows are read, so
+            # the files are validated beforehand.
+            self.__validate_csv_files(file_paths, parser, validator)
+            validator = None
+
+        if len(file_paths) == 1:
+            logging.info('Reading CSV file: %s...', file_paths[0])
+            yield self.__read_csv_file_entry_group_specs(file_paths[0], chunk_size, parser,
+                                                         validator)
+            return
+
+        if chunk_size:
+            # Streamed files are read one after the other, to keep memory usage flat.
+            files_reader = csv_files_reader.CsvFilesReader(
+                file_paths,
+                functools.partial(self.__read_csv_file_entry_group_specs,
+                                  chunk_size=chunk_size,
+                                  parser=parser),
+                workers=1)
+            yield files_reader
+        else:
+            files_reader = csv_files_reader.CsvFilesReader(
+                file_paths, functools.partial(self.read_csv_file, parser=parser), parse_workers)
+            yield self.__read_lazily(files_reader)
+
+        logging.info('')
+        files_reader.log_summary()
+
+    @classmethod
+    def __select_shard(cls, entry_group_specs, shard_index, shard_count):
+        if not shard_count:
+            return entry_group_specs
+
+        logging.info('Processing the Entry Groups of shard %d of %d...', shard_index, shard_count)
+        return sharding.select_shard(entry_group_specs, shard_index, shard_count)
+
+    @classmethod
+    def __skip_journaled(cls, entry_group_specs, journal=None):
+        if not journal:
+            return entry_group_specs
+        return cls.__skip_journaled_entry_groups(entry_group_specs, journal)
+
+    @classmethod
+    def __skip_journaled_entry_groups(cls, entry_group_specs, journal):
+        # Entry Groups are only skipped once all of their Entries are done too, as an
+        # Entry Group split across files or chunks is journaled as done after its first
+        # fragment. Entry Groups with Entries left are processed, so they are completed.
+        for entry_group_spec in entry_group_specs:
+            entry_group_name = entry_group_spec.name
+            entry_specs = [
+                entry_spec for entry_spec in entry_group_spec.entries
+                if not journal.is_entry_done(entry_spec.name)
+            ]
+            if not entry_specs and journal.is_entry_group_done(entry_group_name):
+                logging.info('Entry Group %s is done according to the journal, skipped.',
+                             entry_group_name)
+                continue
+
+            skipped_entries_count = len(entry_group_spec.entries) - len(entry_specs)
+            if skipped_entries_count:
+                logging.info(
+                    '%d Entries of Entry Group %s are done according to the journal,'
+                    ' skipped.', skipped_entries_count, entry_group_name)
+                entry_group_spec.entries = entry_specs
+            yield entry_group_spec
+
+    def __read_csv_file_entry_group_specs(self,
+                                          file_path,
+                                          chunk_size=None,
+                                          parser=None,
+                                          validator=None):
+        if columnar_reader.get_columnar_format(file_path):
+            # Columnar files are always streamed, a row group or batch at a time.
+            return self.__stream_entry_group_specs(
+                self.__read_lazily(columnar_reader.read_dataframes(file_path, chunk_size)))
+
+        if parser == constant.PARSER_CSV:
+            return self.__read_entry_group_specs_with_csv_parser(file_path, chunk_size)
+
+        if not chunk_size:
+            with self.__phase('read'):
+                dataframe = pd.read_csv(file_path, comment='#')
+            with self.__phase('normalize'):
+                normalized_df = self.__normalize_dataframe(dataframe)
+            if validator:
+                with self.__phase('validate'):
+                    validator.validate_dataframe(normalized_df, file_path, dataframe.columns)
+                validator.check()
+            with self.__phase('extract'):
+                return self.__extract_entry_group_specs(normalized_df)
+
+        logging.info('Streaming the CSV file in chunks of %d rows...', chunk_size)
+        return self.__stream_entry_group_specs(
+            self.__read_lazily(pd.read_csv(file_path, comment='#', chunksize=chunk_size)))
+
+    def __validate_csv_files(self, file_paths, parser, validator):
+        # The files are read in chunks, so memory usage stays flat.
+        logging.info('Validating the CSV files...')
+        for file_path in file_paths:
+            if columnar_reader.get_columnar_format(file_path):
+                dataframes = columnar_reader.read_dataframes(file_path, VALIDATION_CHUNK_SIZE)
+            elif parser == constant.PARSER_CSV:
+                self.__validate_csv_file_rows(file_path, validator)
+                continue
+            else:
+                dataframes = pd.read_csv(file_path, comment='#', chunksize=VALIDATION_CHUNK_SIZE)
+
+            fill_values = None
+            for dataframe in self.__read_lazily(dataframes):
+                with self.__phase('validate'):
+                    normalized_df = self.__normalize_dataframe(dataframe, fill_values)
+                    fill_values = normalized_df[
+                        constant.FILESETS_FILLABLE_COLUMNS].iloc[-1].to_dict()
+                    validator.validate_dataframe(normalized_df, file_path, dataframe.columns)
+        validator.check()
+
+    def __validate_csv_file_rows(self, file_path, validator):
+        # The stdlib parser rows are already normalized. Its header is not checked, as
+        # the missing columns are read as missing values.
+        with open(file_path, newline='') as csv_file:
+            rows = csv_parser.read_rows(csv_file)
+            start = 0
+            while True:
+                with self.__phase('read'):
+                    chunk = list(itertools.islice(rows, VALIDATION_CHUNK_SIZE))
+                if not chunk:
+                    return
+                with self.__phase('validate'):
+                    validator.validate_dataframe(
+                        pd.DataFrame.from_records(chunk,
+                                                  columns=constant.FILESETS_COLUMNS_ORDER,
+                                                  index=pd.RangeIndex(start, start + len(chunk))),
+                        file_path)
+                start += len(chunk)
+
+    def __read_entry_group_specs_with_csv_parser(self, file_path, chunk_size=None):
+        # The stdlib parser normalizes the rows and groups them as it reads them, so
+        # all of its work is accounted to the read phase.
+        if not chunk_size:
+            with self.__phase('read'):
+                return csv_parser.read_entry_group_specs(file_path)
+
+        logging.info('Streaming the CSV file...')
+        return self.__read_lazily(csv_parser.read_entry_group_specs(file_path, stream=True))
+
+    def __read_lazily(self, reader):
+        # The items are read lazily, so the time spent reading each one is
+        # accounted separately.
+        reader = iter(reader)
+        while True:
+            with self.__phase('read'):
+                item = next(reader, None)
+            if item is None:
+                return
+            yield item
+
+    def __stream_entry_group_specs(self, dataframes):
+        # The rows of the last Entry Group seen are held back until a row of another
+        # Entry Group shows up, as the group may continue in the next chunk.
+        fill_values = None
+        pending_dataframes = []
+        pending_entry_group_name = None
+        yielded_entry_group_names = set()
+
+        for dataframe in dataframes:
+            with self.__phase('normalize'):
+                normalized_df = self.__normalize_dataframe(dataframe, fill_values)
+            fill_values = normalized_df[constant.FILESETS_FILLABLE_COLUMNS].iloc[-1].to_dict()
 
-        entry_groups_dict = {'entry_groups': self.__extract_entry_groups_dict(normalized_df)}
+            entry_group_names = normalized_df[constant.FILESETS_ENTRY_GROUP_NAME_COLUMN_LABEL]
+            last_entry_group_name = entry_group_names.iloc[-1]
+            other_entry_groups_rows = \
+                entry_group_names.ne(last_entry_group_name).to_numpy().nonzero()[0]
+
+            if len(other_entry_groups_rows):
+                split_position = other_entry_groups_rows[-1] + 1
+                pending_dataframes.append(normalized_df.iloc[:split_position])
+                normalized_df = normalized_df.iloc[split_position:]
+
+            if len(other_entry_groups_rows) or \
+                    last_entry_group_name != pending_entry_group_name:
+                yield from self.__extract_complete_entry_group_specs(pending_dataframes,
+                                                                     yielded_entry_group_names)
+                pending_dataframes = []
+
+            pending_dataframes.append(normalized_df)
+            pending_entry_group_name = last_entry_group_name
+
+        yield from self.__extract_complete_entry_group_specs(pending_dataframes,
+                                                             yielded_entry_group_names)
+
+    def __extract_complete_entry_group_specs(self, dataframes, yielded_entry_group_names):
+        if not dataframes:
+            return
+
+        # The rows of the pending chunks are added one chunk after the other, rather than
+        # concatenated, which would copy them.
+        with self.__phase('extract'):
+            builder = csv_parser.EntryGroupsBuilder()
+            for dataframe in dataframes:
+                self.__add_rows(builder, dataframe)
+            entry_group_specs = builder.pop_entry_group_specs()
+        for entry_group_spec in entry_group_specs:
+            entry_group_name = entry_group_spec.name
+            if entry_group_name in yielded_entry_group_names:
+                logging.warning(
+                    'Entry Group %s rows are not contiguous, they will be processed'
+                    ' separately.', entry_group_name)
+            yielded_entry_group_names.add(entry_group_name)
+            yield entry_group_spec
+
+    def __create_entry_groups_and_entries(self,
+                                          entry_group_specs,
+                                          workers=None,
+                                          async_concurrency=None,
+                                          prefetch_entries=None,
+                                          manifest=None,
+                                          journal=None):
+        if async_concurrency:
+            return self.__run_coroutine(
+                self.__create_entry_groups_asynchronously(entry_group_specs, async_concurrency,
+                                                          prefetch_entries, manifest, journal),
+                min(async_concurrency, constant.ASYNC_EXECUTOR_MAX_WORKERS))
+
+        if workers and workers > 1:
+            return self.__create_entry_groups_concurrently(entry_group_specs, workers,
+                                                           prefetch_entries, manifest, journal)
 
         created_entry_groups = []
-        for entry_group_dict in entry_groups_dict['entry_groups']:
+        for entry_group_spec in entry_group_specs:
             logging.info('')
             created_entry_groups.append(
-                self.__create_entry_groups_from_dict(entry_group_dict,
-                                                     validate_dataflow_sql_types))
+                self.__create_entry_groups_from_spec(entry_group_spec, prefetch_entries, manifest,
+                                                     journal))
+        return created_entry_groups
+
+    def __create_entry_groups_concurrently(self,
+                                           entry_group_specs,
+                                           workers=None,
+                                           prefetch_entries=None,
+                                           manifest=None,
+                                           journal=None):
+        logging.info('Upserting the Entries with %d workers...', workers)
+        # Bounding the number of submitted Entries keeps memory usage flat, even if
+        # the Entry Groups are streamed from a large file.
+        semaphore = threading.BoundedSemaphore(workers * 2)
+        created_entry_groups = []
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            # Entry Groups are created in the calling thread, so they always exist
+            # before any of their Entries is submitted to the pool.
+            submitted_entry_groups = collections.deque()
+            for entry_group_spec in entry_group_specs:
+                logging.info('')
+                entry_group_name = self.__create_entry_group_from_spec(entry_group_spec)
+                existing_entries = self.__prefetch_entries(
+                    entry_group_name) if prefetch_entries else None
+                submitted_entry_groups.append(
+                    (entry_group_name,
+                     self.__submit_entries_from_specs(executor, semaphore,
+                                                      entry_group_spec.entries, entry_group_name,
+                                                      existing_entries, manifest, journal)))
+                self.__collect_submitted_entry_groups(submitted_entry_groups, created_entry_groups,
+                                                      journal)
+
+            self.__collect_submitted_entry_groups(submitted_entry_groups,
+                                                  created_entry_groups,
+                                                  journal,
+                                                  wait=True)
+        return created_entry_groups
+
+    async def __create_entry_groups_asynchronously(self,
+                                                   entry_group_specs,
+                                                   async_concurrency=None,
+                                                   prefetch_entries=None,
+                                                   manifest=None,
+                                                   journal=None):
+        logging.info('Upserting the Entries with up to %d requests in flight...',
+                     async_concurrency)
+        async_facade = async_datacatalog_facade.AsyncDataCatalogFacade(
+            rate_limiter=self.__rate_limiter,
+            metrics=self.__metrics,
+            channels=self.__channels,
+            channel_dispatch=self.__channel_dispatch,
+            update_payloads=self.__update_payloads)
+        semaphore = asyncio.Semaphore(async_concurrency)
+
+        async def submit(coroutine):
+            # Acquiring before scheduling keeps the number of pending tasks bounded,
+            # instead of creating one task per Entry upfront.
+            await semaphore.acquire()
+            task = asyncio.ensure_future(coroutine)
+            task.add_done_callback(lambda _: semaphore.release())
+            return task
+
+        created_entry_groups = []
+        submitted_entry_groups = collections.deque()
+        for entry_group_spec in entry_group_specs:
+            logging.info('')
+            # Entry Groups are awaited before their Entries are scheduled.
+            entry_group_name = await self.__create_entry_group_from_spec_asynchronously(
+                async_facade, entry_group_spec)
+            existing_entries = None
+            if prefetch_entries:
+                existing_entries = self.__index_entries(
+                    entry_group_name, await async_facade.list_entries(entry_group_name))
+
+            submitted_entries = []
+            for entry_spec in entry_group_spec.entries:
+                entry_name = entry_spec.name
+                if self.__is_unchanged_entry(entry_spec, manifest):
+                    task = asyncio.get_event_loop().create_future()
+                    task.set_result(constant.CREATE_OUTCOME_UNCHANGED)
+                else:
+                    entry = self.__make_entry(entry_spec)
+                    task = await submit(
+                        self.__upsert_entry_asynchronously(async_facade, entry_group_name,
+                                                           entry_name, entry_spec.id, entry,
+                                                           existing_entries, manifest))
+                self.__record_entry_when_done(journal, entry_name, task)
+                submitted_entries.append((entry_name, task))
+            submitted_entry_groups.append((entry_group_name, submitted_entries))
+            self.__collect_submitted_entry_groups(submitted_entry_groups, created_entry_groups,
+                                                  journal)
+
+        pending_tasks = [
+            task for _, submitted_entries in submitted_entry_groups
+            for _, task in submitted_entries
+        ]
+        if pending_tasks:
+            await asyncio.wait(pending_tasks)
+        self.__collect_submitted_entry_groups(submitted_entry_groups,
+                                              created_entry_groups,
+                                              journal,
+                                              wait=True)
         return created_entry_groups
 
-    def __delete_entry_groups_and_entries_from_dataframe(self, dataframe):
-        normalized_df = self.__normalize_dataframe(dataframe)
+    def __plan_entry_groups(self, entry_group_specs, plan_writer, workers):
+        # Entry Groups are read concurrently, and their records are written in order
+        # as soon as they are ready, so the pending ones are bounded.
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            planned_entry_groups = collections.deque()
+            for entry_group_spec in entry_group_specs:
+                planned_entry_groups.append(
+                    executor.submit(self.__plan_entry_group, entry_group_spec))
+                if len(planned_entry_groups) >= workers * 2:
+                    self.__write_plan_records(plan_writer, planned_entry_groups.popleft())
 
-        entry_groups_dict = {'entry_groups': self.__extract_entry_groups_dict(normalized_df)}
+            while planned_entry_groups:
+                self.__write_plan_records(plan_writer, planned_entry_groups.popleft())
 
-        for entry_group_dict in entry_groups_dict['entry_groups']:
-            entry_group_name = entry_group_dict['name']
+    @classmethod
+    def __write_plan_records(cls, plan_writer, future):
+        for plan_record in future.result():
+            plan_writer.write(*plan_record)
+
+    def __plan_entry_group(self, entry_group_spec):
+        entry_group_name = entry_group_spec.name
+        try:
+            # Entries are matched by id, as the listed names may be spelled differently,
+            # e.g. using the project number instead of its id.
+            existing_entries = {
+                entry.name.split('/')[-1]: entry
+                for entry in self.__datacatalog_facade.list_entries(entry_group_name)
+            }
+            entry_group_action = fileset_plan.ACTION_UNCHANGED
+        except (exceptions.NotFound, exceptions.PermissionDenied):
+            existing_entries = {}
+            entry_group_action = fileset_plan.ACTION_CREATE
+
+        entry_group_data = None
+        if entry_group_action == fileset_plan.ACTION_CREATE:
+            entry_group_data = entry_group_spec.to_dict()
+        plan_records = [(fileset_plan.RESOURCE_ENTRY_GROUP, entry_group_action, entry_group_name,
+                         None, entry_group_data)]
+
+        for entry_spec in entry_group_spec.entries:
+            persisted_entry = existing_entries.pop(entry_spec.id, None)
+            update_fields = None
+            if persisted_entry is None:
+                action = fileset_plan.ACTION_CREATE
+            elif entry_fingerprint.fingerprint_entry(persisted_entry) != \
+                    entry_fingerprint.fingerprint_entry_spec(entry_spec):
+                # Entries are compared by fingerprint, and only the changed ones are built
+                # to find the fields to update.
+                action = fileset_plan.ACTION_UPDATE
+                update_fields = entry_update.find_changed_fields(persisted_entry,
+                                                                 self.__make_entry(entry_spec))
+            else:
+                action = fileset_plan.ACTION_UNCHANGED
+
+            plan_records.append(
+                (fileset_plan.RESOURCE_ENTRY, action, entry_spec.name, entry_group_name,
+                 entry_spec.to_dict() if action != fileset_plan.ACTION_UNCHANGED else None,
+                 update_fields))
+
+        for persisted_entry in existing_entries.values():
+            plan_records.append((fileset_plan.RESOURCE_ENTRY, fileset_plan.ACTION_DELETE,
+                                 persisted_entry.name, entry_group_name))
+
+        return plan_records
+
+    def __apply_plan_records(self, plan_records, workers):
+        applied_changes = collections.Counter()
+        semaphore = threading.BoundedSemaphore(workers * 2)
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            submitted_changes = collections.deque()
+            for plan_record in plan_records:
+                action = plan_record['action']
+                if action == fileset_plan.ACTION_UNCHANGED:
+                    continue
+
+                # Entry Groups are created in the calling thread, so they always exist
+                # before any of their Entries is submitted to the pool.
+                if plan_record['resource'] == fileset_plan.RESOURCE_ENTRY_GROUP:
+                    self.__create_entry_group_from_spec(
+                        fileset_spec.EntryGroupSpec.from_dict(plan_record['data']))
+                    applied_changes[(fileset_plan.RESOURCE_ENTRY_GROUP, action)] += 1
+                    continue
+
+                semaphore.acquire()
+                future = executor.submit(self.__apply_entry_change, plan_record)
+                future.add_done_callback(lambda _: semaphore.release())
+                submitted_changes.append((plan_record, future))
+                self.__collect_applied_changes(submitted_changes, applied_changes)
+
+            self.__collect_applied_changes(submitted_changes, applied_changes, wait=True)
+        return applied_changes
+
+    def __apply_entry_change(self, plan_record):
+        action = plan_record['action']
+        entry_name = plan_record['name']
+        if action == fileset_plan.ACTION_DELETE:
+            outcome = self.__datacatalog_facade.delete_entry(entry_name)
+            return 'failed' if outcome == constant.DELETE_OUTCOME_FAILED else action
+
+        entry_spec = fileset_spec.EntrySpec.from_dict(plan_record['data'])
+        entry = self.__make_entry(entry_spec)
+        if action == fileset_plan.ACTION_CREATE:
             try:
-                entries_dict = entry_group_dict['entries']
-                for entry_dict in entries_dict:
-                    entry_name = entry_dict['name']
-                    try:
-                        self.__datacatalog_facade.delete_entry(entry_name)
-                    except exceptions.GoogleAPICallError as e:
-                        logging.warning('Exception deleting Entry %s.: %s', entry_name, str(e))
-
-                self.__datacatalog_facade.delete_entry_group(entry_group_name)
-                logging.info('Entry Group %s deleted.', entry_group_name)
-            except exceptions.GoogleAPICallError as e:
-                logging.warning('Exception deleting Entry Group %s.: %s', entry_group_name, str(e))
+                created_entry = self.__datacatalog_facade.create_entry(
+                    plan_record['parent'], entry_spec.id, entry)
+            except exceptions.AlreadyExists:
+                # A retried create call may have been committed by a previous attempt.
+                created_entry = self.__datacatalog_facade.upsert_entry(
+                    plan_record['parent'], entry_name, entry_spec.id, entry)
+            if created_entry is None:
+                return 'failed'
+        else:
+            # Plans written before the changed fields were recorded update whole Entries.
+            entry.name = entry_name
+            self.__datacatalog_facade.update_entry(entry, plan_record.get('fields'))
+        return action
 
     @classmethod
-    def __normalize_dataframe(cls, dataframe):
+    def __collect_applied_changes(cls, submitted_changes, applied_changes, wait=False):
+        while submitted_changes and (wait or submitted_changes[0][1].done()):
+            plan_record, future = submitted_changes.popleft()
+            try:
+                applied_changes[(fileset_plan.RESOURCE_ENTRY, future.result())] += 1
+            except Exception as e:
+                logging.warning('Entry %s was not %sd: %s', plan_record['name'],
+                                plan_record['action'], e)
+                applied_changes[(fileset_plan.RESOURCE_ENTRY, 'failed')] += 1
+
+    def __export_entry_groups(self, locations, csv_writer, workers):
+        # The Entries of each Entry Group are listed by a worker thread into a bounded
+        # queue, which the calling thread drains in order, so the rows of each Entry Group
+        # are contiguous and at most workers * 2 Entry Groups are pending.
+        stopped = threading.Event()
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                pending_entry_groups = collections.deque()
+                for entry_groups in executor.map(self.__list_location_entry_groups, locations):
+                    for entry_group in entry_groups:
+                        entries_queue = queue.Queue(EXPORT_PAGE_SIZE)
+                        executor.submit(self.__list_fileset_entries, entry_group.name,
+                                        entries_queue, stopped)
+                        pending_entry_groups.append((entry_group, entries_queue))
+                        if len(pending_entry_groups) >= workers * 2:
+                            self.__write_entry_group(csv_writer, *pending_entry_groups.popleft())
+
+                while pending_entry_groups:
+                    self.__write_entry_group(csv_writer, *pending_entry_groups.popleft())
+            finally:
+                # Unblocks the workers waiting for room in a queue that will not be drained.
+                stopped.set()
+
+    def __list_location_entry_groups(self, location):
+        project_id, location_id = location
+        try:
+            entry_groups = list(
+                self.__datacatalog_facade.list_entry_groups(project_id, location_id))
+        except exceptions.GoogleAPICallError as e:
+            logging.warning('Entry Groups of project %s, location %s could not be listed: %s',
+                            project_id, location_id, e)
+            return []
+
+        # System Entry Groups, e.g. @bigquery, hold no Fileset and may be huge.
+        return [
+            entry_group for entry_group in entry_groups
+            if not entry_group.name.split('/')[-1].startswith('@')
+        ]
+
+    def __list_fileset_entries(self, entry_group_name, entries_queue, stopped):
+        # The listing ends with None, or the error that interrupted it.
+        try:
+            for entry in self.__datacatalog_facade.list_entries(entry_group_name,
+                                                                page_size=EXPORT_PAGE_SIZE):
+                if self.__datacatalog_facade.is_fileset_entry(entry) and \
+                        not self.__put(entries_queue, entry, stopped):
+                    return
+            end = None
+        except Exception as e:
+            end = e
+        self.__put(entries_queue, end, stopped)
+
+    @classmethod
+    def __put(cls, entries_queue, item, stopped):
+        while not stopped.is_set():
+            try:
+                entries_queue.put(item, timeout=1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def __write_entry_group(self, csv_writer, entry_group, entries_queue):
+        try:
+            csv_writer.write_entry_group(entry_group, self.__drain_entries(entries_queue))
+        except exceptions.GoogleAPICallError as e:
+            logging.warning(
+                'Entries of Entry Group %s could not be listed, only the ones listed before'
+                ' the error were exported: %s', entry_group.name, e)
+
+    def __drain_entries(self, entries_queue):
+        while True:
+            item = entries_queue.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+            if self.__progress:
+                self.__progress.record(constant.EXPORT_OUTCOME_EXPORTED)
+
+    @classmethod
+    def __run_coroutine(cls, coroutine, executor_workers):
+        # Blocking clients adapted to coroutines run in the loop's default executor, which
+        # bounds the number of blocking requests in flight. Further calls queue up.
+        loop = asyncio.new_event_loop()
+        executor = futures.ThreadPoolExecutor(max_workers=executor_workers)
+        loop.set_default_executor(executor)
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+            executor.shutdown(wait=True)
+
+    def __delete_entry_groups_and_entries(self,
+                                          entry_group_specs,
+                                          manifest=None,
+                                          workers=1,
+                                          journal=None):
+        semaphore = threading.BoundedSemaphore(workers * 2)
+        deleted_entry_groups = []
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            submitted_entry_groups = collections.deque()
+            for entry_group_spec in entry_group_specs:
+                submitted_entries = []
+                for entry_spec in entry_group_spec.entries:
+                    semaphore.acquire()
+                    future = executor.submit(self.__datacatalog_facade.delete_entry,
+                                             entry_spec.name)
+                    future.add_done_callback(lambda _: semaphore.release())
+                    self.__record_entry_when_done(journal, entry_spec.name, future)
+                    submitted_entries.append((entry_spec.name, future))
+                submitted_entry_groups.append((entry_group_spec.name, submitted_entries))
+                self.__collect_deleted_entry_groups(submitted_entry_groups, deleted_entry_groups,
+                                                    manifest, journal)
+
+            self.__collect_deleted_entry_groups(submitted_entry_groups,
+                                                deleted_entry_groups,
+                                                manifest,
+                                                journal,
+                                                wait=True)
+        return deleted_entry_groups
+
+    def __collect_deleted_entry_groups(self,
+                                       submitted_entry_groups,
+                                       deleted_entry_groups,
+                                       manifest=None,
+                                       journal=None,
+                                       wait=False):
+        # Entry Groups are deleted in the calling thread, in order, once all of their
+        # Entries are done.
+        while submitted_entry_groups and (wait
+                                          or all(future.done()
+                                                 for _, future in submitted_entry_groups[0][1])):
+            entry_group_name, submitted_entries = submitted_entry_groups.popleft()
+            deleted_entries = []
+            for entry_name, future in submitted_entries:
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    logging.warning('Entry %s was not deleted: %s', entry_name, e)
+                    outcome = constant.DELETE_OUTCOME_FAILED
+                deleted_entries.append((entry_name, outcome))
+                # Whatever the outcome, the Entry is synced again if it is recreated.
+                if manifest:
+                    manifest.remove(entry_name)
+
+            failed_entries_count = sum(1 for _, outcome in deleted_entries
+                                       if outcome == constant.DELETE_OUTCOME_FAILED)
+            if failed_entries_count:
+                logging.warning('Entry Group %s was not deleted, %d of its Entries remain.',
+                                entry_group_name, failed_entries_count)
+                outcome = constant.DELETE_OUTCOME_FAILED
+            else:
+                outcome = self.__delete_entry_group(entry_group_name)
+            if journal:
+                journal.record_entry_group(entry_group_name, outcome)
+            deleted_entry_groups.append((entry_group_name, outcome, deleted_entries))
+
+    def __delete_entry_group(self, entry_group_name):
+        try:
+            self.__datacatalog_facade.delete_entry_group(entry_group_name)
+            logging.info('Entry Group %s deleted.', entry_group_name)
+            return constant.DELETE_OUTCOME_DELETED
+        except (exceptions.NotFound, exceptions.PermissionDenied):
+            logging.info('Entry Group %s not found.', entry_group_name)
+            return constant.DELETE_OUTCOME_NOT_FOUND
+        except exceptions.GoogleAPICallError as e:
+            logging.warning('Exception deleting Entry Group %s.: %s', entry_group_name, str(e))
+            return constant.DELETE_OUTCOME_FAILED
+
+    @classmethod
+    def __normalize_dataframe(cls, dataframe, fill_values=None):
         # Reorder dataframe columns.
         ordered_df = dataframe.reindex(columns=constant.FILESETS_COLUMNS_ORDER, copy=False)
 
         # Fill NA/NaN values by propagating the last valid observation forward to next valid.
         filled_subset = ordered_df[constant.FILESETS_FILLABLE_COLUMNS].fillna(method='pad')
 
+        # Values carried from a previous chunk fill its leading empty rows, if any.
+        if fill_values:
+            filled_subset = filled_subset.fillna(value=fill_values)
+
         # Rebuild the dataframe by concatenating the fillable and non-fillable columns.
         rebuilt_df = pd.concat([filled_subset, ordered_df[constant.FILESETS_NON_FILLABLE_COLUMNS]],
                                axis=1)
@@ -114,143 +1060,239 @@ class FilesetDatasourceProcessor:
 
         return rebuilt_df
 
-    def __extract_entry_groups_dict(self, dataframe):
-        dataframe.set_index(constant.FILESETS_ENTRY_GROUP_NAME_COLUMN_LABEL, inplace=True)
-        key_values = dataframe.index.unique().tolist()
-        array = []
-        for key_value in key_values:
-            # We use an array with: [key_value] to make sure the dataframe loc
-            # always returns a dataframe, and not a Series
-            if pd.notna(key_value):
-                entry_group_subset = dataframe.loc[[key_value]]
-
-                dataframe.drop(key_value, inplace=True)
-
-                entry_group_data = \
-                    entry_group_subset.loc[:,
-                                           :constant.FILESETS_ENTRY_GROUP_DESCRIPTION_COLUMN_LABEL]
-
-                entries = self.__extract_entries(
-                    key_value, entry_group_subset.loc[:, constant.FILESETS_ENTRY_ID_COLUMN_LABEL:])
-
-                array.append({
-                    'name':
-                    key_value,
-                    'display_name':
-                    entry_group_data[constant.FILESETS_ENTRY_GROUP_DISPLAY_NAME_COLUMN_LABEL][0],
-                    'description':
-                    entry_group_data[constant.FILESETS_ENTRY_GROUP_DESCRIPTION_COLUMN_LABEL][0],
-                    'entries':
-                    entries
-                })
-        return array
-
-    def __extract_entries(self, entry_group_name, dataframe):
-        dataframe.set_index(constant.FILESETS_ENTRY_ID_COLUMN_LABEL, inplace=True)
-        key_values = dataframe.index.unique().tolist()
-        array = []
-        for key_value in key_values:
-            if pd.notna(key_value):
-                # We use an array with: [key_value] to make sure the dataframe loc
-                # always returns a dataframe, and not a Series
-                entry_subset = dataframe.loc[[key_value]]
-
-                entry_name = '{}/entries/{}'.format(entry_group_name, key_value)
-
-                schema_columns_subset = \
-                    entry_subset.loc[:, constant.FILESETS_ENTRY_SCHEMA_COLUMN_NAME_COLUMN_LABEL:]
-
-                schema_columns_dict = self.__convert_schema_columns_dataframe_to_dict(
-                    schema_columns_subset)
-
-                array.append({
-                    'id':
-                    key_value,
-                    'name':
-                    entry_name,
-                    'display_name':
-                    entry_subset['entry_display_name'][0],
-                    'description':
-                    entry_subset['entry_description'][0],
-                    'file_patterns':
-                    entry_subset['entry_file_patterns'][0].split(
-                        constant.FILE_PATTERNS_VALUES_SEPARATOR),
-                    'schema_columns':
-                    schema_columns_dict
-                })
-        return array
-
-    def __create_entry_groups_from_dict(self, entry_group_dict, validate_dataflow_sql_types=None):
-        entry_group_name = entry_group_dict['name']
-        entries_dict = entry_group_dict['entries']
-        entry_group = datacatalog_entity_factory.DataCatalogEntityFactory.make_entry_group(
-            entry_group_dict)
-        project_id, location_id, entry_group_id = \
-            self.__datacatalog_facade.extract_resources_from_entry_group(entry_group_name)
-        try:
-            self.__datacatalog_facade.create_entry_group(project_id, location_id, entry_group_id,
-                                                         entry_group)
-        except exceptions.AlreadyExists:
-            logging.warning('Entry Group %s already exists.', entry_group_name)
+    @classmethod
+    def __extract_entry_group_specs(cls, dataframe):
+        builder = csv_parser.EntryGroupsBuilder()
+        cls.__add_rows(builder, dataframe)
+        return builder.pop_entry_group_specs()
+
+    @classmethod
+    def __add_rows(cls, builder, dataframe):
+        # Single pass over the rows, grouping them by Entry Group and Entry.
+        for row in dataframe[list(constant.FILESETS_COLUMNS_ORDER)].itertuples(index=False,
+                                                                               name=None):
+            builder.add_row(row)
+
+    def __create_entry_groups_from_spec(self,
+                                        entry_group_spec,
+                                        prefetch_entries=None,
+                                        manifest=None,
+                                        journal=None):
+        entry_group_name = self.__create_entry_group_from_spec(entry_group_spec)
+        existing_entries = self.__prefetch_entries(entry_group_name) if prefetch_entries else None
 
-        created_entries = self.__create_entries_from_dict(entries_dict, entry_group_name,
-                                                          validate_dataflow_sql_types)
+        created_entries = self.__create_entries_from_specs(entry_group_spec.entries,
+                                                           entry_group_name, existing_entries,
+                                                           manifest, journal)
+        if journal:
+            journal.record_entry_group(
+                entry_group_name, constant.CREATE_OUTCOME_UPSERTED if len(created_entries) == len(
+                    entry_group_spec.entries) else constant.CREATE_OUTCOME_FAILED)
         return entry_group_name, created_entries
 
-    def __create_entries_from_dict(self,
-                                   entries_dict,
-                                   entry_group_name,
-                                   validate_dataflow_sql_types=None):
-        created_entries = []
-        for entry_dict in entries_dict:
-            entry_name = entry_dict['name']
-            schema_columns = entry_dict.get('schema_columns')
+    def __prefetch_entries(self, entry_group_name):
+        return self.__index_entries(entry_group_name,
+                                    self.__datacatalog_facade.list_entries(entry_group_name))
+
+    @classmethod
+    def __index_entries(cls, entry_group_name, entries):
+        # Entries are indexed by id, as the listed names may be spelled differently,
+        # e.g. using the project number instead of its id.
+        existing_entries = {entry.name.split('/')[-1]: entry for entry in entries}
+        logging.info('Prefetched %d existing Entries from %s', len(existing_entries),
+                     entry_group_name)
+        return existing_entries
+
+    def __create_entry_group_from_spec(self, entry_group_spec):
+        self.__entry_group_registry.upsert_entry_group(self.__datacatalog_facade, entry_group_spec)
+        return entry_group_spec.name
+
+    async def __create_entry_group_from_spec_asynchronously(self, async_facade, entry_group_spec):
+        await self.__entry_group_registry.upsert_entry_group_asynchronously(
+            async_facade, entry_group_spec)
+        return entry_group_spec.name
+
+    def __log_entry_group_outcomes(self):
+        outcomes = self.__entry_group_registry.outcomes
+        logging.info('Entry Groups created: %d, updated: %d, unchanged: %d',
+                     outcomes[constant.ENTRY_GROUP_OUTCOME_CREATED],
+                     outcomes[constant.ENTRY_GROUP_OUTCOME_UPDATED],
+                     outcomes[constant.ENTRY_GROUP_OUTCOME_UNCHANGED])
+
+    def __log_update_payloads(self):
+        update_payloads = self.__update_payloads
+        if not update_payloads.updates_count:
+            return
 
-            if (self.__is_valid_dataflow_sql_types(schema_columns, validate_dataflow_sql_types)
-                    or validate_dataflow_sql_types is None):
+        logging.info(
+            'Entries updated with a field mask: %d, %d bytes sent instead of %d,'
+            ' %d bytes saved (%.0f%%)', update_payloads.updates_count, update_payloads.sent_bytes,
+            update_payloads.full_bytes, update_payloads.saved_bytes,
+            100 * update_payloads.saved_bytes / (update_payloads.full_bytes or 1))
 
-                entry = datacatalog_entity_factory.DataCatalogEntityFactory.make_entry(entry_dict)
-                self.__datacatalog_facade.upsert_entry(entry_group_name, entry_name,
-                                                       entry_dict['id'], entry)
+    def __create_entries_from_specs(self,
+                                    entry_specs,
+                                    entry_group_name,
+                                    existing_entries=None,
+                                    manifest=None,
+                                    journal=None):
+        created_entries = []
+        for entry_spec in entry_specs:
+            entry_name = entry_spec.name
+            outcome = constant.CREATE_OUTCOME_UNCHANGED
+            if not self.__is_unchanged_entry(entry_spec, manifest):
+                entry = self.__make_entry(entry_spec)
+                outcome = self.__upsert_entry(entry_group_name, entry_name, entry_spec.id, entry,
+                                              existing_entries, manifest)
+            if journal:
+                journal.record_entry(entry_name, outcome)
+            if self.__progress:
+                self.__progress.record(outcome)
+            if outcome != constant.CREATE_OUTCOME_FAILED:
                 created_entries.append(entry_name)
-            else:
-                logging.warning('Entry %s skipped, invalid Dataflow SQL type.', entry_name)
         return created_entries
 
+    def __upsert_entry(self, entry_group_name, entry_name, entry_id, entry, existing_entries,
+                       manifest):
+        return self.__get_upsert_outcome(
+            self.__datacatalog_facade.upsert_entry(entry_group_name, entry_name, entry_id, entry,
+                                                   existing_entries, manifest))
+
     @classmethod
-    def __convert_schema_columns_dataframe_to_dict(cls, dataframe):
-        base_dict = dataframe.to_dict(orient='records')
-
-        id_to_column_schema_map = {}
-        for base_object in base_dict:
-            id_to_column_schema_map[
-                base_object[constant.FILESETS_ENTRY_SCHEMA_COLUMN_NAME_COLUMN_LABEL]] = \
-                {
-                    constant.FILESETS_ENTRY_SCHEMA_COLUMN_DESCRIPTION_COLUMN_LABEL:
-                        base_object[
-                            constant.FILESETS_ENTRY_SCHEMA_COLUMN_DESCRIPTION_COLUMN_LABEL],
-                    constant.FILESETS_ENTRY_SCHEMA_COLUMN_MODE_COLUMN_LABEL:
-                        base_object[constant.FILESETS_ENTRY_SCHEMA_COLUMN_MODE_COLUMN_LABEL],
-                    constant.FILESETS_ENTRY_SCHEMA_COLUMN_TYPE_COLUMN_LABEL:
-                        base_object[constant.FILESETS_ENTRY_SCHEMA_COLUMN_TYPE_COLUMN_LABEL]
-                }
-
-        return id_to_column_schema_map
+    async def __upsert_entry_asynchronously(cls, async_facade, entry_group_name, entry_name,
+                                            entry_id, entry, existing_entries, manifest):
+        return cls.__get_upsert_outcome(await
+                                        async_facade.upsert_entry(entry_group_name, entry_name,
+                                                                  entry_id, entry,
+                                                                  existing_entries, manifest))
 
     @classmethod
-    def __is_valid_dataflow_sql_types(cls, schema_columns, validate_dataflow_sql_types):
-        error_msgs = []
-        if schema_columns and validate_dataflow_sql_types:
-            for column_id, items in schema_columns.items():
-                if pd.notna(column_id):
-                    column_type = items['schema_column_type']
-                    if items['schema_column_type'] not in constant.DATAFLOW_SQL_VALID_TYPES:
-                        error_msgs.append('column: {} type: {} not in allowed '
-                                          'Dataflow SQL types: {}'.format(
-                                              column_id, column_type,
-                                              constant.DATAFLOW_SQL_VALID_TYPES))
-        if error_msgs:
-            logging.warning(error_msgs)
-            return False
-        else:
+    def __get_upsert_outcome(cls, upserted_entry):
+        # The facades return no Entry when they logged an error instead of raising it.
+        return constant.CREATE_OUTCOME_FAILED if upserted_entry is None \
+            else constant.CREATE_OUTCOME_UPSERTED
+
+    def __submit_entries_from_specs(self,
+                                    executor,
+                                    semaphore,
+                                    entry_specs,
+                                    entry_group_name,
+                                    existing_entries=None,
+                                    manifest=None,
+                                    journal=None):
+        submitted_entries = []
+        for entry_spec in entry_specs:
+            entry_name = entry_spec.name
+            if self.__is_unchanged_entry(entry_spec, manifest):
+                future = futures.Future()
+                future.set_result(constant.CREATE_OUTCOME_UNCHANGED)
+            else:
+                entry = self.__make_entry(entry_spec)
+                semaphore.acquire()
+                future = executor.submit(self.__upsert_entry, entry_group_name, entry_name,
+                                         entry_spec.id, entry, existing_entries, manifest)
+                future.add_done_callback(lambda _: semaphore.release())
+            self.__record_entry_when_done(journal, entry_name, future)
+            submitted_entries.append((entry_name, future))
+        return submitted_entries
+
+    @classmethod
+    def __collect_submitted_entry_groups(cls,
+                                         submitted_entry_groups,
+                                         created_entry_groups,
+                                         journal=None,
+                                         wait=False):
+        # Entry Groups are collected in order, as soon as all of their Entries are done,
+        # so the upsert results are not retained until the end of the run.
+        while submitted_entry_groups and (wait
+                                          or all(future.done()
+                                                 for _, future in submitted_entry_groups[0][1])):
+            entry_group_name, submitted_entries = submitted_entry_groups.popleft()
+            created_entries = cls.__collect_submitted_entries(submitted_entries)
+            if journal:
+                journal.record_entry_group(
+                    entry_group_name, constant.CREATE_OUTCOME_UPSERTED if len(created_entries)
+                    == len(submitted_entries) else constant.CREATE_OUTCOME_FAILED)
+            created_entry_groups.append((entry_group_name, created_entries))
+
+    def __record_entry_when_done(self, journal, entry_name, future):
+        # Entries are journaled and reported from the worker threads as soon as they are
+        # done, rather than when their Entry Group is collected. The outcome is the result.
+        progress = self.__progress
+        if not journal and not progress:
+            return
+
+        def record(done_future):
+            if done_future.cancelled() or done_future.exception():
+                done_outcome = constant.CREATE_OUTCOME_FAILED
+            else:
+                done_outcome = done_future.result()
+            if journal:
+                journal.record_entry(entry_name, done_outcome)
+            if progress:
+                progress.record(done_outcome)
+
+        future.add_done_callback(record)
+
+    @classmethod
+    def __collect_submitted_entries(cls, submitted_entries):
+        created_entries = []
+        for entry_name, future in submitted_entries:
+            # A failed Entry must not affect the other ones, so its error is logged
+            # and the Entry is left out of the results.
+            try:
+                if future.result() != constant.CREATE_OUTCOME_FAILED:
+                    created_entries.append(entry_name)
+            except Exception as e:
+                logging.warning('Entry %s was not upserted: %s', entry_name, e)
+        return created_entries
+
+    def __start_progress(self,
+                         description,
+                         entry_group_specs,
+                         validator=None,
+                         shard_count=None,
+                         journal=None):
+        if not self.__progress_interval:
+            return
+
+        # The Entries are only counted when it is free, i.e. when they were all validated
+        # or read upfront, and none of them is filtered out.
+        total = None
+        if not shard_count and not journal:
+            if validator:
+                total = validator.entries_count
+            elif isinstance(entry_group_specs, list):
+                total = sum(
+                    len(entry_group_spec.entries) for entry_group_spec in entry_group_specs)
+        self.__progress = progress_reporter.ProgressReporter(description, total,
+                                                             self.__progress_interval)
+
+    def __finish_progress(self):
+        if self.__progress:
+            self.__progress.finish()
+            self.__progress = None
+
+    def __make_entry(self, entry_spec):
+        with self.__phase('build'):
+            return datacatalog_entity_factory.DataCatalogEntityFactory.make_entry(entry_spec)
+
+    def __phase(self, name):
+        if self.__metrics:
+            return self.__metrics.phase(name)
+        return contextlib.ExitStack()
+
+    @classmethod
+    def __is_unchanged_entry(cls, entry_spec, manifest=None):
+        # The fingerprint is computed from the spec, so unchanged Entries are not built.
+        if manifest and manifest.is_unchanged(
+                entry_spec.name, entry_fingerprint.fingerprint_entry_spec(entry_spec)):
+            structured_logging.entry_logger.info(
+                'Entry %s is unchanged since the last sync, skipped.',
+                entry_spec.name,
+                extra={'fields': {
+                    'entry': entry_spec.name,
+                    'operation': 'skipped'
+                }})
             return True
+        return False
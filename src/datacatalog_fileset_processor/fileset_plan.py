@@ -0,0 +1,84 @@
+import collections
+import json
+import math
+
+ACTION_CREATE = 'create'
+ACTION_UPDATE = 'update'
+ACTION_UNCHANGED = 'unchanged'
+ACTION_DELETE = 'delete'
+
+RESOURCE_ENTRY_GROUP = 'entry_group'
+RESOURCE_ENTRY = 'entry'
+
+
+class FilesetPlanWriter:
+    """Writes a plan file, listing the changes to be applied to Data Catalog.
+
+    The plan is stored as a JSON Lines file with one record per resource. Each Entry
+    Group record comes before the records of its Entries.
+    """
+
+    def __init__(self, file_path):
+        self.__file = open(file_path, 'w')
+        self.summary = collections.Counter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, resource, action, name, parent=None, data=None, fields=None):
+        """Writes a plan record.
+
+        :param resource: The resource type, RESOURCE_ENTRY_GROUP or RESOURCE_ENTRY.
+        :param action: The action to be applied to the resource.
+        :param name: The resource name.
+        :param parent: The parent Entry Group name, for Entries.
+        :param data: The resource dict, for the resources to be created or updated.
+        :param fields: The update mask paths of the changed fields, for the Entries to be
+         updated.
+        """
+        record = {'resource': resource, 'action': action, 'name': name}
+        if parent:
+            record['parent'] = parent
+        if data:
+            record['data'] = self.__make_serializable(data)
+        if fields:
+            record['fields'] = list(fields)
+
+        self.__file.write(json.dumps(record) + '\n')
+        self.summary[(resource, action)] += 1
+
+    @classmethod
+    def __make_serializable(cls, value):
+        # Empty CSV cells are read as NaN, which is not valid JSON. Schema columns
+        # without a name are dropped, as they are ignored when making the Entries.
+        if isinstance(value, dict):
+            return {
+                key: cls.__make_serializable(item)
+                for key, item in value.items() if not cls.__is_empty(key)
+            }
+        if isinstance(value, list):
+            return [cls.__make_serializable(item) for item in value]
+        return None if cls.__is_empty(value) else value
+
+    @classmethod
+    def __is_empty(cls, value):
+        return value is None or isinstance(value, float) and math.isnan(value)
+
+    def close(self):
+        self.__file.close()
+
+
+class FilesetPlanReader:
+    """Iterates over the records of a plan file, in order."""
+
+    def __init__(self, file_path):
+        self.__file_path = file_path
+
+    def __iter__(self):
+        with open(self.__file_path) as plan_file:
+            for line in plan_file:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,193 @@
+import sys
+
+from datacatalog_fileset_processor import constant
+
+
+def intern(value):
+    """Interns a string, so the values repeated across rows share a single object.
+
+    :param value: A value, which is returned as is unless it is a string.
+    :return: The interned string, or the value.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def merge_entry_group_specs(entry_group_specs):
+    """Merges the fragments of the Entry Groups read more than once, e.g. from several
+    files or from non-contiguous chunks, as if all of their rows were read at once.
+
+    The first fragment of each Entry Group wins for its display name and description,
+    and the Entries with the same id are merged, like the rows of a single file.
+
+    :param entry_group_specs: An iterable of EntryGroupSpec, which are all consumed.
+    :return: A list of EntryGroupSpec, in the order each Entry Group first appears.
+    """
+    merged_entry_groups = {}
+    merged_entries = {}
+    for entry_group_spec in entry_group_specs:
+        entry_group_name = entry_group_spec.name
+        merged_entry_group = merged_entry_groups.setdefault(entry_group_name, entry_group_spec)
+        if merged_entry_group is not entry_group_spec:
+            if merged_entry_group.display_name is None:
+                merged_entry_group.display_name = entry_group_spec.display_name
+            if merged_entry_group.description is None:
+                merged_entry_group.description = entry_group_spec.description
+
+        for entry_spec in entry_group_spec.entries:
+            merged_entry = merged_entries.setdefault((entry_group_name, entry_spec.id), entry_spec)
+            if merged_entry is entry_spec:
+                if merged_entry_group is not entry_group_spec:
+                    merged_entry_group.entries.append(entry_spec)
+                continue
+            for column in entry_spec.columns:
+                merged_entry.set_column(column)
+    return list(merged_entry_groups.values())
+
+
+class _Spec:
+    """Base class of the specs, comparing and printing them by their slots values."""
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return isinstance(other, self.__class__) and all(
+            getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self):
+        return '{}({})'.format(
+            self.__class__.__name__,
+            ', '.join('{}={!r}'.format(slot, getattr(self, slot)) for slot in self.__slots__))
+
+    # Specs are pickled as a tuple of their slots values, when read in worker processes.
+    # Unpickled strings are interned again, as they are new objects.
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, intern(value))
+
+
+class EntryGroupSpec(_Spec):
+    """An Entry Group and its Entries, as read from a Filesets CSV file."""
+    __slots__ = ('name', 'display_name', 'description', 'entries')
+
+    def __init__(self, name, display_name=None, description=None, entries=None):
+        self.name = intern(name)
+        self.display_name = display_name
+        self.description = description
+        self.entries = entries if entries is not None else []
+
+    def to_dict(self):
+        """
+        :return: A dict of the Entry Group fields, without its Entries.
+        """
+        return {
+            'name': self.name,
+            'display_name': self.display_name,
+            'description': self.description
+        }
+
+    @classmethod
+    def from_dict(cls, entry_group_dict):
+        """
+        :param entry_group_dict: A dict returned by to_dict.
+        :return: An EntryGroupSpec, without Entries.
+        """
+        return cls(entry_group_dict['name'], entry_group_dict.get('display_name'),
+                   entry_group_dict.get('description'))
+
+
+class EntrySpec(_Spec):
+    """A Fileset Entry, as read from a Filesets CSV file.
+
+    The Entry name is derived from its Entry Group name and id, so it is not stored.
+    """
+    __slots__ = ('entry_group_name', 'id', 'display_name', 'description', 'file_patterns',
+                 'columns')
+
+    def __init__(self,
+                 entry_group_name,
+                 entry_id,
+                 display_name=None,
+                 description=None,
+                 file_patterns=(),
+                 columns=None):
+        self.entry_group_name = intern(entry_group_name)
+        self.id = intern(entry_id)
+        self.display_name = display_name
+        self.description = description
+        self.file_patterns = tuple(file_patterns)
+        self.columns = columns if columns is not None else []
+
+    @property
+    def name(self):
+        return '{}/entries/{}'.format(self.entry_group_name, self.id)
+
+    def set_column(self, column):
+        """Adds a schema column, replacing the column with the same name if any.
+
+        :param column: A ColumnSpec.
+        """
+        for index, existing_column in enumerate(self.columns):
+            if existing_column.name == column.name:
+                self.columns[index] = column
+                return
+        self.columns.append(column)
+
+    def to_dict(self):
+        """
+        :return: A dict of the Entry fields, with its schema columns keyed by name.
+        """
+        return {
+            'id': self.id,
+            'name': self.name,
+            'display_name': self.display_name,
+            'description': self.description,
+            'file_patterns': list(self.file_patterns),
+            'schema_columns': {
+                column.name: column.to_dict()
+                for column in self.columns
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, entry_dict):
+        """
+        :param entry_dict: A dict returned by to_dict.
+        :return: An EntrySpec.
+        """
+        entry_group_name, _, entry_id = entry_dict['name'].rpartition('/entries/')
+        return cls(entry_group_name,
+                   entry_id,
+                   entry_dict.get('display_name'),
+                   entry_dict.get('description'),
+                   entry_dict.get('file_patterns', ()),
+                   columns=[
+                       ColumnSpec.from_dict(name, items)
+                       for name, items in entry_dict.get('schema_columns', {}).items()
+                   ])
+
+
+class ColumnSpec(_Spec):
+    """A schema column of a Fileset Entry."""
+    __slots__ = ('name', 'type', 'description', 'mode')
+
+    def __init__(self, name, column_type=None, description=None, mode=None):
+        # Column names, types, modes and often descriptions repeat across Entries.
+        self.name = intern(name)
+        self.type = intern(column_type)
+        self.description = intern(description)
+        self.mode = intern(mode)
+
+    def to_dict(self):
+        return {
+            constant.FILESETS_ENTRY_SCHEMA_COLUMN_DESCRIPTION_COLUMN_LABEL: self.description,
+            constant.FILESETS_ENTRY_SCHEMA_COLUMN_MODE_COLUMN_LABEL: self.mode,
+            constant.FILESETS_ENTRY_SCHEMA_COLUMN_TYPE_COLUMN_LABEL: self.type
+        }
+
+    @classmethod
+    def from_dict(cls, name, column_dict):
+        return cls(name, column_dict.get(constant.FILESETS_ENTRY_SCHEMA_COLUMN_TYPE_COLUMN_LABEL),
+                   column_dict.get(constant.FILESETS_ENTRY_SCHEMA_COLUMN_DESCRIPTION_COLUMN_LABEL),
+                   column_dict.get(constant.FILESETS_ENTRY_SCHEMA_COLUMN_MODE_COLUMN_LABEL))
@@ -0,0 +1,190 @@
+import collections
+import logging
+
+import pandas as pd
+
+from datacatalog_fileset_processor import constant
+
+# Number of rows listed for each violation, the other ones are only counted.
+MAX_REPORTED_ROWS = 10
+
+_ENTRY_COLUMNS = [
+    column for column in constant.FILESETS_NON_FILLABLE_COLUMNS
+    if column != constant.FILESETS_ENTRY_ID_COLUMN_LABEL
+]
+
+
+class FilesetsValidator:
+    """Checks the Filesets rows before any of them is synced.
+
+    Checks are vectorized over whole dataframes, so even large files are validated in
+    seconds, and the violations are collected along with their row numbers, so they are
+    all reported at once. Rows are numbered from 1, the header excluded, and the comment
+    and blank lines are not counted.
+    """
+
+    def __init__(self, validate_dataflow_sql_types=None):
+        """
+        :param validate_dataflow_sql_types: flag if enabled will check the schema columns
+         types are Dataflow SQL types.
+        """
+        self.__validate_dataflow_sql_types = validate_dataflow_sql_types
+        # Entries seen in the previous dataframes of each file, by (Entry Group, Entry id).
+        self.__seen_entries = collections.defaultdict(set)
+        # Number of rows and first row numbers of each violation, by message.
+        self.violations = collections.OrderedDict()
+
+    @property
+    def entries_count(self):
+        """
+        :return: The number of distinct Entries in each file validated so far, summed.
+        """
+        return sum(len(entries) for entries in self.__seen_entries.values())
+
+    def validate_dataframe(self, dataframe, file_path, columns=None):
+        """Checks the rows of a normalized dataframe.
+
+        :param dataframe: A normalized dataframe, indexed by the position of the rows in
+         the file, starting from 0, as read by pandas.read_csv.
+        :param file_path: The CSV file path, used in the violation messages.
+        :param columns: The columns of the CSV file header, checked for the required ones.
+         Defaults to the dataframe columns.
+        """
+        columns = dataframe.columns if columns is None else columns
+        missing_columns = [
+            column for column in constant.FILESETS_REQUIRED_COLUMNS if column not in columns
+        ]
+        for column in missing_columns:
+            self.__add('{}: missing required column {}'.format(file_path, column))
+
+        entry_group_names = dataframe[constant.FILESETS_ENTRY_GROUP_NAME_COLUMN_LABEL]
+        entry_ids = dataframe[constant.FILESETS_ENTRY_ID_COLUMN_LABEL]
+        entry_rows = entry_ids.notna()
+        if constant.FILESETS_ENTRY_ID_COLUMN_LABEL not in missing_columns:
+            # Only the few rows without an Entry id are looked at.
+            rows_without_entry = dataframe.loc[~entry_rows, _ENTRY_COLUMNS]
+            self.__check_rows(
+                '{}: missing {}'.format(file_path, constant.FILESETS_ENTRY_ID_COLUMN_LABEL),
+                rows_without_entry.notna().any(axis=1))
+        if constant.FILESETS_ENTRY_GROUP_NAME_COLUMN_LABEL not in missing_columns:
+            self.__check_rows(
+                '{}: missing {}'.format(file_path,
+                                        constant.FILESETS_ENTRY_GROUP_NAME_COLUMN_LABEL),
+                entry_rows & entry_group_names.isna())
+
+        # Entries may span several rows, of which only the first one must describe them.
+        first_entry_rows = self.__find_first_entry_rows(
+            file_path, entry_rows & ~dataframe.duplicated([
+                constant.FILESETS_ENTRY_GROUP_NAME_COLUMN_LABEL,
+                constant.FILESETS_ENTRY_ID_COLUMN_LABEL
+            ]), entry_group_names, entry_ids)
+        for column in (constant.FILESETS_ENTRY_DISPLAY_NAME_COLUMN_LABEL,
+                       constant.FILESETS_ENTRY_FILE_PATTERNS_COLUMN_LABEL):
+            if column not in missing_columns:
+                self.__check_rows(
+                    '{}: missing {} on the first row of the Entry'.format(file_path, column),
+                    first_entry_rows & dataframe[column].isna())
+
+        self.__check_values(
+            '{}: invalid {} {{!r}}'.format(file_path,
+                                           constant.FILESETS_ENTRY_GROUP_NAME_COLUMN_LABEL),
+            entry_group_names,
+            lambda values: values.astype(str).str.match(constant.ENTRY_GROUP_NAME_PATTERN))
+        self.__check_values(
+            '{}: invalid {} {{!r}}'.format(file_path, constant.FILESETS_ENTRY_ID_COLUMN_LABEL),
+            entry_ids, lambda values: values.astype(str).str.match(constant.ENTRY_ID_PATTERN))
+        self.__check_file_patterns(file_path,
+                                   dataframe[constant.FILESETS_ENTRY_FILE_PATTERNS_COLUMN_LABEL])
+        self.__check_schema_columns(file_path, dataframe)
+
+    def __find_first_entry_rows(self, file_path, first_entry_rows, entry_group_names, entry_ids):
+        # Entries already seen in a previous dataframe of the same file are excluded.
+        seen_entries = self.__seen_entries[file_path]
+        entries = list(zip(entry_group_names[first_entry_rows], entry_ids[first_entry_rows]))
+        if seen_entries:
+            first_entry_rows = first_entry_rows.copy()
+            first_entry_rows[first_entry_rows] = [entry not in seen_entries for entry in entries]
+        seen_entries.update(entries)
+        return first_entry_rows
+
+    def __check_file_patterns(self, file_path, file_patterns):
+        # Each value holds several patterns, which are split and checked one by one, once
+        # for each distinct value.
+        file_patterns = file_patterns.dropna()
+        unique_values = pd.Series(file_patterns.unique(), dtype=object)
+        patterns = unique_values.astype(str).str.split(
+            constant.FILE_PATTERNS_VALUES_SEPARATOR).explode()
+        invalid_patterns = patterns[~patterns.str.match(constant.ENTRY_FILE_PATTERN_PATTERN)]
+        for pattern, positions in invalid_patterns.groupby(invalid_patterns,
+                                                           sort=False).indices.items():
+            invalid_values = unique_values[invalid_patterns.index[positions]]
+            self.__check_rows(
+                '{}: invalid file pattern {!r}, expected gs://bucket/path'.format(
+                    file_path, pattern), file_patterns.isin(invalid_values))
+
+    def __check_schema_columns(self, file_path, dataframe):
+        column_names = dataframe[constant.FILESETS_ENTRY_SCHEMA_COLUMN_NAME_COLUMN_LABEL]
+        column_types = dataframe[constant.FILESETS_ENTRY_SCHEMA_COLUMN_TYPE_COLUMN_LABEL]
+        self.__check_rows(
+            '{}: missing {}'.format(file_path,
+                                    constant.FILESETS_ENTRY_SCHEMA_COLUMN_TYPE_COLUMN_LABEL),
+            column_names.notna() & column_types.isna())
+
+        if self.__validate_dataflow_sql_types:
+            self.__check_values(
+                '{}: {} {{!r}} not in allowed Dataflow SQL types: {}'.format(
+                    file_path, constant.FILESETS_ENTRY_SCHEMA_COLUMN_TYPE_COLUMN_LABEL,
+                    constant.DATAFLOW_SQL_VALID_TYPES), column_types[column_names.notna()],
+                lambda values: values.isin(constant.DATAFLOW_SQL_VALID_TYPES))
+
+        self.__check_values(
+            '{}: invalid {} {{!r}}, expected one of {}'.format(
+                file_path, constant.FILESETS_ENTRY_SCHEMA_COLUMN_MODE_COLUMN_LABEL,
+                constant.SCHEMA_COLUMN_VALID_MODES),
+            dataframe[constant.FILESETS_ENTRY_SCHEMA_COLUMN_MODE_COLUMN_LABEL],
+            lambda values: values.isin(constant.SCHEMA_COLUMN_VALID_MODES))
+
+    def __check_rows(self, message, invalid_rows):
+        if invalid_rows.any():
+            self.__add(message, invalid_rows.index[invalid_rows.to_numpy()])
+
+    def __check_values(self, message_format, values, is_valid):
+        # Each distinct value is checked once, and the rows holding the invalid ones
+        # are then looked up at once.
+        values = values.dropna()
+        unique_values = pd.Series(values.unique(), dtype=object)
+        invalid_values = unique_values[~is_valid(unique_values).fillna(False).astype(bool)]
+        if invalid_values.empty:
+            return
+
+        invalid_rows = values[values.isin(invalid_values)]
+        for value, positions in invalid_rows.groupby(invalid_rows, sort=False).indices.items():
+            self.__add(message_format.format(value), invalid_rows.index[positions])
+
+    def __add(self, message, row_indexes=()):
+        violation = self.violations.setdefault(message, [0, []])
+        violation[0] += len(row_indexes)
+        reported_rows = violation[1]
+        for row_index in row_indexes[:MAX_REPORTED_ROWS - len(reported_rows)]:
+            reported_rows.append(int(row_index) + 1)
+
+    def check(self):
+        """Logs all the violations found so far, and fails if there is any.
+
+        :raises ValueError: If any violation was found.
+        """
+        if not self.violations:
+            return
+
+        for message, (rows_count, row_numbers) in self.violations.items():
+            if not rows_count:
+                logging.error('%s', message)
+                continue
+
+            rows = ', '.join(str(row_number) for row_number in row_numbers)
+            if rows_count > len(row_numbers):
+                rows += ' and {} more'.format(rows_count - len(row_numbers))
+            logging.error('%s, row%s %s', message, 's' if rows_count > 1 else '', rows)
+
+        raise ValueError('{} violations found in the CSV files, no change was made.'.format(
+            sum(max(rows_count, 1) for rows_count, _ in self.violations.values())))
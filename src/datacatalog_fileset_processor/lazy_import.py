@@ -0,0 +1,33 @@
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """Imports a module lazily: its code only runs once one of its attributes is used.
+
+    Modules pulling heavy dependencies, such as pandas or the Data Catalog client, are
+    imported this way by the command line interface, so printing the usage or reporting
+    an argument error does not pay for them.
+
+    The module must be loaded from a single thread, e.g. by using it before starting
+    any worker thread.
+
+    :param name: The absolute module name.
+    :return: The module.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+
+    # Bind the module to its package, as the import statement does.
+    parent_name, _, child_name = name.rpartition('.')
+    if parent_name:
+        setattr(sys.modules[parent_name], child_name, module)
+    return module
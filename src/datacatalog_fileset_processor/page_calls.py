@@ -0,0 +1,31 @@
+import functools
+
+from google.api_core import page_iterator
+
+
+def is_list_method(name):
+    """
+    :param name: A Data Catalog client method name.
+    :return: True if the method returns a lazy iterator, which fetches the pages of
+     results as it is iterated.
+    """
+    return name.startswith('list_')
+
+
+def wrap_page_calls(result, call):
+    """Makes the page fetches of a lazy list result go through a call wrapper.
+
+    Building the iterator returned by a list method makes no API call: each page is
+    fetched by a call of its own, once the previous one was iterated. The page method
+    of the iterator is wrapped, rather than the iteration, so a page call can be
+    retried without losing the position in the results.
+
+    :param result: The result of a list method. Only GRPCIterator results, as returned
+     by the google-cloud-datacatalog 1.x clients, are wrapped.
+    :param call: A function called with the page method and its arguments, e.g.
+     RateLimiter.call bound to the RPC type.
+    :return: The result.
+    """
+    if isinstance(result, page_iterator.GRPCIterator):
+        result._method = functools.partial(call, result._method)
+    return result
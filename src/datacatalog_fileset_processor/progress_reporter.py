@@ -0,0 +1,71 @@
+import collections
+import datetime
+import logging
+import threading
+import time
+
+
+class ProgressReporter:
+    """Thread safe reporter of the progress of a run.
+
+    Logs, at most once per interval, the number of items done, their throughput, the
+    estimated time left when the total is known, and their counts by outcome. The clock
+    is only read as items are recorded, so no thread is needed.
+    """
+
+    def __init__(self, description, total=None, interval=10.0):
+        """
+        :param description: What the items are, e.g. 'Entries'.
+        :param total: Optional number of items to be processed, used for the ETA.
+        :param interval: Minimum number of seconds between two reports.
+        """
+        self.__description = description
+        self.__total = total
+        self.__interval = interval
+        self.__outcomes = collections.Counter()
+        self.__lock = threading.Lock()
+        self.__start = time.monotonic()
+        self.__next_report = self.__start + interval
+
+    @property
+    def outcomes(self):
+        with self.__lock:
+            return collections.Counter(self.__outcomes)
+
+    def record(self, outcome):
+        """Records an item as done, and reports the progress if the interval elapsed.
+
+        :param outcome: The outcome of the item, e.g. constant.CREATE_OUTCOME_UPSERTED.
+        """
+        with self.__lock:
+            self.__outcomes[outcome] += 1
+            now = time.monotonic()
+            if now < self.__next_report:
+                return
+            # Reporting under the lock keeps the reports in order, which only costs
+            # once per interval.
+            self.__next_report = now + self.__interval
+            self.__report(self.__outcomes, now - self.__start)
+
+    def finish(self):
+        """Reports the final progress."""
+        self.__report(self.outcomes, time.monotonic() - self.__start)
+
+    def __report(self, outcomes, elapsed):
+        done = sum(outcomes.values())
+        rate = done / elapsed if elapsed > 0 else 0.0
+        fields = collections.OrderedDict([('done', done), ('total', self.__total),
+                                          ('rate', round(rate, 1)), ('eta_seconds', None),
+                                          ('outcomes', dict(outcomes))])
+        message = '{}: {}'.format(self.__description, done)
+        if self.__total is not None:
+            message += '/{}'.format(self.__total)
+        message += ', {:.1f}/s'.format(rate)
+        if self.__total is not None and rate > 0:
+            eta_seconds = max(0, self.__total - done) / rate
+            fields['eta_seconds'] = round(eta_seconds)
+            message += ', ETA {}'.format(datetime.timedelta(seconds=round(eta_seconds)))
+        for outcome, count in sorted(outcomes.items()):
+            message += ', {}: {}'.format(outcome, count)
+
+        logging.info('%s', message, extra={'fields': {'progress': fields}})
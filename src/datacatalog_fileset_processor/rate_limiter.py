@@ -0,0 +1,197 @@
+import functools
+import itertools
+import logging
+import random
+import threading
+import time
+
+from google.api_core import exceptions
+
+from datacatalog_fileset_processor import page_calls
+
+
+class TokenBucket:
+    """Thread safe token bucket, allowing up to rate acquisitions per second."""
+
+    def __init__(self, rate, capacity=None):
+        """
+        :param rate: Number of tokens added per second.
+        :param capacity: Maximum number of tokens, which bounds the bursts. Defaults to
+         one second worth of tokens.
+        """
+        self.__rate = float(rate)
+        self.__capacity = float(capacity or max(1.0, rate))
+        self.__tokens = self.__capacity
+        self.__last_refill = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self):
+        """Takes a token, waiting until one is available."""
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                self.__tokens = min(self.__capacity,
+                                    self.__tokens + (now - self.__last_refill) * self.__rate)
+                self.__last_refill = now
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return
+                wait_time = (1 - self.__tokens) / self.__rate
+            time.sleep(wait_time)
+
+
+class AdaptiveConcurrencyLimit:
+    """Bounds the number of calls in flight, adapting the bound to the quota errors.
+
+    The limit is halved each time a call is throttled, and grows back by one after
+    limit successful calls in a row, up to the maximum.
+    """
+
+    def __init__(self, maximum, minimum=1):
+        self.__maximum = maximum
+        self.__minimum = minimum
+        self.__limit = float(maximum)
+        self.__in_flight = 0
+        self.__condition = threading.Condition()
+
+    @property
+    def limit(self):
+        return int(self.__limit)
+
+    def acquire(self):
+        """Waits until a call can be started."""
+        with self.__condition:
+            while self.__in_flight >= int(self.__limit):
+                self.__condition.wait()
+            self.__in_flight += 1
+
+    def release(self, throttled=False):
+        """Reports a call as finished.
+
+        :param throttled: Whether the call failed because of a quota error.
+        """
+        with self.__condition:
+            self.__in_flight -= 1
+            if throttled:
+                self.__limit = max(self.__minimum, self.__limit / 2)
+                logging.info('Quota exceeded, concurrency limit lowered to %d', self.limit)
+            else:
+                self.__limit = min(self.__maximum, self.__limit + 1 / self.__limit)
+            self.__condition.notify_all()
+
+
+class RateLimiter:
+    """Throttles and retries the Data Catalog API calls.
+
+    Calls wait for a token of their RPC type bucket and for a free concurrency slot.
+    Calls that fail with a transient error are retried with jittered exponential
+    backoff. A timed out call may have been committed, so retried create calls may
+    fail with AlreadyExists, which the callers handle.
+    """
+
+    TRANSIENT_ERRORS = (exceptions.Aborted, exceptions.DeadlineExceeded,
+                        exceptions.InternalServerError, exceptions.ResourceExhausted,
+                        exceptions.ServiceUnavailable)
+
+    def __init__(self,
+                 qps=None,
+                 rpc_qps=None,
+                 max_concurrency=None,
+                 max_retries=5,
+                 initial_backoff=1.0,
+                 max_backoff=60.0):
+        """
+        :param qps: Default maximum number of calls per second, for each RPC type.
+         Calls are not throttled if not set.
+        :param rpc_qps: Optional dict of the maximum number of calls per second by RPC
+         type, e.g. {'create_entry': 10}, overriding the default.
+        :param max_concurrency: If set, the maximum number of calls in flight. The limit
+         is lowered on quota errors, and grows back as calls succeed.
+        :param max_retries: Maximum number of retries for each call.
+        :param initial_backoff: Maximum delay before the first retry, in seconds.
+        :param max_backoff: Maximum delay between two retries, in seconds.
+        """
+        self.__qps = qps
+        self.__rpc_qps = rpc_qps or {}
+        self.__buckets = {}
+        self.__buckets_lock = threading.Lock()
+        self.__concurrency_limit = AdaptiveConcurrencyLimit(
+            max_concurrency) if max_concurrency else None
+        self.__max_retries = max_retries
+        self.__initial_backoff = initial_backoff
+        self.__max_backoff = max_backoff
+
+    @property
+    def concurrency_limit(self):
+        return self.__concurrency_limit
+
+    def wrap(self, client):
+        """Wraps an API client, so all of its calls go through the limiter.
+
+        :param client: A Data Catalog API client.
+        :return: The wrapped client.
+        """
+        return RateLimitedClient(client, self)
+
+    def call(self, rpc_name, function, *args, **kwargs):
+        """Calls an API function, throttling and retrying it as needed.
+
+        :param rpc_name: The RPC type, e.g. 'create_entry'.
+        :param function: The function to be called.
+        :return: The function result.
+        """
+        bucket = self.__get_bucket(rpc_name)
+        for attempt in itertools.count():
+            if bucket:
+                bucket.acquire()
+            if self.__concurrency_limit:
+                self.__concurrency_limit.acquire()
+
+            throttled = False
+            try:
+                return function(*args, **kwargs)
+            except self.TRANSIENT_ERRORS as e:
+                throttled = isinstance(e, exceptions.ResourceExhausted)
+                if attempt >= self.__max_retries:
+                    raise
+                delay = random.uniform(
+                    0, min(self.__max_backoff, self.__initial_backoff * 2**attempt))
+                logging.warning('%s failed, retrying in %.2fs: %s', rpc_name, delay, e)
+            finally:
+                if self.__concurrency_limit:
+                    self.__concurrency_limit.release(throttled)
+
+            time.sleep(delay)
+
+    def __get_bucket(self, rpc_name):
+        qps = self.__rpc_qps.get(rpc_name, self.__qps)
+        if not qps:
+            return None
+
+        with self.__buckets_lock:
+            bucket = self.__buckets.get(rpc_name)
+            if bucket is None:
+                bucket = self.__buckets[rpc_name] = TokenBucket(qps)
+        return bucket
+
+
+class RateLimitedClient:
+    """Exposes the methods of a Data Catalog client through a RateLimiter.
+
+    The list methods are not throttled themselves, as they make no API call, but each
+    page fetched while iterating their results is.
+    """
+
+    def __init__(self, client, rate_limiter):
+        self.__client = client
+        self.__rate_limiter = rate_limiter
+
+    def __getattr__(self, name):
+        method = getattr(self.__client, name)
+        if page_calls.is_list_method(name):
+            return functools.partial(self.__call_list_method, name, method)
+        return functools.partial(self.__rate_limiter.call, name, method)
+
+    def __call_list_method(self, name, method, *args, **kwargs):
+        return page_calls.wrap_page_calls(method(*args, **kwargs),
+                                          functools.partial(self.__rate_limiter.call, name))
@@ -0,0 +1,125 @@
+import logging
+import os
+import threading
+import time
+
+from datacatalog_fileset_processor import constant
+
+KIND_ENTRY_GROUP = 'G'
+KIND_ENTRY = 'E'
+
+FAILED_OUTCOMES = (constant.CREATE_OUTCOME_FAILED, constant.DELETE_OUTCOME_FAILED)
+
+# Records reach the operating system as soon as they are written, so they survive the
+# process being killed. They are synced to disk at most once per interval, so a node
+# crash only loses the last interval of records.
+FSYNC_INTERVAL_SECONDS = 1.0
+
+
+class RunJournal:
+    """Append-only record of the Entry Groups and Entries completed by a run, so an
+    interrupted run can be resumed without processing them again.
+
+    Each line holds a kind, G for Entry Groups and E for Entries, an outcome and a
+    resource name, separated by tabs. Every line is appended with a single unbuffered
+    write to a file opened in append mode, so lines are never interleaved, even when
+    several workers or processes write to the same journal. The last outcome recorded
+    for a resource wins, and resources whose last outcome is a failure are not done.
+    """
+
+    def __init__(self, file_path, resume=False, fsync_interval=FSYNC_INTERVAL_SECONDS):
+        """
+        :param file_path: The journal file path, created if it does not exist.
+        :param resume: flag if enabled will load the records of the journal file, instead
+         of discarding them.
+        :param fsync_interval: Minimum number of seconds between two syncs of the journal
+         file to disk.
+        """
+        self.__file_path = file_path
+        self.__fsync_interval = fsync_interval
+        self.__lock = threading.Lock()
+        self.__done_names = {KIND_ENTRY_GROUP: set(), KIND_ENTRY: set()}
+
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        if resume:
+            self.__load(file_path)
+        else:
+            flags |= os.O_TRUNC
+        self.__fd = os.open(file_path, flags, 0o644)
+        self.__last_fsync = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __load(self, file_path):
+        if not os.path.exists(file_path):
+            return
+
+        with open(file_path, 'rb') as journal_file:
+            content = journal_file.read()
+        # A line cut short by a crash is dropped, so the next records start on a new line.
+        complete_length = content.rfind(b'\n') + 1
+        if complete_length < len(content):
+            os.truncate(file_path, complete_length)
+
+        for line in content[:complete_length].decode('utf-8').splitlines():
+            kind, outcome, name = line.split('\t', 2)
+            if outcome in FAILED_OUTCOMES:
+                self.__done_names[kind].discard(name)
+            else:
+                self.__done_names[kind].add(name)
+
+        logging.info('Loaded %d Entry Groups and %d Entries done from journal: %s',
+                     len(self.__done_names[KIND_ENTRY_GROUP]), len(self.__done_names[KIND_ENTRY]),
+                     file_path)
+
+    def is_entry_group_done(self, entry_group_name):
+        """
+        :param entry_group_name: Entry Group Name.
+        :return: True if the Entry Group was completed by a previous run.
+        """
+        return entry_group_name in self.__done_names[KIND_ENTRY_GROUP]
+
+    def is_entry_done(self, entry_name):
+        """
+        :param entry_name: Entry Name.
+        :return: True if the Entry was completed by a previous run.
+        """
+        return entry_name in self.__done_names[KIND_ENTRY]
+
+    def record_entry_group(self, entry_group_name, outcome):
+        """Records the outcome of an Entry Group, once all of its Entries are done.
+
+        :param entry_group_name: Entry Group Name.
+        :param outcome: One of the constant.CREATE_OUTCOME_* or DELETE_OUTCOME_* values.
+        """
+        self.__write(KIND_ENTRY_GROUP, entry_group_name, outcome)
+
+    def record_entry(self, entry_name, outcome):
+        """Records the outcome of an Entry. It can be called from any thread.
+
+        :param entry_name: Entry Name.
+        :param outcome: One of the constant.CREATE_OUTCOME_* or DELETE_OUTCOME_* values.
+        """
+        self.__write(KIND_ENTRY, entry_name, outcome)
+
+    def __write(self, kind, name, outcome):
+        line = '{}\t{}\t{}\n'.format(kind, outcome, name).encode('utf-8')
+        with self.__lock:
+            os.write(self.__fd, line)
+            now = time.monotonic()
+            if now - self.__last_fsync >= self.__fsync_interval:
+                os.fsync(self.__fd)
+                self.__last_fsync = now
+
+    def close(self):
+        """Syncs the journal file to disk and closes it."""
+        with self.__lock:
+            if self.__fd is None:
+                return
+            os.fsync(self.__fd)
+            os.close(self.__fd)
+            self.__fd = None
@@ -0,0 +1,206 @@
+import bisect
+import collections
+import contextlib
+import functools
+import itertools
+import json
+import threading
+import time
+
+from datacatalog_fileset_processor import page_calls
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_PROMETHEUS_PREFIX = 'datacatalog_fileset_processor'
+
+
+class LatencyHistogram:
+    """Counts observed latencies in buckets, as Prometheus histograms do."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.__buckets = buckets
+        # The last count is for the observations above the largest bucket.
+        self.__counts = [0] * (len(buckets) + 1)
+        self.__sum = 0.0
+
+    def observe(self, value):
+        self.__counts[bisect.bisect_left(self.__buckets, value)] += 1
+        self.__sum += value
+
+    def to_dict(self):
+        """
+        :return: A dict with the sum and count of the observations, and the cumulative
+         count of each bucket keyed by its upper bound.
+        """
+        cumulative_counts = list(itertools.accumulate(self.__counts))
+        buckets = collections.OrderedDict(
+            (str(float(bound)), count) for bound, count in zip(self.__buckets, cumulative_counts))
+        buckets['+Inf'] = cumulative_counts[-1]
+        return {'count': cumulative_counts[-1], 'sum': self.__sum, 'buckets': buckets}
+
+
+class RunMetrics:
+    """Thread safe recorder of the API calls and processing phases of a run.
+
+    Records the number of calls, errors by status code and latency histogram of each
+    RPC type, and the time spent in each phase. Phases may be nested, in which case
+    the time spent in the inner phase is not accounted to the outer one.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__calls = collections.Counter()
+        self.__errors = collections.defaultdict(collections.Counter)
+        self.__latencies = collections.defaultdict(LatencyHistogram)
+        self.__phases = collections.Counter()
+        self.__local = threading.local()
+
+    def wrap(self, client):
+        """Wraps an API client, so all of its calls are recorded.
+
+        :param client: A Data Catalog API client.
+        :return: The wrapped client.
+        """
+        return InstrumentedClient(client, self)
+
+    def call(self, rpc_name, function, *args, **kwargs):
+        """Calls an API function, recording its latency and outcome.
+
+        :param rpc_name: The RPC type, e.g. 'create_entry'.
+        :param function: The function to be called.
+        :return: The function result.
+        """
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except Exception as e:
+            self.record_call(rpc_name, time.perf_counter() - start, e)
+            raise
+        self.record_call(rpc_name, time.perf_counter() - start)
+        return result
+
+    def record_call(self, rpc_name, latency, error=None):
+        """
+        :param rpc_name: The RPC type.
+        :param latency: The call latency, in seconds.
+        :param error: The exception raised by the call, if it failed.
+        """
+        with self.__lock:
+            self.__calls[rpc_name] += 1
+            self.__latencies[rpc_name].observe(latency)
+            if error is not None:
+                self.__errors[rpc_name][self.__status_code(error)] += 1
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Accounts the time spent in the block to the given phase."""
+        stack = self.__local.__dict__.setdefault('phases', [])
+        start = time.perf_counter()
+        if stack:
+            self.__record_phase(stack[-1][0], start - stack[-1][1])
+        stack.append([name, start])
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            _, resumed = stack.pop()
+            self.__record_phase(name, end - resumed)
+            if stack:
+                stack[-1][1] = end
+
+    def __record_phase(self, name, elapsed):
+        with self.__lock:
+            self.__phases[name] += elapsed
+
+    @classmethod
+    def __status_code(cls, error):
+        grpc_status_code = getattr(error, 'grpc_status_code', None)
+        if grpc_status_code is not None:
+            return grpc_status_code.name
+        return type(error).__name__
+
+    def to_dict(self):
+        with self.__lock:
+            return {
+                'rpcs': {
+                    rpc_name: {
+                        'calls': calls,
+                        'errors': dict(self.__errors[rpc_name]),
+                        'latency_seconds': self.__latencies[rpc_name].to_dict()
+                    }
+                    for rpc_name, calls in sorted(self.__calls.items())
+                },
+                'phases_seconds': dict(sorted(self.__phases.items()))
+            }
+
+    def to_prometheus(self):
+        """
+        :return: The metrics in the Prometheus text exposition format.
+        """
+        metrics = self.to_dict()
+        rpcs = metrics['rpcs']
+        lines = []
+
+        def add_metric(name, metric_type, description, samples):
+            name = '{}_{}'.format(_PROMETHEUS_PREFIX, name)
+            lines.append('# HELP {} {}'.format(name, description))
+            lines.append('# TYPE {} {}'.format(name, metric_type))
+            for suffix, labels, value in samples:
+                lines.append('{}{}{{{}}} {}'.format(
+                    name, suffix, ','.join('{}="{}"'.format(label, label_value)
+                                           for label, label_value in labels), value))
+
+        add_metric('rpc_calls_total', 'counter', 'Data Catalog API calls, by RPC type.',
+                   [('', [('rpc', rpc_name)], rpc['calls']) for rpc_name, rpc in rpcs.items()])
+        add_metric('rpc_errors_total', 'counter',
+                   'Failed Data Catalog API calls, by RPC type and status code.',
+                   [('', [('rpc', rpc_name), ('code', code)], count)
+                    for rpc_name, rpc in rpcs.items()
+                    for code, count in sorted(rpc['errors'].items())])
+
+        latency_samples = []
+        for rpc_name, rpc in rpcs.items():
+            histogram = rpc['latency_seconds']
+            latency_samples.extend(('_bucket', [('rpc', rpc_name), ('le', bound)], count)
+                                   for bound, count in histogram['buckets'].items())
+            latency_samples.append(('_sum', [('rpc', rpc_name)], histogram['sum']))
+            latency_samples.append(('_count', [('rpc', rpc_name)], histogram['count']))
+        add_metric('rpc_latency_seconds', 'histogram',
+                   'Data Catalog API calls latency, by RPC type.', latency_samples)
+
+        add_metric('phase_seconds', 'gauge', 'Time spent in each processing phase.',
+                   [('', [('phase', phase)], seconds)
+                    for phase, seconds in metrics['phases_seconds'].items()])
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, file_path_prefix):
+        """Writes the metrics to <file_path_prefix>.json and, in the Prometheus text
+        format, to <file_path_prefix>.prom.
+        """
+        with open(file_path_prefix + '.json', 'w') as json_file:
+            json.dump(self.to_dict(), json_file, indent=2)
+        with open(file_path_prefix + '.prom', 'w') as prometheus_file:
+            prometheus_file.write(self.to_prometheus())
+
+
+class InstrumentedClient:
+    """Exposes the methods of a Data Catalog client, recording their calls.
+
+    The list methods are not recorded themselves, as they make no API call, but each
+    page fetched while iterating their results is.
+    """
+
+    def __init__(self, client, run_metrics):
+        self.__client = client
+        self.__run_metrics = run_metrics
+
+    def __getattr__(self, name):
+        method = getattr(self.__client, name)
+        if page_calls.is_list_method(name):
+            return functools.partial(self.__call_list_method, name, method)
+        return functools.partial(self.__run_metrics.call, name, method)
+
+    def __call_list_method(self, name, method, *args, **kwargs):
+        return page_calls.wrap_page_calls(method(*args, **kwargs),
+                                          functools.partial(self.__run_metrics.call, name))
@@ -0,0 +1,56 @@
+import hashlib
+
+
+def shard_of(entry_group_name, shard_count):
+    """Computes the shard an Entry Group belongs to.
+
+    The shard only depends on the Entry Group name, unlike the builtin hash of strings,
+    which is salted in each process, so every run and node agrees on it.
+
+    :param entry_group_name: The Entry Group name.
+    :param shard_count: The number of shards.
+    :return: The shard index, from 0 to shard_count - 1.
+    """
+    digest = hashlib.sha256(entry_group_name.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % shard_count
+
+
+def select_shard(entry_group_specs, shard_index, shard_count):
+    """Filters the Entry Groups of a shard.
+
+    :param entry_group_specs: An iterable of EntryGroupSpec.
+    :param shard_index: The index of the shard to keep.
+    :param shard_count: The number of shards.
+    :return: An iterator over the EntryGroupSpec of the shard.
+    """
+    return (entry_group_spec for entry_group_spec in entry_group_specs
+            if shard_of(entry_group_spec.name, shard_count) == shard_index)
+
+
+def count_shard_sizes(entry_group_specs, shard_count):
+    """Counts the Entry Groups and Entries of each shard.
+
+    :param entry_group_specs: An iterable of EntryGroupSpec.
+    :param shard_count: The number of shards.
+    :return: A list of Tuple (entry_groups_count, entries_count), by shard index.
+    """
+    shard_sizes = [[0, 0] for _ in range(shard_count)]
+    for entry_group_spec in entry_group_specs:
+        shard_size = shard_sizes[shard_of(entry_group_spec.name, shard_count)]
+        shard_size[0] += 1
+        shard_size[1] += len(entry_group_spec.entries)
+    return [tuple(shard_size) for shard_size in shard_sizes]
+
+
+def validate_shard(shard_index, shard_count):
+    """Checks the shard options, which are either both set or both unset.
+
+    :raise ValueError: If only one of them is set, or shard_index is out of range.
+    """
+    if shard_index is None and shard_count is None:
+        return
+    if shard_index is None or shard_count is None:
+        raise ValueError('shard_index and shard_count must be set together')
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError('shard_index must be between 0 and shard_count - 1, got {} of {}'.format(
+            shard_index, shard_count))
@@ -0,0 +1,86 @@
+import collections
+import datetime
+import json
+import logging
+import zlib
+
+from datacatalog_fileset_processor import constant
+
+# Logger of the records written for each Entry, which may be sampled. Their structured
+# fields, passed as extra={'fields': {...}}, include the Entry name.
+entry_logger = logging.getLogger('datacatalog_fileset_processor.entries')
+
+_SAMPLING_RANGE = 10000
+
+
+class EntrySampler(logging.Filter):
+    """Keeps the records of a sample of the Entries.
+
+    Entries are sampled by a hash of their name, so all the records of a sampled Entry
+    are kept, and the same Entries are sampled in every run. Warnings and errors are
+    always kept. Records filtered out are neither formatted nor written.
+    """
+
+    def __init__(self, rate):
+        """
+        :param rate: Fraction of the Entries whose records are kept, between 0 and 1.
+        """
+        super().__init__()
+        self.__threshold = int(rate * _SAMPLING_RANGE)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+
+        entry_name = get_fields(record).get('entry')
+        if entry_name is None:
+            return True
+        return zlib.crc32(entry_name.encode()) % _SAMPLING_RANGE < self.__threshold
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats the log records as JSON objects, one per line, with their structured fields."""
+
+    def format(self, record):
+        document = collections.OrderedDict([
+            ('time', datetime.datetime.fromtimestamp(record.created,
+                                                     datetime.timezone.utc).isoformat()),
+            ('level', record.levelname),
+            ('logger', record.name),
+            ('message', record.getMessage()),
+        ])
+        document.update(get_fields(record))
+        if record.exc_info:
+            document['exception'] = self.formatException(record.exc_info)
+        return json.dumps(document, default=str)
+
+
+def get_fields(record):
+    """
+    :param record: A log record.
+    :return: The structured fields of the record, if any.
+    """
+    return getattr(record, 'fields', None) or {}
+
+
+def setup_logging(log_format=constant.LOG_FORMAT_TEXT, entry_sample_rate=None):
+    """Sets up the root logger, and the sampling of the Entries records.
+
+    :param log_format: One of the constant.LOG_FORMATS values. Blank lines, used as
+     spacers in the text format, are skipped in the JSON one.
+    :param entry_sample_rate: Fraction of the Entries whose records are written, between
+     0 and 1. All of them are written if not set.
+    """
+    handler = logging.StreamHandler()
+    if log_format == constant.LOG_FORMAT_JSON:
+        handler.setFormatter(JsonFormatter())
+        handler.addFilter(lambda record: bool(record.getMessage()))
+    else:
+        handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    logging.basicConfig(level=logging.INFO, handlers=[handler])
+
+    for log_filter in list(entry_logger.filters):
+        if isinstance(log_filter, EntrySampler):
+            entry_logger.removeFilter(log_filter)
+    if entry_sample_rate is not None and entry_sample_rate < 1:
+        entry_logger.addFilter(EntrySampler(entry_sample_rate))
@@ -0,0 +1,400 @@
+import asyncio
+import collections
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions
+from google.cloud import datacatalog_v1
+
+from datacatalog_fileset_processor import async_datacatalog_facade, entry_fingerprint
+
+
+class AsyncDataCatalogFacadeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.__datacatalog_client = FakeAsyncDataCatalogClient()
+        self.__datacatalog_facade = async_datacatalog_facade.AsyncDataCatalogFacade(
+            client=self.__datacatalog_client)
+
+    def test_constructor_should_set_instance_attributes(self):
+        self.assertIsNotNone(
+            self.__datacatalog_facade.__dict__['_AsyncDataCatalogFacade__datacatalog'])
+
+    @mock.patch('datacatalog_fileset_processor.async_datacatalog_facade.datacatalog_v1')
+    def test_constructor_should_adapt_blocking_client_if_no_async_client(
+            self, mock_datacatalog_v1):  # noqa: E125
+        del mock_datacatalog_v1.DataCatalogAsyncClient
+        mock_datacatalog_v1.DataCatalogClient.return_value.get_entry.return_value = 'entry'
+
+        facade = async_datacatalog_facade.AsyncDataCatalogFacade()
+
+        self.assertEqual('entry', run(facade.get_entry('entry_name')))
+        mock_datacatalog_v1.DataCatalogClient.return_value.get_entry.assert_called_with(
+            name='entry_name')
+
+    @mock.patch('datacatalog_fileset_processor.async_datacatalog_facade.datacatalog_v1')
+    def test_adapted_blocking_client_should_list_all_pages(self, mock_datacatalog_v1):
+        del mock_datacatalog_v1.DataCatalogAsyncClient
+        mock_datacatalog_v1.DataCatalogClient.return_value.list_entries.return_value = iter(
+            ['entry_1', 'entry_2'])
+
+        facade = async_datacatalog_facade.AsyncDataCatalogFacade()
+
+        self.assertEqual(['entry_1', 'entry_2'], run(facade.list_entries('entry_group_name')))
+
+    @mock.patch('datacatalog_fileset_processor.async_datacatalog_facade.datacatalog_v1')
+    def test_constructor_should_adapt_blocking_client_with_rate_limiter(
+            self, mock_datacatalog_v1):  # noqa: E125
+        rate_limiter = mock.MagicMock()
+        rate_limiter.wrap.return_value.get_entry.return_value = 'entry'
+
+        facade = async_datacatalog_facade.AsyncDataCatalogFacade(rate_limiter=rate_limiter)
+
+        self.assertEqual('entry', run(facade.get_entry('entry_name')))
+        rate_limiter.wrap.assert_called_once_with(
+            mock_datacatalog_v1.DataCatalogClient.return_value)
+        mock_datacatalog_v1.DataCatalogAsyncClient.assert_not_called()
+
+    @mock.patch('datacatalog_fileset_processor.async_datacatalog_facade.datacatalog_v1')
+    def test_constructor_should_adapt_blocking_client_with_metrics(
+            self, mock_datacatalog_v1):  # noqa: E125
+        metrics = mock.MagicMock()
+        metrics.wrap.return_value.get_entry.return_value = 'entry'
+
+        facade = async_datacatalog_facade.AsyncDataCatalogFacade(metrics=metrics)
+
+        self.assertEqual('entry', run(facade.get_entry('entry_name')))
+        metrics.wrap.assert_called_once_with(mock_datacatalog_v1.DataCatalogClient.return_value)
+        mock_datacatalog_v1.DataCatalogAsyncClient.assert_not_called()
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_facade.datacatalog_v1')
+    @mock.patch('datacatalog_fileset_processor.async_datacatalog_facade.datacatalog_v1')
+    def test_constructor_with_channels_should_adapt_blocking_client_pool(
+            self, mock_datacatalog_v1, mock_facade_datacatalog_v1):  # noqa: E125
+        mock_facade_datacatalog_v1.DataCatalogClient.return_value.get_entry.return_value = \
+            'entry'
+
+        facade = async_datacatalog_facade.AsyncDataCatalogFacade(channels=2)
+
+        self.assertEqual('entry', run(facade.get_entry('entry_name')))
+        self.assertEqual(2, mock_facade_datacatalog_v1.DataCatalogClient.call_count)
+        mock_datacatalog_v1.DataCatalogAsyncClient.assert_not_called()
+
+    def test_create_entry_should_succeed(self):
+        entry = create_entry('display_name', 'description')
+
+        result = run(self.__datacatalog_facade.create_entry('entry_group_name', 'entry_id', entry))
+
+        self.assertEqual(1, self.__datacatalog_client.calls['create_entry'])
+        self.assertEqual('entry_group_name/entries/entry_id', result.name)
+
+    def test_create_entry_should_return_none_on_permission_denied(self):
+        self.__datacatalog_client.errors['create_entry'] = \
+            exceptions.PermissionDenied('Permission denied')
+        entry = create_entry('display_name', 'description')
+
+        result = run(self.__datacatalog_facade.create_entry('entry_group_name', 'entry_id', entry))
+
+        self.assertEqual(1, self.__datacatalog_client.calls['create_entry'])
+        self.assertIsNone(result)
+
+    def test_upsert_entry_nonexistent_should_create(self):
+        entry = create_entry('display_name', 'description')
+
+        run(
+            self.__datacatalog_facade.upsert_entry('entry_group_name',
+                                                   'entry_group_name/entries/entry_id', 'entry_id',
+                                                   entry))
+
+        self.assertEqual(1, self.__datacatalog_client.calls['get_entry'])
+        self.assertEqual(1, self.__datacatalog_client.calls['create_entry'])
+
+    def test_upsert_entry_changed_should_update(self):
+        self.__datacatalog_client.entries['name'] = create_entry('display_name', 'description')
+        entry = create_entry('display_name_2', 'description_2')
+
+        result = run(
+            self.__datacatalog_facade.upsert_entry('entry_group_name', 'name', 'entry_id', entry))
+
+        self.assertEqual(1, self.__datacatalog_client.calls['get_entry'])
+        self.assertEqual(1, self.__datacatalog_client.calls['update_entry'])
+        self.assertEqual('display_name_2', result.display_name)
+
+    def test_upsert_entry_unchanged_should_not_update(self):
+        self.__datacatalog_client.entries['name'] = create_entry('display_name', 'description')
+        entry = create_entry('display_name', 'description')
+
+        run(self.__datacatalog_facade.upsert_entry('entry_group_name', 'name', 'entry_id', entry))
+
+        self.assertEqual(1, self.__datacatalog_client.calls['get_entry'])
+        self.assertEqual(0, self.__datacatalog_client.calls['update_entry'])
+
+    def test_upsert_entry_should_return_none_on_failed_precondition(self):
+        persisted_entry = create_entry('display_name', 'description')
+        self.__datacatalog_client.entries['name'] = persisted_entry
+        self.__datacatalog_client.errors['update_entry'] = \
+            exceptions.FailedPrecondition('Failed precondition')
+
+        result = run(
+            self.__datacatalog_facade.upsert_entry('entry_group_name', 'name', 'entry_id',
+                                                   create_entry('display_name_2', 'description')))
+
+        self.assertEqual(1, self.__datacatalog_client.calls['update_entry'])
+        self.assertIsNone(result)
+
+    def test_list_entries_should_return_all_pages(self):
+        self.__datacatalog_client.entries['entry_group_name/entries/entry_1'] = create_entry(
+            'display_name', 'description')
+        self.__datacatalog_client.entries['entry_group_name/entries/entry_2'] = create_entry(
+            'display_name', 'description')
+        self.__datacatalog_client.entries['other/entries/entry_3'] = create_entry(
+            'display_name', 'description')
+
+        entries = run(self.__datacatalog_facade.list_entries('entry_group_name'))
+
+        self.assertEqual(2, len(entries))
+        self.assertEqual(1, self.__datacatalog_client.calls['list_entries'])
+
+    def test_upsert_entry_prefetched_unchanged_should_not_call_api(self):
+        entry = create_entry('display_name', 'description')
+
+        run(
+            self.__datacatalog_facade.upsert_entry('entry_group_name', 'name', 'entry_id', entry,
+                                                   {'entry_id': entry}))
+
+        self.assertEqual(0, sum(self.__datacatalog_client.calls.values()))
+
+    def test_upsert_entry_prefetched_nonexistent_should_create(self):
+        entry = create_entry('display_name', 'description')
+
+        run(
+            self.__datacatalog_facade.upsert_entry('entry_group_name',
+                                                   'entry_group_name/entries/entry_id', 'entry_id',
+                                                   entry, {}))
+
+        self.assertEqual(0, self.__datacatalog_client.calls['get_entry'])
+        self.assertEqual(1, self.__datacatalog_client.calls['create_entry'])
+
+    def test_upsert_entry_prefetched_already_exists_should_read_entry(self):
+        self.__datacatalog_client.entries['name'] = create_entry('display_name', 'description')
+        self.__datacatalog_client.errors['create_entry'] = \
+            exceptions.AlreadyExists('Entry already exists')
+
+        run(
+            self.__datacatalog_facade.upsert_entry('entry_group_name', 'name', 'entry_id',
+                                                   create_entry('display_name', 'description'),
+                                                   {}))
+
+        self.assertEqual(1, self.__datacatalog_client.calls['get_entry'])
+        self.assertEqual(0, self.__datacatalog_client.calls['update_entry'])
+
+    def test_upsert_entry_prefetched_should_return_none_on_failed_precondition(self):
+        persisted_entry = create_entry('display_name', 'description')
+        self.__datacatalog_client.errors['update_entry'] = \
+            exceptions.FailedPrecondition('Failed precondition')
+
+        result = run(
+            self.__datacatalog_facade.upsert_entry('entry_group_name', 'name', 'entry_id',
+                                                   create_entry('display_name_2', 'description'),
+                                                   {'entry_id': persisted_entry}))
+
+        self.assertEqual(1, self.__datacatalog_client.calls['update_entry'])
+        self.assertIsNone(result)
+
+    def test_upsert_entry_with_manifest_should_record_synced_entry(self):
+        self.__datacatalog_client.entries['name'] = create_entry('display_name', 'description')
+        entry = create_entry('display_name_2', 'description')
+        manifest = mock.MagicMock()
+
+        run(
+            self.__datacatalog_facade.upsert_entry('entry_group_name',
+                                                   'name',
+                                                   'entry_id',
+                                                   entry,
+                                                   manifest=manifest))
+
+        manifest.record.assert_called_once_with('name', entry_fingerprint.fingerprint_entry(entry))
+
+    def test_upsert_entry_with_manifest_should_not_record_entry_not_created(self):
+        self.__datacatalog_client.errors['create_entry'] = \
+            exceptions.PermissionDenied('Permission denied')
+        manifest = mock.MagicMock()
+
+        run(
+            self.__datacatalog_facade.upsert_entry('entry_group_name',
+                                                   'name',
+                                                   'entry_id',
+                                                   create_entry('display_name', 'description'), {},
+                                                   manifest=manifest))
+
+        manifest.record.assert_not_called()
+
+    def test_delete_entry_should_succeed(self):
+        self.__datacatalog_client.entries['name'] = create_entry('display_name', 'description')
+
+        outcome = run(self.__datacatalog_facade.delete_entry('name'))
+
+        self.assertEqual(1, self.__datacatalog_client.calls['delete_entry'])
+        self.assertNotIn('name', self.__datacatalog_client.entries)
+        self.assertEqual('deleted', outcome)
+
+    def test_delete_entry_not_found_should_return_outcome(self):
+        outcome = run(self.__datacatalog_facade.delete_entry('name'))
+
+        self.assertEqual(1, self.__datacatalog_client.calls['delete_entry'])
+        self.assertEqual('not found', outcome)
+
+    def test_delete_entry_error_should_be_ignored(self):
+        self.__datacatalog_client.errors['delete_entry'] = \
+            exceptions.ServiceUnavailable('Service unavailable')
+
+        outcome = run(self.__datacatalog_facade.delete_entry('name'))
+
+        self.assertEqual(1, self.__datacatalog_client.calls['delete_entry'])
+        self.assertEqual('failed', outcome)
+
+    def test_create_entry_group_should_succeed(self):
+        result = run(
+            self.__datacatalog_facade.create_entry_group('my-project', 'location-id',
+                                                         'entry_group_id',
+                                                         datacatalog_v1.types.EntryGroup()))
+
+        self.assertEqual(1, self.__datacatalog_client.calls['create_entry_group'])
+        self.assertEqual('projects/my-project/locations/location-id/entryGroups/entry_group_id',
+                         result.name)
+
+    def test_list_entry_groups_should_return_all_pages(self):
+        for entry_group_id in ('entry_group_1', 'entry_group_2'):
+            run(
+                self.__datacatalog_facade.create_entry_group('my-project', 'location-id',
+                                                             entry_group_id,
+                                                             datacatalog_v1.types.EntryGroup()))
+
+        entry_groups = run(self.__datacatalog_facade.list_entry_groups(
+            'my-project', 'location-id'))
+
+        self.assertEqual(1, self.__datacatalog_client.calls['list_entry_groups'])
+        self.assertEqual(['entry_group_1', 'entry_group_2'],
+                         [entry_group.name.split('/')[-1] for entry_group in entry_groups])
+
+    def test_update_entry_group_should_send_field_mask(self):
+        entry_group = datacatalog_v1.types.EntryGroup()
+        entry_group.name = 'entry_group_name'
+
+        run(self.__datacatalog_facade.update_entry_group(entry_group, ('display_name', )))
+
+        self.assertEqual(1, self.__datacatalog_client.calls['update_entry_group'])
+        self.assertEqual({'paths': ['display_name']},
+                         self.__datacatalog_client.update_masks['entry_group_name'])
+
+    def test_delete_entry_group_should_succeed(self):
+        run(self.__datacatalog_facade.delete_entry_group('entry_group_name'))
+
+        self.assertEqual(1, self.__datacatalog_client.calls['delete_entry_group'])
+
+    def test_extract_resources_from_entry_group_should_return_values(self):
+        resource_name = 'projects/my-project/locations/us-central1/entryGroups/my-entry-group'
+
+        project_id, location_id, entry_group_id = \
+            self.__datacatalog_facade.extract_resources_from_entry_group(resource_name)
+
+        self.assertEqual('my-project', project_id)
+        self.assertEqual('us-central1', location_id)
+        self.assertEqual('my-entry-group', entry_group_id)
+
+
+class FakeAsyncDataCatalogClient:
+    """In-process stand-in for the Data Catalog asyncio client."""
+
+    def __init__(self):
+        self.entries = {}
+        self.entry_groups = {}
+        self.update_masks = {}
+        self.errors = {}
+        self.calls = collections.Counter()
+
+    async def __call(self, method):
+        self.calls[method] += 1
+        await asyncio.sleep(0)
+        if method in self.errors:
+            raise self.errors[method]
+
+    async def create_entry(self, parent, entry_id, entry):
+        await self.__call('create_entry')
+        entry.name = '{}/entries/{}'.format(parent, entry_id)
+        self.entries[entry.name] = entry
+        return entry
+
+    async def get_entry(self, name):
+        await self.__call('get_entry')
+        if name not in self.entries:
+            raise exceptions.PermissionDenied('Entry not found')
+        return self.entries[name]
+
+    async def list_entries(self, parent):
+        await self.__call('list_entries')
+        return FakeAsyncPager(
+            [entry for name, entry in self.entries.items() if name.startswith(parent + '/')])
+
+    async def update_entry(self, entry, update_mask):
+        await self.__call('update_entry')
+        self.entries[entry.name] = entry
+        return entry
+
+    async def delete_entry(self, name):
+        await self.__call('delete_entry')
+        if name not in self.entries:
+            raise exceptions.NotFound('Entry not found')
+        del self.entries[name]
+
+    async def create_entry_group(self, parent, entry_group_id, entry_group):
+        await self.__call('create_entry_group')
+        entry_group.name = '{}/entryGroups/{}'.format(parent, entry_group_id)
+        self.entry_groups[entry_group.name] = entry_group
+        return entry_group
+
+    async def list_entry_groups(self, parent):
+        await self.__call('list_entry_groups')
+        return FakeAsyncPager([
+            entry_group for name, entry_group in self.entry_groups.items()
+            if name.startswith(parent + '/')
+        ])
+
+    async def update_entry_group(self, entry_group, update_mask):
+        await self.__call('update_entry_group')
+        self.entry_groups[entry_group.name] = entry_group
+        self.update_masks[entry_group.name] = update_mask
+        return entry_group
+
+    async def delete_entry_group(self, name):
+        await self.__call('delete_entry_group')
+
+
+class FakeAsyncPager:
+
+    def __init__(self, items):
+        self.__items = iter(items)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.__items)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def create_entry(display_name, description):
+    entry = datacatalog_v1.types.Entry()
+    entry.display_name = display_name
+    entry.description = description
+    return entry
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
@@ -0,0 +1,67 @@
+import threading
+import unittest
+from unittest import mock
+
+from datacatalog_fileset_processor import client_pool
+
+
+class ClientPoolTest(unittest.TestCase):
+
+    def test_call_should_dispatch_round_robin(self):
+        clients = [mock.MagicMock() for _ in range(3)]
+        pool = client_pool.ClientPool(clients)
+
+        for index in range(7):
+            pool.get_entry(name='entry_{}'.format(index))
+
+        self.assertEqual([3, 2, 2], [client.get_entry.call_count for client in clients])
+        clients[1].get_entry.assert_called_with(name='entry_4')
+
+    def test_call_least_loaded_should_skip_busy_clients(self):
+        clients = [mock.MagicMock() for _ in range(3)]
+        pool = client_pool.ClientPool(clients, dispatch='least-loaded')
+        started = threading.Event()
+        finished = threading.Event()
+
+        def wait(**kwargs):
+            started.set()
+            finished.wait()
+
+        clients[0].list_entries.side_effect = wait
+        thread = threading.Thread(target=pool.list_entries, kwargs={'parent': 'entry_group'})
+        thread.start()
+        started.wait()
+        for _ in range(4):
+            pool.get_entry(name='entry')
+        self.assertEqual([1, 0, 0], pool.in_flight)
+        finished.set()
+        thread.join()
+
+        clients[0].get_entry.assert_not_called()
+        self.assertEqual(4, clients[1].get_entry.call_count + clients[2].get_entry.call_count)
+        self.assertEqual([0, 0, 0], pool.in_flight)
+
+    def test_call_should_release_client_on_error(self):
+        client = mock.MagicMock()
+        client.get_entry.side_effect = ValueError('error')
+        pool = client_pool.ClientPool([client], dispatch='least-loaded')
+
+        self.assertRaises(ValueError, pool.get_entry, name='entry')
+
+        self.assertEqual([0], pool.in_flight)
+
+    def test_constructor_unknown_dispatch_should_raise(self):
+        self.assertRaises(ValueError, client_pool.ClientPool, [mock.MagicMock()], 'random')
+
+    def test_create_transport_should_create_channel_of_its_own(self):
+        transport_class = mock.MagicMock()
+
+        transport = client_pool.create_transport('credentials', transport_class, 'address:443')
+
+        self.assertEqual(transport_class.return_value, transport)
+        _, kwargs = transport_class.create_channel.call_args
+        self.assertEqual('address:443', kwargs['address'])
+        self.assertEqual('credentials', kwargs['credentials'])
+        self.assertIn(('grpc.use_local_subchannel_pool', 1), kwargs['options'])
+        transport_class.assert_called_once_with(
+            channel=transport_class.create_channel.return_value)
@@ -0,0 +1,82 @@
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from datacatalog_fileset_processor import columnar_reader
+
+_PYARROW_MISSING = importlib.util.find_spec('pyarrow') is None
+
+
+class ColumnarReaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.__temp_dir)
+        self.__dataframe = pd.DataFrame(
+            data={
+                'other_column': ['a', 'b', 'c'],
+                'entry_id': ['entry_1', None, '002'],
+                'entry_group_name': ['entry_group_1', None, 'entry_group_2'],
+            })
+
+    def test_get_columnar_format_should_use_file_extension(self):
+        self.assertEqual('parquet', columnar_reader.get_columnar_format('dir/filesets.PARQUET'))
+        self.assertEqual('arrow', columnar_reader.get_columnar_format('filesets.feather'))
+        self.assertEqual('jsonl', columnar_reader.get_columnar_format('filesets.ndjson'))
+        self.assertIsNone(columnar_reader.get_columnar_format('filesets.csv'))
+
+    def test_read_dataframes_not_columnar_file_should_raise(self):
+        self.assertRaises(ValueError, list, columnar_reader.read_dataframes('filesets.csv'))
+
+    def test_read_dataframes_json_lines_should_read_chunks_as_strings(self):
+        file_path = self.__path('filesets.jsonl')
+        self.__dataframe.to_json(file_path, orient='records', lines=True)
+
+        dataframes = list(columnar_reader.read_dataframes(file_path, chunk_size=2))
+
+        self.assertEqual([[0, 1], [2]], [list(dataframe.index) for dataframe in dataframes])
+        self.assertEqual('002', dataframes[1].loc[2, 'entry_id'])
+        self.assertNotIn('other_column', dataframes[0].columns)
+        self.assertIn('entry_display_name', dataframes[0].columns)
+
+    @unittest.skipIf(_PYARROW_MISSING, 'pyarrow is not installed')
+    def test_read_dataframes_parquet_should_read_needed_columns_by_row_group(self):
+        import pyarrow
+        from pyarrow import parquet
+        file_path = self.__path('filesets.parquet')
+        parquet.write_table(pyarrow.Table.from_pandas(self.__dataframe, preserve_index=False),
+                            file_path,
+                            row_group_size=2)
+
+        dataframes = list(columnar_reader.read_dataframes(file_path))
+
+        self.assertEqual([[0, 1], [2]], [list(dataframe.index) for dataframe in dataframes])
+        self.assertEqual(['entry_group_name', 'entry_id'], list(dataframes[0].columns))
+        self.assertIsNone(dataframes[0].loc[1, 'entry_id'])
+
+    @unittest.skipIf(_PYARROW_MISSING, 'pyarrow is not installed')
+    def test_read_dataframes_arrow_should_read_file_and_stream_formats(self):
+        import pyarrow
+        table = pyarrow.Table.from_pandas(self.__dataframe, preserve_index=False)
+        file_path = self.__path('filesets.arrow')
+        with pyarrow.OSFile(file_path, 'wb') as sink, \
+                pyarrow.ipc.new_file(sink, table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=2):
+                writer.write_batch(batch)
+        stream_path = self.__path('filesets_stream.arrow')
+        with pyarrow.OSFile(stream_path, 'wb') as sink, \
+                pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        for path, expected_indexes in ((file_path, [[0, 1], [2]]), (stream_path, [[0, 1, 2]])):
+            dataframes = list(columnar_reader.read_dataframes(path))
+
+            self.assertEqual(expected_indexes, [list(dataframe.index) for dataframe in dataframes])
+            self.assertEqual(['entry_group_name', 'entry_id'], list(dataframes[0].columns))
+
+    def __path(self, file_name):
+        return os.path.join(self.__temp_dir, file_name)
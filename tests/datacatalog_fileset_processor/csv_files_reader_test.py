@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from datacatalog_fileset_processor import csv_files_reader, fileset_spec
+
+
+class CsvFilesReaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.__temp_dir)
+
+    def test_resolve_csv_files_should_list_directory_csv_files(self):
+        file_paths = self.__touch('b.csv', 'a.csv', 'notes.txt')
+
+        self.assertEqual([file_paths[1], file_paths[0]],
+                         csv_files_reader.resolve_csv_files(self.__temp_dir))
+
+    def test_resolve_csv_files_should_list_directory_columnar_files(self):
+        file_paths = self.__touch('b.parquet', 'a.csv', 'c.JSONL', 'notes.json')
+
+        self.assertEqual([file_paths[1], file_paths[0], file_paths[2]],
+                         csv_files_reader.resolve_csv_files(self.__temp_dir))
+
+    def test_resolve_csv_files_should_expand_glob_pattern(self):
+        file_paths = self.__touch('team_b.csv', 'team_a.csv', 'other.csv')
+
+        self.assertEqual([file_paths[1], file_paths[0]],
+                         csv_files_reader.resolve_csv_files(
+                             os.path.join(self.__temp_dir, 'team_*.csv')))
+
+    def test_resolve_csv_files_should_keep_file_path(self):
+        self.assertEqual(['filesets.csv'], csv_files_reader.resolve_csv_files('filesets.csv'))
+
+    def test_resolve_csv_files_without_matches_should_raise(self):
+        self.assertRaises(FileNotFoundError, csv_files_reader.resolve_csv_files, self.__temp_dir)
+
+    def test_iter_should_yield_entry_groups_in_files_order(self):
+        file_paths = self.__touch(*['team_{}.csv'.format(index) for index in range(7)])
+        files_reader = csv_files_reader.CsvFilesReader(file_paths, read_entry_groups, workers=2)
+
+        entry_group_specs = list(files_reader)
+
+        self.assertEqual(['team_{}'.format(index) for index in range(7)] + ['shared'] * 7,
+                         [entry_group_spec.name for entry_group_spec in entry_group_specs[::2]] +
+                         [entry_group_spec.name for entry_group_spec in entry_group_specs[1::2]])
+        self.assertEqual(14, files_reader.entry_groups_count)
+        self.assertEqual(14, files_reader.entries_count)
+        self.assertEqual(['shared'], list(files_reader.duplicate_entry_groups))
+        self.assertEqual(file_paths, files_reader.duplicate_entry_groups['shared'])
+
+    def test_iter_should_not_report_entry_group_repeated_in_a_file(self):
+        file_path, = self.__touch('team.csv')
+        files_reader = csv_files_reader.CsvFilesReader(
+            [file_path, file_path],
+            lambda path: [fileset_spec.EntryGroupSpec('team', entries=[])],
+            workers=1)
+
+        self.assertEqual(2, len(list(files_reader)))
+        self.assertEqual({}, files_reader.duplicate_entry_groups)
+
+    def test_log_summary_should_log_duplicates(self):
+        file_paths = self.__touch('team_a.csv', 'team_b.csv')
+        files_reader = csv_files_reader.CsvFilesReader(file_paths, read_entry_groups, workers=1)
+        list(files_reader)
+
+        with self.assertLogs(level='INFO') as logs:
+            files_reader.log_summary()
+
+        self.assertIn('Read 2 CSV files: 4 Entry Groups, 4 Entries', logs.output[0])
+        self.assertIn('1 Entry Groups are defined in more than one file', logs.output[1])
+        self.assertIn('shared: {}, {}'.format(*file_paths), logs.output[2])
+
+    def __touch(self, *file_names):
+        file_paths = []
+        for file_name in file_names:
+            file_path = os.path.join(self.__temp_dir, file_name)
+            open(file_path, 'w').close()
+            file_paths.append(file_path)
+        return file_paths
+
+
+def read_entry_groups(file_path):
+    # Module level, so worker processes can unpickle it.
+    team = os.path.splitext(os.path.basename(file_path))[0]
+    return [
+        fileset_spec.EntryGroupSpec(team, entries=[fileset_spec.EntrySpec(team, 'entry')]),
+        fileset_spec.EntryGroupSpec('shared', entries=[fileset_spec.EntrySpec('shared', team)])
+    ]
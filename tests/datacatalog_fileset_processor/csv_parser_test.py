@@ -0,0 +1,120 @@
+import glob
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from datacatalog_fileset_processor import csv_parser, fileset_datasource_processor, fileset_spec
+
+_PROCESSOR_CLASS = fileset_datasource_processor.FilesetDatasourceProcessor
+
+_SAMPLE_INPUT_DIR = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'sample-input',
+                                 'create-filesets')
+
+_HEADER = 'entry_group_name,entry_group_display_name,entry_group_description,entry_id,' \
+    'entry_display_name,entry_description,entry_file_patterns,schema_column_name,' \
+    'schema_column_type,schema_column_description,schema_column_mode\n'
+
+
+class CsvParserTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.__temp_dir)
+
+    def test_read_entry_group_specs_should_match_pandas_parser(self):
+        file_paths = sorted(glob.glob(os.path.join(_SAMPLE_INPUT_DIR, '*.csv')))
+        self.assertTrue(file_paths)
+
+        for file_path in file_paths:
+            with self.subTest(file_path=os.path.basename(file_path)):
+                self.assertEqual(read_with_pandas(file_path),
+                                 csv_parser.read_entry_group_specs(file_path))
+
+    def test_read_entry_group_specs_stream_should_match_pandas_parser(self):
+        file_path = os.path.join(_SAMPLE_INPUT_DIR, 'fileset-entry-opt-1-all-metadata.csv')
+
+        self.assertEqual(read_with_pandas(file_path),
+                         list(csv_parser.read_entry_group_specs(file_path, stream=True)))
+
+    def test_read_entry_group_specs_stream_non_contiguous_should_warn(self):
+        file_path = self.__write_csv('eg_1,,,entry_1,Entry 1,,gs://b/*,,,,\n'
+                                     'eg_2,,,entry_2,Entry 2,,gs://b/*,,,,\n'
+                                     'eg_1,,,entry_3,Entry 3,,gs://b/*,,,,\n')
+
+        with self.assertLogs(level='WARNING') as logs:
+            entry_groups = list(csv_parser.read_entry_group_specs(file_path, stream=True))
+
+        self.assertEqual(['eg_1', 'eg_2', 'eg_1'],
+                         [entry_group.name for entry_group in entry_groups])
+        self.assertIn('rows are not contiguous', logs.output[0])
+
+    def test_entry_groups_builder_should_merge_rows_and_drop_unnamed_columns(self):
+        builder = csv_parser.EntryGroupsBuilder()
+        for row in (
+            ('eg_1', 'Group 1', None, 'entry_1', 'Entry 1', None, 'gs://b/*', 'c_1', 'STRING',
+             None, 'REQUIRED'),
+            ('eg_1', 'Group 1', None, 'entry_2', 'Entry 2', None, 'gs://b/*|gs://c/*', None, None,
+             None, None),
+            ('eg_1', 'Group 1', None, 'entry_1', 'Entry 1', None, 'gs://b/*', 'c_2', 'INT64', None,
+             float('nan')),
+            ('eg_1', 'Group 1', None, 'entry_1', 'Entry 1', None, 'gs://b/*', 'c_1', 'BOOL', None,
+             None),
+            (None, None, None, 'entry_3', 'Entry 3', None, 'gs://b/*', None, None, None, None),
+        ):
+            builder.add_row(row)
+
+        entry_group, = builder.pop_entry_group_specs()
+        entry_1, entry_2 = entry_group.entries
+
+        self.assertEqual(
+            [fileset_spec.ColumnSpec('c_1', 'BOOL'),
+             fileset_spec.ColumnSpec('c_2', 'INT64')], entry_1.columns)
+        self.assertEqual('eg_1/entries/entry_2', entry_2.name)
+        self.assertEqual(('gs://b/*', 'gs://c/*'), entry_2.file_patterns)
+        self.assertEqual([], entry_2.columns)
+        self.assertIs(entry_group.name, entry_2.entry_group_name)
+        self.assertEqual([], builder.pop_entry_group_specs())
+
+    def test_read_rows_should_drop_comments_outside_quoted_values(self):
+        rows = list(
+            csv_parser.read_rows(
+                io.StringIO('# Header comment\n' + _HEADER + '\n'
+                            'eg_1,"Group # 1",,entry_1,Entry,"Multi\n\nline",gs://b/*,c,STRING'
+                            ' # Trailing comment\n'
+                            '   \n'
+                            ',,,entry_2,"  Entry 2 ","Second\nline",gs://b/*,c,STRING,NULL,\n')))
+
+        self.assertEqual([
+            ('eg_1', 'Group # 1', None, 'entry_1', 'Entry', 'Multi\n\nline', 'gs://b/*', 'c',
+             'STRING', None, None),
+            ('eg_1', 'Group # 1', None, 'entry_2', 'Entry 2', 'Second\nline', 'gs://b/*', 'c',
+             'STRING', None, None),
+        ], rows)
+
+    def test_read_rows_empty_file_should_return_no_rows(self):
+        self.assertEqual([], list(csv_parser.read_rows(io.StringIO('# Only a comment\n'))))
+
+    def test_is_missing_should_detect_none_and_nan(self):
+        self.assertTrue(csv_parser.is_missing(None))
+        self.assertTrue(csv_parser.is_missing(float('nan')))
+        self.assertFalse(csv_parser.is_missing(''))
+
+    def __write_csv(self, content):
+        file_path = os.path.join(self.__temp_dir, 'filesets.csv')
+        with open(file_path, 'w') as csv_file:
+            csv_file.write(_HEADER + content)
+        return file_path
+
+
+def read_with_pandas(file_path):
+    normalize_dataframe = getattr(_PROCESSOR_CLASS,
+                                  '_FilesetDatasourceProcessor__normalize_dataframe')
+    extract_entry_group_specs = getattr(_PROCESSOR_CLASS,
+                                        '_FilesetDatasourceProcessor__extract_entry_group_specs')
+    return extract_entry_group_specs(normalize_dataframe(pd.read_csv(file_path, comment='#')))
@@ -2,7 +2,7 @@ import unittest
 
 from google.cloud.datacatalog import enums
 
-from datacatalog_fileset_processor import datacatalog_entity_factory
+from datacatalog_fileset_processor import datacatalog_entity_factory, fileset_spec
 
 
 class DataCatalogEntityFactoryTest(unittest.TestCase):
@@ -13,88 +13,63 @@ class DataCatalogEntityFactoryTest(unittest.TestCase):
 
     def test_make_entry_valid_boolean_values_should_set_fields(self):
 
-        entry_dict = {
-            'display_name': 'My Entry',
-            'description': 'My Entry Description',
-            'file_patterns': ['gs://bucket_13c4/*', 'gs://bucket_23c4/*'],
-            'schema_columns': {
-                'has_pii': {
-                    'schema_column_type': 'BOOL',
-                    'schema_column_description': 'My BOOL field',
-                    'schema_column_mode': 'REQUIRED',
-                }
-            }
-        }
-
-        entry = datacatalog_entity_factory.DataCatalogEntityFactory.make_entry(entry_dict)
+        entry_spec = fileset_spec.EntrySpec(
+            'entry_group',
+            'entry',
+            'My Entry',
+            'My Entry Description', ['gs://bucket_13c4/*', 'gs://bucket_23c4/*'],
+            columns=[fileset_spec.ColumnSpec('has_pii', 'BOOL', 'My BOOL field', 'REQUIRED')])
+
+        entry = datacatalog_entity_factory.DataCatalogEntityFactory.make_entry(entry_spec)
 
         my_pii_field = entry.schema.columns[0]
 
-        self.assertEqual(entry_dict['display_name'], entry.display_name)
-        self.assertEqual(entry_dict['description'], entry.description)
-        self.assertEqual(entry_dict['file_patterns'][0], entry.gcs_fileset_spec.file_patterns[0])
-        self.assertEqual(entry_dict['file_patterns'][1], entry.gcs_fileset_spec.file_patterns[1])
+        self.assertEqual(entry_spec.display_name, entry.display_name)
+        self.assertEqual(entry_spec.description, entry.description)
+        self.assertEqual(entry_spec.file_patterns[0], entry.gcs_fileset_spec.file_patterns[0])
+        self.assertEqual(entry_spec.file_patterns[1], entry.gcs_fileset_spec.file_patterns[1])
         self.assertEqual('has_pii', my_pii_field.column)
-        self.assertEqual(entry_dict['schema_columns']['has_pii']['schema_column_type'],
-                         my_pii_field.type)
-        self.assertEqual(entry_dict['schema_columns']['has_pii']['schema_column_description'],
-                         my_pii_field.description)
-        self.assertEqual(entry_dict['schema_columns']['has_pii']['schema_column_mode'],
-                         my_pii_field.mode)
+        self.assertEqual('BOOL', my_pii_field.type)
+        self.assertEqual('My BOOL field', my_pii_field.description)
+        self.assertEqual('REQUIRED', my_pii_field.mode)
 
     def test_make_entry_multiple_schema_columns_should_set_fields(self):
 
-        entry_dict = {
-            'display_name': 'My Entry',
-            'description': 'My Entry Description',
-            'file_patterns': ['gs://bucket_13c4/*', 'gs://bucket_23c4/*'],
-            'schema_columns': {
-                'has_pii': {
-                    'schema_column_type': 'BOOL',
-                    'schema_column_description': 'My BOOL field',
-                    'schema_column_mode': 'REQUIRED',
-                },
-                'first_name': {
-                    'schema_column_type': 'STRING',
-                    'schema_column_description': 'My STRING field',
-                    'schema_column_mode': 'REQUIRED',
-                }
-            }
-        }
-
-        entry = datacatalog_entity_factory.DataCatalogEntityFactory.make_entry(entry_dict)
+        entry_spec = fileset_spec.EntrySpec(
+            'entry_group',
+            'entry',
+            'My Entry',
+            'My Entry Description', ['gs://bucket_13c4/*', 'gs://bucket_23c4/*'],
+            columns=[
+                fileset_spec.ColumnSpec('has_pii', 'BOOL', 'My BOOL field', 'REQUIRED'),
+                fileset_spec.ColumnSpec('first_name', 'STRING', 'My STRING field', 'REQUIRED')
+            ])
+
+        entry = datacatalog_entity_factory.DataCatalogEntityFactory.make_entry(entry_spec)
 
         my_pii_field = entry.schema.columns[0]
         first_name = entry.schema.columns[1]
 
-        self.assertEqual(entry_dict['display_name'], entry.display_name)
-        self.assertEqual(entry_dict['description'], entry.description)
-        self.assertEqual(entry_dict['file_patterns'][0], entry.gcs_fileset_spec.file_patterns[0])
-        self.assertEqual(entry_dict['file_patterns'][1], entry.gcs_fileset_spec.file_patterns[1])
+        self.assertEqual(entry_spec.display_name, entry.display_name)
+        self.assertEqual(entry_spec.description, entry.description)
+        self.assertEqual(entry_spec.file_patterns[0], entry.gcs_fileset_spec.file_patterns[0])
+        self.assertEqual(entry_spec.file_patterns[1], entry.gcs_fileset_spec.file_patterns[1])
         self.assertEqual('has_pii', my_pii_field.column)
-        self.assertEqual(entry_dict['schema_columns']['has_pii']['schema_column_type'],
-                         my_pii_field.type)
-        self.assertEqual(entry_dict['schema_columns']['has_pii']['schema_column_description'],
-                         my_pii_field.description)
-        self.assertEqual(entry_dict['schema_columns']['has_pii']['schema_column_mode'],
-                         my_pii_field.mode)
+        self.assertEqual('BOOL', my_pii_field.type)
+        self.assertEqual('My BOOL field', my_pii_field.description)
+        self.assertEqual('REQUIRED', my_pii_field.mode)
         self.assertEqual('first_name', first_name.column)
-        self.assertEqual(entry_dict['schema_columns']['first_name']['schema_column_type'],
-                         first_name.type)
-        self.assertEqual(entry_dict['schema_columns']['first_name']['schema_column_description'],
-                         first_name.description)
-        self.assertEqual(entry_dict['schema_columns']['first_name']['schema_column_mode'],
-                         first_name.mode)
+        self.assertEqual('STRING', first_name.type)
+        self.assertEqual('My STRING field', first_name.description)
+        self.assertEqual('REQUIRED', first_name.mode)
 
     def test_make_entry_group_should_set_fields(self):
 
-        make_entry_group = {
-            'display_name': 'My Entry Group',
-            'description': 'My Entry Group Description',
-        }
+        entry_group_spec = fileset_spec.EntryGroupSpec('entry_group', 'My Entry Group',
+                                                       'My Entry Group Description')
 
         entry_group = datacatalog_entity_factory.DataCatalogEntityFactory.make_entry_group(
-            make_entry_group)
+            entry_group_spec)
 
-        self.assertEqual(make_entry_group['display_name'], entry_group.display_name)
-        self.assertEqual(make_entry_group['description'], entry_group.description)
+        self.assertEqual(entry_group_spec.display_name, entry_group.display_name)
+        self.assertEqual(entry_group_spec.description, entry_group.description)
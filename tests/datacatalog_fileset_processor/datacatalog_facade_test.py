@@ -4,7 +4,8 @@ from unittest import mock
 from google.api_core import exceptions
 from google.cloud import datacatalog_v1
 
-from datacatalog_fileset_processor import datacatalog_facade
+from datacatalog_fileset_processor import client_pool, datacatalog_facade, entry_fingerprint, \
+    rate_limiter
 
 
 class DataCatalogFacadeTestCase(unittest.TestCase):
@@ -19,6 +20,41 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
     def test_constructor_should_set_instance_attributes(self):
         self.assertIsNotNone(self.__datacatalog_facade.__dict__['_DataCatalogFacade__datacatalog'])
 
+    @mock.patch('datacatalog_fileset_processor.datacatalog_facade.datacatalog_v1.DataCatalogClient'
+                )
+    def test_constructor_should_wrap_client_with_rate_limiter(self, mock_datacatalog_client):
+        rate_limiter = mock.MagicMock()
+
+        facade = datacatalog_facade.DataCatalogFacade(rate_limiter=rate_limiter)
+
+        rate_limiter.wrap.assert_called_once_with(mock_datacatalog_client.return_value)
+        self.assertEqual(rate_limiter.wrap.return_value,
+                         facade.__dict__['_DataCatalogFacade__datacatalog'])
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_facade.datacatalog_v1.DataCatalogClient'
+                )
+    def test_constructor_should_record_metrics_under_rate_limiter(self, mock_datacatalog_client):
+        rate_limiter = mock.MagicMock()
+        metrics = mock.MagicMock()
+
+        facade = datacatalog_facade.DataCatalogFacade(rate_limiter=rate_limiter, metrics=metrics)
+
+        metrics.wrap.assert_called_once_with(mock_datacatalog_client.return_value)
+        rate_limiter.wrap.assert_called_once_with(metrics.wrap.return_value)
+        self.assertEqual(rate_limiter.wrap.return_value,
+                         facade.__dict__['_DataCatalogFacade__datacatalog'])
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_facade.datacatalog_v1.DataCatalogClient'
+                )
+    def test_constructor_with_channels_should_make_client_pool(self, mock_datacatalog_client):
+        facade = datacatalog_facade.DataCatalogFacade(channels=3,
+                                                      channel_dispatch='least-loaded')
+
+        datacatalog = facade.__dict__['_DataCatalogFacade__datacatalog']
+        self.assertIsInstance(datacatalog, client_pool.ClientPool)
+        self.assertEqual(3, len(datacatalog.clients))
+        mock_datacatalog_client.assert_called_with(transport=client_pool.create_transport)
+
     def test_create_entry_should_succeed(self):
         entry = create_entry('type', 'system', 'display_name', 'name', 'description',
                              'linked_resource', 11, 22)
@@ -28,7 +64,7 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         datacatalog = self.__datacatalog_client
         self.assertEqual(1, datacatalog.create_entry.call_count)
 
-    def test_create_entry_should_return_original_on_permission_denied(self):
+    def test_create_entry_should_return_none_on_permission_denied(self):
         datacatalog = self.__datacatalog_client
         datacatalog.create_entry.side_effect = \
             exceptions.PermissionDenied('Permission denied')
@@ -39,7 +75,7 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         result = self.__datacatalog_facade.create_entry('entry_group_name', 'entry_id', entry)
 
         self.assertEqual(1, datacatalog.create_entry.call_count)
-        self.assertEqual(entry, result)
+        self.assertIsNone(result)
 
     def test_get_entry_should_succeed(self):
         self.__datacatalog_facade.get_entry('entry_name')
@@ -80,9 +116,19 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
 
         self.assertEqual(1, datacatalog.get_entry.call_count)
         self.assertEqual(1, datacatalog.update_entry.call_count)
-        datacatalog.update_entry.assert_called_with(entry=entry_2, update_mask=None)
-
-    def test_upsert_entry_should_return_original_on_failed_precondition(self):
+        entry_update = datacatalog_v1.types.Entry()
+        entry_update.name = 'name_2'
+        entry_update.display_name = 'display_name_2'
+        entry_update.description = 'description_2'
+        datacatalog.update_entry.assert_called_with(
+            entry=entry_update, update_mask={'paths': ['display_name', 'description']})
+        update_payloads = self.__datacatalog_facade.update_payloads
+        self.assertEqual(1, update_payloads.updates_count)
+        self.assertEqual(entry_update.ByteSize(), update_payloads.sent_bytes)
+        self.assertEqual(entry_1.ByteSize(), update_payloads.full_bytes)
+        self.assertGreater(update_payloads.saved_bytes, 0)
+
+    def test_upsert_entry_should_return_none_on_failed_precondition(self):
         entry_1 = create_entry('type', 'system', 'display_name', 'name', 'description',
                                'linked_resource_1', 11, 22)
 
@@ -91,15 +137,15 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         datacatalog.update_entry.side_effect = \
             exceptions.FailedPrecondition('Failed precondition')
 
-        entry_2 = create_entry('type', 'system', 'display_name', 'name', 'description',
-                               'linked_resource_2', 11, 22)
+        entry_2 = create_entry('type', 'system', 'display_name', 'name', 'description_2',
+                               'linked_resource_1', 11, 22)
 
         result = self.__datacatalog_facade.upsert_entry('entry_group_name', 'name', 'entry_id',
                                                         entry_2)
 
         self.assertEqual(1, datacatalog.get_entry.call_count)
         self.assertEqual(1, datacatalog.update_entry.call_count)
-        self.assertEqual(entry_1, result)
+        self.assertIsNone(result)
 
     def test_upsert_entry_unchanged_should_not_update(self):
         entry = create_entry('type', 'system', 'display_name', 'name', 'description',
@@ -113,20 +159,282 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         self.assertEqual(1, datacatalog.get_entry.call_count)
         datacatalog.update_entry.assert_not_called()
 
+    def test_entry_was_updated_schema_only_change_should_return_true(self):
+        entry_1 = create_entry('type', 'system', 'display_name', 'name', 'description',
+                               'linked_resource', 11, 22)
+        entry_2 = create_entry('type', 'system', 'display_name', 'name', 'description',
+                               'linked_resource', 11, 22)
+        entry_2.schema.columns.append(datacatalog_v1.types.ColumnSchema(column='first_name'))
+
+        self.assertTrue(datacatalog_facade.DataCatalogFacade.entry_was_updated(entry_1, entry_2))
+
+    def test_entry_was_updated_file_patterns_change_should_return_true(self):
+        entry_1 = create_entry('type', 'system', 'display_name', 'name', 'description',
+                               'linked_resource', 11, 22)
+        entry_2 = create_entry('type', 'system', 'display_name', 'name', 'description',
+                               'linked_resource', 11, 22)
+        entry_2.gcs_fileset_spec.file_patterns.append('gs://bucket/*')
+
+        self.assertTrue(datacatalog_facade.DataCatalogFacade.entry_was_updated(entry_1, entry_2))
+
+    def test_entry_was_updated_server_fields_change_should_return_false(self):
+        entry_1 = create_entry('type', 'system', 'display_name', 'name', 'description',
+                               'linked_resource_1', 11, 22)
+        entry_2 = create_entry('type', 'system', 'display_name', 'name_2', 'description',
+                               'linked_resource_2', 11, 22)
+
+        self.assertFalse(datacatalog_facade.DataCatalogFacade.entry_was_updated(entry_1, entry_2))
+
+    def test_list_entries_should_succeed(self):
+        self.__datacatalog_facade.list_entries('entry_group_name')
+
+        datacatalog = self.__datacatalog_client
+        datacatalog.list_entries.assert_called_once_with(parent='entry_group_name')
+
+    def test_list_entries_with_page_size_should_pass_it(self):
+        self.__datacatalog_facade.list_entries('entry_group_name', page_size=1000)
+
+        datacatalog = self.__datacatalog_client
+        datacatalog.list_entries.assert_called_once_with(parent='entry_group_name',
+                                                         page_size=1000)
+
+    def test_is_fileset_entry_should_check_the_entry_type(self):
+        entry = datacatalog_v1.types.Entry()
+        entry.type = datacatalog_v1.enums.EntryType.FILESET
+
+        self.assertTrue(datacatalog_facade.DataCatalogFacade.is_fileset_entry(entry))
+        self.assertFalse(
+            datacatalog_facade.DataCatalogFacade.is_fileset_entry(datacatalog_v1.types.Entry()))
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_facade.datacatalog_v1.DataCatalogClient'
+                )
+    def test_upsert_entry_create_committed_then_timed_out_should_read_entry(
+            self, mock_datacatalog_client):  # noqa: E125
+        entry = create_entry('type', 'system', 'display_name', 'name', 'description',
+                             'linked_resource', 11, 22)
+        datacatalog = mock_datacatalog_client.return_value
+        datacatalog.get_entry.side_effect = [exceptions.PermissionDenied('Not found'), entry]
+        # The first create attempt is committed, but times out, so it is retried.
+        datacatalog.create_entry.side_effect = [
+            exceptions.DeadlineExceeded('Deadline exceeded'),
+            exceptions.AlreadyExists('Entry already exists')
+        ]
+        facade = datacatalog_facade.DataCatalogFacade(
+            rate_limiter=rate_limiter.RateLimiter(initial_backoff=0))
+
+        result = facade.upsert_entry('entry_group_name', 'name', 'entry_id', entry)
+
+        self.assertEqual(entry, result)
+        self.assertEqual(2, datacatalog.create_entry.call_count)
+        self.assertEqual(2, datacatalog.get_entry.call_count)
+        datacatalog.update_entry.assert_not_called()
+
+    def test_upsert_entry_prefetched_nonexistent_should_create(self):
+        entry = create_entry('type', 'system', 'display_name', 'name', 'description',
+                             'linked_resource', 11, 22)
+
+        self.__datacatalog_facade.upsert_entry('entry_group_name', 'name', 'entry_id', entry, {})
+
+        datacatalog = self.__datacatalog_client
+        datacatalog.get_entry.assert_not_called()
+        self.assertEqual(1, datacatalog.create_entry.call_count)
+
+    def test_upsert_entry_prefetched_already_exists_should_read_entry(self):
+        entry = create_entry('type', 'system', 'display_name', 'name', 'description',
+                             'linked_resource', 11, 22)
+
+        datacatalog = self.__datacatalog_client
+        datacatalog.create_entry.side_effect = exceptions.AlreadyExists('Entry already exists')
+        datacatalog.get_entry.return_value = entry
+
+        self.__datacatalog_facade.upsert_entry('entry_group_name', 'name', 'entry_id', entry, {})
+
+        self.assertEqual(1, datacatalog.create_entry.call_count)
+        self.assertEqual(1, datacatalog.get_entry.call_count)
+        datacatalog.update_entry.assert_not_called()
+
+    def test_upsert_entry_prefetched_changed_should_update(self):
+        entry_1 = create_entry('type', 'system', 'display_name', 'name', 'description',
+                               'linked_resource_1', 11, 22)
+        entry_2 = create_entry('type', 'system', 'display_name_2', 'name', 'description_2',
+                               'linked_resource_1', 11, 22)
+
+        self.__datacatalog_facade.upsert_entry('entry_group_name', 'name', 'entry_id', entry_2,
+                                               {'entry_id': entry_1})
+
+        datacatalog = self.__datacatalog_client
+        datacatalog.get_entry.assert_not_called()
+        self.assertEqual({'paths': ['display_name', 'description']},
+                         datacatalog.update_entry.call_args[1]['update_mask'])
+
+    def test_upsert_entry_changed_update_time_only_should_update_whole_entry(self):
+        entry_1 = create_entry('type', 'system', 'display_name', 'name', 'description',
+                               'linked_resource_1', 11, 22)
+        entry_2 = create_entry('type', 'system', 'display_name', 'name', 'description',
+                               'linked_resource_1', 11, 33)
+
+        self.__datacatalog_facade.upsert_entry('entry_group_name', 'name', 'entry_id', entry_2,
+                                               {'entry_id': entry_1})
+
+        datacatalog = self.__datacatalog_client
+        datacatalog.update_entry.assert_called_once_with(entry=entry_1, update_mask=None)
+        self.assertEqual(0, self.__datacatalog_facade.update_payloads.updates_count)
+
+    def test_update_entry_with_fields_should_send_them_only(self):
+        entry = create_entry('type', 'system', 'display_name', 'name', 'description',
+                             'linked_resource', 11, 22)
+        entry.schema.columns.append(
+            datacatalog_v1.types.ColumnSchema(column='first_name', type='STRING'))
+
+        self.__datacatalog_facade.update_entry(entry, ['schema'])
+
+        entry_update = datacatalog_v1.types.Entry()
+        entry_update.name = 'name'
+        entry_update.schema.columns.extend(entry.schema.columns)
+        datacatalog = self.__datacatalog_client
+        datacatalog.update_entry.assert_called_once_with(entry=entry_update,
+                                                         update_mask={'paths': ['schema']})
+        self.assertEqual(entry.ByteSize() - entry_update.ByteSize(),
+                         self.__datacatalog_facade.update_payloads.saved_bytes)
+
+    def test_upsert_entry_prefetched_unchanged_should_not_call_api(self):
+        entry = create_entry('type', 'system', 'display_name', 'name', 'description',
+                             'linked_resource', 11, 22)
+
+        self.__datacatalog_facade.upsert_entry('entry_group_name', 'name', 'entry_id', entry,
+                                               {'entry_id': entry})
+
+        datacatalog = self.__datacatalog_client
+        datacatalog.get_entry.assert_not_called()
+        datacatalog.create_entry.assert_not_called()
+        datacatalog.update_entry.assert_not_called()
+
+    def test_upsert_entry_prefetched_should_match_entry_by_id(self):
+        entry_1 = create_entry('type', 'system', 'display_name', 'name', 'description',
+                               'linked_resource', 11, 22)
+        entry_1.name = 'projects/123456789/locations/us/entryGroups/entry_group_id/entries/' \
+                       'entry_id'
+        entry_2 = create_entry('type', 'system', 'display_name', 'name', 'description',
+                               'linked_resource', 11, 22)
+
+        self.__datacatalog_facade.upsert_entry(
+            'projects/my-project/locations/us/entryGroups/entry_group_id',
+            'projects/my-project/locations/us/entryGroups/entry_group_id/entries/entry_id',
+            'entry_id', entry_2, {'entry_id': entry_1})
+
+        datacatalog = self.__datacatalog_client
+        datacatalog.get_entry.assert_not_called()
+        datacatalog.create_entry.assert_not_called()
+        datacatalog.update_entry.assert_not_called()
+
+    def test_upsert_entry_prefetched_should_return_none_on_failed_precondition(self):
+        entry_1 = create_entry('type', 'system', 'display_name', 'name', 'description',
+                               'linked_resource_1', 11, 22)
+
+        datacatalog = self.__datacatalog_client
+        datacatalog.update_entry.side_effect = \
+            exceptions.FailedPrecondition('Failed precondition')
+
+        entry_2 = create_entry('type', 'system', 'display_name_2', 'name', 'description',
+                               'linked_resource_2', 11, 22)
+
+        result = self.__datacatalog_facade.upsert_entry('entry_group_name', 'name', 'entry_id',
+                                                        entry_2, {'entry_id': entry_1})
+
+        self.assertEqual(1, datacatalog.update_entry.call_count)
+        self.assertIsNone(result)
+
+    def test_upsert_entry_with_manifest_should_record_created_entry(self):
+        datacatalog = self.__datacatalog_client
+        datacatalog.get_entry.side_effect = exceptions.PermissionDenied('Entry not found')
+        manifest = mock.MagicMock()
+
+        entry = create_entry('type', 'system', 'display_name', 'name', 'description',
+                             'linked_resource', 11, 22)
+
+        self.__datacatalog_facade.upsert_entry('entry_group_name',
+                                               'entry_group_name/entries/entry_id',
+                                               'entry_id',
+                                               entry,
+                                               manifest=manifest)
+
+        manifest.record.assert_called_once_with('entry_group_name/entries/entry_id',
+                                                entry_fingerprint.fingerprint_entry(entry))
+
+    def test_upsert_entry_with_manifest_should_record_unchanged_entry(self):
+        entry = create_entry('type', 'system', 'display_name', 'name', 'description',
+                             'linked_resource', 11, 22)
+        manifest = mock.MagicMock()
+
+        self.__datacatalog_facade.upsert_entry('entry_group_name',
+                                               'name',
+                                               'entry_id',
+                                               entry, {'entry_id': entry},
+                                               manifest=manifest)
+
+        manifest.record.assert_called_once_with('name', entry_fingerprint.fingerprint_entry(entry))
+
+    def test_upsert_entry_with_manifest_should_not_record_entry_not_created(self):
+        datacatalog = self.__datacatalog_client
+        datacatalog.create_entry.side_effect = exceptions.PermissionDenied('Permission denied')
+        manifest = mock.MagicMock()
+
+        entry = create_entry('type', 'system', 'display_name', 'name', 'description',
+                             'linked_resource', 11, 22)
+
+        self.__datacatalog_facade.upsert_entry('entry_group_name',
+                                               'name',
+                                               'entry_id',
+                                               entry, {},
+                                               manifest=manifest)
+
+        manifest.record.assert_not_called()
+
+    def test_upsert_entry_with_manifest_should_not_record_entry_not_updated(self):
+        entry_1 = create_entry('type', 'system', 'display_name', 'name', 'description',
+                               'linked_resource_1', 11, 22)
+
+        datacatalog = self.__datacatalog_client
+        datacatalog.get_entry.return_value = entry_1
+        datacatalog.update_entry.side_effect = \
+            exceptions.FailedPrecondition('Failed precondition')
+        manifest = mock.MagicMock()
+
+        entry = create_entry('type', 'system', 'display_name_2', 'name', 'description',
+                             'linked_resource_2', 11, 22)
+
+        self.__datacatalog_facade.upsert_entry('entry_group_name',
+                                               'name',
+                                               'entry_id',
+                                               entry,
+                                               manifest=manifest)
+
+        manifest.record.assert_not_called()
+
     def test_delete_entry_should_succeed(self):
-        self.__datacatalog_facade.delete_entry('entry_name')
+        outcome = self.__datacatalog_facade.delete_entry('entry_name')
 
         datacatalog = self.__datacatalog_client
         self.assertEqual(1, datacatalog.delete_entry.call_count)
+        self.assertEqual('deleted', outcome)
 
     def test_delete_entry_error_should_be_ignored(self):
         datacatalog = self.__datacatalog_client
         datacatalog.delete_entry.side_effect = \
             Exception('Error when deleting entry')
 
-        self.__datacatalog_facade.delete_entry('entry_name')
+        outcome = self.__datacatalog_facade.delete_entry('entry_name')
 
         self.assertEqual(1, datacatalog.delete_entry.call_count)
+        self.assertEqual('failed', outcome)
+
+    def test_delete_entry_not_found_should_return_outcome(self):
+        datacatalog = self.__datacatalog_client
+        datacatalog.delete_entry.side_effect = exceptions.NotFound('Entry not found')
+
+        outcome = self.__datacatalog_facade.delete_entry('entry_name')
+
+        self.assertEqual('not found', outcome)
 
     def test_create_entry_group_should_succeed(self):
         self.__datacatalog_facade.create_entry_group('my-project', 'location-id', 'entry_group_id',
@@ -135,6 +443,21 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         datacatalog = self.__datacatalog_client
         self.assertEqual(1, datacatalog.create_entry_group.call_count)
 
+    def test_list_entry_groups_should_succeed(self):
+        self.__datacatalog_facade.list_entry_groups('my-project', 'location-id')
+
+        datacatalog = self.__datacatalog_client
+        self.assertEqual(1, datacatalog.list_entry_groups.call_count)
+
+    def test_update_entry_group_should_send_field_mask(self):
+        entry_group = mock.MagicMock()
+
+        self.__datacatalog_facade.update_entry_group(entry_group, ('display_name', 'description'))
+
+        datacatalog = self.__datacatalog_client
+        datacatalog.update_entry_group.assert_called_once_with(
+            entry_group=entry_group, update_mask={'paths': ['display_name', 'description']})
+
     def test_delete_entry_group_should_succeed(self):
         self.__datacatalog_facade.delete_entry_group('entry_group_name')
 
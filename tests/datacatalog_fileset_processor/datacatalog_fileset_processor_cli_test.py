@@ -29,7 +29,74 @@ class DatacatalogFilesetProcessorCLITest(unittest.TestCase):
         fileset_datasource_processor = mock_fileset_datasource_processor.return_value
         fileset_datasource_processor.create_entry_groups_and_entries_from_csv.assert_called_once()
         fileset_datasource_processor.create_entry_groups_and_entries_from_csv.assert_called_with(
-            file_path='test.csv', validate_dataflow_sql_types=False)
+            file_path='test.csv',
+            validate_dataflow_sql_types=False,
+            workers=None,
+            async_concurrency=None,
+            prefetch_entries=False,
+            chunk_size=None,
+            manifest=None,
+            parser='pandas',
+            parse_workers=None,
+            shard_index=None,
+            shard_count=None,
+            journal=None)
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_create_filesets_with_workers_should_call_correct_method(
+            self, mock_fileset_datasource_processor):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run(
+            ['filesets', 'create', '--csv-file', 'test.csv', '--workers', '8'])
+
+        fileset_datasource_processor = mock_fileset_datasource_processor.return_value
+        fileset_datasource_processor.create_entry_groups_and_entries_from_csv.assert_called_with(
+            file_path='test.csv',
+            validate_dataflow_sql_types=False,
+            workers=8,
+            async_concurrency=None,
+            prefetch_entries=False,
+            chunk_size=None,
+            manifest=None,
+            parser='pandas',
+            parse_workers=None,
+            shard_index=None,
+            shard_count=None,
+            journal=None)
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_create_filesets_with_async_concurrency_should_call_correct_method(
+            self, mock_fileset_datasource_processor):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run(
+            ['filesets', 'create', '--csv-file', 'test.csv', '--async-concurrency', '500'])
+
+        fileset_datasource_processor = mock_fileset_datasource_processor.return_value
+        fileset_datasource_processor.create_entry_groups_and_entries_from_csv.assert_called_with(
+            file_path='test.csv',
+            validate_dataflow_sql_types=False,
+            workers=None,
+            async_concurrency=500,
+            prefetch_entries=False,
+            chunk_size=None,
+            manifest=None,
+            parser='pandas',
+            parse_workers=None,
+            shard_index=None,
+            shard_count=None,
+            journal=None)
+
+    def test_parse_args_workers_and_async_concurrency_should_raise_system_exit(self):
+        self.assertRaises(
+            SystemExit,
+            datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI._parse_args, [
+                'filesets', 'create', '--csv-file', 'test.csv', '--workers', '8',
+                '--async-concurrency', '500'
+            ])
 
     @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
                 'fileset_datasource_processor.'
@@ -43,7 +110,352 @@ class DatacatalogFilesetProcessorCLITest(unittest.TestCase):
         fileset_datasource_processor = mock_fileset_datasource_processor.return_value
         fileset_datasource_processor.delete_entry_groups_and_entries_from_csv.assert_called_once()
         fileset_datasource_processor.delete_entry_groups_and_entries_from_csv.assert_called_with(
-            file_path='test.csv')
+            file_path='test.csv',
+            chunk_size=None,
+            manifest=None,
+            workers=None,
+            parser='pandas',
+            parse_workers=None,
+            shard_index=None,
+            shard_count=None,
+            journal=None)
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'entry_manifest.EntryManifest')
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_create_filesets_with_manifest_should_call_correct_method(
+            self, mock_fileset_datasource_processor, mock_entry_manifest):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run([
+            'filesets', 'create', '--csv-file', 'test.csv', '--manifest-file', 'manifest.jsonl',
+            '--force-resync', '--invalidate-manifest'
+        ])
+
+        manifest = mock_entry_manifest.return_value
+        mock_entry_manifest.assert_called_once_with('manifest.jsonl', force_resync=True)
+        manifest.invalidate.assert_called_once()
+        manifest.close.assert_called_once()
+        fileset_datasource_processor = mock_fileset_datasource_processor.return_value
+        fileset_datasource_processor.create_entry_groups_and_entries_from_csv.assert_called_with(
+            file_path='test.csv',
+            validate_dataflow_sql_types=False,
+            workers=None,
+            async_concurrency=None,
+            prefetch_entries=False,
+            chunk_size=None,
+            manifest=manifest,
+            parser='pandas',
+            parse_workers=None,
+            shard_index=None,
+            shard_count=None,
+            journal=None)
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_delete_filesets_with_parse_workers_should_call_correct_method(
+            self, mock_fileset_datasource_processor):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run(
+            ['filesets', 'delete', '--csv-file', 'teams/*.csv', '--parse-workers', '4'])
+
+        fileset_datasource_processor = mock_fileset_datasource_processor.return_value
+        fileset_datasource_processor.delete_entry_groups_and_entries_from_csv.assert_called_with(
+            file_path='teams/*.csv',
+            chunk_size=None,
+            manifest=None,
+            workers=None,
+            parser='pandas',
+            parse_workers=4,
+            shard_index=None,
+            shard_count=None,
+            journal=None)
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'entry_manifest.EntryManifest')
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_delete_filesets_with_manifest_should_call_correct_method(
+            self, mock_fileset_datasource_processor, mock_entry_manifest):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run([
+            'filesets', 'delete', '--csv-file', 'test.csv', '--manifest-file', 'manifest.jsonl',
+            '--workers', '8'
+        ])
+
+        manifest = mock_entry_manifest.return_value
+        manifest.close.assert_called_once()
+        fileset_datasource_processor = mock_fileset_datasource_processor.return_value
+        fileset_datasource_processor.delete_entry_groups_and_entries_from_csv.assert_called_with(
+            file_path='test.csv',
+            chunk_size=None,
+            manifest=manifest,
+            workers=8,
+            parser='pandas',
+            parse_workers=None,
+            shard_index=None,
+            shard_count=None,
+            journal=None)
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_create_filesets_with_shard_should_call_correct_method(
+            self, mock_fileset_datasource_processor):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run([
+            'filesets', 'create', '--csv-file', 'test.csv', '--shard-index', '2', '--shard-count',
+            '8'
+        ])
+
+        fileset_datasource_processor = mock_fileset_datasource_processor.return_value
+        fileset_datasource_processor.create_entry_groups_and_entries_from_csv.assert_called_with(
+            file_path='test.csv',
+            validate_dataflow_sql_types=False,
+            workers=None,
+            async_concurrency=None,
+            prefetch_entries=False,
+            chunk_size=None,
+            manifest=None,
+            parser='pandas',
+            parse_workers=None,
+            shard_index=2,
+            shard_count=8,
+            journal=None)
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_shards_filesets_should_not_create_processor(
+            self, mock_fileset_datasource_processor):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run(
+            ['filesets', 'shards', '--csv-file', 'test.csv', '--shard-count', '8'])
+
+        mock_fileset_datasource_processor.assert_not_called()
+        mock_fileset_datasource_processor.count_shard_sizes_from_csv.assert_called_once_with(
+            file_path='test.csv', shard_count=8, parser='pandas', parse_workers=None)
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'run_journal.RunJournal')
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_create_filesets_with_journal_should_call_correct_method(
+            self, mock_fileset_datasource_processor, mock_run_journal):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run([
+            'filesets', 'create', '--csv-file', 'test.csv', '--journal-file', 'journal.tsv',
+            '--resume'
+        ])
+
+        journal = mock_run_journal.return_value
+        mock_run_journal.assert_called_once_with('journal.tsv', resume=True)
+        journal.close.assert_called_once()
+        fileset_datasource_processor = mock_fileset_datasource_processor.return_value
+        self.assertIs(
+            journal,
+            fileset_datasource_processor.create_entry_groups_and_entries_from_csv.call_args[1]
+            ['journal'])
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'run_journal.RunJournal')
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_delete_filesets_with_journal_should_call_correct_method(
+            self, mock_fileset_datasource_processor, mock_run_journal):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run(
+            ['filesets', 'delete', '--csv-file', 'test.csv', '--journal-file', 'journal.tsv'])
+
+        journal = mock_run_journal.return_value
+        mock_run_journal.assert_called_once_with('journal.tsv', resume=False)
+        journal.close.assert_called_once()
+        fileset_datasource_processor = mock_fileset_datasource_processor.return_value
+        self.assertIs(
+            journal,
+            fileset_datasource_processor.delete_entry_groups_and_entries_from_csv.call_args[1]
+            ['journal'])
+
+    def test_run_create_filesets_resume_without_journal_should_raise_value_error(self):
+        self.assertRaises(ValueError,
+                          datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run,
+                          ['filesets', 'create', '--csv-file', 'test.csv', '--resume'])
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_plan_filesets_should_call_correct_method(
+            self, mock_fileset_datasource_processor):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run([
+            'filesets', 'plan', '--csv-file', 'test.csv', '--plan-file', 'plan.jsonl', '--workers',
+            '8'
+        ])
+
+        fileset_datasource_processor = mock_fileset_datasource_processor.return_value
+        fileset_datasource_processor.plan_entry_groups_and_entries_from_csv.assert_called_with(
+            file_path='test.csv',
+            plan_file_path='plan.jsonl',
+            validate_dataflow_sql_types=False,
+            workers=8,
+            chunk_size=None,
+            parser='pandas',
+            parse_workers=None)
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_export_filesets_should_call_correct_method(
+            self, mock_fileset_datasource_processor):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run([
+            'filesets', 'export', '--location', 'my-project/us-central1', '--location',
+            'other-project/us', '--csv-file', 'export.csv', '--workers', '8'
+        ])
+
+        fileset_datasource_processor = mock_fileset_datasource_processor.return_value
+        fileset_datasource_processor.export_entry_groups_and_entries_to_csv.\
+            assert_called_once_with(
+                locations=[('my-project', 'us-central1'), ('other-project', 'us')],
+                file_path='export.csv',
+                workers=8)
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_apply_filesets_should_call_correct_method(
+            self, mock_fileset_datasource_processor):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run(
+            ['filesets', 'apply', '--plan-file', 'plan.jsonl'])
+
+        fileset_datasource_processor = mock_fileset_datasource_processor.return_value
+        fileset_datasource_processor.apply_plan.assert_called_once_with(
+            plan_file_path='plan.jsonl', workers=None)
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'rate_limiter.RateLimiter')
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_create_filesets_with_rate_limits_should_make_rate_limiter(
+            self, mock_fileset_datasource_processor, mock_rate_limiter):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run([
+            'filesets', 'create', '--csv-file', 'test.csv', '--qps', '20', '--rpc-qps',
+            'create_entry=5', '--rpc-qps', 'get_entry=50', '--max-concurrency', '16',
+            '--max-retries', '3'
+        ])
+
+        mock_rate_limiter.assert_called_once_with(qps=20,
+                                                  rpc_qps={
+                                                      'create_entry': 5,
+                                                      'get_entry': 50
+                                                  },
+                                                  max_concurrency=16,
+                                                  max_retries=3)
+        mock_fileset_datasource_processor.assert_called_once_with(
+            rate_limiter=mock_rate_limiter.return_value,
+            metrics=None,
+            channels=None,
+            channel_dispatch='round-robin',
+            progress_interval=10.0)
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'structured_logging.setup_logging')
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_delete_filesets_with_log_options_should_setup_logging(
+            self, mock_fileset_datasource_processor, mock_setup_logging):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run([
+            'filesets', 'delete', '--csv-file', 'test.csv', '--log-format', 'json',
+            '--log-sample-rate', '0.01', '--progress-interval', '30'
+        ])
+
+        mock_setup_logging.assert_called_once_with('json', 0.01)
+        _, kwargs = mock_fileset_datasource_processor.call_args
+        self.assertEqual(30, kwargs['progress_interval'])
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_apply_filesets_with_channels_should_make_processor_with_channels(
+            self, mock_fileset_datasource_processor):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run([
+            'filesets', 'apply', '--plan-file', 'plan.jsonl', '--channels', '4',
+            '--channel-dispatch', 'least-loaded'
+        ])
+
+        _, kwargs = mock_fileset_datasource_processor.call_args
+        self.assertEqual(4, kwargs['channels'])
+        self.assertEqual('least-loaded', kwargs['channel_dispatch'])
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'run_metrics.RunMetrics')
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_delete_filesets_with_metrics_out_should_write_metrics(
+            self, mock_fileset_datasource_processor, mock_run_metrics):  # noqa: E125
+
+        datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run(
+            ['filesets', 'delete', '--csv-file', 'test.csv', '--metrics-out', 'metrics'])
+
+        self.assertEqual(mock_run_metrics.return_value,
+                         mock_fileset_datasource_processor.call_args[1]['metrics'])
+        mock_run_metrics.return_value.write.assert_called_once_with('metrics')
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'run_metrics.RunMetrics')
+    @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
+                'fileset_datasource_processor.'
+                'FilesetDatasourceProcessor')
+    def test_run_apply_filesets_failure_should_write_metrics(self,
+                                                             mock_fileset_datasource_processor,
+                                                             mock_run_metrics):  # noqa: E125
+        fileset_datasource_processor = mock_fileset_datasource_processor.return_value
+        fileset_datasource_processor.apply_plan.side_effect = RuntimeError('failure')
+
+        self.assertRaises(
+            RuntimeError, datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI.run,
+            ['filesets', 'apply', '--plan-file', 'plan.jsonl', '--metrics-out', 'metrics'])
+
+        mock_run_metrics.return_value.write.assert_called_once_with('metrics')
+
+    def test_parse_args_parser_should_accept_csv(self):
+        args = datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI._parse_args(
+            ['filesets', 'create', '--csv-file', 'test.csv', '--parser', 'csv'])
+
+        self.assertEqual('csv', args.parser)
+
+    def test_parse_args_invalid_parser_should_raise_system_exit(self):
+        self.assertRaises(
+            SystemExit,
+            datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI._parse_args, [
+                'filesets', 'plan', '--csv-file', 'test.csv', '--plan-file', 'plan.jsonl',
+                '--parser', 'excel'
+            ])
+
+    def test_parse_args_invalid_location_should_raise_system_exit(self):
+        for location in ('my-project', 'my-project/', 'projects/my-project/locations/us'):
+            self.assertRaises(
+                SystemExit,
+                datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI._parse_args,
+                ['filesets', 'export', '--location', location, '--csv-file', 'export.csv'])
+
+    def test_parse_args_invalid_rpc_qps_should_raise_system_exit(self):
+        self.assertRaises(
+            SystemExit,
+            datacatalog_fileset_processor_cli.DatacatalogFilesetProcessorCLI._parse_args,
+            ['filesets', 'delete', '--csv-file', 'test.csv', '--rpc-qps', 'create_entry'])
 
     @mock.patch('datacatalog_fileset_processor.datacatalog_fileset_processor_cli.'
                 'DatacatalogFilesetProcessorCLI')
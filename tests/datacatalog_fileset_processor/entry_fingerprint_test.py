@@ -0,0 +1,65 @@
+import unittest
+
+from google.cloud import datacatalog_v1
+
+from datacatalog_fileset_processor import datacatalog_entity_factory, entry_fingerprint, \
+    fileset_spec
+
+
+class EntryFingerprintTest(unittest.TestCase):
+
+    def test_fingerprint_entry_should_be_stable(self):
+        # Manifest files store these fingerprints, so they must not change across versions.
+        self.assertEqual('ffc6ba8f3a6ebafbba5286c8ade9611cecfb419220bc66326f013e5136807359',
+                         entry_fingerprint.fingerprint_entry(create_entry()))
+
+    def test_fingerprint_entry_should_depend_on_managed_fields_only(self):
+        entry = create_entry()
+        same_entry = create_entry()
+        same_entry.name = 'name'
+        same_entry.linked_resource = 'linked_resource'
+        same_entry.source_system_timestamps.update_time.seconds = 22
+
+        fingerprint = entry_fingerprint.fingerprint_entry(entry)
+        self.assertEqual(fingerprint, entry_fingerprint.fingerprint_entry(same_entry))
+
+        for change in (lambda other: setattr(other, 'display_name', 'Other Entry'),
+                       lambda other: setattr(other, 'description', 'Description'),
+                       lambda other: other.gcs_fileset_spec.file_patterns.append('gs://other/*'),
+                       lambda other: setattr(other.schema.columns[0], 'mode', 'REQUIRED')):
+            other_entry = create_entry()
+            change(other_entry)
+            self.assertNotEqual(fingerprint, entry_fingerprint.fingerprint_entry(other_entry))
+
+    def test_fingerprint_entry_spec_should_match_built_entry(self):
+        for entry_spec in (
+                fileset_spec.EntrySpec('entry_group',
+                                       'entry',
+                                       'My Entry',
+                                       None, ['gs://bucket/*'],
+                                       columns=[fileset_spec.ColumnSpec('first_name', 'STRING')]),
+                fileset_spec.EntrySpec('entry_group',
+                                       'entry',
+                                       'My Entry',
+                                       'Description', ['gs://bucket/*', 'gs://other/*'],
+                                       columns=[
+                                           fileset_spec.ColumnSpec('first_name', 'STRING',
+                                                                   'First name', 'REQUIRED'),
+                                           fileset_spec.ColumnSpec('has_pii', 'BOOL')
+                                       ]),
+        ):
+            entry = datacatalog_entity_factory.DataCatalogEntityFactory.make_entry(entry_spec)
+            self.assertEqual(entry_fingerprint.fingerprint_entry(entry),
+                             entry_fingerprint.fingerprint_entry_spec(entry_spec))
+
+
+def create_entry():
+    entry = datacatalog_v1.types.Entry()
+    entry.display_name = 'My Entry'
+    entry.gcs_fileset_spec.file_patterns.append('gs://bucket/*')
+
+    column = datacatalog_v1.types.ColumnSchema()
+    column.column = 'first_name'
+    column.type = 'STRING'
+    entry.schema.columns.append(column)
+    return entry
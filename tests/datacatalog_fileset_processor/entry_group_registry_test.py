@@ -0,0 +1,170 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions
+from google.cloud import datacatalog_v1
+
+from datacatalog_fileset_processor import datacatalog_facade, entry_group_registry, \
+    fileset_spec
+
+
+class EntryGroupRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__registry = entry_group_registry.EntryGroupRegistry()
+        self.__datacatalog_facade = mock.MagicMock()
+        self.__datacatalog_facade.extract_resources_from_entry_group.side_effect = \
+            datacatalog_facade.DataCatalogFacade.extract_resources_from_entry_group
+        self.__datacatalog_facade.list_entry_groups.return_value = [
+            create_entry_group('projects/my-project/locations/us/entryGroups/in_sync', 'In Sync',
+                               'Description'),
+            create_entry_group('projects/1234/locations/us/entryGroups/drifted', 'Old Name',
+                               'Description')
+        ]
+
+    def test_upsert_entry_group_should_list_entry_groups_once_per_location(self):
+        for entry_group_name in ('projects/my-project/locations/us/entryGroups/missing',
+                                 'projects/my-project/locations/us/entryGroups/in_sync',
+                                 'projects/my-project/locations/eu/entryGroups/missing'):
+            self.__registry.upsert_entry_group(self.__datacatalog_facade,
+                                               fileset_spec.EntryGroupSpec(entry_group_name))
+
+        self.assertEqual([
+            mock.call('my-project', 'us'),
+            mock.call('my-project', 'eu'),
+        ], self.__datacatalog_facade.list_entry_groups.call_args_list)
+
+    def test_upsert_entry_group_should_create_missing_entry_group_once(self):
+        entry_group_spec = fileset_spec.EntryGroupSpec(
+            'projects/my-project/locations/us/entryGroups/missing', 'Missing')
+
+        outcomes = [
+            self.__registry.upsert_entry_group(self.__datacatalog_facade, entry_group_spec)
+            for _ in range(2)
+        ]
+
+        self.assertEqual(['created', 'unchanged'], outcomes)
+        self.__datacatalog_facade.create_entry_group.assert_called_once()
+        self.__datacatalog_facade.update_entry_group.assert_not_called()
+
+    def test_upsert_entry_group_should_update_drifted_fields_only(self):
+        outcome = self.__registry.upsert_entry_group(
+            self.__datacatalog_facade,
+            fileset_spec.EntryGroupSpec('projects/my-project/locations/us/entryGroups/drifted',
+                                        'New Name', 'Description'))
+
+        self.assertEqual('updated', outcome)
+        self.__datacatalog_facade.create_entry_group.assert_not_called()
+        entry_group, update_fields = self.__datacatalog_facade.update_entry_group.call_args[0]
+        self.assertEqual('projects/1234/locations/us/entryGroups/drifted', entry_group.name)
+        self.assertEqual('New Name', entry_group.display_name)
+        self.assertEqual(['display_name'], update_fields)
+
+    def test_upsert_entry_group_empty_values_should_keep_existing_ones(self):
+        outcomes = [
+            self.__registry.upsert_entry_group(
+                self.__datacatalog_facade,
+                fileset_spec.EntryGroupSpec('projects/my-project/locations/us/entryGroups/in_sync',
+                                            'In Sync', description)) for description in (None, '')
+        ]
+        outcomes.append(
+            self.__registry.upsert_entry_group(
+                self.__datacatalog_facade,
+                fileset_spec.EntryGroupSpec('projects/my-project/locations/us/entryGroups/drifted',
+                                            'New Name')))
+
+        self.assertEqual(['unchanged', 'unchanged', 'updated'], outcomes)
+        self.__datacatalog_facade.update_entry_group.assert_called_once()
+        _, update_fields = self.__datacatalog_facade.update_entry_group.call_args[0]
+        self.assertEqual(['display_name'], update_fields)
+
+    def test_upsert_entry_group_in_sync_should_not_write(self):
+        outcome = self.__registry.upsert_entry_group(
+            self.__datacatalog_facade,
+            fileset_spec.EntryGroupSpec('projects/my-project/locations/us/entryGroups/in_sync',
+                                        'In Sync', 'Description'))
+
+        self.assertEqual('unchanged', outcome)
+        self.__datacatalog_facade.create_entry_group.assert_not_called()
+        self.__datacatalog_facade.update_entry_group.assert_not_called()
+
+    def test_upsert_entry_group_should_create_if_listing_fails(self):
+        self.__datacatalog_facade.list_entry_groups.side_effect = \
+            exceptions.PermissionDenied('Permission denied')
+        self.__datacatalog_facade.create_entry_group.side_effect = [
+            None, exceptions.AlreadyExists('Entry Group already exists')
+        ]
+
+        with self.assertLogs(level='WARNING'):
+            outcomes = [
+                self.__registry.upsert_entry_group(
+                    self.__datacatalog_facade,
+                    fileset_spec.EntryGroupSpec(
+                        'projects/my-project/locations/us/entryGroups/{}'.format(entry_group_id)))
+                for entry_group_id in ('missing', 'in_sync')
+            ]
+
+        self.assertEqual(['created', 'unchanged'], outcomes)
+        self.assertEqual(1, self.__datacatalog_facade.list_entry_groups.call_count)
+        self.assertEqual(2, self.__datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual({'created': 1, 'unchanged': 1}, self.__registry.outcomes)
+
+    def test_upsert_entry_group_asynchronously_should_match_upsert_entry_group(self):
+        async_facade = FakeAsyncDataCatalogFacade(
+            self.__datacatalog_facade.list_entry_groups.return_value)
+
+        outcomes = [
+            run(self.__registry.upsert_entry_group_asynchronously(async_facade, entry_group_spec))
+            for entry_group_spec in
+            (fileset_spec.EntryGroupSpec('projects/my-project/locations/us/entryGroups/missing'),
+             fileset_spec.EntryGroupSpec('projects/my-project/locations/us/entryGroups/drifted',
+                                         'New Name', 'Description'),
+             fileset_spec.EntryGroupSpec('projects/my-project/locations/us/entryGroups/in_sync',
+                                         'In Sync', 'Description'))
+        ]
+
+        self.assertEqual(['created', 'updated', 'unchanged'], outcomes)
+        self.assertEqual(['list_entry_groups', 'create_entry_group', 'update_entry_group'],
+                         async_facade.calls)
+        self.assertEqual({'created': 1, 'updated': 1, 'unchanged': 1}, self.__registry.outcomes)
+
+
+class FakeAsyncDataCatalogFacade:
+
+    def __init__(self, entry_groups):
+        self.__entry_groups = entry_groups
+        self.calls = []
+
+    async def list_entry_groups(self, project_id, location_id):
+        self.calls.append('list_entry_groups')
+        return self.__entry_groups
+
+    async def create_entry_group(self, project_id, location_id, entry_group_id, entry_group):
+        self.calls.append('create_entry_group')
+        return entry_group
+
+    async def update_entry_group(self, entry_group, update_fields):
+        self.calls.append('update_entry_group')
+        return entry_group
+
+    @classmethod
+    def extract_resources_from_entry_group(cls, entry_group_name):
+        return datacatalog_facade.DataCatalogFacade.extract_resources_from_entry_group(
+            entry_group_name)
+
+
+def create_entry_group(name, display_name, description):
+    entry_group = datacatalog_v1.types.EntryGroup()
+    entry_group.name = name
+    entry_group.display_name = display_name
+    entry_group.description = description
+    return entry_group
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from google.cloud import datacatalog_v1
+
+from datacatalog_fileset_processor import entry_fingerprint, entry_manifest
+
+
+class EntryManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.mkdtemp()
+        self.__file_path = os.path.join(self.__temp_dir, 'manifest.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.__temp_dir)
+
+    def test_is_unchanged_recorded_entry_should_return_true(self):
+        with entry_manifest.EntryManifest(self.__file_path) as manifest:
+            manifest.record('entry_name', fingerprint('display_name'))
+
+            self.assertTrue(manifest.is_unchanged('entry_name', fingerprint('display_name')))
+            self.assertFalse(manifest.is_unchanged('entry_name', fingerprint('display_name_2')))
+            self.assertFalse(manifest.is_unchanged('other_name', fingerprint('display_name')))
+
+    def test_recorded_entries_should_be_loaded_on_next_run(self):
+        with entry_manifest.EntryManifest(self.__file_path) as manifest:
+            manifest.record('entry_1', fingerprint('display_name'))
+            manifest.record('entry_2', fingerprint('display_name'))
+            manifest.record('entry_2', fingerprint('display_name_2'))
+
+        with entry_manifest.EntryManifest(self.__file_path) as manifest:
+            self.assertTrue(manifest.is_unchanged('entry_1', fingerprint('display_name')))
+            self.assertTrue(manifest.is_unchanged('entry_2', fingerprint('display_name_2')))
+
+        with open(self.__file_path) as manifest_file:
+            self.assertEqual(2, len(manifest_file.readlines()))
+
+    def test_recorded_entries_should_be_loaded_if_not_closed(self):
+        manifest = entry_manifest.EntryManifest(self.__file_path)
+        manifest.record('entry_1', fingerprint('display_name'))
+        manifest.record('entry_2', fingerprint('display_name'))
+        manifest.remove('entry_2')
+
+        reloaded_manifest = entry_manifest.EntryManifest(self.__file_path)
+
+        self.assertTrue(reloaded_manifest.is_unchanged('entry_1', fingerprint('display_name')))
+        self.assertFalse(reloaded_manifest.is_unchanged('entry_2', fingerprint('display_name')))
+        manifest.close()
+        reloaded_manifest.close()
+
+    def test_removed_entry_should_be_changed(self):
+        with entry_manifest.EntryManifest(self.__file_path) as manifest:
+            manifest.record('entry_name', fingerprint('display_name'))
+            manifest.remove('entry_name')
+
+            self.assertFalse(manifest.is_unchanged('entry_name', fingerprint('display_name')))
+
+    def test_invalidate_should_forget_every_entry(self):
+        with entry_manifest.EntryManifest(self.__file_path) as manifest:
+            manifest.record('entry_name', fingerprint('display_name'))
+            manifest.invalidate()
+
+            self.assertFalse(manifest.is_unchanged('entry_name', fingerprint('display_name')))
+
+        with entry_manifest.EntryManifest(self.__file_path) as manifest:
+            self.assertFalse(manifest.is_unchanged('entry_name', fingerprint('display_name')))
+
+    def test_force_resync_should_report_every_entry_as_changed(self):
+        with entry_manifest.EntryManifest(self.__file_path) as manifest:
+            manifest.record('entry_name', fingerprint('display_name'))
+
+        with entry_manifest.EntryManifest(self.__file_path, force_resync=True) as manifest:
+            self.assertFalse(manifest.is_unchanged('entry_name', fingerprint('display_name')))
+
+
+def create_entry(display_name):
+    entry = datacatalog_v1.types.Entry()
+    entry.display_name = display_name
+    entry.description = 'description'
+    entry.gcs_fileset_spec.file_patterns.append('gs://bucket/*')
+
+    column = datacatalog_v1.types.ColumnSchema()
+    column.column = 'first_name'
+    column.type = 'STRING'
+    column.mode = 'NULLABLE'
+    entry.schema.columns.append(column)
+    return entry
+
+
+def fingerprint(display_name):
+    return entry_fingerprint.fingerprint_entry(create_entry(display_name))
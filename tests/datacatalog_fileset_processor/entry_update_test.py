@@ -0,0 +1,68 @@
+import unittest
+
+from google.cloud import datacatalog_v1
+
+from datacatalog_fileset_processor import entry_update
+
+
+class EntryUpdateTest(unittest.TestCase):
+
+    def test_find_changed_fields_same_entries_should_return_none(self):
+        self.assertEqual([], entry_update.find_changed_fields(make_entry(), make_entry()))
+
+    def test_find_changed_fields_should_return_each_changed_field(self):
+        entry = make_entry()
+        entry.description = 'New description'
+        entry.gcs_fileset_spec.file_patterns.append('gs://bucket/*.png')
+        entry.schema.columns[0].mode = 'NULLABLE'
+
+        self.assertEqual(['description', 'gcs_fileset_spec.file_patterns', 'schema'],
+                         entry_update.find_changed_fields(make_entry(), entry))
+
+        entry = make_entry()
+        entry.display_name = 'New display name'
+        self.assertEqual(['display_name'], entry_update.find_changed_fields(make_entry(), entry))
+
+    def test_make_entry_update_should_copy_the_given_fields_only(self):
+        entry = make_entry()
+
+        update = entry_update.make_entry_update(entry, ['display_name', 'schema'])
+
+        expected_update = datacatalog_v1.types.Entry()
+        expected_update.name = entry.name
+        expected_update.display_name = entry.display_name
+        expected_update.schema.columns.extend(entry.schema.columns)
+        self.assertEqual(expected_update, update)
+
+        update = entry_update.make_entry_update(entry,
+                                                ['description', 'gcs_fileset_spec.file_patterns'])
+
+        self.assertEqual(entry.description, update.description)
+        self.assertEqual(['gs://bucket/*.csv'], list(update.gcs_fileset_spec.file_patterns))
+        self.assertEqual('', update.display_name)
+
+    def test_update_payload_stats_should_sum_the_recorded_updates(self):
+        update_payloads = entry_update.UpdatePayloadStats()
+
+        update_payloads.record(10, 100)
+        update_payloads.record(20, 50)
+
+        self.assertEqual(2, update_payloads.updates_count)
+        self.assertEqual(30, update_payloads.sent_bytes)
+        self.assertEqual(150, update_payloads.full_bytes)
+        self.assertEqual(120, update_payloads.saved_bytes)
+
+        update_payloads.reset()
+        self.assertEqual((0, 0), (update_payloads.updates_count, update_payloads.saved_bytes))
+
+
+def make_entry():
+    entry = datacatalog_v1.types.Entry()
+    entry.name = 'projects/my-project/locations/us-central1/entryGroups/entry_group/entries/entry'
+    entry.display_name = 'My Fileset'
+    entry.description = 'My description'
+    entry.linked_resource = 'linked_resource'
+    entry.gcs_fileset_spec.file_patterns.append('gs://bucket/*.csv')
+    entry.schema.columns.append(
+        datacatalog_v1.types.ColumnSchema(column='first_name', type='STRING', mode='REQUIRED'))
+    return entry
@@ -0,0 +1,72 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions
+
+from datacatalog_fileset_processor import facade_operations
+
+
+class FacadeOperationsTest(unittest.TestCase):
+
+    def test_run_should_send_call_results(self):
+        target = mock.MagicMock()
+        target.get_entry.return_value = 'entry'
+
+        self.assertEqual('entry', facade_operations.run(read_entry(), target))
+        target.get_entry.assert_called_once_with('name', view='full')
+
+    def test_run_should_throw_call_errors(self):
+        target = mock.MagicMock()
+        target.get_entry.side_effect = exceptions.NotFound('')
+
+        self.assertIsNone(facade_operations.run(read_entry(), target))
+
+    def test_run_asynchronously_should_await_calls(self):
+        target = FakeAsyncTarget()
+
+        self.assertEqual('entry', run(facade_operations.run_asynchronously(read_entry(), target)))
+        self.assertIsNone(
+            run(facade_operations.run_asynchronously(read_entry(), FakeAsyncTarget(False))))
+
+    def test_operations_should_be_shared_by_both_facades(self):
+        sync_target = mock.MagicMock()
+        sync_target.delete_entry.side_effect = exceptions.PermissionDenied('')
+        async_target = FakeAsyncTarget(False)
+
+        sync_outcome = facade_operations.run(facade_operations.delete_entry('name'), sync_target)
+        async_outcome = run(
+            facade_operations.run_asynchronously(facade_operations.delete_entry('name'),
+                                                 async_target))
+
+        self.assertEqual('not found', sync_outcome)
+        self.assertEqual(sync_outcome, async_outcome)
+
+
+class FakeAsyncTarget:
+
+    def __init__(self, exists=True):
+        self.__exists = exists
+
+    async def get_entry(self, name, view=None):
+        if not self.__exists:
+            raise exceptions.NotFound('')
+        return 'entry'
+
+    async def delete_entry(self, name):
+        raise exceptions.PermissionDenied('')
+
+
+def read_entry():
+    try:
+        return (yield facade_operations.call('get_entry', 'name', view='full'))
+    except exceptions.NotFound:
+        return None
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
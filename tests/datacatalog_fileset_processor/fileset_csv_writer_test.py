@@ -0,0 +1,87 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+from google.cloud import datacatalog_v1
+
+from datacatalog_fileset_processor import constant, csv_parser, fileset_csv_writer, \
+    fileset_datasource_processor
+
+
+class FilesetsCsvWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.mkdtemp()
+        self.__file_path = os.path.join(self.__temp_dir, 'filesets.csv')
+
+    def tearDown(self):
+        shutil.rmtree(self.__temp_dir)
+
+    def test_written_rows_should_be_read_back(self):
+        entry_group = datacatalog_v1.types.EntryGroup()
+        entry_group.name = 'projects/my-project/locations/us-central1/entryGroups/entry_group'
+        entry_group.display_name = 'My Entry Group'
+        entry = datacatalog_v1.types.Entry()
+        entry.name = '{}/entries/entry_1'.format(entry_group.name)
+        entry.display_name = 'My Fileset, with a comma'
+        entry.gcs_fileset_spec.file_patterns.extend(['gs://bucket/*.csv', 'gs://bucket/*.png'])
+        entry.schema.columns.extend([
+            datacatalog_v1.types.ColumnSchema(column='first_name',
+                                              type='STRING',
+                                              description='First name',
+                                              mode='REQUIRED'),
+            datacatalog_v1.types.ColumnSchema(column='age', type='INT64')
+        ])
+        empty_entry_group = datacatalog_v1.types.EntryGroup()
+        empty_entry_group.name = \
+            'projects/my-project/locations/us-central1/entryGroups/empty_entry_group'
+
+        with fileset_csv_writer.FilesetsCsvWriter(self.__file_path) as csv_writer:
+            csv_writer.write_entry_group(entry_group, iter([entry]))
+            csv_writer.write_entry_group(empty_entry_group, iter([]))
+
+        self.assertEqual(2, csv_writer.entry_groups_count)
+        self.assertEqual(1, csv_writer.entries_count)
+        with open(self.__file_path, newline='') as csv_file:
+            rows = list(csv.reader(csv_file))
+        self.assertEqual(list(constant.FILESETS_COLUMNS_ORDER), rows[0])
+        self.assertEqual([
+            [
+                entry_group.name, 'My Entry Group', '', 'entry_1', 'My Fileset, with a comma', '',
+                'gs://bucket/*.csv|gs://bucket/*.png', 'first_name', 'STRING', 'First name',
+                'REQUIRED'
+            ],
+            ['', '', '', 'entry_1', '', '', '', 'age', 'INT64', '', ''],
+            [empty_entry_group.name, '', '', '', '', '', '', '', '', '', ''],
+        ], rows[1:])
+
+        entry_group_specs = csv_parser.read_entry_group_specs(self.__file_path)
+        self.assertEqual(['first_name', 'age'],
+                         list(entry_group_specs[0].entries[0].to_dict()['schema_columns']))
+        self.assertEqual([], entry_group_specs[1].entries)
+
+    def test_written_values_with_special_characters_should_be_read_back(self):
+        entry_group = datacatalog_v1.types.EntryGroup()
+        entry_group.name = 'projects/my-project/locations/us-central1/entryGroups/entry_group'
+        entry_group.description = 'Group #1'
+        entry = datacatalog_v1.types.Entry()
+        entry.name = '{}/entries/entry_1'.format(entry_group.name)
+        entry.display_name = 'My Fileset'
+        entry.description = 'Files, of "bucket"\n# 2'
+        entry.gcs_fileset_spec.file_patterns.append('gs://bucket/*')
+        entry.schema.columns.append(
+            datacatalog_v1.types.ColumnSchema(column='id', type='STRING', description='Id #2'))
+
+        with fileset_csv_writer.FilesetsCsvWriter(self.__file_path) as csv_writer:
+            csv_writer.write_entry_group(entry_group, iter([entry]))
+
+        for parser in (constant.PARSER_PANDAS, constant.PARSER_CSV):
+            entry_group_specs = fileset_datasource_processor.FilesetDatasourceProcessor.\
+                read_csv_file(self.__file_path, parser=parser)
+            self.assertEqual(1, len(entry_group_specs), parser)
+            self.assertEqual('Group #1', entry_group_specs[0].description, parser)
+            entry_spec = entry_group_specs[0].entries[0]
+            self.assertEqual('Files, of "bucket"\n# 2', entry_spec.description, parser)
+            self.assertEqual('Id #2', entry_spec.columns[0].description, parser)
@@ -1,9 +1,20 @@
+import asyncio
+import csv
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
 import unittest
 from unittest import mock
 
 import pandas as pd
+from google.api_core import exceptions
+from google.cloud import datacatalog_v1
 
-from datacatalog_fileset_processor import fileset_datasource_processor
+from datacatalog_fileset_processor import constant, datacatalog_facade, entry_fingerprint, \
+    fileset_datasource_processor, fileset_plan, run_journal, run_metrics
 
 
 @mock.patch('datacatalog_fileset_processor.fileset_datasource_processor.pd.read_csv')
@@ -15,6 +26,10 @@ class TagTemplateDatasourceProcessorTest(unittest.TestCase):
             FilesetDatasourceProcessor()
         # Shortcut for the object assigned to self.__tag_datasource_processor.__datacatalog_facade
         self.__datacatalog_facade = mock_datacatalog_facade.return_value
+        self.__datacatalog_facade.extract_resources_from_entry_group.side_effect = \
+            extract_resources_from_entry_group
+        # Shared with the facades, which record the Entry updates payloads in it.
+        self.__update_payloads = mock_datacatalog_facade.call_args[1]['update_payloads']
 
     def test_constructor_should_set_instance_attributes(self, mock_read_csv):
         self.assertIsNotNone(self.__tag_datasource_processor.
@@ -151,6 +166,395 @@ class TagTemplateDatasourceProcessorTest(unittest.TestCase):
 
         self.execute_create_filesets_and_assert()
 
+    def test_create_filesets_from_csv_invalid_dataflow_sql_type_should_fail_before_any_call(
+            self, mock_read_csv):  # noqa: E125
+        dataframe = make_filesets_dataframe()
+        dataframe.loc[0, 'schema_column_type'] = 'VARCHAR'
+        mock_read_csv.return_value = dataframe
+
+        with self.assertLogs(level='ERROR') as logs, self.assertRaises(ValueError):
+            self.__tag_datasource_processor.create_entry_groups_and_entries_from_csv(
+                'file-path', validate_dataflow_sql_types=True)
+
+        self.__datacatalog_facade.create_entry_group.assert_not_called()
+        self.__datacatalog_facade.upsert_entry.assert_not_called()
+        self.assertIn("schema_column_type 'VARCHAR' not in allowed Dataflow SQL types",
+                      logs.output[0])
+        self.assertIn('row 1', logs.output[0])
+
+    def test_create_filesets_from_csv_in_chunks_invalid_rows_should_fail_before_any_call(
+            self, mock_read_csv):  # noqa: E125
+        dataframe = make_filesets_dataframe()
+        dataframe.loc[2, 'entry_id'] = 'entry-test-3'
+        mock_read_csv.return_value = [dataframe.iloc[0:2], dataframe.iloc[2:3]]
+
+        with self.assertLogs(level='ERROR') as logs, self.assertRaises(ValueError):
+            self.__tag_datasource_processor.create_entry_groups_and_entries_from_csv('file-path',
+                                                                                     chunk_size=2)
+
+        self.assertEqual(1, mock_read_csv.call_count)
+        self.__datacatalog_facade.create_entry_group.assert_not_called()
+        self.assertIn("invalid entry_id 'entry-test-3', row 3", logs.output[0])
+
+    def test_plan_filesets_from_csv_with_csv_parser_invalid_rows_should_fail(
+            self, mock_read_csv):  # noqa: E125
+        dataframe = make_filesets_dataframe()
+        dataframe.loc[1, 'entry_file_patterns'] = 'bucket_23c4/*.csv'
+        file_path = self.__write_filesets_csv(dataframe)
+
+        with self.assertLogs(level='ERROR') as logs, self.assertRaises(ValueError):
+            self.__tag_datasource_processor.plan_entry_groups_and_entries_from_csv(file_path,
+                                                                                   file_path +
+                                                                                   '.plan',
+                                                                                   parser='csv')
+
+        mock_read_csv.assert_not_called()
+        self.__datacatalog_facade.list_entries.assert_not_called()
+        self.assertIn("invalid file pattern 'bucket_23c4/*.csv'", logs.output[0])
+        self.assertIn('row 2', logs.output[0])
+
+    def test_create_filesets_from_csv_non_contiguous_rows_should_be_merged(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame(
+            data={
+                'entry_group_name': [
+                    'projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_1a',
+                    'projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_2a',
+                    'projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_1a',
+                    'projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_1a'
+                ],
+                'entry_group_display_name': ['My Group a', 'My Group 2', None, None],
+                'entry_group_description': [None, None, None, None],
+                'entry_id': ['entry_test_1', 'entry_test_2', 'entry_test_3', 'entry_test_1'],
+                'entry_display_name': ['My Fileset', 'My Fileset 2', 'My Fileset 3', None],
+                'entry_description': [None, None, None, None],
+                'entry_file_patterns':
+                ['gs://bucket_13c4/*', 'gs://bucket_23c4/*', 'gs://bucket_33c4/*', None],
+                'schema_column_name': ['first_name', 'first_name', None, 'last_name'],
+                'schema_column_type': ['STRING', 'STRING', None, 'STRING'],
+                'schema_column_description': ['First name', 'First name', None, 'Last name'],
+                'schema_column_mode': ['REQUIRED', 'REQUIRED', None, 'NULLABLE']
+            })
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.extract_resources_from_entry_group.side_effect = \
+            extract_resources_from_entry_group
+
+        created_assets = self.__tag_datasource_processor.\
+            create_entry_groups_and_entries_from_csv('file-path')
+
+        self.assertEqual(2, datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual(3, datacatalog_facade.upsert_entry.call_count)
+        entry_group, entries = created_assets[0]
+        self.assertEqual([
+            'projects/uat-env-1/locations/us-central1/entryGroups/'
+            'entry_group_test_1a/entries/entry_test_1',
+            'projects/uat-env-1/locations/us-central1/entryGroups/'
+            'entry_group_test_1a/entries/entry_test_3'
+        ], entries)
+
+        entry = datacatalog_facade.upsert_entry.call_args_list[0][0][3]
+        self.assertEqual('My Fileset', entry.display_name)
+        self.assertEqual(['first_name', 'last_name'],
+                         [column.column for column in entry.schema.columns])
+
+    def test_create_filesets_from_csv_in_chunks_should_succeed(self, mock_read_csv):
+        dataframe = make_filesets_dataframe()
+        # Entry Group fields only on the first row, so they must be carried across chunks.
+        dataframe.loc[2, ['entry_group_name', 'entry_group_display_name']] = None
+        mock_read_csv.return_value = [
+            dataframe.iloc[[0]], dataframe.iloc[[1]], dataframe.iloc[[2]]
+        ]
+
+        self.execute_create_filesets_and_assert(chunk_size=1)
+
+        # The file is validated in a first pass, then streamed.
+        self.assertEqual([
+            mock.call('file-path',
+                      comment='#',
+                      chunksize=fileset_datasource_processor.VALIDATION_CHUNK_SIZE),
+            mock.call('file-path', comment='#', chunksize=1)
+        ], mock_read_csv.call_args_list)
+        entry_group = self.__datacatalog_facade.create_entry_group.call_args_list[1][0][3]
+        self.assertEqual('My Fileset Entry Group 2', entry_group.display_name)
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_facade.DataCatalogFacade')
+    def test_create_filesets_from_csv_with_metrics_should_record_phases(
+            self, mock_datacatalog_facade, mock_read_csv):  # noqa: E125
+        mock_datacatalog_facade.return_value.extract_resources_from_entry_group.side_effect = \
+            extract_resources_from_entry_group
+        dataframe = make_filesets_dataframe()
+        mock_read_csv.return_value = [dataframe.iloc[0:2], dataframe.iloc[2:3]]
+        metrics = run_metrics.RunMetrics()
+        processor = fileset_datasource_processor.FilesetDatasourceProcessor(metrics=metrics)
+
+        processor.create_entry_groups_and_entries_from_csv('file-path', chunk_size=2)
+
+        mock_datacatalog_facade.assert_called_once_with(rate_limiter=None,
+                                                        metrics=metrics,
+                                                        channels=None,
+                                                        channel_dispatch=None,
+                                                        update_payloads=mock.ANY)
+        self.assertEqual(['build', 'extract', 'normalize', 'read', 'sync', 'validate'],
+                         list(metrics.to_dict()['phases_seconds']))
+
+    def test_create_filesets_from_csv_in_chunks_should_merge_entry_group_rows(
+            self, mock_read_csv):  # noqa: E125
+        dataframe = make_filesets_dataframe()
+        mock_read_csv.return_value = [dataframe.iloc[0:2], dataframe.iloc[2:3]]
+
+        created_assets = self.__tag_datasource_processor.\
+            create_entry_groups_and_entries_from_csv('file-path', chunk_size=2)
+
+        self.assertEqual(2, self.__datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual(2, len(created_assets[1][1]))
+
+    def test_create_filesets_from_csv_in_chunks_non_contiguous_should_warn(self, mock_read_csv):
+        dataframe = make_filesets_dataframe()
+        dataframe.loc[2, 'entry_group_name'] = dataframe.loc[0, 'entry_group_name']
+        mock_read_csv.return_value = [
+            dataframe.iloc[[0]], dataframe.iloc[[1]], dataframe.iloc[[2]]
+        ]
+
+        with self.assertLogs(level='WARNING') as logs:
+            created_assets = self.__tag_datasource_processor.\
+                create_entry_groups_and_entries_from_csv('file-path', chunk_size=1)
+
+        self.assertEqual(3, len(created_assets))
+        self.assertIn('rows are not contiguous', logs.output[0])
+
+    def test_create_filesets_from_csv_in_chunks_with_workers_should_succeed(self, mock_read_csv):
+        dataframe = make_filesets_dataframe()
+        mock_read_csv.return_value = [dataframe.iloc[0:2], dataframe.iloc[2:3]]
+
+        self.execute_create_filesets_and_assert(workers=2, chunk_size=2)
+
+    def test_delete_filesets_from_csv_in_chunks_should_succeed(self, mock_read_csv):
+        dataframe = make_filesets_dataframe()
+        mock_read_csv.return_value = [
+            dataframe.iloc[[0]], dataframe.iloc[[1]], dataframe.iloc[[2]]
+        ]
+
+        self.__tag_datasource_processor.delete_entry_groups_and_entries_from_csv('file-path',
+                                                                                 chunk_size=1)
+
+        mock_read_csv.assert_called_once_with('file-path', comment='#', chunksize=1)
+        self.assertEqual(3, self.__datacatalog_facade.delete_entry.call_count)
+        self.assertEqual(2, self.__datacatalog_facade.delete_entry_group.call_count)
+
+    def test_create_filesets_from_csv_with_csv_parser_should_succeed(self, mock_read_csv):
+        file_path = self.__write_filesets_csv()
+
+        self.execute_create_filesets_and_assert(file_path=file_path, parser='csv')
+
+        mock_read_csv.assert_not_called()
+
+    def test_delete_filesets_from_csv_with_csv_parser_in_chunks_should_succeed(
+            self, mock_read_csv):  # noqa: E125
+        file_path = self.__write_filesets_csv()
+
+        self.__tag_datasource_processor.delete_entry_groups_and_entries_from_csv(file_path,
+                                                                                 chunk_size=1,
+                                                                                 parser='csv')
+
+        mock_read_csv.assert_not_called()
+        self.assertEqual(3, self.__datacatalog_facade.delete_entry.call_count)
+        self.assertEqual(2, self.__datacatalog_facade.delete_entry_group.call_count)
+
+    def test_create_filesets_from_csv_directory_should_process_all_files(self, mock_read_csv):
+        dataframe = make_filesets_dataframe()
+        temp_dir = self.__write_filesets_csvs({
+            'team_a.csv': dataframe.iloc[[0, 1]],
+            'team_b.csv': dataframe.iloc[[2]]
+        })
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.create_entry_group.side_effect = mock_created_entry_group
+
+        with self.assertLogs(level='WARNING') as logs:
+            created_assets = self.__tag_datasource_processor.\
+                create_entry_groups_and_entries_from_csv(temp_dir, parser='csv', parse_workers=2)
+
+        mock_read_csv.assert_not_called()
+        # The Entry Group defined in both files is created once.
+        self.assertEqual(2, datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual(3, datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual(['entry_group_test_1a', 'entry_group_test_2a', 'entry_group_test_2a'],
+                         [entry_group.split('/')[-1] for entry_group, _ in created_assets])
+        self.assertTrue(
+            any('entry_group_test_2a: {}, {}'.format(os.path.join(
+                temp_dir, 'team_a.csv'), os.path.join(temp_dir, 'team_b.csv')) in message
+                for message in logs.output))
+
+    def test_create_filesets_from_json_lines_should_stream_rows(self, mock_read_csv):
+        file_path = self.__write_filesets_json_lines(make_filesets_dataframe())
+
+        created_assets = self.__tag_datasource_processor.\
+            create_entry_groups_and_entries_from_csv(file_path)
+
+        mock_read_csv.assert_not_called()
+        self.assertEqual(2, self.__datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual(3, self.__datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual([1, 2], [len(entries) for _, entries in created_assets])
+
+    def test_create_filesets_from_json_lines_invalid_rows_should_fail_before_any_call(
+            self, mock_read_csv):  # noqa: E125
+        dataframe = make_filesets_dataframe()
+        dataframe.loc[1, 'entry_id'] = 'entry-test-2'
+        file_path = self.__write_filesets_json_lines(dataframe)
+
+        with self.assertLogs(level='ERROR') as logs, self.assertRaises(ValueError):
+            self.__tag_datasource_processor.create_entry_groups_and_entries_from_csv(file_path)
+
+        self.assertIn("invalid entry_id 'entry-test-2', row 2", logs.output[0])
+        self.__datacatalog_facade.create_entry_group.assert_not_called()
+
+    def test_create_filesets_from_csv_with_shard_should_process_shard_entry_groups(
+            self, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.create_entry_group.side_effect = mock_created_entry_group
+
+        created_assets = self.__tag_datasource_processor.\
+            create_entry_groups_and_entries_from_csv('file-path', shard_index=0, shard_count=2)
+
+        self.assertEqual(['entry_group_test_2a'],
+                         [entry_group.split('/')[-1] for entry_group, _ in created_assets])
+        self.assertEqual(2, datacatalog_facade.upsert_entry.call_count)
+
+    def test_delete_filesets_from_csv_with_shard_should_process_shard_entry_groups(
+            self, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
+
+        deleted_assets = self.__tag_datasource_processor.\
+            delete_entry_groups_and_entries_from_csv('file-path', shard_index=1, shard_count=2)
+
+        self.assertEqual(['entry_group_test_1a'],
+                         [entry_group.split('/')[-1] for entry_group, _, _ in deleted_assets])
+        self.assertEqual(1, self.__datacatalog_facade.delete_entry.call_count)
+
+    def test_create_filesets_from_csv_with_invalid_shard_should_raise(self, mock_read_csv):
+        self.assertRaises(ValueError,
+                          self.__tag_datasource_processor.create_entry_groups_and_entries_from_csv,
+                          'file-path',
+                          shard_index=2,
+                          shard_count=2)
+
+        mock_read_csv.assert_not_called()
+
+    def test_count_shard_sizes_from_csv_should_count_each_shard(self, mock_read_csv):
+        mock_read_csv.return_value = make_filesets_dataframe()
+
+        shard_sizes = fileset_datasource_processor.FilesetDatasourceProcessor.\
+            count_shard_sizes_from_csv('file-path', shard_count=3)
+
+        self.assertEqual([(1, 2), (1, 1), (0, 0)], shard_sizes)
+
+    def test_delete_filesets_from_csv_glob_in_chunks_should_process_all_files(
+            self, mock_read_csv):  # noqa: E125
+        dataframe = make_filesets_dataframe()
+        temp_dir = self.__write_filesets_csvs({
+            'team_a.csv': dataframe.iloc[[0]],
+            'team_b.csv': dataframe.iloc[[1, 2]],
+            'notes.txt': dataframe
+        })
+
+        deleted_assets = self.__tag_datasource_processor.\
+            delete_entry_groups_and_entries_from_csv(os.path.join(temp_dir, 'team_*.csv'),
+                                                     chunk_size=1,
+                                                     parser='csv')
+
+        mock_read_csv.assert_not_called()
+        self.assertEqual(2, len(deleted_assets))
+        self.assertEqual(3, self.__datacatalog_facade.delete_entry.call_count)
+        self.assertEqual(2, self.__datacatalog_facade.delete_entry_group.call_count)
+
+    def test_delete_filesets_from_csv_directory_should_merge_entry_group_fragments(
+            self, mock_read_csv):  # noqa: E125
+        dataframe = make_filesets_dataframe()
+        temp_dir = self.__write_filesets_csvs({
+            'team_a.csv': dataframe.iloc[[1]],
+            'team_b.csv': dataframe.iloc[[0, 2]]
+        })
+
+        deleted_assets = self.__tag_datasource_processor.\
+            delete_entry_groups_and_entries_from_csv(temp_dir, parser='csv', parse_workers=1)
+
+        self.assertEqual(3, self.__datacatalog_facade.delete_entry.call_count)
+        self.assertEqual(2, self.__datacatalog_facade.delete_entry_group.call_count)
+        self.assertEqual(
+            [('projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_2a', 2),
+             ('projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_1a', 1)],
+            [(entry_group_name, len(entries)) for entry_group_name, _, entries in deleted_assets])
+
+    def test_read_csv_file_should_return_entry_groups(self, mock_read_csv):
+        mock_read_csv.return_value = make_filesets_dataframe()
+
+        entry_group_specs = fileset_datasource_processor.FilesetDatasourceProcessor.read_csv_file(
+            'file-path')
+
+        mock_read_csv.assert_called_once_with('file-path', comment='#')
+        self.assertEqual([1, 2],
+                         [len(entry_group_spec.entries) for entry_group_spec in entry_group_specs])
+
+    @mock.patch('datacatalog_fileset_processor.columnar_reader.JSON_LINES_CHUNK_SIZE', 1)
+    def test_read_csv_file_json_lines_should_extract_rows_across_chunks(self, mock_read_csv):
+        dataframe = make_filesets_dataframe()
+        dataframe.loc[2, ['entry_group_name', 'entry_group_display_name']] = None
+        # The Entry spans two rows, read in separate chunks.
+        extra_row = pd.DataFrame({
+            'entry_id': ['entry_test_2'],
+            'schema_column_name': ['last_name'],
+            'schema_column_type': ['STRING']
+        })
+        file_path = self.__write_filesets_json_lines(
+            pd.concat([dataframe.iloc[:2], extra_row, dataframe.iloc[2:]], ignore_index=True))
+
+        entry_group_specs = fileset_datasource_processor.FilesetDatasourceProcessor.read_csv_file(
+            file_path)
+
+        mock_read_csv.assert_not_called()
+        self.assertEqual(
+            ['entry_group_test_1a', 'entry_group_test_2a'],
+            [entry_group_spec.name.split('/')[-1] for entry_group_spec in entry_group_specs])
+        entry_specs = entry_group_specs[1].entries
+        self.assertEqual(['entry_test_2', 'entry_test_3'],
+                         [entry_spec.id for entry_spec in entry_specs])
+        self.assertEqual(['first_name', 'last_name'],
+                         [column.name for column in entry_specs[0].columns])
+
+    def test_create_filesets_from_csv_glob_without_files_should_raise(self, mock_read_csv):
+        temp_dir = self.__write_filesets_csvs({})
+
+        self.assertRaises(FileNotFoundError,
+                          self.__tag_datasource_processor.create_entry_groups_and_entries_from_csv,
+                          os.path.join(temp_dir, '*.csv'))
+
+    def __write_filesets_csvs(self, dataframes):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        for file_name, dataframe in dataframes.items():
+            dataframe.to_csv(os.path.join(temp_dir, file_name), index=False)
+        return temp_dir
+
+    def __make_temp_file_path(self, file_name):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        return os.path.join(temp_dir, file_name)
+
+    def __write_filesets_json_lines(self, dataframe):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        file_path = os.path.join(temp_dir, 'filesets.jsonl')
+        dataframe.to_json(file_path, orient='records', lines=True)
+        return file_path
+
+    def __write_filesets_csv(self, dataframe=None):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        file_path = os.path.join(temp_dir, 'filesets.csv')
+        (make_filesets_dataframe() if dataframe is None else dataframe).to_csv(file_path,
+                                                                               index=False)
+        return file_path
+
     def test_delete_filesets_from_csv_should_succeed(self, mock_read_csv):
         mock_read_csv.return_value = pd.DataFrame(
             data={
@@ -190,16 +594,818 @@ class TagTemplateDatasourceProcessorTest(unittest.TestCase):
         self.assertEqual(0, self.__datacatalog_facade.create_entry_group.call_count)
         self.assertEqual(0, self.__datacatalog_facade.upsert_entry.call_count)
 
-    def execute_create_filesets_and_assert(self):
+    def test_create_filesets_from_csv_with_manifest_should_skip_unchanged_entries(
+            self, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
+        manifest = make_manifest(unchanged_entry_ids=['entry_test_2'])
+
+        created_assets = self.__tag_datasource_processor.\
+            create_entry_groups_and_entries_from_csv('file-path', manifest=manifest)
+
+        datacatalog_facade = self.__datacatalog_facade
+        self.assertEqual(2, datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual(manifest, datacatalog_facade.upsert_entry.call_args[0][5])
+        self.assertEqual(2, len(created_assets[1][1]))
+
+    def test_create_filesets_from_csv_with_workers_and_manifest_should_skip_unchanged_entries(
+            self, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
+        manifest = make_manifest(unchanged_entry_ids=['entry_test_1', 'entry_test_3'])
+
+        created_assets = self.__tag_datasource_processor.\
+            create_entry_groups_and_entries_from_csv('file-path', workers=4, manifest=manifest)
+
+        self.assertEqual(1, self.__datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual(1, len(created_assets[0][1]))
+        self.assertEqual(2, len(created_assets[1][1]))
+
+    @mock.patch('datacatalog_fileset_processor.async_datacatalog_facade.AsyncDataCatalogFacade')
+    def test_create_filesets_from_csv_with_async_concurrency_and_manifest_should_skip_entries(
+            self, mock_async_datacatalog_facade, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
+        async_facade = FakeAsyncDataCatalogFacade()
+        mock_async_datacatalog_facade.return_value = async_facade
+        manifest = make_manifest(unchanged_entry_ids=['entry_test_1'])
+
+        created_assets = self.__tag_datasource_processor.\
+            create_entry_groups_and_entries_from_csv('file-path',
+                                                     async_concurrency=2,
+                                                     manifest=manifest)
+
+        self.assertEqual(2, async_facade.upsert_entry_count)
+        self.assertEqual(1, len(created_assets[0][1]))
+        self.assertEqual(2, len(created_assets[1][1]))
+
+    def test_delete_filesets_from_csv_with_workers_should_return_outcomes(self, mock_read_csv):
+        mock_read_csv.return_value = make_filesets_dataframe()
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.delete_entry.side_effect = \
+            lambda entry_name: 'failed' if entry_name.endswith('entry_test_3') else 'deleted'
+        datacatalog_facade.delete_entry_group.side_effect = exceptions.NotFound('Not found')
+
+        deleted_assets = self.__tag_datasource_processor.\
+            delete_entry_groups_and_entries_from_csv('file-path', workers=4)
+
+        self.assertEqual(3, datacatalog_facade.delete_entry.call_count)
+        datacatalog_facade.delete_entry_group.assert_called_once_with(
+            'projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_1a')
+        self.assertEqual([
+            ('projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_1a',
+             'not found', [('projects/uat-env-1/locations/us-central1/entryGroups/'
+                            'entry_group_test_1a/entries/entry_test_1', 'deleted')]),
+            ('projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_2a', 'failed',
+             [('projects/uat-env-1/locations/us-central1/entryGroups/'
+               'entry_group_test_2a/entries/entry_test_2', 'deleted'),
+              ('projects/uat-env-1/locations/us-central1/entryGroups/'
+               'entry_group_test_2a/entries/entry_test_3', 'failed')]),
+        ], deleted_assets)
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_facade.DataCatalogFacade')
+    def test_delete_filesets_from_csv_with_progress_should_report_outcomes(
+            self, mock_datacatalog_facade, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
+        mock_datacatalog_facade.return_value.delete_entry.side_effect = \
+            lambda entry_name: 'failed' if entry_name.endswith('entry_test_3') else 'deleted'
+        processor = fileset_datasource_processor.FilesetDatasourceProcessor(progress_interval=3600)
+
+        with self.assertLogs(level='INFO') as logs:
+            processor.delete_entry_groups_and_entries_from_csv('file-path')
+
+        self.assertIn('INFO:root:Entries: 3/3', '\n'.join(logs.output))
+        self.assertIn(', deleted: 2, failed: 1', '\n'.join(logs.output))
+
+    def test_delete_filesets_from_csv_entry_group_error_should_return_failed(self, mock_read_csv):
+        mock_read_csv.return_value = make_filesets_dataframe()
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.delete_entry.side_effect = exceptions.Unknown('Unknown error')
+        datacatalog_facade.delete_entry_group.side_effect = \
+            exceptions.ServiceUnavailable('Service unavailable')
+
+        deleted_assets = self.__tag_datasource_processor.\
+            delete_entry_groups_and_entries_from_csv('file-path')
+
+        datacatalog_facade.delete_entry_group.assert_not_called()
+        self.assertEqual(['failed', 'failed'], [outcome for _, outcome, _ in deleted_assets])
+
+    def test_delete_filesets_from_csv_entry_group_api_error_should_return_failed(
+            self, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.delete_entry.return_value = 'deleted'
+        datacatalog_facade.delete_entry_group.side_effect = \
+            exceptions.ServiceUnavailable('Service unavailable')
+
+        deleted_assets = self.__tag_datasource_processor.\
+            delete_entry_groups_and_entries_from_csv('file-path')
+
+        self.assertEqual(2, datacatalog_facade.delete_entry_group.call_count)
+        self.assertEqual(['failed', 'failed'], [outcome for _, outcome, _ in deleted_assets])
+
+    def test_delete_filesets_from_csv_with_manifest_should_remove_entries(self, mock_read_csv):
+        mock_read_csv.return_value = make_filesets_dataframe()
+        manifest = mock.MagicMock()
+
+        self.__tag_datasource_processor.delete_entry_groups_and_entries_from_csv('file-path',
+                                                                                 manifest=manifest)
+
+        self.assertEqual(3, manifest.remove.call_count)
+
+    def test_plan_filesets_from_csv_should_write_plan_file(self, mock_read_csv):
+        mock_read_csv.return_value = make_filesets_dataframe()
+
+        entry_group_name = 'projects/uat-env-1/locations/us-central1/entryGroups/' \
+                           'entry_group_test_2a'
+        unchanged_entry = datacatalog_v1.types.Entry()
+        unchanged_entry.name = '{}/entries/entry_test_2'.format(entry_group_name)
+        unchanged_entry.display_name = 'My Fileset 2'
+        unchanged_entry.description = 'This fileset consists of all files for bucket bucket_23c4'
+        unchanged_entry.gcs_fileset_spec.file_patterns.extend(
+            ['gs://bucket_23c4/*.csv', 'gs://bucket_23c4/*.png'])
+        unchanged_entry.schema.columns.append(
+            datacatalog_v1.types.ColumnSchema(column='first_name',
+                                              type='STRING',
+                                              description='First name',
+                                              mode='REQUIRED'))
+        # Fields set by Data Catalog are not compared.
+        unchanged_entry.linked_resource = 'linked_resource'
+        changed_entry = datacatalog_v1.types.Entry()
+        changed_entry.name = '{}/entries/entry_test_3'.format(entry_group_name)
+        removed_entry = datacatalog_v1.types.Entry()
+        removed_entry.name = '{}/entries/entry_test_4'.format(entry_group_name)
+
+        def list_entries(name):
+            if name != entry_group_name:
+                raise exceptions.NotFound('Entry Group not found')
+            return iter([unchanged_entry, changed_entry, removed_entry])
+
+        self.__datacatalog_facade.list_entries.side_effect = list_entries
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            plan_file_path = os.path.join(temp_dir, 'plan.jsonl')
+            summary = self.__tag_datasource_processor.plan_entry_groups_and_entries_from_csv(
+                'file-path', plan_file_path, workers=2)
+            with open(plan_file_path) as plan_file:
+                plan_records = [json.loads(line) for line in plan_file]
+        finally:
+            shutil.rmtree(temp_dir)
+
+        self.assertEqual(0, self.__datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual([('entry_group', 'create'), ('entry', 'create'),
+                          ('entry_group', 'unchanged'), ('entry', 'unchanged'),
+                          ('entry', 'update'), ('entry', 'delete')],
+                         [(plan_record['resource'], plan_record['action'])
+                          for plan_record in plan_records])
+        self.assertEqual(1, summary[(fileset_plan.RESOURCE_ENTRY, fileset_plan.ACTION_DELETE)])
+        self.assertEqual('My Fileset Entry Group a', plan_records[0]['data']['display_name'])
+        self.assertEqual({}, plan_records[4]['data']['schema_columns'])
+        self.assertEqual(['display_name', 'description', 'gcs_fileset_spec.file_patterns'],
+                         plan_records[4]['fields'])
+        self.assertEqual(removed_entry.name, plan_records[5]['name'])
+
+    def test_plan_filesets_from_csv_entry_group_split_across_files_should_be_planned_once(
+            self, mock_read_csv):  # noqa: E125
+        dataframe = make_filesets_dataframe()
+        temp_dir = self.__write_filesets_csvs({
+            'a.csv': dataframe.iloc[[1]],
+            'b.csv': dataframe.iloc[[2]]
+        })
+        entry_group_name = 'projects/uat-env-1/locations/us-central1/entryGroups/' \
+                           'entry_group_test_2a'
+        self.__datacatalog_facade.list_entries.side_effect = lambda name: iter([
+            make_fileset_entry(entry_group_name, entry_id)
+            for entry_id in ('entry_test_2', 'entry_test_3', 'entry_test_4')
+        ])
+
+        plan_file_path = self.__make_temp_file_path('plan.jsonl')
+        with self.assertLogs(level='WARNING'):
+            self.__tag_datasource_processor.plan_entry_groups_and_entries_from_csv(temp_dir,
+                                                                                   plan_file_path,
+                                                                                   parser='csv',
+                                                                                   parse_workers=1)
+        with open(plan_file_path) as plan_file:
+            plan_records = [json.loads(line) for line in plan_file]
+
+        # Only the Entry listed in neither file is deleted.
+        self.assertEqual(
+            [('entry_group', 'unchanged', 'entry_group_test_2a'),
+             ('entry', 'update', 'entry_test_2'), ('entry', 'update', 'entry_test_3'),
+             ('entry', 'delete', 'entry_test_4')],
+            [(plan_record['resource'], plan_record['action'], plan_record['name'].split('/')[-1])
+             for plan_record in plan_records])
+
+    def test_export_filesets_to_csv_should_write_the_processor_layout(self, mock_read_csv):
+        entry_group_name = 'projects/my-project/locations/us-central1/entryGroups/entry_group'
+        entry_group = make_entry_group(entry_group_name, 'My Entry Group')
+        empty_entry_group = make_entry_group(
+            'projects/my-project/locations/us-central1/entryGroups/empty_entry_group')
+        self.__datacatalog_facade.list_entry_groups.side_effect = [
+            [
+                entry_group,
+                make_entry_group('projects/my-project/locations/us-central1/entryGroups/@bigquery')
+            ],
+            exceptions.PermissionDenied('Permission denied'), [empty_entry_group]
+        ]
+        bigquery_entry = make_fileset_entry(entry_group_name, 'table')
+        bigquery_entry.type = datacatalog_v1.enums.EntryType.TABLE
+        entries = {
+            entry_group_name: [
+                make_fileset_entry(entry_group_name, 'entry_1', ['first_name', 'last_name']),
+                bigquery_entry,
+                make_fileset_entry(entry_group_name, 'entry_2')
+            ],
+            empty_entry_group.name: []
+        }
+        self.__datacatalog_facade.list_entries.side_effect = \
+            lambda name, page_size: iter(entries[name])
+        self.__datacatalog_facade.is_fileset_entry.side_effect = \
+            datacatalog_facade.DataCatalogFacade.is_fileset_entry
+        file_path = self.__make_temp_file_path('filesets.csv')
+
+        with self.assertLogs(level='WARNING') as logs:
+            exported_counts = self.__tag_datasource_processor.\
+                export_entry_groups_and_entries_to_csv(
+                    [('my-project', 'us-central1'), ('other-project', 'us-central1'),
+                     ('my-project', 'us')], file_path, workers=2)
+
+        self.assertEqual((2, 2), exported_counts)
+        self.assertIn('project other-project, location us-central1 could not be listed',
+                      logs.output[0])
+        self.assertEqual([
+            mock.call(entry_group_name, page_size=1000),
+            mock.call(empty_entry_group.name, page_size=1000)
+        ], self.__datacatalog_facade.list_entries.call_args_list)
+        entry_group_specs = fileset_datasource_processor.FilesetDatasourceProcessor.\
+            read_csv_file(file_path, parser='csv')
+        self.assertEqual([entry_group_name, empty_entry_group.name],
+                         [entry_group_spec.name for entry_group_spec in entry_group_specs])
+        self.assertEqual('My Entry Group', entry_group_specs[0].display_name)
+        self.assertEqual(['entry_1', 'entry_2'],
+                         [entry_spec.id for entry_spec in entry_group_specs[0].entries])
+        self.assertEqual([], entry_group_specs[1].entries)
+        for entry_spec, entry in zip(entry_group_specs[0].entries, entries[entry_group_name][::2]):
+            self.assertEqual(entry_fingerprint.fingerprint_entry(entry),
+                             entry_fingerprint.fingerprint_entry_spec(entry_spec))
+
+    def test_export_filesets_to_csv_should_keep_entry_groups_in_order(self, mock_read_csv):
+        entry_group_names = [
+            'projects/my-project/locations/us-central1/entryGroups/entry_group_{}'.format(index)
+            for index in range(6)
+        ]
+        self.__datacatalog_facade.list_entry_groups.return_value = [
+            make_entry_group(entry_group_name) for entry_group_name in entry_group_names
+        ]
+
+        def list_entries(name, page_size):
+            # The Entries of the first Entry Groups are listed last.
+            time.sleep(0.01 * (6 - int(name[-1])))
+            if name == entry_group_names[4]:
+                raise exceptions.ServiceUnavailable('Service unavailable')
+            return iter([make_fileset_entry(name, 'entry_{}'.format(index)) for index in range(3)])
+
+        self.__datacatalog_facade.list_entries.side_effect = list_entries
+        file_path = self.__make_temp_file_path('filesets.csv')
+
+        with self.assertLogs(level='WARNING') as logs:
+            exported_counts = self.__tag_datasource_processor.\
+                export_entry_groups_and_entries_to_csv([('my-project', 'us-central1')],
+                                                       file_path,
+                                                       workers=3)
+
+        self.assertEqual((5, 15), exported_counts)
+        self.assertIn('Entries of Entry Group {} could not be listed'.format(entry_group_names[4]),
+                      logs.output[0])
+        with open(file_path) as csv_file:
+            rows = list(csv.reader(csv_file))
+        self.assertEqual(entry_group_names[:4] + entry_group_names[5:],
+                         [row[0] for row in rows[1:] if row[0]])
+        self.assertEqual(['entry_0', 'entry_1', 'entry_2'] * 5, [row[3] for row in rows[1:]])
+
+    @mock.patch('datacatalog_fileset_processor.fileset_datasource_processor.EXPORT_PAGE_SIZE', 2)
+    @mock.patch('datacatalog_fileset_processor.fileset_csv_writer.FilesetsCsvWriter.write_entry')
+    def test_export_filesets_to_csv_write_failure_should_stop_the_workers(
+            self, mock_write_entry, mock_read_csv):  # noqa: E125
+        entry_group_name = 'projects/my-project/locations/us-central1/entryGroups/entry_group'
+        self.__datacatalog_facade.list_entry_groups.return_value = [
+            make_entry_group(entry_group_name)
+        ]
+        self.__datacatalog_facade.list_entries.return_value = iter([
+            make_fileset_entry(entry_group_name, 'entry_{}'.format(index)) for index in range(10)
+        ])
+        mock_write_entry.side_effect = OSError('No space left on device')
+
+        self.assertRaises(OSError,
+                          self.__tag_datasource_processor.export_entry_groups_and_entries_to_csv,
+                          [('my-project', 'us-central1')],
+                          self.__make_temp_file_path('filesets.csv'))
+
+        # The worker waiting for room in the queue gave up, leaving the last Entries: at
+        # most the written one, two queued ones and the one waiting were listed.
+        self.assertGreaterEqual(len(list(self.__datacatalog_facade.list_entries.return_value)), 6)
+
+    def test_apply_plan_should_apply_changes_only(self, mock_read_csv):
+        entry_group_name = 'projects/my-project/locations/us-central1/entryGroups/entry_group'
+        entry_dict = {
+            'id': 'entry_1',
+            'name': '{}/entries/entry_1'.format(entry_group_name),
+            'display_name': 'My Fileset',
+            'description': None,
+            'file_patterns': ['gs://bucket/*'],
+            'schema_columns': {}
+        }
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.delete_entry.side_effect = exceptions.ServiceUnavailable('Unavailable')
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            plan_file_path = os.path.join(temp_dir, 'plan.jsonl')
+            with fileset_plan.FilesetPlanWriter(plan_file_path) as plan_writer:
+                plan_writer.write(fileset_plan.RESOURCE_ENTRY_GROUP, fileset_plan.ACTION_CREATE,
+                                  entry_group_name, None, {
+                                      'name': entry_group_name,
+                                      'display_name': 'My Entry Group',
+                                      'description': None
+                                  })
+                plan_writer.write(fileset_plan.RESOURCE_ENTRY, fileset_plan.ACTION_CREATE,
+                                  entry_dict['name'], entry_group_name, entry_dict)
+                plan_writer.write(fileset_plan.RESOURCE_ENTRY, fileset_plan.ACTION_UPDATE,
+                                  entry_dict['name'], entry_group_name, entry_dict,
+                                  ['display_name'])
+                plan_writer.write(fileset_plan.RESOURCE_ENTRY, fileset_plan.ACTION_UNCHANGED,
+                                  entry_dict['name'], entry_group_name)
+                plan_writer.write(fileset_plan.RESOURCE_ENTRY, fileset_plan.ACTION_DELETE,
+                                  entry_dict['name'], entry_group_name)
+
+            applied_changes = self.__tag_datasource_processor.apply_plan(plan_file_path, workers=2)
+        finally:
+            shutil.rmtree(temp_dir)
+
+        self.assertEqual(1, datacatalog_facade.create_entry_group.call_count)
+        datacatalog_facade.create_entry.assert_called_once()
+        self.assertEqual('entry_1', datacatalog_facade.create_entry.call_args[0][1])
+        updated_entry, update_fields = datacatalog_facade.update_entry.call_args[0]
+        self.assertEqual(entry_dict['name'], updated_entry.name)
+        self.assertEqual(['display_name'], update_fields)
+        datacatalog_facade.upsert_entry.assert_not_called()
+        self.assertEqual(
+            {
+                ('entry_group', 'create'): 1,
+                ('entry', 'create'): 1,
+                ('entry', 'update'): 1,
+                ('entry', 'failed'): 1
+            }, applied_changes)
+
+    def test_apply_plan_create_already_exists_should_upsert_entry(self, mock_read_csv):
+        entry_group_name = 'projects/my-project/locations/us-central1/entryGroups/entry_group'
+        entry_dict = {
+            'id': 'entry_1',
+            'name': '{}/entries/entry_1'.format(entry_group_name),
+            'display_name': 'My Fileset',
+            'description': None,
+            'file_patterns': ['gs://bucket/*'],
+            'schema_columns': {}
+        }
+
+        datacatalog_facade = self.__datacatalog_facade
+        # The create call was committed, then timed out and was retried.
+        datacatalog_facade.create_entry.side_effect = exceptions.AlreadyExists('Already exists')
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            plan_file_path = os.path.join(temp_dir, 'plan.jsonl')
+            with fileset_plan.FilesetPlanWriter(plan_file_path) as plan_writer:
+                plan_writer.write(fileset_plan.RESOURCE_ENTRY, fileset_plan.ACTION_CREATE,
+                                  entry_dict['name'], entry_group_name, entry_dict)
+
+            applied_changes = self.__tag_datasource_processor.apply_plan(plan_file_path)
+        finally:
+            shutil.rmtree(temp_dir)
+
+        parent, entry_name, entry_id, _ = datacatalog_facade.upsert_entry.call_args[0]
+        self.assertEqual((entry_group_name, entry_dict['name'], 'entry_1'),
+                         (parent, entry_name, entry_id))
+        self.assertEqual({('entry', 'create'): 1}, applied_changes)
+
+    def test_apply_plan_create_denied_should_count_failed_entry(self, mock_read_csv):
+        entry_group_name = 'projects/my-project/locations/us-central1/entryGroups/entry_group'
+        entry_dict = {
+            'id': 'entry_1',
+            'name': '{}/entries/entry_1'.format(entry_group_name),
+            'display_name': 'My Fileset',
+            'description': None,
+            'file_patterns': ['gs://bucket/*'],
+            'schema_columns': {}
+        }
+
+        # The facade logs the permission denied errors, and returns no Entry.
+        self.__datacatalog_facade.create_entry.return_value = None
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            plan_file_path = os.path.join(temp_dir, 'plan.jsonl')
+            with fileset_plan.FilesetPlanWriter(plan_file_path) as plan_writer:
+                plan_writer.write(fileset_plan.RESOURCE_ENTRY, fileset_plan.ACTION_CREATE,
+                                  entry_dict['name'], entry_group_name, entry_dict)
+
+            applied_changes = self.__tag_datasource_processor.apply_plan(plan_file_path)
+        finally:
+            shutil.rmtree(temp_dir)
+
+        self.assertEqual({('entry', 'failed'): 1}, applied_changes)
+
+    def test_create_filesets_from_csv_with_workers_should_succeed(self, mock_read_csv):
+        mock_read_csv.return_value = make_filesets_dataframe()
+
+        self.execute_create_filesets_and_assert(workers=4)
+
+    def test_create_filesets_from_csv_should_log_the_update_bytes_saved(self, mock_read_csv):
+        mock_read_csv.return_value = make_filesets_dataframe()
+        self.__update_payloads.record(1, 1)
+        self.__datacatalog_facade.upsert_entry.side_effect = \
+            lambda *args: self.__update_payloads.record(10, 100)
+
+        with self.assertLogs(level='INFO') as logs:
+            self.__tag_datasource_processor.create_entry_groups_and_entries_from_csv('file-path')
+
+        self.assertIn(
+            'INFO:root:Entries updated with a field mask: 3, 30 bytes sent instead of 300,'
+            ' 270 bytes saved (90%)', logs.output)
+
+    def test_create_filesets_from_csv_with_workers_should_isolate_failures(self, mock_read_csv):
+        mock_read_csv.return_value = make_filesets_dataframe()
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.extract_resources_from_entry_group.side_effect = \
+            extract_resources_from_entry_group
+
+        def upsert_entry(entry_group_name,
+                         entry_name,
+                         entry_id,
+                         entry,
+                         existing_entries=None,
+                         manifest=None):
+            if entry_id == 'entry_test_2':
+                raise exceptions.ResourceExhausted('Quota exceeded')
+            return entry
+
+        datacatalog_facade.upsert_entry.side_effect = upsert_entry
+
+        created_assets = self.__tag_datasource_processor.\
+            create_entry_groups_and_entries_from_csv('file-path', workers=4)
+
+        self.assertEqual(2, datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual(3, datacatalog_facade.upsert_entry.call_count)
+        entry_group, entries = created_assets[1]
+        self.assertEqual(
+            'projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_2a',
+            entry_group)
+        self.assertEqual([
+            'projects/uat-env-1/locations/us-central1/entryGroups/'
+            'entry_group_test_2a/entries/entry_test_3'
+        ], entries)
+
+    @mock.patch('datacatalog_fileset_processor.datacatalog_facade.DataCatalogFacade')
+    def test_create_filesets_from_csv_with_progress_should_report_outcomes(
+            self, mock_datacatalog_facade, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
+        datacatalog_facade = mock_datacatalog_facade.return_value
+        datacatalog_facade.extract_resources_from_entry_group.side_effect = \
+            extract_resources_from_entry_group
+        datacatalog_facade.upsert_entry.side_effect = [
+            mock.MagicMock(),
+            exceptions.ResourceExhausted('Quota exceeded'),
+            mock.MagicMock()
+        ]
+        processor = fileset_datasource_processor.FilesetDatasourceProcessor(progress_interval=3600)
+
+        with self.assertLogs(level='INFO') as logs:
+            processor.create_entry_groups_and_entries_from_csv('file-path', workers=4)
+
+        self.assertIn('INFO:root:Entries: 3/3', '\n'.join(logs.output))
+        self.assertIn(', failed: 1, upserted: 2', '\n'.join(logs.output))
+
+    def test_create_filesets_from_csv_with_prefetch_should_list_entries(self, mock_read_csv):
+        mock_read_csv.return_value = make_filesets_dataframe()
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.extract_resources_from_entry_group.side_effect = \
+            extract_resources_from_entry_group
+        persisted_entry = mock.MagicMock()
+        # The listed names use the project number, unlike the CSV file.
+        persisted_entry.name = 'projects/123456789/locations/us-central1/entryGroups/' \
+                               'entry_group_test_2a/entries/entry_test_2'
+        datacatalog_facade.list_entries.side_effect = \
+            lambda entry_group_name: [persisted_entry] if entry_group_name.endswith('2a') else []
+
+        self.__tag_datasource_processor.create_entry_groups_and_entries_from_csv(
+            'file-path', prefetch_entries=True)
+
+        self.assertEqual(2, datacatalog_facade.list_entries.call_count)
+        self.assertEqual(3, datacatalog_facade.upsert_entry.call_count)
+        existing_entries = datacatalog_facade.upsert_entry.call_args[0][4]
+        self.assertEqual({'entry_test_2': persisted_entry}, existing_entries)
+
+    def test_create_filesets_from_csv_with_workers_and_prefetch_should_list_entries(
+            self, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.extract_resources_from_entry_group.side_effect = \
+            extract_resources_from_entry_group
+        datacatalog_facade.list_entries.return_value = []
+
+        self.__tag_datasource_processor.create_entry_groups_and_entries_from_csv(
+            'file-path', workers=4, prefetch_entries=True)
+
+        self.assertEqual(2, datacatalog_facade.list_entries.call_count)
+        self.assertEqual({}, datacatalog_facade.upsert_entry.call_args[0][4])
+
+    @mock.patch('datacatalog_fileset_processor.async_datacatalog_facade.AsyncDataCatalogFacade')
+    def test_create_filesets_from_csv_with_async_concurrency_and_prefetch_should_list_entries(
+            self, mock_async_datacatalog_facade, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
+        async_facade = FakeAsyncDataCatalogFacade()
+        mock_async_datacatalog_facade.return_value = async_facade
+
+        self.__tag_datasource_processor.create_entry_groups_and_entries_from_csv(
+            'file-path', async_concurrency=2, prefetch_entries=True)
+
+        self.assertEqual(2, async_facade.list_entries_count)
+        self.assertEqual(3, async_facade.upsert_entry_count)
+
+    @mock.patch('datacatalog_fileset_processor.async_datacatalog_facade.AsyncDataCatalogFacade')
+    def test_create_filesets_from_csv_with_async_concurrency_should_succeed(
+            self, mock_async_datacatalog_facade, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
+        async_facade = FakeAsyncDataCatalogFacade()
+        mock_async_datacatalog_facade.return_value = async_facade
+
+        created_assets = self.__tag_datasource_processor.\
+            create_entry_groups_and_entries_from_csv('file-path', async_concurrency=2)
+
+        self.assertEqual(2, async_facade.create_entry_group_count)
+        self.assertEqual(1, async_facade.list_entry_groups_count)
+        self.assertEqual(3, async_facade.upsert_entry_count)
+        self.assertEqual(0, self.__datacatalog_facade.upsert_entry.call_count)
+        self.assertLessEqual(async_facade.max_in_flight, 2)
+        self.assertEqual([
+            ('projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_1a', [
+                'projects/uat-env-1/locations/us-central1/entryGroups/'
+                'entry_group_test_1a/entries/entry_test_1'
+            ]),
+            ('projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_2a', [
+                'projects/uat-env-1/locations/us-central1/entryGroups/'
+                'entry_group_test_2a/entries/entry_test_2',
+                'projects/uat-env-1/locations/us-central1/entryGroups/'
+                'entry_group_test_2a/entries/entry_test_3'
+            ]),
+        ], created_assets)
+
+    @mock.patch('datacatalog_fileset_processor.async_datacatalog_facade.AsyncDataCatalogFacade')
+    def test_create_filesets_from_csv_with_async_concurrency_should_not_cap_blocking_calls(
+            self, mock_async_datacatalog_facade, mock_read_csv):  # noqa: E125
+        # More blocking calls than the default executor threads must be in flight at once.
+        entries_count = 64
+        dataframe = make_filesets_dataframe().iloc[[0] * entries_count].reset_index(drop=True)
+        dataframe['entry_id'] = ['entry_test_{}'.format(index) for index in range(entries_count)]
+        mock_read_csv.return_value = dataframe
+        async_facade = BlockingFakeAsyncDataCatalogFacade(entries_count)
+        mock_async_datacatalog_facade.return_value = async_facade
+
+        created_assets = self.__tag_datasource_processor.\
+            create_entry_groups_and_entries_from_csv('file-path',
+                                                     async_concurrency=entries_count)
+
+        self.assertEqual(entries_count, len(created_assets[0][1]))
+
+    @mock.patch('datacatalog_fileset_processor.async_datacatalog_facade.AsyncDataCatalogFacade')
+    def test_create_filesets_from_csv_with_async_concurrency_should_cap_executor_threads(
+            self, mock_async_datacatalog_facade, mock_read_csv):  # noqa: E125
+        entries_count = constant.ASYNC_EXECUTOR_MAX_WORKERS * 2
+        dataframe = make_filesets_dataframe().iloc[[0] * entries_count].reset_index(drop=True)
+        dataframe['entry_id'] = ['entry_test_{}'.format(index) for index in range(entries_count)]
+        mock_read_csv.return_value = dataframe
+        async_facade = ThreadCountingFakeAsyncDataCatalogFacade()
+        mock_async_datacatalog_facade.return_value = async_facade
+
+        created_assets = self.__tag_datasource_processor.\
+            create_entry_groups_and_entries_from_csv('file-path',
+                                                     async_concurrency=entries_count)
+
+        self.assertEqual(entries_count, len(created_assets[0][1]))
+        self.assertLessEqual(len(async_facade.thread_names), constant.ASYNC_EXECUTOR_MAX_WORKERS)
+
+    @mock.patch('datacatalog_fileset_processor.async_datacatalog_facade.AsyncDataCatalogFacade')
+    def test_create_filesets_from_csv_with_async_concurrency_should_isolate_failures(
+            self, mock_async_datacatalog_facade, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
+        async_facade = FakeAsyncDataCatalogFacade(failed_entry_ids=['entry_test_1'])
+        mock_async_datacatalog_facade.return_value = async_facade
+
+        created_assets = self.__tag_datasource_processor.\
+            create_entry_groups_and_entries_from_csv('file-path', async_concurrency=10)
+
+        self.assertEqual(3, async_facade.upsert_entry_count)
+        entry_group, entries = created_assets[0]
+        self.assertEqual([], entries)
+        entry_group, entries = created_assets[1]
+        self.assertEqual(2, len(entries))
+
+    def test_create_filesets_from_csv_with_journal_should_resume_remaining_work(
+            self, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
         datacatalog_facade = self.__datacatalog_facade
         datacatalog_facade.create_entry_group.side_effect = mock_created_entry_group
-        project_id, location_id, entry_group_id = 'my_project', 'my_location', 'my-entry-group'
-        datacatalog_facade.extract_resources_from_entry_group.return_value = (project_id,
-                                                                              location_id,
-                                                                              entry_group_id)
+
+        def upsert_entry(entry_group_name,
+                         entry_name,
+                         entry_id,
+                         entry,
+                         existing_entries=None,
+                         manifest=None):
+            if entry_id == 'entry_test_2':
+                raise exceptions.ResourceExhausted('Quota exceeded')
+            return entry
+
+        datacatalog_facade.upsert_entry.side_effect = upsert_entry
+        journal_file_path = self.__make_journal_file_path()
+
+        with run_journal.RunJournal(journal_file_path) as journal:
+            self.__tag_datasource_processor.create_entry_groups_and_entries_from_csv(
+                'file-path', workers=4, journal=journal)
+
+        datacatalog_facade.reset_mock()
+        datacatalog_facade.upsert_entry.side_effect = None
+        with run_journal.RunJournal(journal_file_path, resume=True) as journal:
+            created_assets = self.__tag_datasource_processor.\
+                create_entry_groups_and_entries_from_csv('file-path', journal=journal)
+
+        # Only the Entry that failed, and its Entry Group, are processed again.
+        datacatalog_facade.create_entry_group.assert_called_once()
+        datacatalog_facade.upsert_entry.assert_called_once()
+        self.assertEqual('entry_test_2', datacatalog_facade.upsert_entry.call_args[0][2])
+        self.assertEqual(1, len(created_assets))
+        with run_journal.RunJournal(journal_file_path, resume=True) as journal:
+            self.assertTrue(
+                journal.is_entry_group_done('projects/uat-env-1/locations/us-central1/'
+                                            'entryGroups/entry_group_test_2a'))
+
+    def test_create_filesets_from_csv_with_journal_should_resume_entry_group_split_across_files(
+            self, mock_read_csv):  # noqa: E125
+        dataframe = make_filesets_dataframe()
+        temp_dir = self.__write_filesets_csvs({
+            'a.csv': dataframe.iloc[[1]],
+            'b.csv': dataframe.iloc[[2]]
+        })
+        entry_group_name = 'projects/uat-env-1/locations/us-central1/entryGroups/' \
+                           'entry_group_test_2a'
+        journal_file_path = self.__make_journal_file_path()
+        # The run was interrupted once the first file was processed.
+        with run_journal.RunJournal(journal_file_path) as journal:
+            journal.record_entry('{}/entries/entry_test_2'.format(entry_group_name), 'upserted')
+            journal.record_entry_group(entry_group_name, 'upserted')
+
+        with run_journal.RunJournal(journal_file_path, resume=True) as journal, \
+                self.assertLogs(level='WARNING'):
+            self.__tag_datasource_processor.create_entry_groups_and_entries_from_csv(
+                temp_dir, parser='csv', parse_workers=1, journal=journal)
+
+        self.__datacatalog_facade.upsert_entry.assert_called_once()
+        self.assertEqual('entry_test_3', self.__datacatalog_facade.upsert_entry.call_args[0][2])
+
+    def test_create_filesets_from_csv_with_journal_should_record_outcomes(self, mock_read_csv):
+        mock_read_csv.return_value = make_filesets_dataframe()
+        journal = mock.MagicMock()
+        journal.is_entry_group_done.return_value = False
+        journal.is_entry_done.return_value = False
+
+        self.__tag_datasource_processor.create_entry_groups_and_entries_from_csv(
+            'file-path', manifest=make_manifest(['entry_test_3']), journal=journal)
+
+        self.assertEqual([
+            mock.call(
+                'projects/uat-env-1/locations/us-central1/entryGroups/'
+                'entry_group_test_1a/entries/entry_test_1', 'upserted'),
+            mock.call(
+                'projects/uat-env-1/locations/us-central1/entryGroups/'
+                'entry_group_test_2a/entries/entry_test_2', 'upserted'),
+            mock.call(
+                'projects/uat-env-1/locations/us-central1/entryGroups/'
+                'entry_group_test_2a/entries/entry_test_3', 'unchanged'),
+        ], journal.record_entry.call_args_list)
+        self.assertEqual(2, journal.record_entry_group.call_count)
+
+    def test_create_filesets_from_csv_entries_not_written_should_be_recorded_as_failed(
+            self, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
+        # The facade logs the permission denied errors, and returns no Entry.
+        self.__datacatalog_facade.upsert_entry.side_effect = \
+            lambda entry_group_name, entry_name, entry_id, *args: \
+            None if entry_id == 'entry_test_1' else mock.MagicMock()
+
+        for workers in (1, 4):
+            with self.subTest(workers=workers):
+                journal = mock.MagicMock()
+                journal.is_entry_group_done.return_value = False
+                journal.is_entry_done.return_value = False
+
+                created_assets = self.__tag_datasource_processor.\
+                    create_entry_groups_and_entries_from_csv('file-path',
+                                                             workers=workers,
+                                                             journal=journal)
+
+                self.assertEqual([[], ['entry_test_2', 'entry_test_3']],
+                                 [[entry_name.split('/')[-1] for entry_name in entries]
+                                  for _, entries in created_assets])
+                self.assertEqual(
+                    {
+                        'entry_test_1': 'failed',
+                        'entry_test_2': 'upserted',
+                        'entry_test_3': 'upserted'
+                    }, {
+                        name.split('/')[-1]: outcome
+                        for (name, outcome), _ in journal.record_entry.call_args_list
+                    })
+                self.assertEqual(
+                    {
+                        'entry_group_test_1a': 'failed',
+                        'entry_group_test_2a': 'upserted'
+                    }, {
+                        name.split('/')[-1]: outcome
+                        for (name, outcome), _ in journal.record_entry_group.call_args_list
+                    })
+
+    @mock.patch('datacatalog_fileset_processor.async_datacatalog_facade.AsyncDataCatalogFacade')
+    def test_create_filesets_from_csv_with_async_concurrency_and_journal_should_record_outcomes(
+            self, mock_async_datacatalog_facade, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
+        mock_async_datacatalog_facade.return_value = FakeAsyncDataCatalogFacade(
+            failed_entry_ids=['entry_test_1'], denied_entry_ids=['entry_test_2'])
+        journal_file_path = self.__make_journal_file_path()
+
+        with run_journal.RunJournal(journal_file_path) as journal:
+            self.__tag_datasource_processor.create_entry_groups_and_entries_from_csv(
+                'file-path',
+                async_concurrency=10,
+                manifest=make_manifest(['entry_test_3']),
+                journal=journal)
+
+        with open(journal_file_path) as journal_file:
+            records = sorted(
+                line.split('\t')[1] + ' ' + line.split('/')[-1].strip() for line in journal_file)
+        self.assertEqual([
+            'failed entry_group_test_1a', 'failed entry_group_test_2a', 'failed entry_test_1',
+            'failed entry_test_2', 'unchanged entry_test_3'
+        ], records)
+
+    def test_delete_filesets_from_csv_with_journal_should_resume_remaining_work(
+            self, mock_read_csv):  # noqa: E125
+        mock_read_csv.return_value = make_filesets_dataframe()
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.delete_entry.side_effect = \
+            lambda entry_name: 'failed' if entry_name.endswith('entry_test_3') else 'deleted'
+        journal_file_path = self.__make_journal_file_path()
+
+        with run_journal.RunJournal(journal_file_path) as journal:
+            self.__tag_datasource_processor.delete_entry_groups_and_entries_from_csv(
+                'file-path', workers=2, journal=journal)
+
+        datacatalog_facade.reset_mock()
+        datacatalog_facade.delete_entry.side_effect = None
+        datacatalog_facade.delete_entry.return_value = 'deleted'
+        with run_journal.RunJournal(journal_file_path, resume=True) as journal:
+            deleted_assets = self.__tag_datasource_processor.\
+                delete_entry_groups_and_entries_from_csv('file-path', journal=journal)
+
+        datacatalog_facade.delete_entry.assert_called_once_with(
+            'projects/uat-env-1/locations/us-central1/entryGroups/'
+            'entry_group_test_2a/entries/entry_test_3')
+        datacatalog_facade.delete_entry_group.assert_called_once_with(
+            'projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_2a')
+        self.assertEqual(1, len(deleted_assets))
+
+    def __make_journal_file_path(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        return os.path.join(temp_dir, 'journal.tsv')
+
+    def execute_create_filesets_and_assert(self,
+                                           workers=None,
+                                           chunk_size=None,
+                                           file_path='file-path',
+                                           parser=None):
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.create_entry_group.side_effect = mock_created_entry_group
+        datacatalog_facade.extract_resources_from_entry_group.side_effect = \
+            extract_resources_from_entry_group
 
         created_assets = self.__tag_datasource_processor.\
-            create_entry_groups_and_entries_from_csv('file-path')
+            create_entry_groups_and_entries_from_csv(file_path, workers=workers,
+                                                     chunk_size=chunk_size, parser=parser)
 
         self.assertEqual(2, datacatalog_facade.create_entry_group.call_count)
         self.assertEqual(3, datacatalog_facade.upsert_entry.call_count)
@@ -224,8 +1430,163 @@ class TagTemplateDatasourceProcessorTest(unittest.TestCase):
             'entry_group_test_2a/entries/entry_test_3', entries[1])
 
 
+def extract_resources_from_entry_group(entry_group_name):
+    return 'my_project', 'my_location', entry_group_name.split('/')[-1]
+
+
 def mock_created_entry_group(*args):
     entry_group_id = args[2]
     entry_group = args[3]
     entry_group.name = entry_group_id
     return entry_group
+
+
+class FakeAsyncDataCatalogFacade:
+
+    def __init__(self, failed_entry_ids=None, denied_entry_ids=None):
+        self.__failed_entry_ids = failed_entry_ids or []
+        self.__denied_entry_ids = denied_entry_ids or []
+        self.create_entry_group_count = 0
+        self.list_entry_groups_count = 0
+        self.list_entries_count = 0
+        self.upsert_entry_count = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create_entry_group(self, project_id, location_id, entry_group_id, entry_group):
+        self.create_entry_group_count += 1
+        if self.create_entry_group_count > 1:
+            raise exceptions.AlreadyExists('Entry Group already exists')
+        return entry_group
+
+    async def list_entry_groups(self, project_id, location_id):
+        self.list_entry_groups_count += 1
+        return []
+
+    async def list_entries(self, entry_group_name):
+        self.list_entries_count += 1
+        return []
+
+    async def upsert_entry(self,
+                           entry_group_name,
+                           entry_name,
+                           entry_id,
+                           entry,
+                           existing_entries=None,
+                           manifest=None):
+        self.upsert_entry_count += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if entry_id in self.__failed_entry_ids:
+            raise exceptions.ServiceUnavailable('Service unavailable')
+        if entry_id in self.__denied_entry_ids:
+            return None
+        return entry
+
+    @classmethod
+    def extract_resources_from_entry_group(cls, entry_group_name):
+        return 'my_project', 'my_location', entry_group_name.split('/')[-1]
+
+
+class BlockingFakeAsyncDataCatalogFacade(FakeAsyncDataCatalogFacade):
+    """Upserts Entries with blocking calls run in the event loop's default executor, which
+    all wait for each other, so they fail unless that many calls run at once."""
+
+    def __init__(self, parties):
+        super().__init__()
+        self.__barrier = threading.Barrier(parties, timeout=5)
+
+    async def upsert_entry(self,
+                           entry_group_name,
+                           entry_name,
+                           entry_id,
+                           entry,
+                           existing_entries=None,
+                           manifest=None):
+        await asyncio.get_event_loop().run_in_executor(None, self.__barrier.wait)
+        return entry
+
+
+class ThreadCountingFakeAsyncDataCatalogFacade(FakeAsyncDataCatalogFacade):
+    """Upserts Entries with blocking calls run in the event loop's default executor,
+    recording the threads they run in."""
+
+    def __init__(self):
+        super().__init__()
+        self.thread_names = set()
+
+    async def upsert_entry(self,
+                           entry_group_name,
+                           entry_name,
+                           entry_id,
+                           entry,
+                           existing_entries=None,
+                           manifest=None):
+        await asyncio.get_event_loop().run_in_executor(None, self.__record_thread)
+        return entry
+
+    def __record_thread(self):
+        time.sleep(0.01)
+        self.thread_names.add(threading.current_thread().name)
+
+
+def make_entry_group(name, display_name=None):
+    entry_group = datacatalog_v1.types.EntryGroup()
+    entry_group.name = name
+    if display_name:
+        entry_group.display_name = display_name
+    return entry_group
+
+
+def make_fileset_entry(entry_group_name, entry_id, column_names=()):
+    entry = datacatalog_v1.types.Entry()
+    entry.name = '{}/entries/{}'.format(entry_group_name, entry_id)
+    entry.display_name = 'My Fileset {}'.format(entry_id)
+    entry.type = datacatalog_v1.enums.EntryType.FILESET
+    entry.gcs_fileset_spec.file_patterns.extend(['gs://bucket/*.csv', 'gs://bucket/*.png'])
+    entry.schema.columns.extend([
+        datacatalog_v1.types.ColumnSchema(column=column_name, type='STRING', mode='REQUIRED')
+        for column_name in column_names
+    ])
+    return entry
+
+
+def make_manifest(unchanged_entry_ids):
+    manifest = mock.MagicMock()
+    manifest.is_unchanged.side_effect = \
+        lambda entry_name, entry: entry_name.split('/')[-1] in unchanged_entry_ids
+    return manifest
+
+
+def make_filesets_dataframe():
+    return pd.DataFrame(
+        data={
+            'entry_group_name': [
+                'projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_1a',
+                'projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_2a',
+                'projects/uat-env-1/locations/us-central1/entryGroups/entry_group_test_2a'
+            ],
+            'entry_group_display_name':
+            ['My Fileset Entry Group a', 'My Fileset Entry Group 2', 'My Fileset Entry Group 2'],
+            'entry_group_description': [
+                'This Entry Group consists of ....', 'This Entry Group consists of 2....',
+                'This Entry Group consists of 2....'
+            ],
+            'entry_id': ['entry_test_1', 'entry_test_2', 'entry_test_3'],
+            'entry_display_name': ['My Fileset', 'My Fileset 2', 'My Fileset 3'],
+            'entry_description': [
+                'This fileset consists of all files for bucket bucket_13c4',
+                'This fileset consists of all files for bucket bucket_23c4',
+                'This fileset consists of all files for bucket bucket_33c4'
+            ],
+            'entry_file_patterns': [
+                'gs://bucket_13c4/*', 'gs://bucket_23c4/*.csv|gs://bucket_23c4/*.png',
+                'gs://bucket_33c4/*.csv|gs://bucket_33c4/*.png'
+            ],
+            'schema_column_name': ['first_name_a', 'first_name', None],
+            'schema_column_type': ['STRING', 'STRING', None],
+            'schema_column_description': ['First name', 'First name', None],
+            'schema_column_mode': ['REQUIRED', 'REQUIRED', None]
+        })
@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from datacatalog_fileset_processor import fileset_plan
+
+
+class FilesetPlanTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.mkdtemp()
+        self.__file_path = os.path.join(self.__temp_dir, 'plan.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.__temp_dir)
+
+    def test_written_records_should_be_read_in_order(self):
+        with fileset_plan.FilesetPlanWriter(self.__file_path) as plan_writer:
+            plan_writer.write(fileset_plan.RESOURCE_ENTRY_GROUP,
+                              fileset_plan.ACTION_CREATE,
+                              'entry_group',
+                              data={'name': 'entry_group'})
+            plan_writer.write(fileset_plan.RESOURCE_ENTRY, fileset_plan.ACTION_CREATE,
+                              'entry_group/entries/entry_1', 'entry_group', {'id': 'entry_1'})
+            plan_writer.write(fileset_plan.RESOURCE_ENTRY, fileset_plan.ACTION_UNCHANGED,
+                              'entry_group/entries/entry_2', 'entry_group')
+            plan_writer.write(fileset_plan.RESOURCE_ENTRY, fileset_plan.ACTION_UPDATE,
+                              'entry_group/entries/entry_3', 'entry_group', {'id': 'entry_3'},
+                              ('description', ))
+
+        self.assertEqual(
+            {
+                (fileset_plan.RESOURCE_ENTRY_GROUP, fileset_plan.ACTION_CREATE): 1,
+                (fileset_plan.RESOURCE_ENTRY, fileset_plan.ACTION_CREATE): 1,
+                (fileset_plan.RESOURCE_ENTRY, fileset_plan.ACTION_UNCHANGED): 1,
+                (fileset_plan.RESOURCE_ENTRY, fileset_plan.ACTION_UPDATE): 1
+            }, plan_writer.summary)
+        self.assertEqual([
+            {
+                'resource': 'entry_group',
+                'action': 'create',
+                'name': 'entry_group',
+                'data': {
+                    'name': 'entry_group'
+                }
+            },
+            {
+                'resource': 'entry',
+                'action': 'create',
+                'name': 'entry_group/entries/entry_1',
+                'parent': 'entry_group',
+                'data': {
+                    'id': 'entry_1'
+                }
+            },
+            {
+                'resource': 'entry',
+                'action': 'unchanged',
+                'name': 'entry_group/entries/entry_2',
+                'parent': 'entry_group'
+            },
+            {
+                'resource': 'entry',
+                'action': 'update',
+                'name': 'entry_group/entries/entry_3',
+                'parent': 'entry_group',
+                'data': {
+                    'id': 'entry_3'
+                },
+                'fields': ['description']
+            },
+        ], list(fileset_plan.FilesetPlanReader(self.__file_path)))
+
+    def test_write_empty_values_should_be_serializable(self):
+        with fileset_plan.FilesetPlanWriter(self.__file_path) as plan_writer:
+            plan_writer.write(
+                fileset_plan.RESOURCE_ENTRY, fileset_plan.ACTION_CREATE,
+                'entry_group/entries/entry_1', 'entry_group', {
+                    'description': float('nan'),
+                    'file_patterns': ['gs://bucket/*'],
+                    'schema_columns': {
+                        float('nan'): {
+                            'schema_column_type': float('nan')
+                        },
+                        'first_name': {
+                            'schema_column_type': 'STRING',
+                            'schema_column_mode': float('nan')
+                        }
+                    }
+                })
+
+        record, = fileset_plan.FilesetPlanReader(self.__file_path)
+        self.assertEqual(
+            {
+                'description': None,
+                'file_patterns': ['gs://bucket/*'],
+                'schema_columns': {
+                    'first_name': {
+                        'schema_column_type': 'STRING',
+                        'schema_column_mode': None
+                    }
+                }
+            }, record['data'])
@@ -0,0 +1,138 @@
+import pickle
+import unittest
+
+from datacatalog_fileset_processor import fileset_spec
+
+
+class FilesetSpecTest(unittest.TestCase):
+
+    def test_entry_spec_dict_should_round_trip(self):
+        entry_spec = fileset_spec.EntrySpec(
+            'projects/my-project/locations/us-central1/entryGroups/entry_group',
+            'entry_1',
+            'My Entry',
+            None, ['gs://bucket/*'],
+            columns=[
+                fileset_spec.ColumnSpec('first_name', 'STRING', None, 'REQUIRED'),
+                fileset_spec.ColumnSpec('has_pii', 'BOOL')
+            ])
+
+        entry_dict = entry_spec.to_dict()
+
+        self.assertEqual(
+            {
+                'id': 'entry_1',
+                'name': 'projects/my-project/locations/us-central1/entryGroups/entry_group'
+                '/entries/entry_1',
+                'display_name': 'My Entry',
+                'description': None,
+                'file_patterns': ['gs://bucket/*'],
+                'schema_columns': {
+                    'first_name': {
+                        'schema_column_type': 'STRING',
+                        'schema_column_description': None,
+                        'schema_column_mode': 'REQUIRED'
+                    },
+                    'has_pii': {
+                        'schema_column_type': 'BOOL',
+                        'schema_column_description': None,
+                        'schema_column_mode': None
+                    }
+                }
+            }, entry_dict)
+        self.assertEqual(entry_spec, fileset_spec.EntrySpec.from_dict(entry_dict))
+
+    def test_entry_group_spec_dict_should_round_trip_without_entries(self):
+        entry_group_spec = fileset_spec.EntryGroupSpec(
+            'entry_group', 'My Entry Group', entries=[fileset_spec.EntrySpec('entry_group', 'e')])
+
+        entry_group_dict = entry_group_spec.to_dict()
+
+        self.assertEqual(
+            {
+                'name': 'entry_group',
+                'display_name': 'My Entry Group',
+                'description': None
+            }, entry_group_dict)
+        self.assertEqual(fileset_spec.EntryGroupSpec('entry_group', 'My Entry Group'),
+                         fileset_spec.EntryGroupSpec.from_dict(entry_group_dict))
+
+    def test_set_column_should_replace_column_with_same_name(self):
+        entry_spec = fileset_spec.EntrySpec('entry_group', 'entry')
+
+        entry_spec.set_column(fileset_spec.ColumnSpec('first_name', 'STRING'))
+        entry_spec.set_column(fileset_spec.ColumnSpec('has_pii', 'BOOL'))
+        entry_spec.set_column(fileset_spec.ColumnSpec('first_name', 'BYTES'))
+
+        self.assertEqual([
+            fileset_spec.ColumnSpec('first_name', 'BYTES'),
+            fileset_spec.ColumnSpec('has_pii', 'BOOL')
+        ], entry_spec.columns)
+
+    def test_merge_entry_group_specs_should_merge_fragments(self):
+        first_entry_spec = fileset_spec.EntrySpec(
+            'entry_group', 'entry', columns=[fileset_spec.ColumnSpec('first_name', 'STRING')])
+        entry_group_specs = [
+            fileset_spec.EntryGroupSpec('entry_group', entries=[first_entry_spec]),
+            fileset_spec.EntryGroupSpec('other_entry_group', 'Other Entry Group'),
+            fileset_spec.EntryGroupSpec(
+                'entry_group',
+                'My Entry Group',
+                entries=[
+                    fileset_spec.EntrySpec('entry_group',
+                                           'entry',
+                                           columns=[fileset_spec.ColumnSpec('has_pii', 'BOOL')]),
+                    fileset_spec.EntrySpec('entry_group', 'other_entry')
+                ])
+        ]
+
+        merged_entry_group_specs = fileset_spec.merge_entry_group_specs(iter(entry_group_specs))
+
+        self.assertEqual(['entry_group', 'other_entry_group'],
+                         [entry_group_spec.name for entry_group_spec in merged_entry_group_specs])
+        entry_group_spec = merged_entry_group_specs[0]
+        self.assertEqual('My Entry Group', entry_group_spec.display_name)
+        self.assertEqual(['entry', 'other_entry'],
+                         [entry_spec.id for entry_spec in entry_group_spec.entries])
+        self.assertEqual([
+            fileset_spec.ColumnSpec('first_name', 'STRING'),
+            fileset_spec.ColumnSpec('has_pii', 'BOOL')
+        ], entry_group_spec.entries[0].columns)
+
+    def test_specs_should_share_repeated_strings(self):
+        # Strings built at runtime are distinct objects unless they are interned.
+        column_type = ''.join(['STR', 'ING'])
+        other_column_type = ''.join(['STRI', 'NG'])
+        self.assertIsNot(column_type, other_column_type)
+
+        column = fileset_spec.ColumnSpec('first_name', column_type)
+        other_column = fileset_spec.ColumnSpec('last_name', other_column_type)
+
+        self.assertIs(column.type, other_column.type)
+        self.assertEqual(1, fileset_spec.intern(1))
+        self.assertIsNone(fileset_spec.intern(None))
+
+    def test_specs_should_not_have_instance_dicts(self):
+        entry_spec = fileset_spec.EntrySpec('entry_group', 'entry')
+
+        self.assertFalse(hasattr(entry_spec, '__dict__'))
+        self.assertNotEqual(entry_spec, fileset_spec.EntrySpec('entry_group', 'other_entry'))
+        self.assertNotEqual(entry_spec, entry_spec.to_dict())
+        self.assertIn("id='entry'", repr(entry_spec))
+
+    def test_specs_should_round_trip_through_pickle_with_interned_strings(self):
+        entry_group_spec = fileset_spec.EntryGroupSpec(
+            'entry_group',
+            'My Entry Group',
+            entries=[
+                fileset_spec.EntrySpec('entry_group',
+                                       'entry',
+                                       file_patterns=['gs://bucket/*'],
+                                       columns=[fileset_spec.ColumnSpec('first_name', 'STRING')])
+            ])
+
+        unpickled_spec = pickle.loads(pickle.dumps(entry_group_spec))
+
+        self.assertEqual(entry_group_spec, unpickled_spec)
+        self.assertIs(entry_group_spec.entries[0].columns[0].type,
+                      unpickled_spec.entries[0].columns[0].type)
@@ -0,0 +1,157 @@
+import unittest
+
+import pandas as pd
+
+from datacatalog_fileset_processor import constant, fileset_validator
+
+
+class FilesetsValidatorTest(unittest.TestCase):
+
+    def test_validate_dataframe_valid_rows_should_pass(self):
+        validator = fileset_validator.FilesetsValidator(validate_dataflow_sql_types=True)
+
+        validator.validate_dataframe(make_dataframe([make_row(),
+                                                     make_continuation_row()]), 'file.csv')
+
+        self.assertEqual({}, validator.violations)
+        validator.check()
+
+    def test_validate_dataframe_should_report_every_violation_with_its_rows(self):
+        validator = fileset_validator.FilesetsValidator(validate_dataflow_sql_types=True)
+
+        validator.validate_dataframe(
+            make_dataframe([
+                make_row(entry_group_name='entry_group'),
+                make_row(entry_id='entry-1', schema_column_mode='OPTIONAL'),
+                make_row(entry_id=None),
+                make_row(entry_id='entry_2', entry_display_name=None, entry_file_patterns=None),
+                make_row(entry_id='entry_3',
+                         entry_file_patterns='gs://bucket/*|bucket/*.csv',
+                         schema_column_type='VARCHAR'),
+                make_row(entry_id='entry_4', schema_column_type=None),
+            ]), 'file.csv')
+
+        dataflow_sql_type_message = \
+            "file.csv: schema_column_type 'VARCHAR' not in allowed Dataflow SQL types: {}".format(
+                constant.DATAFLOW_SQL_VALID_TYPES)
+        mode_message = "file.csv: invalid schema_column_mode 'OPTIONAL', expected one of {}" \
+            .format(constant.SCHEMA_COLUMN_VALID_MODES)
+        self.assertEqual(
+            {
+                'file.csv: missing entry_id': [1, [3]],
+                'file.csv: missing entry_display_name on the first row of the Entry': [1, [4]],
+                'file.csv: missing entry_file_patterns on the first row of the Entry': [1, [4]],
+                "file.csv: invalid entry_group_name 'entry_group'": [1, [1]],
+                "file.csv: invalid entry_id 'entry-1'": [1, [2]],
+                "file.csv: invalid file pattern 'bucket/*.csv', expected gs://bucket/path":
+                [1, [5]],
+                'file.csv: missing schema_column_type': [1, [6]],
+                dataflow_sql_type_message: [1, [5]],
+                mode_message: [1, [2]],
+            }, dict(validator.violations))
+
+    def test_validate_dataframe_should_not_check_dataflow_sql_types_unless_enabled(self):
+        validator = fileset_validator.FilesetsValidator()
+
+        validator.validate_dataframe(make_dataframe([make_row(schema_column_type='DOUBLE')]),
+                                     'file.csv')
+
+        self.assertEqual({}, validator.violations)
+
+    def test_validate_dataframe_should_check_the_header(self):
+        validator = fileset_validator.FilesetsValidator()
+        dataframe = make_dataframe([make_row(entry_file_patterns=None)])
+
+        validator.validate_dataframe(
+            dataframe, 'file.csv',
+            [column for column in dataframe.columns if column != 'entry_file_patterns'])
+
+        self.assertEqual({'file.csv: missing required column entry_file_patterns': [0, []]},
+                         dict(validator.violations))
+        with self.assertLogs(level='ERROR') as logs, \
+                self.assertRaisesRegex(ValueError, '1 violations found'):
+            validator.check()
+        self.assertEqual(['ERROR:root:file.csv: missing required column entry_file_patterns'],
+                         logs.output)
+
+    def test_validate_dataframe_should_track_entries_across_dataframes(self):
+        validator = fileset_validator.FilesetsValidator()
+        first_dataframe = make_dataframe([make_row()])
+        second_dataframe = make_dataframe(
+            [make_continuation_row(),
+             make_continuation_row(entry_id='entry_2')], start=1)
+
+        validator.validate_dataframe(first_dataframe, 'file.csv')
+        validator.validate_dataframe(second_dataframe, 'file.csv')
+        validator.validate_dataframe(first_dataframe, 'other.csv')
+
+        self.assertEqual(
+            {
+                'file.csv: missing entry_display_name on the first row of the Entry': [1, [3]],
+                'file.csv: missing entry_file_patterns on the first row of the Entry': [1, [3]],
+            }, dict(validator.violations))
+
+    def test_check_should_log_the_first_rows_and_count_the_other_ones(self):
+        validator = fileset_validator.FilesetsValidator()
+        validator.validate_dataframe(
+            make_dataframe(
+                [make_row(entry_id='entry-{}'.format(index % 2)) for index in range(15)]),
+            'file.csv')
+
+        with self.assertLogs(level='ERROR') as logs, \
+                self.assertRaisesRegex(ValueError, '15 violations found'):
+            validator.check()
+
+        self.assertEqual([
+            "ERROR:root:file.csv: invalid entry_id 'entry-0', rows 1, 3, 5, 7, 9, 11, 13, 15",
+            "ERROR:root:file.csv: invalid entry_id 'entry-1', rows 2, 4, 6, 8, 10, 12, 14",
+        ], logs.output)
+
+    def test_check_should_truncate_the_reported_rows(self):
+        validator = fileset_validator.FilesetsValidator()
+        validator.validate_dataframe(make_dataframe([make_row(entry_id='entry-1')] * 12),
+                                     'file.csv')
+
+        with self.assertLogs(level='ERROR') as logs, self.assertRaises(ValueError):
+            validator.check()
+
+        self.assertEqual([
+            "ERROR:root:file.csv: invalid entry_id 'entry-1', rows 1, 2, 3, 4, 5, 6, 7, 8, 9, 10"
+            " and 2 more"
+        ], logs.output)
+
+
+def make_row(**values):
+    row = {
+        'entry_group_name': 'projects/my-project/locations/us-central1/entryGroups/entry_group_1',
+        'entry_group_display_name': 'My Entry Group',
+        'entry_group_description': None,
+        'entry_id': 'entry_1',
+        'entry_display_name': 'My Fileset',
+        'entry_description': None,
+        'entry_file_patterns': 'gs://bucket/*.csv|gs://bucket/*.png',
+        'schema_column_name': 'first_name',
+        'schema_column_type': 'STRING',
+        'schema_column_description': None,
+        'schema_column_mode': 'REQUIRED',
+    }
+    row.update(values)
+    return row
+
+
+def make_continuation_row(**values):
+    values = dict(
+        {
+            'entry_display_name': None,
+            'entry_file_patterns': None,
+            'schema_column_name': 'last_name',
+            'schema_column_mode': None
+        }, **values)
+    return make_row(**values)
+
+
+def make_dataframe(rows, start=0):
+    # Rows are indexed by their position in the file, as when read by pandas.read_csv.
+    return pd.DataFrame(rows,
+                        columns=constant.FILESETS_COLUMNS_ORDER,
+                        index=pd.RangeIndex(start, start + len(rows)))
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from datacatalog_fileset_processor import lazy_import
+
+
+class LazyImportTest(unittest.TestCase):
+
+    def test_lazy_import_should_load_module_on_attribute_access(self):
+        self.assertNotIn('json.tool', sys.modules)
+        self.addCleanup(sys.modules.pop, 'json.tool', None)
+
+        module = lazy_import.lazy_import('json.tool')
+
+        self.assertIs(module, sys.modules['json.tool'])
+        self.assertTrue(callable(module.main))
+        self.assertIs(module, sys.modules['json'].tool)
+
+    def test_lazy_import_loaded_module_should_return_it(self):
+        self.assertIs(os, lazy_import.lazy_import('os'))
+
+    def test_import_cli_should_not_load_heavy_dependencies(self):
+        # A new interpreter is needed, as the tests already imported them.
+        output = subprocess.check_output([
+            sys.executable, '-c', 'import sys, datacatalog_fileset_processor; '
+            'print(sorted({"pandas", "google.cloud.datacatalog_v1"} & set(sys.modules)))'
+        ],
+                                         env=dict(os.environ,
+                                                  PYTHONPATH=os.pathsep.join(sys.path)))
+
+        self.assertEqual('[]', output.decode().strip())
+
+    def test_import_cli_should_load_modules_used_by_worker_threads(self):
+        # Lazily imported modules must not be loaded from several threads at once.
+        output = subprocess.check_output([
+            sys.executable, '-c', 'import sys, types, datacatalog_fileset_processor; '
+            'print(type(sys.modules["datacatalog_fileset_processor.structured_logging"])'
+            ' is types.ModuleType)'
+        ],
+                                         env=dict(os.environ,
+                                                  PYTHONPATH=os.pathsep.join(sys.path)))
+
+        self.assertEqual('True', output.decode().strip())
@@ -0,0 +1,43 @@
+import types
+import unittest
+from unittest import mock
+
+from google.api_core import page_iterator
+
+from datacatalog_fileset_processor import page_calls
+
+
+class PageCallsTest(unittest.TestCase):
+
+    def test_is_list_method_should_match_list_methods_only(self):
+        self.assertTrue(page_calls.is_list_method('list_entries'))
+        self.assertFalse(page_calls.is_list_method('lookup_entry'))
+
+    def test_wrap_page_calls_should_call_each_page_through_wrapper(self):
+        page_method = mock.MagicMock(side_effect=[
+            types.SimpleNamespace(entries=['entry_1'], next_page_token='2'),
+            types.SimpleNamespace(entries=['entry_2'], next_page_token='')
+        ])
+        call = mock.MagicMock(side_effect=lambda function, *args: function(*args))
+
+        result = page_calls.wrap_page_calls(make_grpc_iterator(page_method), call)
+
+        call.assert_not_called()
+        self.assertEqual(['entry_1', 'entry_2'], list(result))
+        self.assertEqual(2, call.call_count)
+        self.assertEqual('2', page_method.call_args[0][0].page_token)
+
+    def test_wrap_page_calls_should_return_other_results_as_is(self):
+        result = iter(['entry'])
+
+        self.assertIs(result, page_calls.wrap_page_calls(result, mock.MagicMock()))
+
+
+def make_grpc_iterator(page_method):
+    """Makes the iterator returned by the list methods of the 1.x clients.
+
+    :param page_method: Function called with the request of each page, returning a
+     response with the entries and the next page token.
+    """
+    return page_iterator.GRPCIterator(None, page_method, types.SimpleNamespace(page_token=None),
+                                      'entries')
@@ -0,0 +1,45 @@
+import unittest
+from unittest import mock
+
+from datacatalog_fileset_processor import progress_reporter
+
+
+@mock.patch('datacatalog_fileset_processor.progress_reporter.time.monotonic')
+class ProgressReporterTest(unittest.TestCase):
+
+    def test_record_should_report_once_per_interval(self, mock_monotonic):
+        mock_monotonic.side_effect = [0, 5, 10, 12]
+        reporter = progress_reporter.ProgressReporter('Entries', total=10, interval=10)
+
+        with self.assertLogs(level='INFO') as logs:
+            reporter.record('upserted')
+            reporter.record('unchanged')
+            reporter.record('upserted')
+
+        self.assertEqual(
+            ['INFO:root:Entries: 2/10, 0.2/s, ETA 0:00:40, unchanged: 1, upserted: 1'],
+            logs.output)
+        self.assertEqual(
+            {
+                'progress': {
+                    'done': 2,
+                    'total': 10,
+                    'rate': 0.2,
+                    'eta_seconds': 40,
+                    'outcomes': {
+                        'upserted': 1,
+                        'unchanged': 1
+                    }
+                }
+            }, logs.records[0].fields)
+
+    def test_finish_without_total_should_not_report_eta(self, mock_monotonic):
+        mock_monotonic.side_effect = [0, 1, 2]
+        reporter = progress_reporter.ProgressReporter('Entries')
+        reporter.record('deleted')
+
+        with self.assertLogs(level='INFO') as logs:
+            reporter.finish()
+
+        self.assertEqual(['INFO:root:Entries: 1, 0.5/s, deleted: 1'], logs.output)
+        self.assertEqual({'deleted': 1}, reporter.outcomes)
@@ -0,0 +1,154 @@
+import threading
+import time
+import types
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions, page_iterator
+
+from datacatalog_fileset_processor import rate_limiter
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_acquire_should_wait_for_tokens(self):
+        bucket = rate_limiter.TokenBucket(100, capacity=1)
+
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.045)
+
+    def test_acquire_should_allow_bursts_up_to_capacity(self):
+        bucket = rate_limiter.TokenBucket(1, capacity=5)
+
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+
+        self.assertLess(time.monotonic() - start, 0.5)
+
+
+class AdaptiveConcurrencyLimitTest(unittest.TestCase):
+
+    def test_release_throttled_should_halve_limit(self):
+        concurrency_limit = rate_limiter.AdaptiveConcurrencyLimit(8)
+
+        concurrency_limit.acquire()
+        concurrency_limit.release(throttled=True)
+        self.assertEqual(4, concurrency_limit.limit)
+
+        for _ in range(3):
+            concurrency_limit.acquire()
+            concurrency_limit.release(throttled=True)
+        self.assertEqual(1, concurrency_limit.limit)
+
+    def test_release_should_grow_limit_back_up_to_maximum(self):
+        concurrency_limit = rate_limiter.AdaptiveConcurrencyLimit(4)
+        concurrency_limit.acquire()
+        concurrency_limit.release(throttled=True)
+
+        for _ in range(100):
+            concurrency_limit.acquire()
+            concurrency_limit.release()
+
+        self.assertEqual(4, concurrency_limit.limit)
+
+    def test_acquire_should_wait_for_free_slot(self):
+        concurrency_limit = rate_limiter.AdaptiveConcurrencyLimit(1)
+        concurrency_limit.acquire()
+        acquired = threading.Event()
+
+        def acquire():
+            concurrency_limit.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+
+        concurrency_limit.release()
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def test_call_should_retry_transient_errors(self):
+        function = mock.MagicMock(side_effect=[
+            exceptions.ServiceUnavailable('Service unavailable'),
+            exceptions.ResourceExhausted('Quota exceeded'), 'result'
+        ])
+        limiter = rate_limiter.RateLimiter(initial_backoff=0)
+
+        self.assertEqual('result', limiter.call('get_entry', function, name='name'))
+        self.assertEqual(3, function.call_count)
+        function.assert_called_with(name='name')
+
+    def test_call_should_raise_after_max_retries(self):
+        function = mock.MagicMock(side_effect=exceptions.ServiceUnavailable('Unavailable'))
+        limiter = rate_limiter.RateLimiter(max_retries=2, initial_backoff=0)
+
+        self.assertRaises(exceptions.ServiceUnavailable, limiter.call, 'get_entry', function)
+        self.assertEqual(3, function.call_count)
+
+    def test_call_should_not_retry_other_errors(self):
+        function = mock.MagicMock(side_effect=exceptions.PermissionDenied('Permission denied'))
+        limiter = rate_limiter.RateLimiter(initial_backoff=0)
+
+        self.assertRaises(exceptions.PermissionDenied, limiter.call, 'get_entry', function)
+        self.assertEqual(1, function.call_count)
+
+    def test_call_quota_error_should_lower_concurrency_limit(self):
+        function = mock.MagicMock(
+            side_effect=[exceptions.ResourceExhausted('Quota exceeded'), 'result'])
+        limiter = rate_limiter.RateLimiter(max_concurrency=10, initial_backoff=0)
+
+        limiter.call('create_entry', function)
+
+        self.assertEqual(5, limiter.concurrency_limit.limit)
+
+    @mock.patch('datacatalog_fileset_processor.rate_limiter.TokenBucket')
+    def test_call_should_use_bucket_by_rpc_type(self, mock_token_bucket):
+        limiter = rate_limiter.RateLimiter(qps=10, rpc_qps={'create_entry': 2})
+
+        limiter.call('create_entry', mock.MagicMock())
+        limiter.call('create_entry', mock.MagicMock())
+        limiter.call('get_entry', mock.MagicMock())
+
+        mock_token_bucket.assert_has_calls([mock.call(2), mock.call(10)], any_order=True)
+        self.assertEqual(2, mock_token_bucket.call_count)
+        self.assertEqual(3, mock_token_bucket.return_value.acquire.call_count)
+
+    def test_wrap_should_call_client_through_limiter(self):
+        client = mock.MagicMock()
+        client.get_entry.side_effect = [exceptions.DeadlineExceeded('Deadline'), 'entry']
+        limiter = rate_limiter.RateLimiter(initial_backoff=0)
+
+        self.assertEqual('entry', limiter.wrap(client).get_entry(name='name'))
+        self.assertEqual(2, client.get_entry.call_count)
+
+    @mock.patch('datacatalog_fileset_processor.rate_limiter.TokenBucket')
+    def test_wrap_should_throttle_and_retry_each_page_of_list_calls(self, mock_token_bucket):
+        page_method = mock.MagicMock(side_effect=[
+            types.SimpleNamespace(entries=['entry_1'], next_page_token='2'),
+            exceptions.ResourceExhausted('Quota exceeded'),
+            types.SimpleNamespace(entries=['entry_2'], next_page_token='')
+        ])
+        client = mock.MagicMock()
+        client.list_entries.return_value = make_grpc_iterator(page_method)
+        limiter = rate_limiter.RateLimiter(qps=10, initial_backoff=0)
+
+        entries = limiter.wrap(client).list_entries(parent='entry_group')
+        mock_token_bucket.return_value.acquire.assert_not_called()
+
+        # The page that failed is fetched again, and the listing goes on from there.
+        self.assertEqual(['entry_1', 'entry_2'], list(entries))
+        self.assertEqual(3, mock_token_bucket.return_value.acquire.call_count)
+        self.assertEqual('2', page_method.call_args[0][0].page_token)
+
+
+def make_grpc_iterator(page_method):
+    return page_iterator.GRPCIterator(None, page_method, types.SimpleNamespace(page_token=None),
+                                      'entries')
@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from datacatalog_fileset_processor import run_journal
+
+
+class RunJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.__file_path = os.path.join(temp_dir, 'journal.tsv')
+
+    def test_resume_should_report_recorded_resources_as_done(self):
+        with run_journal.RunJournal(self.__file_path) as journal:
+            journal.record_entry('entry_group/entries/entry_1', 'upserted')
+            journal.record_entry('entry_group/entries/entry_2', 'failed')
+            journal.record_entry('entry_group/entries/entry_3', 'not found')
+            journal.record_entry_group('entry_group', 'failed')
+
+        with run_journal.RunJournal(self.__file_path, resume=True) as journal:
+            self.assertTrue(journal.is_entry_done('entry_group/entries/entry_1'))
+            self.assertFalse(journal.is_entry_done('entry_group/entries/entry_2'))
+            self.assertTrue(journal.is_entry_done('entry_group/entries/entry_3'))
+            self.assertFalse(journal.is_entry_group_done('entry_group'))
+
+    def test_last_recorded_outcome_should_win(self):
+        with run_journal.RunJournal(self.__file_path) as journal:
+            journal.record_entry('entry_1', 'upserted')
+            journal.record_entry('entry_1', 'failed')
+            journal.record_entry('entry_2', 'failed')
+        with run_journal.RunJournal(self.__file_path, resume=True) as journal:
+            journal.record_entry('entry_2', 'upserted')
+            journal.record_entry_group('entry_group', 'upserted')
+
+        with run_journal.RunJournal(self.__file_path, resume=True) as journal:
+            self.assertFalse(journal.is_entry_done('entry_1'))
+            self.assertTrue(journal.is_entry_done('entry_2'))
+            self.assertTrue(journal.is_entry_group_done('entry_group'))
+
+    def test_without_resume_should_discard_records(self):
+        with run_journal.RunJournal(self.__file_path) as journal:
+            journal.record_entry('entry_1', 'upserted')
+
+        with run_journal.RunJournal(self.__file_path) as journal:
+            self.assertFalse(journal.is_entry_done('entry_1'))
+        self.assertEqual(0, os.path.getsize(self.__file_path))
+
+    def test_resume_should_drop_line_cut_short(self):
+        with open(self.__file_path, 'w') as journal_file:
+            journal_file.write('E\tupserted\tentry_1\nE\tupse')
+
+        with run_journal.RunJournal(self.__file_path, resume=True) as journal:
+            journal.record_entry('entry_2', 'upserted')
+
+        with open(self.__file_path) as journal_file:
+            self.assertEqual('E\tupserted\tentry_1\nE\tupserted\tentry_2\n', journal_file.read())
+
+    def test_resume_without_file_should_succeed(self):
+        with run_journal.RunJournal(self.__file_path, resume=True) as journal:
+            self.assertFalse(journal.is_entry_done('entry_1'))
+
+    def test_concurrent_records_should_not_interleave(self):
+        with run_journal.RunJournal(self.__file_path) as journal:
+
+            def record_entries(worker):
+                for index in range(500):
+                    journal.record_entry('entry_group/entries/entry_{}_{}'.format(worker, index),
+                                         'upserted')
+
+            threads = [
+                threading.Thread(target=record_entries, args=(worker, )) for worker in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        with open(self.__file_path) as journal_file:
+            lines = journal_file.read().splitlines()
+        self.assertEqual(4000, len(set(lines)))
+        for line in lines:
+            self.assertRegex(line, r'^E\tupserted\tentry_group/entries/entry_\d_\d+$')
+
+    @mock.patch('datacatalog_fileset_processor.run_journal.os.fsync')
+    def test_records_should_be_synced_at_most_once_per_interval(self, mock_fsync):
+        journal = run_journal.RunJournal(self.__file_path, fsync_interval=3600)
+        for index in range(100):
+            journal.record_entry('entry_{}'.format(index), 'upserted')
+        mock_fsync.assert_not_called()
+
+        journal.close()
+        journal.close()
+
+        mock_fsync.assert_called_once()
+
+    @mock.patch('datacatalog_fileset_processor.run_journal.os.fsync')
+    def test_records_should_be_synced_once_interval_elapsed(self, mock_fsync):
+        with run_journal.RunJournal(self.__file_path, fsync_interval=0) as journal:
+            journal.record_entry('entry_1', 'upserted')
+            journal.record_entry('entry_2', 'upserted')
+
+        self.assertEqual(3, mock_fsync.call_count)
@@ -0,0 +1,145 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import types
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions, page_iterator
+
+from datacatalog_fileset_processor import run_metrics
+
+
+class LatencyHistogramTest(unittest.TestCase):
+
+    def test_to_dict_should_return_cumulative_buckets(self):
+        histogram = run_metrics.LatencyHistogram(buckets=(0.1, 1.0))
+        for latency in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(latency)
+
+        self.assertEqual({
+            'count': 4,
+            'sum': 2.65,
+            'buckets': {
+                '0.1': 2,
+                '1.0': 3,
+                '+Inf': 4
+            }
+        }, histogram.to_dict())
+
+
+class RunMetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__metrics = run_metrics.RunMetrics()
+
+    def test_wrap_should_record_calls_and_errors_by_status_code(self):
+        client = mock.MagicMock()
+        client.get_entry.side_effect = [
+            'entry',
+            exceptions.ServiceUnavailable('Unavailable'),
+            exceptions.PermissionDenied('Permission denied')
+        ]
+        instrumented_client = self.__metrics.wrap(client)
+
+        self.assertEqual('entry', instrumented_client.get_entry(name='name'))
+        self.assertRaises(exceptions.ServiceUnavailable, instrumented_client.get_entry)
+        self.assertRaises(exceptions.PermissionDenied, instrumented_client.get_entry)
+        instrumented_client.create_entry()
+
+        rpcs = self.__metrics.to_dict()['rpcs']
+        self.assertEqual(['create_entry', 'get_entry'], list(rpcs))
+        self.assertEqual(3, rpcs['get_entry']['calls'])
+        self.assertEqual({'UNAVAILABLE': 1, 'PERMISSION_DENIED': 1}, rpcs['get_entry']['errors'])
+        self.assertEqual(3, rpcs['get_entry']['latency_seconds']['count'])
+        self.assertEqual({}, rpcs['create_entry']['errors'])
+        client.get_entry.assert_any_call(name='name')
+
+    def test_wrap_should_record_each_page_of_list_calls(self):
+        page_method = mock.MagicMock(side_effect=[
+            types.SimpleNamespace(entries=['entry_1'], next_page_token='2'),
+            exceptions.ServiceUnavailable('Unavailable')
+        ])
+        client = mock.MagicMock()
+        client.list_entries.return_value = page_iterator.GRPCIterator(
+            None, page_method, types.SimpleNamespace(page_token=None), 'entries')
+
+        entries = self.__metrics.wrap(client).list_entries(parent='entry_group')
+        self.assertEqual({}, self.__metrics.to_dict()['rpcs'])
+
+        self.assertRaises(exceptions.ServiceUnavailable, list, entries)
+        rpc = self.__metrics.to_dict()['rpcs']['list_entries']
+        self.assertEqual(2, rpc['calls'])
+        self.assertEqual({'UNAVAILABLE': 1}, rpc['errors'])
+
+    def test_record_call_other_errors_should_use_exception_name(self):
+        self.__metrics.record_call('get_entry', 0.1, ValueError('Invalid'))
+
+        self.assertEqual({'ValueError': 1},
+                         self.__metrics.to_dict()['rpcs']['get_entry']['errors'])
+
+    def test_phase_should_not_account_nested_phases_to_outer_one(self):
+        with self.__metrics.phase('sync'):
+            time.sleep(0.02)
+            with self.__metrics.phase('build'):
+                time.sleep(0.05)
+            time.sleep(0.02)
+
+        phases = self.__metrics.to_dict()['phases_seconds']
+        self.assertGreaterEqual(phases['build'], 0.05)
+        self.assertGreaterEqual(phases['sync'], 0.04)
+        self.assertLess(phases['sync'], 0.08)
+
+    def test_phase_should_accumulate_across_threads(self):
+
+        def build():
+            with self.__metrics.phase('build'):
+                time.sleep(0.02)
+
+        threads = [threading.Thread(target=build) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertGreaterEqual(self.__metrics.to_dict()['phases_seconds']['build'], 0.06)
+
+    def test_to_prometheus_should_export_every_metric(self):
+        self.__metrics.record_call('create_entry', 0.2)
+        self.__metrics.record_call('create_entry', 20, exceptions.ResourceExhausted('Quota'))
+        with self.__metrics.phase('read'):
+            pass
+
+        lines = self.__metrics.to_prometheus().splitlines()
+
+        prefix = 'datacatalog_fileset_processor_'
+        self.assertIn('# TYPE {}rpc_latency_seconds histogram'.format(prefix), lines)
+        self.assertIn('{}rpc_calls_total{{rpc="create_entry"}} 2'.format(prefix), lines)
+        self.assertIn(
+            '{}rpc_errors_total{{rpc="create_entry",code="RESOURCE_EXHAUSTED"}} 1'.format(prefix),
+            lines)
+        self.assertIn(
+            '{}rpc_latency_seconds_bucket{{rpc="create_entry",le="0.25"}} 1'.format(prefix), lines)
+        self.assertIn(
+            '{}rpc_latency_seconds_bucket{{rpc="create_entry",le="+Inf"}} 2'.format(prefix), lines)
+        self.assertIn('{}rpc_latency_seconds_count{{rpc="create_entry"}} 2'.format(prefix), lines)
+        self.assertTrue(
+            any(
+                line.startswith('{}phase_seconds{{phase="read"}}'.format(prefix))
+                for line in lines))
+
+    def test_write_should_write_json_and_prometheus_files(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        file_path_prefix = os.path.join(temp_dir, 'metrics')
+        self.__metrics.record_call('delete_entry', 0.01)
+
+        self.__metrics.write(file_path_prefix)
+
+        with open(file_path_prefix + '.json') as json_file:
+            self.assertEqual(self.__metrics.to_dict()['rpcs'], json.load(json_file)['rpcs'])
+        with open(file_path_prefix + '.prom') as prometheus_file:
+            self.assertEqual(self.__metrics.to_prometheus(), prometheus_file.read())
@@ -0,0 +1,52 @@
+import unittest
+
+from datacatalog_fileset_processor import fileset_spec, sharding
+
+
+class ShardingTest(unittest.TestCase):
+
+    def test_shard_of_should_be_stable(self):
+        # Nodes and runs must agree on the shards, so the values must not change.
+        self.assertEqual([0, 2, 1], [
+            sharding.shard_of(
+                'projects/my-project/locations/us-central1/entryGroups/'
+                'entry_group_{}'.format(index), 4) for index in range(3)
+        ])
+
+    def test_select_shard_should_partition_entry_groups(self):
+        entry_group_specs = [
+            fileset_spec.EntryGroupSpec('entry_group_{}'.format(index)) for index in range(100)
+        ]
+
+        shards = [
+            list(sharding.select_shard(entry_group_specs, shard_index, 3))
+            for shard_index in range(3)
+        ]
+
+        self.assertEqual(
+            sorted(entry_group_spec.name for entry_group_spec in entry_group_specs),
+            sorted(entry_group_spec.name for shard in shards for entry_group_spec in shard))
+        for shard in shards:
+            self.assertGreater(len(shard), 20)
+
+    def test_count_shard_sizes_should_count_entry_groups_and_entries(self):
+        entry_group_specs = [
+            fileset_spec.EntryGroupSpec('entry_group_{}'.format(index),
+                                        entries=[fileset_spec.EntrySpec('entry_group', 'entry')] *
+                                        index) for index in range(10)
+        ]
+
+        shard_sizes = sharding.count_shard_sizes(entry_group_specs, 2)
+
+        self.assertEqual(2, len(shard_sizes))
+        self.assertEqual((10, 45), tuple(map(sum, zip(*shard_sizes))))
+        self.assertEqual(
+            sum(1 for entry_group_spec in entry_group_specs
+                if sharding.shard_of(entry_group_spec.name, 2) == 0), shard_sizes[0][0])
+
+    def test_validate_shard_should_raise_on_invalid_options(self):
+        sharding.validate_shard(None, None)
+        sharding.validate_shard(3, 4)
+
+        for shard_index, shard_count in ((1, None), (None, 4), (4, 4), (-1, 4), (0, 0)):
+            self.assertRaises(ValueError, sharding.validate_shard, shard_index, shard_count)
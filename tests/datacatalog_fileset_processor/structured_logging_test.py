@@ -0,0 +1,83 @@
+import json
+import logging
+import sys
+import unittest
+from unittest import mock
+
+from datacatalog_fileset_processor import structured_logging
+
+
+class StructuredLoggingTest(unittest.TestCase):
+
+    def test_entry_sampler_should_keep_all_records_of_sampled_entries(self):
+        sampler = structured_logging.EntrySampler(0.1)
+        entry_names = ['entry_{}'.format(index) for index in range(1000)]
+
+        kept_entry_names = [
+            entry_name for entry_name in entry_names
+            if sampler.filter(make_record(fields={'entry': entry_name}))
+        ]
+
+        self.assertLess(50, len(kept_entry_names))
+        self.assertGreater(150, len(kept_entry_names))
+        self.assertTrue(
+            all(
+                sampler.filter(make_record(fields={'entry': entry_name}))
+                for entry_name in kept_entry_names))
+
+    def test_entry_sampler_should_keep_warnings_and_other_records(self):
+        sampler = structured_logging.EntrySampler(0)
+
+        self.assertFalse(sampler.filter(make_record(fields={'entry': 'entry'})))
+        self.assertTrue(
+            sampler.filter(make_record(level=logging.WARNING, fields={'entry': 'entry'})))
+        self.assertTrue(sampler.filter(make_record()))
+
+    def test_json_formatter_should_include_fields(self):
+        record = make_record(fields={'entry': 'entry_1', 'operation': 'created'})
+
+        document = json.loads(structured_logging.JsonFormatter().format(record))
+
+        self.assertEqual('INFO', document['level'])
+        self.assertEqual('Entry created: entry_1', document['message'])
+        self.assertEqual('entry_1', document['entry'])
+        self.assertEqual('created', document['operation'])
+        self.assertIn('time', document)
+
+    def test_json_formatter_should_include_exception(self):
+        try:
+            raise ValueError('error')
+        except ValueError:
+            record = make_record(level=logging.ERROR, exc_info=sys.exc_info())
+
+        document = json.loads(structured_logging.JsonFormatter().format(record))
+
+        self.assertIn('ValueError: error', document['exception'])
+
+    @mock.patch('datacatalog_fileset_processor.structured_logging.logging.basicConfig')
+    def test_setup_logging_json_should_set_formatter_and_sampler(self, mock_basic_config):
+        structured_logging.setup_logging('json', 0.5)
+        structured_logging.setup_logging('json', 0.1)
+
+        handler = mock_basic_config.call_args[1]['handlers'][0]
+        self.assertIsInstance(handler.formatter, structured_logging.JsonFormatter)
+        self.assertFalse(handler.filter(make_record(message='')))
+        samplers = [
+            log_filter for log_filter in structured_logging.entry_logger.filters
+            if isinstance(log_filter, structured_logging.EntrySampler)
+        ]
+        self.assertEqual(1, len(samplers))
+
+        structured_logging.setup_logging()
+
+        self.assertEqual([], structured_logging.entry_logger.filters)
+
+
+def make_record(level=logging.INFO, message='Entry created: entry_1', fields=None, exc_info=None):
+    return logging.getLogger('test').makeRecord('test',
+                                                level,
+                                                __file__,
+                                                1,
+                                                message, (),
+                                                exc_info,
+                                                extra={'fields': fields} if fields else None)